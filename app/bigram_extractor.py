@@ -0,0 +1,86 @@
+"""Session-end bigram latency extraction from recorded keystrokes.
+
+The typing area already records every keystroke with a timestamp for ghost
+replay. Once a session ends, that list is replayed through a scratch
+TypingEngine (the same way ghost races do) to learn which expected
+character each keystroke was aimed at. Nothing runs while the user types.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.typing_engine import TypingEngine
+
+# (char1, char2) -> [total_time_ms, correct_count, error_count]
+BigramTotals = Dict[Tuple[str, str], List[float]]
+
+# Gaps longer than this are hesitation, not key-to-key latency
+MAX_BIGRAM_GAP_MS = 2000
+
+
+def extract_bigrams(
+    keystrokes: Sequence[dict],
+    content: str,
+    auto_indent: bool = False,
+    space_per_tab: int = 4,
+    max_gap_ms: int = MAX_BIGRAM_GAP_MS,
+) -> BigramTotals:
+    """Aggregate inter-key latency and errors per expected bigram.
+
+    Args:
+        keystrokes: Ghost keystroke dicts (``t`` ms, ``k`` key, ``c`` correct).
+        content: The exact text the session was typed against.
+        auto_indent: Whether smart indentation was active.
+        space_per_tab: Spaces inserted per Tab press.
+        max_gap_ms: Latencies above this are not counted.
+
+    A correct keystroke that directly follows another correct one adds its
+    latency to the bigram (previous expected char, expected char). A wrong
+    keystroke counts an error against the bigram it interrupted.
+    """
+    engine = TypingEngine(content, allow_continue_mistakes=True)
+    engine.auto_indent = auto_indent
+    state = engine.state
+
+    totals: BigramTotals = {}
+    # Expected char, timestamp and resulting cursor of the last clean keystroke
+    prev_char: Optional[str] = None
+    prev_t = 0
+    prev_cursor = -1
+
+    for keystroke in keystrokes:
+        key = keystroke.get("k", "")
+        t = keystroke.get("t", 0)
+
+        if key == "<CTRL-BACKSPACE>":
+            engine.process_ctrl_backspace()
+            prev_char = None
+            continue
+        if key == "\b":
+            engine.process_backspace(space_per_tab=space_per_tab)
+            prev_char = None
+            continue
+        if key == "\t":
+            for _ in range(space_per_tab):
+                engine.process_keystroke(" ", increment_stats=False, space_per_tab=space_per_tab)
+            prev_char = None
+            continue
+        if not key:
+            continue
+
+        pos = state.cursor_position
+        if pos >= len(content):
+            break
+        is_correct, expected, _ = engine.process_keystroke(key, space_per_tab=space_per_tab)
+
+        if is_correct:
+            if prev_char is not None and prev_cursor == pos and 0 <= t - prev_t <= max_gap_ms:
+                entry = totals.setdefault((prev_char, expected), [0.0, 0, 0])
+                entry[0] += t - prev_t
+                entry[1] += 1
+            prev_char, prev_t, prev_cursor = expected, t, state.cursor_position
+        else:
+            if pos > 0:
+                entry = totals.setdefault((content[pos - 1], expected), [0.0, 0, 0])
+                entry[2] += 1
+            prev_char = None
+
+    return totals
@@ -0,0 +1,116 @@
+"""Level-of-detail helpers for the stats charts.
+
+Charts hand in their value arrays and the pixel width they are drawn at and
+get back the indices worth drawing, plus a bucketed index for hover
+hit-testing. Nothing here imports Qt so it can be tested headless.
+"""
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# (data index, x, y) in widget coordinates
+PlotPoint = Tuple[int, float, float]
+
+
+def linear_regression(values: Sequence[float]) -> Tuple[float, float]:
+    """Least-squares fit of ``values`` against their index. Returns (slope, intercept)."""
+    n = len(values)
+    if n < 2:
+        return 0, values[0] if values else 0
+
+    x_mean = (n - 1) / 2
+    y_mean = sum(values) / n
+    # Closed forms for x = 0..n-1 keep this a single pass over the values
+    numerator = sum(i * y for i, y in enumerate(values)) - n * x_mean * y_mean
+    denominator = n * (n * n - 1) / 12
+
+    slope = numerator / denominator
+    intercept = y_mean - slope * x_mean
+    return slope, intercept
+
+
+def lttb_indices(values: Sequence[float], threshold: int) -> List[int]:
+    """Pick ``threshold`` indices with Largest-Triangle-Three-Buckets.
+
+    The x coordinate is the index itself. First and last points are always
+    kept; when there is nothing to drop every index is returned.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    sampled = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(max(int((i + 2) * every) + 1, avg_start + 1), n)
+        avg_x = (avg_start + avg_end - 1) / 2
+        avg_y = sum(values[avg_start:avg_end]) / (avg_end - avg_start)
+
+        range_start = int(i * every) + 1
+        range_end = max(int((i + 1) * every) + 1, range_start + 1)
+        ay = values[a]
+        max_area = -1.0
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((a - avg_x) * (values[j] - ay) - (a - j) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        sampled.append(next_a)
+        a = next_a
+
+    sampled.append(n - 1)
+    return sampled
+
+
+def minmax_indices(values: Sequence[float], buckets: int) -> List[int]:
+    """Keep the minimum and maximum of each of ``buckets`` equal index ranges.
+
+    Suited to bars and connected lines where dropping a spike would change
+    the silhouette. Returns indices in ascending order.
+    """
+    n = len(values)
+    if buckets <= 0 or n <= 2 * buckets:
+        return list(range(n))
+
+    result: List[int] = []
+    for b in range(buckets):
+        start = b * n // buckets
+        end = (b + 1) * n // buckets
+        if start >= end:
+            continue
+        chunk = values[start:end]
+        lo = start + chunk.index(min(chunk))
+        hi = start + chunk.index(max(chunk))
+        result.extend(sorted({lo, hi}))
+    return result
+
+
+class PointBucketIndex:
+    """Screen points bucketed into fixed-width columns for hover lookups."""
+
+    def __init__(self, points: Iterable[PlotPoint], bucket_width: float = 16.0):
+        self.bucket_width = bucket_width
+        self._buckets: Dict[int, List[PlotPoint]] = {}
+        for point in points:
+            self._buckets.setdefault(int(point[1] // bucket_width), []).append(point)
+
+    def candidates(self, x: float, radius: float) -> Iterator[PlotPoint]:
+        """Yield points whose column lies within ``radius`` of ``x``, by index."""
+        first = int((x - radius) // self.bucket_width)
+        last = int((x + radius) // self.bucket_width)
+        for bucket in range(first, last + 1):
+            yield from self._buckets.get(bucket, ())
+
+    def nearest(self, x: float, y: float, radius: float) -> Optional[int]:
+        """Return the data index of the closest point strictly within ``radius``."""
+        closest = None
+        closest_dist = radius
+        for index, px, py in self.candidates(x, radius):
+            dist = math.hypot(x - px, y - py)
+            if dist < closest_dist:
+                closest_dist = dist
+                closest = index
+        return closest
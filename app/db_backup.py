@@ -0,0 +1,232 @@
+"""Online backups of profile databases.
+
+Copying ``typing_stats.db`` while the app runs is unsafe under WAL: the
+newest pages may still be in ``typing_stats.db-wal``. Backups here go
+through SQLite's online backup API instead, a bounded number of pages per
+step with a pause in between. The copy is read from a single read
+transaction, so in WAL mode session writes carry on and never force the
+backup to restart.
+
+Snapshots live in the profile's ``backups/`` folder, are checked with
+``PRAGMA quick_check`` before they replace anything, and are rotated to
+the newest few. ``restore_backup`` copies a snapshot back over the live
+database, through the same API.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR_NAME = "backups"
+BACKUP_SUFFIX = ".db"
+_PARTIAL_SUFFIX = ".partial"
+_STAMP_FORMAT = "%Y%m%d-%H%M%S"
+
+# Pages copied per backup step (4 KiB pages: ~1 MiB) and the pause after each
+BACKUP_STEP_PAGES = 256
+BACKUP_STEP_PAUSE_S = 0.005
+# Snapshots kept per profile when the setting is missing
+DEFAULT_BACKUP_KEEP = 5
+# MainWindow checks whether a snapshot is due this long after launch, then hourly
+BACKUP_STARTUP_DELAY_MS = 30_000
+BACKUP_CHECK_INTERVAL_MS = 60 * 60 * 1000
+
+
+class BackupError(Exception):
+    """A backup or restore failed; the live database is untouched."""
+
+
+class BackupCancelled(BackupError):
+    pass
+
+
+@dataclass
+class BackupInfo:
+    """One snapshot on disk."""
+    path: Path
+    created: datetime
+    size: int
+
+
+def backup_dir_for(db_path: Union[str, Path]) -> Path:
+    return Path(db_path).parent / BACKUP_DIR_NAME
+
+
+def list_backups(db_path: Union[str, Path]) -> List[BackupInfo]:
+    """Snapshots of a profile database, newest first."""
+    folder = backup_dir_for(db_path)
+    stem = Path(db_path).stem
+    backups = []
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return []
+    for entry in entries:
+        name = entry.name
+        if not (name.startswith(f"{stem}-") and name.endswith(BACKUP_SUFFIX)):
+            continue
+        try:
+            created = datetime.strptime(name[len(stem) + 1:-len(BACKUP_SUFFIX)], _STAMP_FORMAT)
+        except ValueError:
+            continue
+        backups.append(BackupInfo(Path(entry.path), created, entry.stat().st_size))
+    return sorted(backups, key=lambda b: b.created, reverse=True)
+
+
+def verify_database(path: Union[str, Path]) -> bool:
+    """True if ``PRAGMA quick_check`` finds no problems."""
+    try:
+        conn = sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True, timeout=10.0)
+    except sqlite3.Error:
+        return False
+    try:
+        rows = conn.execute("PRAGMA quick_check").fetchall()
+        return rows == [("ok",)]
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+def _copy_database(
+    source: sqlite3.Connection,
+    target: sqlite3.Connection,
+    pages: int,
+    pause_s: float,
+    cancelled: Optional[Callable[[], bool]],
+):
+    def progress(status, remaining, total):
+        if cancelled is not None and cancelled():
+            raise BackupCancelled("Backup cancelled")
+        if remaining and pause_s:
+            time.sleep(pause_s)
+
+    source.backup(target, pages=pages, progress=progress)
+
+
+def create_backup(
+    db_path: Union[str, Path],
+    keep: int = DEFAULT_BACKUP_KEEP,
+    pages: int = BACKUP_STEP_PAGES,
+    pause_s: float = BACKUP_STEP_PAUSE_S,
+    cancelled: Optional[Callable[[], bool]] = None,
+    now: Optional[datetime] = None,
+) -> Path:
+    """Snapshot ``db_path`` into its backups folder and rotate old snapshots.
+
+    Raises:
+        BackupError: The copy failed its integrity check or was cancelled.
+        sqlite3.Error: The source could not be read.
+    """
+    db_path = Path(db_path)
+    folder = backup_dir_for(db_path)
+    folder.mkdir(parents=True, exist_ok=True)
+    stamp = (now or datetime.now()).strftime(_STAMP_FORMAT)
+    final = folder / f"{db_path.stem}-{stamp}{BACKUP_SUFFIX}"
+    partial = final.with_name(final.name + _PARTIAL_SUFFIX)
+
+    source = sqlite3.connect(db_path, timeout=10.0)
+    target = sqlite3.connect(partial)
+    try:
+        # One read transaction for the whole copy: a consistent snapshot that
+        # other connections' commits (WAL) don't invalidate mid-backup
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        _copy_database(source, target, pages, pause_s, cancelled)
+        source.rollback()
+        # A standalone file: no -wal/-shm needed to open or restore it
+        target.execute("PRAGMA journal_mode=DELETE")
+    except BaseException:
+        target.close()
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+    target.close()
+
+    if not verify_database(partial):
+        partial.unlink(missing_ok=True)
+        raise BackupError(f"Backup of {db_path.name} failed its integrity check")
+    os.replace(partial, final)
+
+    for old in list_backups(db_path)[max(keep, 1):]:
+        try:
+            old.path.unlink()
+        except OSError as e:
+            logger.warning("Could not remove old backup %s: %s", old.path.name, e)
+    return final
+
+
+def restore_backup(backup_path: Union[str, Path], db_path: Union[str, Path]):
+    """Replace the contents of ``db_path`` with a snapshot.
+
+    The snapshot is verified first. The copy goes through the backup API
+    into the live database, so its WAL stays consistent; callers must
+    flush pending writes beforehand and reload anything cached afterwards.
+
+    Raises:
+        BackupError: The snapshot is missing or damaged.
+    """
+    backup_path = Path(backup_path)
+    if not backup_path.is_file() or not verify_database(backup_path):
+        raise BackupError(f"Backup {backup_path.name} is missing or damaged")
+
+    source = sqlite3.connect(f"file:{backup_path.as_posix()}?mode=ro", uri=True)
+    target = sqlite3.connect(db_path, timeout=10.0)
+    try:
+        source.backup(target)
+        target.execute("PRAGMA journal_mode=WAL")
+    finally:
+        source.close()
+        target.close()
+
+
+def backup_due(db_path: Union[str, Path], interval_hours: int, now: Optional[datetime] = None) -> bool:
+    """Whether the newest snapshot is older than ``interval_hours`` (0 = never)."""
+    if interval_hours <= 0:
+        return False
+    backups = list_backups(db_path)
+    if not backups:
+        return True
+    age = (now or datetime.now()) - backups[0].created
+    return age.total_seconds() >= interval_hours * 3600
+
+
+class _BackupSignals(QObject):
+    finished = Signal(str)  # Snapshot path
+    failed = Signal(str)
+
+
+class BackupTask(QRunnable):
+    """Background snapshot of one profile database."""
+
+    def __init__(self, db_path: Path, keep: int = DEFAULT_BACKUP_KEEP):
+        super().__init__()
+        self.db_path = db_path
+        self.keep = keep
+        self.signals = _BackupSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            path = create_backup(self.db_path, self.keep, cancelled=self._cancelled.is_set)
+        except BackupCancelled:
+            return
+        except Exception as e:
+            logger.exception("Backing up %s failed", self.db_path)
+            self.signals.failed.emit(str(e))
+            return
+        logger.info("Backed up profile database to %s", path)
+        self.signals.finished.emit(str(path))
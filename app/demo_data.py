@@ -1,15 +1,24 @@
 """Generate demo data for testing the Stats page.
 
-This module creates realistic fake typing session data spanning one year.
+This module creates realistic fake typing session data spanning one year
+(or any number of days). Sessions are generated and inserted in chunks, so
+benchmark-size databases (``--gen-count 5000000``) build with bounded
+memory, together with matching key, confusion, bigram and file stats and
+ghost replays.
 """
+import hashlib
 import sqlite3
 import random
 import string
+from collections import defaultdict
 from datetime import datetime, timedelta
+from itertools import accumulate
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterator, List, Tuple
 import calendar
 
+from app.ghost_manager import GhostManager
+
 # Runtime flag for demo mode (set via command line --demo)
 _demo_mode_enabled: bool = False
 
@@ -57,80 +66,282 @@ def connect_demo(db_path: Optional[Path] = None) -> sqlite3.Connection:
 
 
 def init_demo_tables(conn: sqlite3.Connection):
-    """Initialize the demo database tables."""
-    cur = conn.cursor()
-    
-    # Session history table (main table for stats)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS session_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            file_path TEXT NOT NULL,
-            language TEXT DEFAULT '',
-            wpm REAL NOT NULL,
-            accuracy REAL NOT NULL,
-            total_keystrokes INTEGER DEFAULT 0,
-            correct_keystrokes INTEGER DEFAULT 0,
-            incorrect_keystrokes INTEGER DEFAULT 0,
-            duration REAL DEFAULT 0,
-            completed BOOLEAN DEFAULT 0,
-            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # File statistics
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS file_stats (
-            file_path TEXT PRIMARY KEY,
-            best_wpm REAL DEFAULT 0,
-            last_wpm REAL DEFAULT 0,
-            best_accuracy REAL DEFAULT 0,
-            last_accuracy REAL DEFAULT 0,
-            times_practiced INTEGER DEFAULT 0,
-            last_practiced TIMESTAMP,
-            completed BOOLEAN DEFAULT 0
-        )
-    """)
-    
-    # Key statistics for heatmaps
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS key_stats (
-            char TEXT,
-            language TEXT,
-            correct_count INTEGER DEFAULT 0,
-            error_count INTEGER DEFAULT 0,
-            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (char, language)
-        )
-    """)
-    
-    # Error type statistics
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS error_type_stats (
-            language TEXT PRIMARY KEY,
-            omissions INTEGER DEFAULT 0,
-            insertions INTEGER DEFAULT 0,
-            transpositions INTEGER DEFAULT 0,
-            substitutions INTEGER DEFAULT 0
+    """Initialize the demo database tables.
+
+    The demo database gets the same schema as a profile database (every
+    stats_db migration), so demo mode and generated benchmark data exercise
+    the real columns, indexes and summary tables.
+    """
+    from app import stats_db
+    stats_db.apply_stats_migrations(conn)
+
+
+# Sessions built and inserted per batch; generation memory is bounded by this,
+# not by the number of sessions generated
+GENERATION_CHUNK_SIZE = 20_000
+# Large runs spread the practiced files over more project folders (one per
+# this many sessions) so path filters and per-file stats have real work to do
+SESSIONS_PER_DEMO_FOLDER = 5_000
+MAX_DEMO_FOLDERS = 1_000
+# Ghost replays written for the best files when a ghosts folder is given
+DEMO_GHOST_LIMIT = 50
+DEMO_GHOST_KEYSTROKES = 400
+
+DEFAULT_LANGUAGES = ["Python", "JavaScript", "TypeScript", "Rust", "Go", "C++", "Java", "C#"]
+DEFAULT_LANGUAGE_WEIGHTS = [30, 25, 15, 10, 8, 5, 4, 3]
+
+# File path templates
+FILE_TEMPLATES = {
+    "Python": ["main.py", "app.py", "utils.py", "models.py", "views.py", "api.py"],
+    "JavaScript": ["index.js", "app.js", "utils.js", "components.js", "api.js"],
+    "TypeScript": ["index.ts", "app.ts", "types.ts", "utils.ts", "api.ts"],
+    "Rust": ["main.rs", "lib.rs", "utils.rs", "mod.rs"],
+    "Go": ["main.go", "handler.go", "utils.go", "server.go"],
+    "C++": ["main.cpp", "utils.cpp", "app.cpp", "handler.cpp"],
+    "Java": ["Main.java", "App.java", "Utils.java", "Service.java"],
+    "C#": ["Program.cs", "App.cs", "Utils.cs", "Service.cs"],
+    "Markdown": ["README.md", "guide.md", "notes.md"],
+    "HTML": ["index.html", "about.html", "contact.html"],
+    "CSS": ["style.css", "main.css", "theme.css"],
+    "JSON": ["package.json", "config.json", "data.json"],
+    "SQL": ["schema.sql", "query.sql", "migrations.sql"],
+    "Shell": ["install.sh", "deploy.sh", "run.sh"],
+}
+
+# Columns of the generated session_history rows, in tuple order
+SESSION_COLUMNS = (
+    "file_path", "language", "auto_indent", "wpm", "accuracy", "total_keystrokes",
+    "correct_keystrokes", "incorrect_keystrokes", "duration", "completed", "recorded_at",
+)
+
+# Skill curve: WPM and accuracy improve linearly over the generated period
+BASE_WPM = 35
+MAX_WPM_GAIN = 45
+BASE_ACCURACY = 0.85
+MAX_ACCURACY_GAIN = 0.12
+
+_HOURS = range(24)
+_HOUR_CUM_WEIGHTS = list(accumulate([1,1,1,1,1,2,3,5,8,10,10,8,6,5,6,8,10,12,10,8,6,4,2,1]))
+
+
+def parse_gen_count(value: str) -> Tuple[Optional[Tuple[int, int]], Optional[int]]:
+    """Parse ``--gen-count``: a per-day range ("3-10") or a total ("5000000").
+
+    Returns:
+        (sessions_range, total_sessions), one of them None
+    Raises:
+        ValueError: Neither form.
+    """
+    low, dash, high = value.strip().replace("_", "").partition("-")
+    try:
+        # int() also takes signs, which neither form allows
+        if not (low.isdigit() and (high.isdigit() or not dash)):
+            raise ValueError
+        if dash:
+            if int(high) < int(low):
+                raise ValueError
+            return (int(low), int(high)), None
+        return None, int(low)
+    except ValueError:
+        raise ValueError(
+            f"expected a range like '3-10' or a session count like '5000000', got {value!r}"
+        ) from None
+
+
+def plan_daily_sessions(
+    start_date: datetime,
+    days: int,
+    sessions_range: Tuple[int, int] = (3, 10),
+    total_sessions: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> List[int]:
+    """Number of sessions to generate on each day.
+
+    Weekends are lighter and about one day in seven is a break, except in
+    the last ten days (so there is a current streak). With
+    ``total_sessions`` the same pattern is scaled to exactly that total.
+    """
+    rng = rng or random.Random()
+    plan = []
+    for day_offset in range(days):
+        current_date = start_date + timedelta(days=day_offset)
+        is_weekend = current_date.weekday() >= 5
+        days_from_end = days - day_offset
+        is_break_day = rng.random() < 0.15 if days_from_end > 10 else False
+
+        if is_break_day:
+            plan.append(0)
+        elif is_weekend:
+            plan.append(rng.randint(1 if days_from_end <= 10 else 0, max(1, sessions_range[1] // 2)))
+        else:
+            plan.append(rng.randint(sessions_range[0], sessions_range[1]))
+
+    if total_sessions is None or not plan:
+        return plan
+
+    weight_total = sum(plan)
+    if not weight_total:
+        plan, weight_total = [1] * days, days
+    # Cumulative rounding: the shares add up to exactly total_sessions
+    scaled, running, allotted = [], 0, 0
+    for weight in plan:
+        running += weight
+        upto = running * total_sessions // weight_total
+        scaled.append(upto - allotted)
+        allotted = upto
+    return scaled
+
+
+def _iter_day_seconds(count: int, chunk_size: int, rng: random.Random) -> Iterator[List[int]]:
+    """Start times (seconds into the day) of a day's sessions, in order.
+
+    Comes in sorted batches of at most ``chunk_size``. A day that fits in
+    one batch draws its hours from the hour weights; a bigger one is split
+    over the hours by weight and each hour into equal slices, so no more
+    than one batch is ever held.
+    """
+    if count <= chunk_size:
+        hours = rng.choices(_HOURS, cum_weights=_HOUR_CUM_WEIGHTS, k=count)
+        yield sorted(hour * 3600 + int(rng.random() * 3600) for hour in hours)
+        return
+
+    weight_total = _HOUR_CUM_WEIGHTS[-1]
+    allotted = 0
+    for hour, cum_weight in enumerate(_HOUR_CUM_WEIGHTS):
+        hour_count = cum_weight * count // weight_total - allotted
+        allotted += hour_count
+        slices = -(-hour_count // chunk_size)
+        for index in range(slices):
+            start = hour * 3600 + 3600 * index // slices
+            span = hour * 3600 + 3600 * (index + 1) // slices - start
+            slice_count = hour_count * (index + 1) // slices - hour_count * index // slices
+            yield sorted(start + int(rng.random() * span) for _ in range(slice_count))
+
+
+def iter_session_chunks(
+    start_date: datetime,
+    plan: List[int],
+    languages: List[str],
+    language_weights: List[float],
+    folders: int = 1,
+    chunk_size: int = GENERATION_CHUNK_SIZE,
+    rng: Optional[random.Random] = None,
+) -> Iterator[List[tuple]]:
+    """Generate the planned sessions as lists of row tuples (SESSION_COLUMNS).
+
+    Rows come out in recorded_at order, at most ``chunk_size`` per list,
+    however many sessions a single day has.
+    """
+    rng = rng or random.Random()
+    days = len(plan)
+    language_cum_weights = list(accumulate(language_weights))
+    paths = {}
+    for language in languages:
+        templates = FILE_TEMPLATES.get(
+            language, ["file.txt", "script" + ("" if language == "Text" else f".{language[:2].lower()}")]
         )
-    """)
-    
-    # Key confusions
+        root = f"/demo/projects/{language.lower()}"
+        paths[language] = [
+            f"{root}/{name}" if folder == 0 else f"{root}/pkg{folder:03d}/{name}"
+            for folder in range(folders) for name in templates
+        ]
+    # Bound once: these run several times per session
+    rand, gauss, uniform = rng.random, rng.gauss, rng.uniform
+
+    chunk: List[tuple] = []
+    for day_offset, count in enumerate(plan):
+        if not count:
+            continue
+        progress = day_offset / days
+        day = (start_date + timedelta(days=day_offset)).strftime("%Y-%m-%d")
+        skill_wpm = BASE_WPM + MAX_WPM_GAIN * progress + rng.gauss(0, 8)
+        skill_accuracy = BASE_ACCURACY + MAX_ACCURACY_GAIN * progress
+        completion_base = 0.6 + progress * 0.3
+
+        for seconds in _iter_day_seconds(count, chunk_size, rng):
+            if len(chunk) + len(seconds) > chunk_size:
+                yield chunk
+                chunk = []
+            batch_languages = rng.choices(languages, cum_weights=language_cum_weights, k=len(seconds))
+            for second, language in zip(seconds, batch_languages):
+                language_paths = paths[language]
+                file_path = language_paths[int(rand() * len(language_paths))]
+
+                wpm = max(20, skill_wpm + gauss(0, 5))
+                if rand() < 0.05:
+                    wpm += uniform(10, 25)
+                accuracy = min(1.0, max(0.7, skill_accuracy + gauss(0, 0.03)))
+
+                duration = uniform(30, 900)
+                total_chars = int(wpm * duration / 12)  # 5 chars per word
+                correct_chars = int(total_chars * accuracy)
+                completed = rand() < max(0.3, min(0.95, completion_base - duration / 3000))
+
+                chunk.append((
+                    file_path,
+                    language,
+                    int(rand() < 0.3),
+                    round(wpm, 1),
+                    round(accuracy, 4),
+                    total_chars,
+                    correct_chars,
+                    total_chars - correct_chars,
+                    round(duration, 1),
+                    int(completed),
+                    f"{day} {second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}",
+                ))
+    if chunk:
+        yield chunk
+
+
+class GenerationTotals:
+    """Running per-language and per-file figures of the generated sessions.
+
+    Sized by the number of distinct languages and files, not sessions, so
+    the auxiliary tables can be derived after streaming millions of rows.
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.language_sessions: Dict[str, int] = defaultdict(int)
+        self.language_chars: Dict[str, int] = defaultdict(int)
+        self.language_wpm_sum: Dict[str, float] = defaultdict(float)
+        # (file_path, auto_indent) -> [best_wpm, last_wpm, best_acc, last_acc,
+        #                              times, completed, last_practiced, best completed row]
+        self.files: Dict[Tuple[str, int], list] = {}
+
+    def add(self, rows: List[tuple]):
+        for row in rows:
+            file_path, language, auto_indent, wpm, accuracy, total, _, _, _, completed, recorded_at = row
+            self.language_sessions[language] += 1
+            self.language_chars[language] += total
+            self.language_wpm_sum[language] += wpm
+            entry = self.files.get((file_path, auto_indent))
+            if entry is None:
+                entry = self.files[(file_path, auto_indent)] = [0, 0, 0, 0, 0, 0, None, None]
+            entry[0] = max(entry[0], wpm)
+            entry[1] = wpm
+            entry[2] = max(entry[2], accuracy)
+            entry[3] = accuracy
+            entry[4] += 1
+            entry[6] = recorded_at
+            if completed:
+                entry[5] = 1
+                if entry[7] is None or wpm > entry[7][3]:
+                    entry[7] = row
+        self.sessions += len(rows)
+
+
+def _drop_history_triggers_and_indexes(cur: sqlite3.Cursor) -> List[Tuple[str, str]]:
+    """Drop session_history's triggers and indexes for a bulk load; returns them."""
     cur.execute("""
-        CREATE TABLE IF NOT EXISTS key_confusions (
-            expected_char TEXT,
-            actual_char TEXT,
-            language TEXT,
-            count INTEGER DEFAULT 0,
-            PRIMARY KEY (expected_char, actual_char, language)
-        )
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name = 'session_history' AND type IN ('trigger', 'index') AND sql IS NOT NULL
     """)
-
-    cur.execute("""CREATE INDEX IF NOT EXISTS idx_demo_session_history_language
-                   ON session_history(language)""")
-    cur.execute("""CREATE INDEX IF NOT EXISTS idx_demo_session_history_date
-                   ON session_history(recorded_at)""")
-    
-    conn.commit()
+    saved = cur.fetchall()
+    for kind, name, _ in saved:
+        cur.execute(f'DROP {kind.upper()} "{name}"')
+    return [(kind, sql) for kind, _, sql in saved]
 
 
 def generate_data_for_db(
@@ -138,149 +349,100 @@ def generate_data_for_db(
     year: Optional[int] = None,
     days: int = 365,
     sessions_range: tuple = (3, 10),
-    languages: Optional[list] = None
+    languages: Optional[list] = None,
+    total_sessions: Optional[int] = None,
+    ghosts_dir: Optional[Path] = None,
+    chunk_size: int = GENERATION_CHUNK_SIZE,
+    seed: Optional[int] = None,
 ):
-    """Core generation logic that writes to a specific DB path."""
+    """Core generation logic that writes to a specific DB path.
+
+    Replaces all history in ``db_path``. Sessions are streamed into the
+    database in chunks inside one transaction with ``synchronous=OFF``;
+    session_history's triggers and indexes are dropped meanwhile and the
+    tables they maintain rebuilt in one pass at the end.
+
+    Args:
+        sessions_range: Sessions per weekday (weekends get fewer).
+        total_sessions: Generate exactly this many sessions instead,
+            spread over the days with the same pattern.
+        ghosts_dir: Also write ghost replays for the best files here.
+        seed: Seed for reproducible data.
+    """
+    rng = random.Random(seed)
     conn = connect_demo(db_path)
-    cur = conn.cursor()
-    
-    # Clear existing data for fresh generation? 
-    # Or should we append? The legacy behavior was "delete everything then generate".
-    # Let's clean up first to be safe and consistent.
-    tables = ["session_history", "key_stats", "file_stats", "error_type_stats", "key_confusions"]
-    for table in tables:
-        try:
-            cur.execute(f"DELETE FROM {table}")
-        except sqlite3.OperationalError:
-            # Table might not exist yet if initializing fresh
-            pass
-            
     # Ensure tables exist
     init_demo_tables(conn)
     
     # Configuration
     if not languages:
-        languages = ["Python", "JavaScript", "TypeScript", "Rust", "Go", "C++", "Java", "C#"]
-        language_weights = [30, 25, 15, 10, 8, 5, 4, 3]
+        languages = DEFAULT_LANGUAGES
+        language_weights = DEFAULT_LANGUAGE_WEIGHTS
     else:
         # Equal weights if custom list provided
         language_weights = [1] * len(languages)
 
-    # File path templates
-    all_file_templates = {
-        "Python": ["main.py", "app.py", "utils.py", "models.py", "views.py", "api.py"],
-        "JavaScript": ["index.js", "app.js", "utils.js", "components.js", "api.js"],
-        "TypeScript": ["index.ts", "app.ts", "types.ts", "utils.ts", "api.ts"],
-        "Rust": ["main.rs", "lib.rs", "utils.rs", "mod.rs"],
-        "Go": ["main.go", "handler.go", "utils.go", "server.go"],
-        "C++": ["main.cpp", "utils.cpp", "app.cpp", "handler.cpp"],
-        "Java": ["Main.java", "App.java", "Utils.java", "Service.java"],
-        "C#": ["Program.cs", "App.cs", "Utils.cs", "Service.cs"],
-        "Markdown": ["README.md", "guide.md", "notes.md"],
-        "HTML": ["index.html", "about.html", "contact.html"],
-        "CSS": ["style.css", "main.css", "theme.css"],
-        "JSON": ["package.json", "config.json", "data.json"],
-        "SQL": ["schema.sql", "query.sql", "migrations.sql"],
-        "Shell": ["install.sh", "deploy.sh", "run.sh"],
-    }
-    
-    # Params
-    base_wpm = 35
-    max_wpm_gain = 45
-    base_accuracy = 0.85
-    max_accuracy_gain = 0.12
-    
     if year:
         start_date = datetime(year, 1, 1)
         days = 366 if calendar.isleap(year) else 365
     else:
-        today = datetime.now()
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         start_date = today - timedelta(days=days)
     
     print(f"Generating data from {start_date.date()} to {start_date.date() + timedelta(days=days-1)}")
-    
-    records = []
-    
-    for day_offset in range(days):
-        current_date = start_date + timedelta(days=day_offset)
-        progress = day_offset / days
-        
-        is_weekend = current_date.weekday() >= 5
-        days_from_end = days - day_offset
-        is_break_day = random.random() < 0.15 if days_from_end > 10 else False
-        
-        if is_break_day:
-            num_sessions = 0
-        elif is_weekend:
-            num_sessions = random.randint(1 if days_from_end <= 10 else 0, max(1, sessions_range[1] // 2))
-        else:
-            num_sessions = random.randint(sessions_range[0], sessions_range[1])
-        
-        for _ in range(num_sessions):
-            language = random.choices(languages, weights=language_weights, k=1)[0]
-            
-            # Fallback for templates
-            templates = all_file_templates.get(language, ["file.txt", "script" + ("" if language == "Text" else f".{language[:2].lower()}")])
-            file_name = random.choice(templates)
-            file_path = f"/demo/projects/{language.lower()}/{file_name}"
-            
-            skill_wpm = base_wpm + (max_wpm_gain * progress)
-            daily_variance = random.gauss(0, 8)
-            session_variance = random.gauss(0, 5)
-            wpm = max(20, skill_wpm + daily_variance + session_variance)
-            
-            if random.random() < 0.05:
-                wpm += random.uniform(10, 25)
-            
-            skill_accuracy = base_accuracy + (max_accuracy_gain * progress)
-            acc_variance = random.gauss(0, 0.03)
-            accuracy = min(1.0, max(0.7, skill_accuracy + acc_variance))
-            
-            duration = random.uniform(30, 900)
-            total_chars = int(wpm * (duration / 60) * 5)
-            correct_chars = int(total_chars * accuracy)
-            incorrect_chars = total_chars - correct_chars
-            
-            completion_chance = 0.6 + (progress * 0.3) - (duration / 3000)
-            completed = random.random() < max(0.3, min(0.95, completion_chance))
-            
-            hour = random.choices(
-                range(24),
-                weights=[1,1,1,1,1,2,3,5,8,10,10,8,6,5,6,8,10,12,10,8,6,4,2,1],
-                k=1
-            )[0]
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-            timestamp = current_date.replace(hour=hour, minute=minute, second=second)
-            
-            records.append((
-                file_path,
-                language,
-                round(wpm, 1),
-                round(accuracy, 4),
-                total_chars,
-                correct_chars,
-                incorrect_chars,
-                round(duration, 1),
-                int(completed),
-                timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            ))
-    
-    # Write to DB
-    cur.executemany("""
-        INSERT INTO session_history (
-            file_path, language, wpm, accuracy, total_keystrokes,
-            correct_keystrokes, incorrect_keystrokes, duration, completed, recorded_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, records)
-    
-    conn.commit()
-    
-    populate_auxiliary_stats(conn, records, languages)
+
+    plan = plan_daily_sessions(start_date, days, sessions_range, total_sessions, rng)
+    planned = sum(plan)
+    folders = min(MAX_DEMO_FOLDERS, max(1, planned // SESSIONS_PER_DEMO_FOLDER))
+    totals = GenerationTotals()
+
+    conn.execute("PRAGMA synchronous=OFF")
+    cur = conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        # Without triggers the DELETE is a cheap truncate, and the inserts skip
+        # per-row index and summary upkeep
+        saved = _drop_history_triggers_and_indexes(cur)
+        # Clear existing data: generation always starts fresh
+        for table in ("session_history", "file_stats", "key_stats", "error_type_stats",
+                      "key_confusions", "bigram_stats", "session_progress"):
+            cur.execute(f"DELETE FROM {table}")
+
+        insert_sql = f"""
+            INSERT INTO session_history ({", ".join(SESSION_COLUMNS)})
+            VALUES ({", ".join("?" * len(SESSION_COLUMNS))})
+        """
+        for chunk in iter_session_chunks(start_date, plan, languages, language_weights, folders, chunk_size, rng):
+            cur.executemany(insert_sql, chunk)
+            totals.add(chunk)
+            if planned >= 10 * chunk_size:
+                print(f"  {totals.sessions:,} / {planned:,} sessions")
+
+        for kind, sql in saved:
+            if kind == "index":
+                cur.execute(sql)
+        from app import stats_db
+        stats_db.rebuild_history_summaries(cur)
+        for kind, sql in saved:
+            if kind == "trigger":
+                cur.execute(sql)
+
+        populate_auxiliary_stats(conn, totals, languages, rng)
+        # The Languages tab's completion counts come from file_stats
+        stats_db.rebuild_language_progress(cur)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        conn.close()
+        raise
     conn.close()
+
+    if ghosts_dir is not None:
+        written = write_demo_ghosts(ghosts_dir, totals, rng)
+        print(f"Wrote {written} ghost replays to: {ghosts_dir}")
     
-    print(f"Generated {len(records)} demo sessions in: {db_path}")
-    return len(records)
+    print(f"Generated {totals.sessions} demo sessions in: {db_path}")
+    return totals.sessions
 
 
 def generate_demo_data(year: Optional[int] = None, days: int = 365, sessions_per_day_range: tuple = (3, 10)):
@@ -289,61 +451,67 @@ def generate_demo_data(year: Optional[int] = None, days: int = 365, sessions_per
     generate_data_for_db(db_path, year=year, days=days, sessions_range=sessions_per_day_range)
 
 
-def populate_auxiliary_stats(conn: sqlite3.Connection, sessions: list, languages: list):
-    """Populate auxiliary stats like key heatmaps based on session data."""
+# Keyboard characters with generated key stats: all standard keys (lower and
+# upper) as laid out in KeyboardHeatmap, plus space
+_KEY_CHARS = (
+    "`1234567890-=" + "qwertyuiop[]\\" + "asdfghjkl;'" + "zxcvbnm,./"
+    + "~!@#$%^&*()_+" + "QWERTYUIOP{}|" + "ASDFGHJKL:\"" + "ZXCVBNM<>?"
+    + " "
+)
+# Characters whose pairs get bigram stats
+_BIGRAM_CHARS = "etaoinsrlcdu _.(){}=:;,"
+
+
+def _char_frequency(char: str) -> float:
+    """Relative frequency of a key in code (common chars happen more)."""
+    if char.lower() in "eiaorsntlcdupmhgbfywkvxzjq ":
+        return 2.0  # Common
+    if char in string.digits:
+        return 0.8
+    return 0.5  # Symbols/Upper rare
+
+
+def populate_auxiliary_stats(
+    conn: sqlite3.Connection,
+    totals: GenerationTotals,
+    languages: list,
+    rng: Optional[random.Random] = None,
+):
+    """Populate key heatmaps, error types, confusions, bigrams and file stats.
+
+    Counts are scaled to what the generated sessions typed per language,
+    so the tables match the history they go with.
+    """
+    rng = rng or random.Random()
     cur = conn.cursor()
     
     print("Generating heatmap and error stats...")
     
     # 1. Key Stats (Heatmap)
-    # Include all standard keyboard keys (lower and upper)
-    # Based on the layouts in KeyboardHeatmap
-    rows_lower = "`1234567890-=" + "qwertyuiop[]\\" + "asdfghjkl;'" + "zxcvbnm,./"
-    rows_upper = "~!@#$%^&*()_+" + "QWERTYUIOP{}|" + "ASDFGHJKL:\"" + "ZXCVBNM<>?"
-    
-    all_chars = rows_lower + rows_upper + " " # Add space
-    
+    frequency_total = sum(_char_frequency(char) for char in _KEY_CHARS)
     key_records = []
     
     for lang in languages:
-        # Check if language has any sessions
-        # But even if not, we want some base "global" stats if possible, or just skip
-        # The demo usually generates data for all languages in the list
-        
-        # Base multiplier based on language popularity (simulated)
-        # But ensuring minimum activity for valid heatmap
-        activity_multiplier = 1000 
-        
-        for char in all_chars:
-            # Generate "balanced" stats
-            # We want every key to have hits and some errors
-            
-            # Base frequency logic (common chars happen more)
-            if char.lower() in "eiaorsntlcdupmhgbfywkvxzjq ":
-                freq_factor = 2.0  # Common
-            elif char in string.digits:
-                freq_factor = 0.8
-            else:
-                freq_factor = 0.5  # Symbols/Upper rare
-            
-            # Randomize frequency a bit
-            hits = int(activity_multiplier * freq_factor * random.uniform(0.5, 1.5))
+        typed = totals.language_chars.get(lang, 0)
+        for char in _KEY_CHARS:
+            # This key's share of what was typed, randomized a bit
+            hits = int(typed * _char_frequency(char) / frequency_total * rng.uniform(0.5, 1.5))
             hits = max(15, hits) # Ensure at least 15 hits per key per language
             
             # Calculate accuracy - ensure it's not perfect
             # Random accuracy between 75% and 98%
-            accuracy = random.uniform(0.75, 0.98)
+            accuracy = rng.uniform(0.75, 0.98)
             
             # Specific keys might have worse accuracy (e.g. number row, symbols)
             if char in "~!@#$%^&*()_+{}|:\"<>?":
-                accuracy -= random.uniform(0.05, 0.15)
+                accuracy -= rng.uniform(0.05, 0.15)
             
             correct = int(hits * accuracy)
             error = hits - correct
             
             # Ensure at least some errors
             if error == 0 and hits > 10:
-                error = random.randint(1, int(hits * 0.1) + 1)
+                error = rng.randint(1, int(hits * 0.1) + 1)
                 correct = hits - error
             
             key_records.append((char, lang, correct, error))
@@ -353,12 +521,8 @@ def populate_auxiliary_stats(conn: sqlite3.Connection, sessions: list, languages
     # 2. Error Type Stats
     error_records = []
     
-    # Cache key stats for confusion generation: (char, language) -> error_count
-    key_error_counts = {} 
-    
     for lang in languages:
-        total_sessions = sum(1 for s in sessions if s[1] == lang)
-        base_errors = total_sessions * 50
+        base_errors = totals.language_sessions.get(lang, 0) * 50
         
         omissions = int(base_errors * 0.4)
         insertions = int(base_errors * 0.2)
@@ -372,7 +536,7 @@ def populate_auxiliary_stats(conn: sqlite3.Connection, sessions: list, languages
         VALUES (?, ?, ?, ?, ?)
     """, error_records)
     
-    # 3. Key Confusions (New)
+    # 3. Key Confusions
     print("Generating key confusion data...")
     confusion_records = []
     
@@ -399,21 +563,21 @@ def populate_auxiliary_stats(conn: sqlite3.Connection, sessions: list, languages
         # If no adjacency known (symbols/caps), pick randoms or use self (as if double typed)
         if not adj_chars:
             pool = "etaoinshrdlcumwfgypbvkjxqz" 
-            adj_chars = "".join(random.sample(pool, 3))
+            adj_chars = "".join(rng.sample(pool, 3))
             
         # Distribute the total 'error' count among 1-3 confusion candidates
         remaining_errors = error
         
         # Pick 1-3 confusion keys
-        num_confusions = min(len(adj_chars), random.randint(1, 3))
-        conf_keys = random.sample(list(adj_chars), num_confusions)
+        num_confusions = min(len(adj_chars), rng.randint(1, 3))
+        conf_keys = rng.sample(list(adj_chars), num_confusions)
         
         for i, conf_key in enumerate(conf_keys):
             if i == len(conf_keys) - 1:
                 count = remaining_errors
             else:
                 # Give a chunk
-                count = random.randint(1, max(1, remaining_errors - (len(conf_keys) - i)))
+                count = rng.randint(1, max(1, remaining_errors - (len(conf_keys) - i)))
             
             remaining_errors -= count
             
@@ -427,45 +591,125 @@ def populate_auxiliary_stats(conn: sqlite3.Connection, sessions: list, languages
         VALUES (?, ?, ?, ?)
     """, confusion_records)
 
-    # 4. File Stats
-    # Aggregate from sessions
-    file_map = {}
-    for s in sessions:
-        # s = (file_path, language, wpm, accuracy, total_chars, correct, incorrect, duration, completed, timestamp)
-        fpath = s[0]
-        wpm = s[2]
-        acc = s[3]
-        
-        if fpath not in file_map:
-            file_map[fpath] = {
-                "best_wpm": 0, "last_wpm": 0, 
-                "best_acc": 0, "last_acc": 0, 
-                "times": 0, "completed": 0
-            }
-        
-        fm = file_map[fpath]
-        fm["last_wpm"] = wpm
-        if wpm > fm["best_wpm"]: fm["best_wpm"] = wpm
-        fm["last_acc"] = acc
-        if acc > fm["best_acc"]: fm["best_acc"] = acc
-        fm["times"] += 1
-        if s[8]: fm["completed"] = 1 # Just mark if ever moved
-    
-    file_records = []
-    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    for fpath, data in file_map.items():
-        file_records.append((
-            fpath, data["best_wpm"], data["last_wpm"], 
-            data["best_acc"], data["last_acc"], 
-            data["times"], now_str, data["completed"]
-        ))
-        
+    # 4. Bigram Stats
+    # Latency follows the language's average speed; pairs with symbols are
+    # slower and more error-prone
+    print("Generating bigram data...")
+    pairs = [(c1, c2) for c1 in _BIGRAM_CHARS for c2 in _BIGRAM_CHARS]
+    pair_weights = [_char_frequency(c1) * _char_frequency(c2) for c1, c2 in pairs]
+    weight_total = sum(pair_weights)
+    bigram_records = []
+    for lang in languages:
+        sessions = totals.language_sessions.get(lang, 0)
+        if not sessions:
+            continue
+        ms_per_key = 12000 / (totals.language_wpm_sum[lang] / sessions)
+        typed = totals.language_chars[lang]
+        for (c1, c2), weight in zip(pairs, pair_weights):
+            attempts = int(typed * weight / weight_total * rng.uniform(0.5, 1.5))
+            if attempts < 5:
+                continue
+            difficulty = rng.uniform(0.8, 1.3) * (2.5 - max(_char_frequency(c1), _char_frequency(c2)) * 0.75)
+            errors = int(attempts * min(0.5, 0.04 * difficulty * rng.uniform(0.5, 1.5)))
+            correct = attempts - errors
+            bigram_records.append((c1, c2, lang, round(correct * ms_per_key * difficulty, 1), correct, errors))
+
+    cur.executemany("""
+        INSERT INTO bigram_stats (char1, char2, language, total_time, correct_count, error_count)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, bigram_records)
+
+    # 5. File Stats
+    file_records = [
+        (fpath, auto_indent, best_wpm, last_wpm, best_acc, last_acc, times, last_practiced, completed)
+        for (fpath, auto_indent), (best_wpm, last_wpm, best_acc, last_acc, times, completed, last_practiced, _)
+        in totals.files.items()
+    ]
     cur.executemany("""
-        INSERT INTO file_stats (file_path, best_wpm, last_wpm, best_accuracy, last_accuracy, times_practiced, last_practiced, completed)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO file_stats (file_path, auto_indent, best_wpm, last_wpm, best_accuracy, last_accuracy,
+                                times_practiced, last_practiced, completed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, file_records)
-    
-    conn.commit()
+
+
+class _DemoGhostManager(GhostManager):
+    """Ghosts for demo paths, which don't exist on disk.
+
+    Keyed by a hash of the path, as GhostManager falls back to for missing
+    files, minus the warning per lookup.
+    """
+
+    def _get_file_hash(self, file_path: str) -> str:
+        return hashlib.sha256(file_path.encode()).hexdigest()[:16]
+
+
+def _demo_ghost_session(row: tuple, rng: random.Random, keystroke_count: int) -> dict:
+    """Keystrokes and graph history of a made-up replay matching a session row."""
+    wpm, accuracy = row[3], row[4]
+    ms_per_key = 12000 / wpm
+    text = FILE_TEMPLATES.get(row[1], ["x"])[0] + " = compute(value, other) {}\n"
+    keystrokes, wpm_history, error_history = [], [], []
+    t = 0.0
+    correct = errors = 0
+    for i in range(keystroke_count):
+        t += ms_per_key * rng.uniform(0.6, 1.4)
+        hit = rng.random() < accuracy
+        keystrokes.append({"t": int(t), "k": text[i % len(text)], "c": 1 if hit else 0})
+        if hit:
+            correct += 1
+        else:
+            errors += 1
+        second = int(t // 1000)
+        if second >= 1 and (not wpm_history or wpm_history[-1][0] < second):
+            wpm_history.append((second, round(correct / 5 / (t / 60000), 1)))
+            error_history.append((second, errors))
+    elapsed = t / 1000
+    return {
+        "keystrokes": keystrokes,
+        "wpm_history": wpm_history,
+        "error_history": error_history,
+        "final_stats": {
+            "wpm": wpm,
+            "accuracy": correct / keystroke_count,
+            "time": elapsed,
+            "total": keystroke_count,
+            "correct": correct,
+            "incorrect": errors,
+            "status_text": "Finished",
+            "status_color": "#a3be8c",
+        },
+    }
+
+
+def write_demo_ghosts(
+    ghosts_dir: Path,
+    totals: GenerationTotals,
+    rng: Optional[random.Random] = None,
+    limit: int = DEMO_GHOST_LIMIT,
+    keystroke_count: int = DEMO_GHOST_KEYSTROKES,
+) -> int:
+    """Write ghost replays for the fastest completed session of the top files.
+
+    Returns the number of ghosts written.
+    """
+    rng = rng or random.Random()
+    manager = _DemoGhostManager(ghosts_dir)
+    best = sorted(
+        (entry[7] for entry in totals.files.values() if entry[7] is not None),
+        key=lambda row: row[3],
+        reverse=True,
+    )[:limit]
+    written = 0
+    for row in best:
+        replay = _demo_ghost_session(row, rng, keystroke_count)
+        recorded_at = datetime.strptime(row[10], "%Y-%m-%d %H:%M:%S")
+        if manager.save_ghost(
+            row[0], row[3], row[4], replay["keystrokes"], recorded_at.isoformat(),
+            final_stats=replay["final_stats"], wpm_history=replay["wpm_history"],
+            error_history=replay["error_history"], auto_indent=bool(row[2]),
+        ):
+            written += 1
+    return written
 
 
 def ensure_demo_data():
@@ -0,0 +1,252 @@
+"""Weak-key drills assembled from lines of the user's own files.
+
+Two pieces work together:
+
+* ``update_char_index`` runs after a folder scan (on the scan worker) and
+  keeps a per-file character-frequency index in the database. Only files
+  whose mtime or size changed are re-read.
+* ``generate_drill`` turns key, confusion and bigram statistics into a
+  weakness profile, looks up the files densest in the weakest characters
+  through the index, and scores just those files line by line to build a
+  practice buffer.
+"""
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app import stats_db
+
+# Files larger than this are not worth reading for a drill
+MAX_INDEXED_FILE_BYTES = 512 * 1024
+
+# A key needs this many attempts before its error rate means anything
+MIN_KEY_SAMPLES = 10
+
+# Lines shorter than this carry too little to drill, longer ones get unwieldy
+MIN_LINE_LENGTH = 12
+MAX_LINE_LENGTH = 100
+
+
+@dataclass
+class WeaknessProfile:
+    """Per-character and per-bigram weights, 1.0 being the weakest."""
+    keys: Dict[str, float] = field(default_factory=dict)
+    bigrams: Dict[Tuple[str, str], float] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not self.keys and not self.bigrams
+
+
+def count_chars(text: str) -> Tuple[int, Dict[str, int]]:
+    """Return the non-whitespace length of ``text`` and its character counts."""
+    counts = Counter(text)
+    for ch in (" ", "\t", "\n", "\r"):
+        counts.pop(ch, None)
+    return sum(counts.values()), dict(counts)
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def update_char_index(language_files: Dict[str, List[str]]) -> int:
+    """Bring the stored character index in line with a scan result.
+
+    Returns the number of files that had to be (re-)read.
+    """
+    stamps = stats_db.get_char_index_stamps()
+    rows = []
+    live = set()
+    for language, paths in language_files.items():
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_size > MAX_INDEXED_FILE_BYTES:
+                continue
+            live.add(path)
+            if stamps.get(path) == (st.st_mtime_ns, st.st_size):
+                continue
+            text = _read_text(path)
+            if text is None:
+                continue
+            length, counts = count_chars(text)
+            rows.append((path, language, st.st_mtime_ns, st.st_size, length, json.dumps(counts)))
+
+    removed = [path for path in stamps if path not in live]
+    if rows or removed:
+        stats_db.update_char_index(rows, removed)
+    return len(rows)
+
+
+def build_weakness_profile(
+    key_stats: Dict[str, Dict[str, int]],
+    key_confusions: Dict[str, Dict[str, int]],
+    bigram_stats: Iterable[Dict],
+    max_keys: int = 12,
+) -> WeaknessProfile:
+    """Weight the worst keys and bigrams from the aggregated statistics.
+
+    Keys are ranked by error rate. The characters a weak key is most often
+    mistyped as get half its weight so the drill exercises both sides of the
+    confusion. Whitespace is ignored since every line contains it.
+    """
+    rates = {}
+    for ch, counts in key_stats.items():
+        if len(ch) != 1 or ch.isspace():
+            continue
+        attempts = counts.get("correct", 0) + counts.get("error", 0)
+        if attempts >= MIN_KEY_SAMPLES and counts.get("error", 0):
+            rates[ch] = counts["error"] / attempts
+
+    keys: Dict[str, float] = {}
+    weakest = sorted(rates.items(), key=lambda item: item[1], reverse=True)[:max_keys]
+    if weakest:
+        top_rate = weakest[0][1]
+        for ch, rate in weakest:
+            keys[ch] = rate / top_rate
+        for ch, weight in list(keys.items()):
+            confused = key_confusions.get(ch)
+            if not confused:
+                continue
+            actual = max(confused, key=confused.get)
+            if len(actual) == 1 and not actual.isspace():
+                keys[actual] = max(keys.get(actual, 0.0), weight / 2)
+
+    bigrams: Dict[Tuple[str, str], float] = {}
+    bigram_list = list(bigram_stats)
+    top_ms = max((b["avg_ms"] for b in bigram_list), default=0)
+    top_err = max((b["error_rate"] for b in bigram_list), default=0)
+    for b in bigram_list:
+        pair = (b["char1"], b["char2"])
+        weight = max(
+            b["avg_ms"] / top_ms if top_ms else 0.0,
+            b["error_rate"] / top_err if top_err else 0.0,
+        )
+        bigrams[pair] = max(bigrams.get(pair, 0.0), weight)
+
+    return WeaknessProfile(keys=keys, bigrams=bigrams)
+
+
+def load_weakness_profile(languages: Optional[List[str]] = None) -> WeaknessProfile:
+    """Build the weakness profile from the stored statistics."""
+    bigrams = (
+        stats_db.get_bigram_stats(languages, order_by="slowest")
+        + stats_db.get_bigram_stats(languages, order_by="errors")
+    )
+    return build_weakness_profile(
+        stats_db.get_key_stats(languages),
+        stats_db.get_key_confusions(languages),
+        bigrams,
+    )
+
+
+def _profile_chars(profile: WeaknessProfile) -> Dict[str, float]:
+    """Characters to look up in the index, with bigram endpoints folded in."""
+    chars = dict(profile.keys)
+    for (c1, c2), weight in profile.bigrams.items():
+        for ch in (c1, c2):
+            if not ch.isspace():
+                chars[ch] = max(chars.get(ch, 0.0), weight / 2)
+    return chars
+
+
+def rank_candidate_files(
+    profile: WeaknessProfile,
+    languages: Optional[List[str]] = None,
+    limit: int = 30,
+) -> List[str]:
+    """Files with the highest weighted density of the profile's characters."""
+    weights = _profile_chars(profile)
+    scores: Dict[str, float] = {}
+    for path, ch, density in stats_db.get_char_postings(weights, languages):
+        scores[path] = scores.get(path, 0.0) + weights[ch] * density
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+
+def score_line(line: str, profile: WeaknessProfile) -> float:
+    """Weakness weight per character of ``line``."""
+    if not line:
+        return 0.0
+    keys = profile.keys
+    bigrams = profile.bigrams
+    total = 0.0
+    prev = None
+    for ch in line:
+        total += keys.get(ch, 0.0)
+        if prev is not None:
+            total += bigrams.get((prev, ch), 0.0)
+        prev = ch
+    return total / len(line)
+
+
+def assemble_drill(
+    profile: WeaknessProfile,
+    paths: Iterable[str],
+    target_chars: int = 1200,
+    read_text: Callable[[str], Optional[str]] = _read_text,
+) -> str:
+    """Concatenate the highest-scoring distinct lines of ``paths``.
+
+    Lines are stripped of indentation so the buffer types the same with or
+    without smart indent.
+    """
+    scored = {}
+    for path in paths:
+        text = read_text(path)
+        if not text:
+            continue
+        for raw in text.splitlines():
+            line = raw.strip()
+            if MIN_LINE_LENGTH <= len(line) <= MAX_LINE_LENGTH and line not in scored:
+                score = score_line(line, profile)
+                if score > 0:
+                    scored[line] = score
+
+    lines = []
+    size = 0
+    for line in sorted(scored, key=scored.get, reverse=True):
+        if size >= target_chars:
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def generate_drill(
+    languages: Optional[List[str]] = None,
+    target_chars: int = 1200,
+    profile: Optional[WeaknessProfile] = None,
+) -> Optional[str]:
+    """Build a drill for ``languages`` (all when None).
+
+    Returns None when there is not enough typing data or no indexed file
+    contains the weak characters.
+    """
+    if profile is None:
+        profile = load_weakness_profile(languages)
+    if profile.is_empty():
+        return None
+    paths = rank_candidate_files(profile, languages)
+    drill = assemble_drill(profile, paths, target_chars)
+    return drill or None
+
+
+def write_drill_file(text: str, directory: Path, extension: str = ".txt") -> Path:
+    """Write ``text`` to the drill file for ``extension`` and return its path.
+
+    The drill is a regular file so sessions, progress and ghosts work on it
+    like on any other file.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"weak_keys_drill{extension}"
+    path.write_text(text, encoding="utf-8")
+    return path
@@ -3,7 +3,7 @@ import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QPushButton, QLabel, QMessageBox, QApplication, QFrame
 )
-from PySide6.QtCore import Qt, QTimer, QSize, QEvent, Signal
+from PySide6.QtCore import Qt, QTimer, QSize, QEvent, QRunnable, QThreadPool, Signal
 from PySide6.QtGui import QKeyEvent
 from typing import Optional, List
 from app.file_tree import FileTreeWidget
@@ -15,14 +15,42 @@ from app.session_result_dialog import SessionResultDialog
 from app import stats_db
 from app.file_scanner import get_language_for_file
 from app.typing_engine import TypingEngine
+from app.bigram_extractor import extract_bigrams
 from app.ui_icons import get_icon
 import time
 import logging
 import logging
 
+logger = logging.getLogger(__name__)
+
 # Debug timing flag - should match ui_main.DEBUG_STARTUP_TIMING
 DEBUG_STARTUP_TIMING = True
 
+
+class _BigramStatsTask(QRunnable):
+    """Background task that extracts a finished session's bigram latencies and saves them."""
+
+    def __init__(self, language: str, keystrokes: list, content: str, auto_indent: bool, space_per_tab: int):
+        super().__init__()
+        self.language = language
+        self.keystrokes = keystrokes
+        self.content = content
+        self.auto_indent = auto_indent
+        self.space_per_tab = space_per_tab
+
+    def run(self):
+        try:
+            bigrams = extract_bigrams(
+                self.keystrokes,
+                self.content,
+                auto_indent=self.auto_indent,
+                space_per_tab=self.space_per_tab,
+            )
+            stats_db.update_bigram_stats(self.language, bigrams)
+        except Exception:
+            logger.exception("Error recording bigram stats")
+
+
 class EditorTab(QWidget):
     """Complete editor/typing tab with tree, typing area, and stats."""
     # Signals for communication with parent
@@ -38,6 +66,7 @@ class EditorTab(QWidget):
         super().__init__(parent)
         self.current_file: Optional[str] = None
         self._loaded = False  # Lazy loading flag
+        self._drill_language: Optional[str] = None  # Language view to drill, None for all
         
         # Ghost race state
         self.is_racing = False
@@ -151,9 +180,17 @@ class EditorTab(QWidget):
         self.file_tree.random_button.setFixedHeight(34)
         self.file_tree.random_button.setStyleSheet(header_btn_style)
 
-        # Set stretch: Search bar takes all space (1), Random button stays compact (0)
+        self.drill_btn = QPushButton("Drill")
+        self.drill_btn.setIcon(get_icon("KEYBOARD"))
+        self.drill_btn.setToolTip("Practice lines from your files that stress your weakest keys")
+        self.drill_btn.setFixedHeight(34)
+        self.drill_btn.setStyleSheet(header_btn_style)
+        self.drill_btn.clicked.connect(self.on_drill_clicked)
+
+        # Set stretch: Search bar takes all space (1), buttons stay compact (0)
         left_header_layout.addWidget(self.file_tree.search_bar, 1)
         left_header_layout.addWidget(self.file_tree.random_button, 0)
+        left_header_layout.addWidget(self.drill_btn, 0)
 
         left_layout.addWidget(left_header_widget)
         
@@ -551,17 +588,52 @@ class EditorTab(QWidget):
     def load_folder(self, folder_path: str):
         """Load a single folder for practice."""
         self.ensure_loaded()
+        self._drill_language = None
         self.file_tree.load_folder(folder_path)
     
     def load_folders(self, folder_paths: List[str]):
         """Load multiple folders for practice."""
         self.ensure_loaded()
+        self._drill_language = None
         self.file_tree.load_folders(folder_paths)
     
     def load_language_files(self, language: str, files: List[str]):
         """Load files filtered by language."""
         self.ensure_loaded()
+        self._drill_language = language
         self.file_tree.load_language_files(language, files)
+
+    def on_drill_clicked(self):
+        """Open a practice buffer built from the lines that stress the weakest keys."""
+        from app import drill_generator
+        from app.file_scanner import LANGUAGE_MAP
+        from app.portable_data import get_data_manager
+
+        self.ensure_loaded()
+        languages = [self._drill_language] if self._drill_language else None
+        drill = drill_generator.generate_drill(languages)
+        if not drill:
+            QMessageBox.information(
+                self,
+                "Weak-Key Drill",
+                "Not enough data for a drill yet.\n\n"
+                "Complete a few sessions and open the Languages tab once so your files get indexed.",
+            )
+            return
+
+        extension = next(
+            (ext for ext, lang in LANGUAGE_MAP.items() if lang == self._drill_language),
+            ".txt",
+        )
+        directory = get_data_manager().get_active_profile_dir() / "drills"
+        drill_path = str(drill_generator.write_drill_file(drill, directory, extension))
+
+        # A fresh drill replaces the old buffer, so nothing of it can be resumed
+        if self.current_file == drill_path:
+            self.current_file = None
+        for auto_indent in (False, True):
+            stats_db.clear_session_progress(drill_path, auto_indent=auto_indent)
+        self.on_file_selected(drill_path)
     
     def on_file_selected(self, file_path: str):
         """Handle file selection from tree."""
@@ -925,6 +997,7 @@ class EditorTab(QWidget):
             language=get_language_for_file(self.current_file),
             errors=stats.get("error_types", {})
         )
+        self._record_bigram_stats(get_language_for_file(self.current_file))
 
         # Check and save ghost if this is a new best
         is_new_best = self._check_and_save_ghost(stats)
@@ -1158,6 +1231,22 @@ class EditorTab(QWidget):
         # Update progress bars
         self.update_progress_bar_color()
     
+    def _record_bigram_stats(self, language: str):
+        """Save bigram latencies from the finished session's keystrokes in the background."""
+        engine = self.typing_area.engine
+        keystrokes = self.typing_area.get_ghost_data() if hasattr(self.typing_area, 'get_ghost_data') else []
+        if not engine or not keystrokes:
+            return
+        # Snapshot on the UI thread; the typing area keeps appending to its own list
+        task = _BigramStatsTask(
+            language,
+            list(keystrokes),
+            engine.state.content,
+            engine.auto_indent,
+            getattr(self.typing_area, 'space_per_tab', 4),
+        )
+        QThreadPool.globalInstance().start(task)
+
     def _check_and_save_ghost(self, stats: dict) -> bool:
         """Check if this session is a new best and save ghost if so. Returns True if new best."""
         from app.ghost_manager import get_ghost_manager
@@ -1573,6 +1662,7 @@ class EditorTab(QWidget):
                     language=lang,
                     errors=self.typing_area.engine.state.error_types
                 )
+                self._record_bigram_stats(lang)
 
             # Check and save new ghost if this beat the old one
         race_stats = {
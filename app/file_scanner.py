@@ -2,9 +2,11 @@
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Dict, List, Set, Optional, Tuple, Union
 from collections import defaultdict
+from functools import lru_cache
 import fnmatch
+import re
 import app.settings as settings
 
 logger = logging.getLogger(__name__)
@@ -174,8 +176,18 @@ def validate_file_path(file_path: str, root_folder: Optional[str] = None) -> Tup
 
 
 class IgnoreManager:
-    """Optimized manager for checking if paths should be ignored."""
-    
+    """Optimized manager for checking if paths should be ignored.
+
+    Glob patterns are compiled into a single combined regex per
+    (name/path, case-sensitivity) group, so checking an entry costs at most
+    one regex match per group instead of one ``fnmatch`` call per pattern.
+    Decisions are memoised per file name and per directory, which makes
+    repeated tree walks over the same folders nearly free.
+    """
+
+    # Upper bound for the memoised decisions before the caches are reset
+    MAX_CACHE_ENTRIES = 65536
+
     def __init__(self, ignored_files: List[str], ignored_folders: List[str]):
         # Files/Patterns
         self.file_exts: Set[str] = set()
@@ -193,6 +205,8 @@ class IgnoreManager:
         for p in ignored_folders:
             self._add_pattern(p, is_folder=True)
 
+        self._compile()
+
     def _add_pattern(self, pattern: str, is_folder: bool):
         is_case_insensitive = pattern.startswith('"') and pattern.endswith('"')
         orig_p = pattern[1:-1] if is_case_insensitive else pattern
@@ -224,69 +238,150 @@ class IgnoreManager:
         else:
             self.file_globs.append((p, is_path, is_case_insensitive))
 
-    def should_ignore_file(self, path: Path) -> bool:
-        name = path.name
-        ext = path.suffix.lower()
-        if ext in self.file_exts:
+    @staticmethod
+    def _compile_group(globs: List[Tuple[str, bool, bool]], is_path: bool, is_ci: bool):
+        """Combine every glob of one group into a single compiled ``match``."""
+        parts = []
+        for p, glob_is_path, glob_is_ci in globs:
+            if glob_is_path != is_path or glob_is_ci != is_ci:
+                continue
+            # fnmatch.fnmatch normalises case/separators on the pattern too
+            parts.append(fnmatch.translate(os.path.normcase(p) if is_ci else p))
+        if not parts:
+            return None
+        return re.compile("|".join(parts)).match
+
+    def _compile(self):
+        """Build the combined matchers and reset the decision caches."""
+        g = self._compile_group
+        self._file_name_cs = g(self.file_globs, False, False)
+        self._file_name_ci = g(self.file_globs, False, True)
+        self._file_path_cs = g(self.file_globs, True, False)
+        self._file_path_ci = g(self.file_globs, True, True)
+        self._folder_name_cs = g(self.folder_globs, False, False)
+        self._folder_name_ci = g(self.folder_globs, False, True)
+        self._folder_path_cs = g(self.folder_globs, True, False)
+        self._folder_path_ci = g(self.folder_globs, True, True)
+
+        # Path-level rules force a full path check; without them the decision
+        # depends only on the entry name and can be cached by name.
+        self._has_file_path_rules = bool(
+            self.file_paths or self._file_path_cs or self._file_path_ci
+        )
+
+        self._file_name_cache: Dict[str, bool] = {}
+        self._folder_cache: Dict[str, bool] = {}
+
+    def _file_name_ignored(self, name: str) -> bool:
+        dot = name.rfind(".")
+        if dot > 0 and name[dot:].lower() in self.file_exts:
             return True
-            
+
         name_lower = name.lower()
         if name in self.file_names or name_lower in self.file_names:
             return True
-            
-        str_path = str(path)
+
+        if self._file_name_cs and self._file_name_cs(name):
+            return True
+        if self._file_name_ci and self._file_name_ci(os.path.normcase(name_lower)):
+            return True
+        return False
+
+    def _file_path_ignored(self, str_path: str) -> bool:
         str_path_lower = str_path.lower()
         if str_path in self.file_paths or str_path_lower in self.file_paths:
             return True
-            
-        for p, is_path, is_ci in self.file_globs:
-            to_check = (str_path_lower if is_ci else str_path) if is_path else (name_lower if is_ci else name)
-            if is_ci:
-                if fnmatch.fnmatch(to_check, p): return True
-            else:
-                if fnmatch.fnmatchcase(to_check, p): return True
+        if self._file_path_cs and self._file_path_cs(str_path):
+            return True
+        if self._file_path_ci and self._file_path_ci(os.path.normcase(str_path_lower)):
+            return True
         return False
 
-    def should_ignore_folder(self, path: Path) -> bool:
-        name = path.name
+    def _folder_ignored(self, name: str, str_path: str) -> bool:
         name_lower = name.lower()
         if name in self.folder_names or name_lower in self.folder_names:
             return True
-            
-        str_path = str(path)
+
         str_path_lower = str_path.lower()
         if str_path in self.folder_paths or str_path_lower in self.folder_paths:
             return True
-            
-        for p, is_path, is_ci in self.folder_globs:
-            to_check = (str_path_lower if is_ci else str_path) if is_path else (name_lower if is_ci else name)
-            if is_ci:
-                if fnmatch.fnmatch(to_check, p): return True
-            else:
-                if fnmatch.fnmatchcase(to_check, p): return True
+
+        if self._folder_name_cs and self._folder_name_cs(name):
+            return True
+        if self._folder_name_ci and self._folder_name_ci(os.path.normcase(name_lower)):
+            return True
+        if self._folder_path_cs and self._folder_path_cs(str_path):
+            return True
+        if self._folder_path_ci and self._folder_path_ci(os.path.normcase(str_path_lower)):
+            return True
         return False
 
+    def should_ignore_file(self, path: Union[Path, str]) -> bool:
+        """Return True if the file at ``path`` matches an ignore pattern."""
+        if isinstance(path, str):
+            str_path = path
+            name = os.path.basename(path)
+        else:
+            str_path = None
+            name = path.name
+
+        cache = self._file_name_cache
+        decision = cache.get(name)
+        if decision is None:
+            if len(cache) >= self.MAX_CACHE_ENTRIES:
+                cache.clear()
+            decision = cache[name] = self._file_name_ignored(name)
+        if decision:
+            return True
 
-def get_global_ignore_settings() -> Tuple[List[str], List[str]]:
-    """Return (ignored_files, ignored_folders) from settings."""
-    raw_files = settings.get_setting("ignored_files", settings.get_default("ignored_files"))
-    raw_folders = settings.get_setting("ignored_folders", settings.get_default("ignored_folders"))
-    
+        if not self._has_file_path_rules:
+            return False
+        return self._file_path_ignored(str_path if str_path is not None else str(path))
+
+    def should_ignore_folder(self, path: Union[Path, str]) -> bool:
+        """Return True if the folder at ``path`` matches an ignore pattern."""
+        str_path = path if isinstance(path, str) else str(path)
+
+        cache = self._folder_cache
+        decision = cache.get(str_path)
+        if decision is None:
+            if len(cache) >= self.MAX_CACHE_ENTRIES:
+                cache.clear()
+            name = os.path.basename(str_path) if isinstance(path, str) else path.name
+            decision = cache[str_path] = self._folder_ignored(name, str_path)
+        return decision
+
+
+def parse_ignore_settings(raw_files: str, raw_folders: str) -> Tuple[List[str], List[str]]:
+    """Split the newline-separated ignore settings into pattern lists."""
     ignored_files = [p.strip() for p in raw_files.split('\n') if p.strip()]
     ignored_folders = [p.strip() for p in raw_folders.split('\n') if p.strip()]
     
     return ignored_files, ignored_folders
 
 
+def get_global_ignore_settings() -> Tuple[List[str], List[str]]:
+    """Return (ignored_files, ignored_folders) from settings."""
+    raw_files = settings.get_setting("ignored_files", settings.get_default("ignored_files"))
+    raw_folders = settings.get_setting("ignored_folders", settings.get_default("ignored_folders"))
+    return parse_ignore_settings(raw_files, raw_folders)
+
+
+@lru_cache(maxsize=16)
+def _get_ignore_manager(ignored_files: Tuple[str, ...], ignored_folders: Tuple[str, ...]) -> IgnoreManager:
+    """Return a shared, compiled IgnoreManager for the given pattern set."""
+    return IgnoreManager(list(ignored_files), list(ignored_folders))
+
+
 def should_ignore_file(path: Path, ignored_files: List[str]) -> bool:
     """Check if a file should be ignored based on name or path patterns (Legacy wrapper)."""
-    manager = IgnoreManager(ignored_files, [])
+    manager = _get_ignore_manager(tuple(ignored_files), ())
     return manager.should_ignore_file(path)
 
 
 def should_ignore_folder(path: Path, ignored_folders: List[str]) -> bool:
     """Check if a folder should be ignored based on patterns (Legacy wrapper)."""
-    manager = IgnoreManager([], ignored_folders)
+    manager = _get_ignore_manager((), tuple(ignored_folders))
     return manager.should_ignore_folder(path)
 
 
@@ -340,20 +435,20 @@ def count_files_fast(folder_path: str, threshold: int = 1000) -> int:
             # Filter ignored directories
             dirs[:] = [d for d in dirs if d not in ignored_dirs_set]
             dirs[:] = [d for d in dirs if not (root_path / d).is_symlink()]
-            dirs[:] = [d for d in dirs if not ignore_manager.should_ignore_folder(root_path / d)]
+            dirs[:] = [d for d in dirs if not ignore_manager.should_ignore_folder(os.path.join(root, d))]
             
             # Count valid files
             for filename in files:
+                # Skip ignored files (cheap, string-based check first)
+                if ignore_manager.should_ignore_file(os.path.join(root, filename)):
+                    continue
+                
                 file_path = root_path / filename
                 
                 # Skip symlinks
                 if file_path.is_symlink():
                     continue
                 
-                # Skip ignored files
-                if ignore_manager.should_ignore_file(file_path):
-                    continue
-                
                 # Check if has valid extension
                 ext = file_path.suffix.lower()
                 if ext in LANGUAGE_MAP:
@@ -390,18 +485,25 @@ def is_large_folder(folder_path: str, threshold: Optional[int] = None) -> bool:
     return count > threshold
 
 
-def scan_folders(folder_paths: List[str]) -> Dict[str, List[str]]:
+def scan_folders(
+    folder_paths: List[str],
+    ignore_settings: Optional[Tuple[List[str], List[str]]] = None,
+) -> Dict[str, List[str]]:
     """
     Scan multiple folders and group files by language.
     
     Args:
         folder_paths: List of folder paths to scan
+        ignore_settings: (ignored_files, ignored_folders) patterns; defaults
+            to the current profile's settings
         
     Returns:
         Dict mapping language name -> list of file paths
     """
     ignored_dirs_set = get_ignored_dirs()
-    ignored_file_patterns, ignored_folder_patterns = get_global_ignore_settings()
+    if ignore_settings is None:
+        ignore_settings = get_global_ignore_settings()
+    ignored_file_patterns, ignored_folder_patterns = ignore_settings
     ignore_manager = IgnoreManager(ignored_file_patterns, ignored_folder_patterns)
     language_files: Dict[str, List[str]] = defaultdict(list)
     
@@ -453,7 +555,7 @@ def scan_folders(folder_paths: List[str]) -> Dict[str, List[str]]:
             dirs[:] = [d for d in dirs if not (root_path / d).is_symlink()]
 
             # 3. User-defined global folder patterns
-            dirs[:] = [d for d in dirs if not ignore_manager.should_ignore_folder(root_path / d)]
+            dirs[:] = [d for d in dirs if not ignore_manager.should_ignore_folder(os.path.join(root, d))]
             
             for filename in files:
                 # Check file count limit
@@ -461,16 +563,16 @@ def scan_folders(folder_paths: List[str]) -> Dict[str, List[str]]:
                     logger.warning(f"Max files limit ({MAX_FILES_PER_FOLDER}) reached for folder: {folder_path}")
                     break
                 
+                # Global ignore check (patterns) - string-based, before any stat call
+                if ignore_manager.should_ignore_file(os.path.join(root, filename)):
+                    continue
+                
                 file_path = root_path / filename
                 
                 # Skip symlinked files (could point outside folder)
                 if file_path.is_symlink():
                     continue
                 
-                # Global ignore check (patterns)
-                if ignore_manager.should_ignore_file(file_path):
-                    continue
-                
                 ext = file_path.suffix.lower()
                 
                 # Dynamic Language Detection
@@ -624,13 +624,13 @@ class InternalFileTree(QTreeWidget):
             root_path = Path(root)
             
             # Respect ignore settings
-            dirs[:] = [d for d in dirs if not self.ignore_manager.should_ignore_folder(root_path / d)]
+            dirs[:] = [d for d in dirs if not self.ignore_manager.should_ignore_folder(os.path.join(root, d))]
             dirs[:] = [d for d in dirs if not (root_path / d).is_symlink()]
             
             for filename in files:
                 file_path = os.path.join(root, filename)
                 
-                if self.ignore_manager.should_ignore_file(Path(file_path)):
+                if self.ignore_manager.should_ignore_file(file_path):
                     continue
                 
                 ext = os.path.splitext(filename)[1].lower()
@@ -37,9 +37,12 @@ def _compute_data_checksum(data: dict) -> str:
 class GhostManager:
     """Manages ghost replay data - stores only the best session per file."""
     
-    def __init__(self):
-        # Always use portable ghosts directory (works in both dev and exe mode)
-        if _PORTABLE_MODE_AVAILABLE:
+    def __init__(self, ghosts_dir: Optional[Path] = None):
+        # Always use portable ghosts directory (works in both dev and exe mode),
+        # unless writing another profile's ghosts (demo data generation)
+        if ghosts_dir is not None:
+            self.ghosts_dir = Path(ghosts_dir)
+        elif _PORTABLE_MODE_AVAILABLE:
             self.ghosts_dir = get_ghosts_dir()
         else:
             self.ghosts_dir = Path("ghosts")
@@ -140,8 +143,7 @@ class GhostManager:
                     os.unlink(temp_path)
                 raise
             
-            print(f"[GhostManager] Saved ghost: {file_path} @ {wpm:.1f} WPM")
-            logger.info(f"Saved ghost: {file_path} @ {wpm:.1f} WPM")
+            logger.info("Saved ghost: %s @ %.1f WPM", file_path, wpm)
             return True
         except Exception as e:
             error_msg = f"Failed to save ghost data: {e}"
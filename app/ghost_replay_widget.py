@@ -2,10 +2,14 @@
 A dedicated widget to handle the ghost replay animation and controls.
 This widget overlays the typing area during replay.
 """
+import logging
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox
 from PySide6.QtCore import Qt, QTimer, Signal, QEvent
 from PySide6.QtGui import QKeyEvent
 
+logger = logging.getLogger(__name__)
+
+
 class GhostReplayWidget(QWidget):
     """
     A widget that overlays the typing area to show and control a ghost replay.
@@ -85,7 +89,7 @@ class GhostReplayWidget(QWidget):
             self.stop_replay()
             return
 
-        print(f"[GhostReplay] Starting new replay with {len(keystrokes)} keystrokes")
+        logger.debug("[GhostReplay] Starting new replay with %d keystrokes", len(keystrokes))
 
         # Normalize timestamps to start immediately
         first_timestamp = keystrokes[0]["t"]
@@ -112,7 +116,7 @@ class GhostReplayWidget(QWidget):
         if not self.is_replaying:
             return
 
-        print("[GhostReplay] Replay stopped.")
+        logger.debug("[GhostReplay] Replay stopped.")
         self.is_replaying = False
 
         # Clean up timers
@@ -0,0 +1,220 @@
+"""Compressed cold storage for expired session history.
+
+When the retention job expires sessions it can move them here instead of
+discarding them, keeping the profile database small. Multi-year trends
+stay available through the per-day totals the retention job leaves in
+the database (stats_db archived_daily_stats); the archive itself keeps
+the full rows. It lives next to the profile database
+(``typing_stats.archive``) and is append-only: a sequence of frames, each
+holding the sessions of one calendar month as zlib-compressed columns.
+
+Frame layout::
+
+    b"DTA1" | header length (u32 LE) | payload length (u32 LE)
+    | header JSON | payload
+
+The header carries the month, row count, first/last ``recorded_at`` and a
+CRC of the payload, so range queries skip whole months without
+decompressing them. A frame cut short by a crash is ignored on read and
+truncated before the next append.
+"""
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MAGIC = b"DTA1"
+ARCHIVE_SUFFIX = ".archive"
+_FRAME_PREFIX = struct.Struct("<4sII")
+
+# session_history columns kept in the archive, in row-tuple order
+ARCHIVE_COLUMNS = (
+    "id", "file_path", "language", "auto_indent", "wpm", "accuracy",
+    "total_keystrokes", "correct_keystrokes", "incorrect_keystrokes",
+    "duration", "completed", "recorded_at",
+)
+_RECORDED_AT = ARCHIVE_COLUMNS.index("recorded_at")
+_ID = ARCHIVE_COLUMNS.index("id")
+
+
+@dataclass
+class ArchiveFrame:
+    """Location and summary of one month's frame in the archive file."""
+    month: str  # YYYY-MM
+    rows: int
+    first: str  # Earliest recorded_at
+    last: str  # Latest recorded_at
+    crc: int
+    offset: int  # Start of the payload
+    size: int
+
+
+def archive_path_for(db_path: Union[str, Path]) -> Path:
+    """The archive file belonging to a profile database."""
+    return Path(db_path).with_suffix(ARCHIVE_SUFFIX)
+
+
+class HistoryArchive:
+    """Reader/appender for one profile's archive file.
+
+    Frame headers are cached and only re-read when the file changes on
+    disk; payloads are decoded on demand and not kept. Safe to share
+    between threads.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._frames: List[ArchiveFrame] = []
+        self._valid_size = 0
+
+    # --- Reading --------------------------------------------------------
+
+    def _scan(self):
+        """Refresh the frame index if the file changed since the last scan."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._stamp, self._frames, self._valid_size = None, [], 0
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+
+        frames: List[ArchiveFrame] = []
+        pos = 0
+        with open(self.path, "rb") as f:
+            while True:
+                prefix = f.read(_FRAME_PREFIX.size)
+                if len(prefix) < _FRAME_PREFIX.size:
+                    break
+                magic, header_len, payload_len = _FRAME_PREFIX.unpack(prefix)
+                if magic != ARCHIVE_MAGIC:
+                    logger.warning("Archive %s: bad frame at byte %d, ignoring the rest", self.path.name, pos)
+                    break
+                header_raw = f.read(header_len)
+                offset = pos + _FRAME_PREFIX.size + header_len
+                if len(header_raw) < header_len or offset + payload_len > st.st_size:
+                    break  # Cut short by a crash mid-append
+                try:
+                    header = json.loads(header_raw)
+                except ValueError:
+                    logger.warning("Archive %s: unreadable header at byte %d", self.path.name, pos)
+                    break
+                frames.append(ArchiveFrame(
+                    header["month"], header["rows"], header["first"], header["last"],
+                    header["crc"], offset, payload_len,
+                ))
+                pos = offset + payload_len
+                f.seek(pos)
+
+        self._stamp, self._frames, self._valid_size = stamp, frames, pos
+
+    def frames(self) -> List[ArchiveFrame]:
+        with self._lock:
+            self._scan()
+            return list(self._frames)
+
+    def months(self) -> List[str]:
+        """Archived months (YYYY-MM), sorted."""
+        return sorted({frame.month for frame in self.frames()})
+
+    def first_recorded_at(self) -> Optional[str]:
+        return min((frame.first for frame in self.frames()), default=None)
+
+    def _decode(self, frame: ArchiveFrame) -> List[tuple]:
+        with open(self.path, "rb") as f:
+            f.seek(frame.offset)
+            payload = f.read(frame.size)
+        if zlib.crc32(payload) != frame.crc:
+            logger.warning("Archive %s: checksum mismatch in %s, skipping it", self.path.name, frame.month)
+            return []
+        columns = json.loads(zlib.decompress(payload))
+        return list(zip(*(columns[name] for name in ARCHIVE_COLUMNS)))
+
+    def read_rows(self, first_month: Optional[str] = None, last_month: Optional[str] = None) -> List[tuple]:
+        """Archived sessions from the given months (inclusive), oldest frame first.
+
+        Rows are tuples in ARCHIVE_COLUMNS order. A session archived twice
+        (crash between append and delete) is returned once.
+        """
+        with self._lock:
+            self._scan()
+            seen = set()
+            result = []
+            for frame in self._frames:
+                if first_month and frame.month < first_month:
+                    continue
+                if last_month and frame.month > last_month:
+                    continue
+                for row in self._decode(frame):
+                    if row[_ID] not in seen:
+                        seen.add(row[_ID])
+                        result.append(row)
+            return result
+
+    # --- Writing --------------------------------------------------------
+
+    def append(self, rows: Iterable[Sequence]) -> int:
+        """Append sessions (tuples in ARCHIVE_COLUMNS order), one frame per month.
+
+        The data is fsynced before returning, so callers can delete the
+        rows from the database afterwards. Returns the number of rows written.
+        """
+        by_month: Dict[str, List[Sequence]] = defaultdict(list)
+        for row in rows:
+            by_month[str(row[_RECORDED_AT])[:7]].append(row)
+        if not by_month:
+            return 0
+
+        with self._lock:
+            self._scan()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            written = 0
+            with open(self.path, "ab") as f:
+                if f.tell() != self._valid_size:
+                    f.truncate(self._valid_size)  # Drop a frame cut short earlier
+                    f.seek(self._valid_size)
+                for month in sorted(by_month):
+                    month_rows = sorted(by_month[month], key=lambda r: r[_RECORDED_AT])
+                    f.write(_encode_frame(month, month_rows))
+                    written += len(month_rows)
+                f.flush()
+                os.fsync(f.fileno())
+            return written
+
+
+def _encode_frame(month: str, rows: List[Sequence]) -> bytes:
+    columns = {name: [row[i] for row in rows] for i, name in enumerate(ARCHIVE_COLUMNS)}
+    payload = zlib.compress(json.dumps(columns, separators=(",", ":")).encode("utf-8"), 9)
+    header = json.dumps({
+        "month": month,
+        "rows": len(rows),
+        "first": rows[0][_RECORDED_AT],
+        "last": rows[-1][_RECORDED_AT],
+        "crc": zlib.crc32(payload),
+    }, separators=(",", ":")).encode("utf-8")
+    return _FRAME_PREFIX.pack(ARCHIVE_MAGIC, len(header), len(payload)) + header + payload
+
+
+_archives: Dict[Path, HistoryArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(db_path: Union[str, Path]) -> HistoryArchive:
+    """Shared HistoryArchive for a profile database (created lazily, may not exist yet)."""
+    path = archive_path_for(db_path)
+    with _archives_lock:
+        archive = _archives.get(path)
+        if archive is None:
+            archive = _archives[path] = HistoryArchive(path)
+        return archive
@@ -0,0 +1,148 @@
+"""Streaming export of session history to CSV or NDJSON.
+
+The exporter walks the filtered history with a chunked cursor
+(``stats_db.iter_session_history``) and writes each chunk as it arrives, so
+memory use does not grow with the size of the history. It has no Qt
+dependency; HistoryTab runs it on a worker thread and wires up progress and
+cancellation.
+"""
+import csv
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app import stats_db
+
+
+# Export format -> file dialog filter
+EXPORT_FORMATS: Dict[str, str] = {
+    "csv": "CSV Files (*.csv)",
+    "ndjson": "NDJSON (*.ndjson)",
+}
+
+CSV_FIELDS = [
+    "Date", "Language", "File", "WPM", "Accuracy",
+    "Duration (s)", "Correct", "Incorrect", "Smart Indent",
+]
+
+# Raw, machine-friendly columns for NDJSON (one record per line; loads directly
+# with pandas.read_json(path, lines=True))
+NDJSON_FIELDS = [
+    "id", "recorded_at", "language", "file_path", "wpm", "accuracy",
+    "duration", "total", "correct", "incorrect", "auto_indent",
+]
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled before it completes."""
+
+
+def format_for_path(path: str, default: str = "csv") -> str:
+    """Guess the export format from a file extension."""
+    ext = Path(path).suffix.lower().lstrip(".")
+    if ext in ("ndjson", "jsonl"):
+        return "ndjson"
+    if ext == "csv":
+        return "csv"
+    return default
+
+
+def format_timestamp(value: Optional[str]) -> str:
+    """Format a stored timestamp the way the History tab displays it."""
+    if not value:
+        return ""
+    try:
+        return datetime.fromisoformat(value).strftime("%d/%m/%Y %H:%M")
+    except ValueError:
+        return value
+
+
+def _csv_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    file_path = record.get("file_path") or ""
+    return {
+        "Date": format_timestamp(record.get("recorded_at")),
+        "Language": record.get("language") or "Unknown",
+        "File": Path(file_path).name if file_path else "",
+        "WPM": f"{record.get('wpm') or 0.0:.1f}",
+        "Accuracy": f"{(record.get('accuracy') or 0.0) * 100:.1f}%",
+        "Duration (s)": f"{record.get('duration') or 0.0:.1f}",
+        "Correct": record.get("correct") or 0,
+        "Incorrect": record.get("incorrect") or 0,
+        "Smart Indent": "ON" if record.get("auto_indent") else "OFF",
+    }
+
+
+def write_records(
+    chunks: Iterable[List[Dict[str, Any]]],
+    stream,
+    fmt: str = "csv",
+    progress: Optional[Callable[[int], None]] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> int:
+    """Write chunks of history records to an open text stream.
+
+    Returns the number of rows written. Raises ExportCancelled if
+    ``is_cancelled`` returns True between chunks.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    written = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        write_chunk = lambda chunk: writer.writerows(_csv_row(r) for r in chunk)
+    else:
+        def write_chunk(chunk):
+            stream.writelines(
+                json.dumps({key: r.get(key) for key in NDJSON_FIELDS}, ensure_ascii=False) + "\n"
+                for r in chunk
+            )
+
+    for chunk in chunks:
+        if is_cancelled and is_cancelled():
+            raise ExportCancelled()
+        write_chunk(chunk)
+        written += len(chunk)
+        if progress:
+            progress(written)
+    return written
+
+
+def export_session_history(
+    dest_path: str,
+    fmt: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> int:
+    """Stream the filtered session history into ``dest_path``.
+
+    Output goes to a temporary ``.part`` file that replaces ``dest_path`` only
+    once the export completes, so a cancelled or failed export never leaves a
+    truncated file behind.
+
+    Returns:
+        Number of sessions exported.
+    """
+    fmt = fmt or format_for_path(dest_path)
+    tmp_path = f"{dest_path}.part"
+    chunks = stats_db.iter_session_history(chunk_size=chunk_size, **(filters or {}))
+    try:
+        with open(tmp_path, "w", newline="", encoding="utf-8") as stream:
+            written = write_records(chunks, stream, fmt, progress, is_cancelled)
+        os.replace(tmp_path, dest_path)
+        return written
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        chunks.close()
@@ -0,0 +1,143 @@
+"""Background enforcement of the history retention setting.
+
+``RetentionCleanupTask`` runs on the thread pool. It deletes (or, with
+``archive``, moves to app.history_archive) expired sessions in small
+rowid-range batches and then hands the freed pages back
+with ``PRAGMA incremental_vacuum``, pausing between steps so the UI's own
+reads and the session writes at the end of a test never queue behind it.
+
+Databases created before ``auto_vacuum=INCREMENTAL`` was the default only
+shrink after a full VACUUM. That rewrites the whole file under an
+exclusive lock, so it never runs from the retention job; the user starts
+it with ``CompactDatabaseTask`` (Settings > Compact Database).
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Tuple
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from app import stats_db
+from app.history_archive import get_archive
+
+logger = logging.getLogger(__name__)
+
+# Pause between batches/vacuum steps, giving other connections the lock
+MAINTENANCE_PAUSE_S = 0.05
+# How long MainWindow waits before cleaning up: after launch, and after the
+# retention setting changed (debounces scrolling through the combo)
+RETENTION_STARTUP_DELAY_MS = 10_000
+RETENTION_CHANGE_DELAY_MS = 2_000
+
+
+class _RetentionCleanupSignals(QObject):
+    finished = Signal(int, int)  # sessions deleted, free pages left
+    failed = Signal(str)
+
+
+class RetentionCleanupTask(QRunnable):
+    """Delete sessions older than ``retention_days`` from ``db_path``.
+
+    The database path is fixed when the task is created, so a profile
+    switch while it runs doesn't redirect it. ``cancel()`` stops it after
+    the current step. With ``archive`` the expired sessions are moved to
+    the profile's history archive rather than discarded.
+    """
+
+    def __init__(
+        self,
+        retention_days: int,
+        db_path: Path,
+        batch_size: int = stats_db.RETENTION_BATCH_SIZE,
+        vacuum_pages: int = stats_db.VACUUM_STEP_PAGES,
+        pause_s: float = MAINTENANCE_PAUSE_S,
+        archive: bool = False,
+    ):
+        super().__init__()
+        self.retention_days = retention_days
+        self.db_path = db_path
+        self.archive = archive
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.pause_s = pause_s
+        self.signals = _RetentionCleanupSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _idle(self) -> bool:
+        """Sleep between steps; False once cancelled."""
+        return not self._cancelled.wait(self.pause_s)
+
+    def run(self):
+        try:
+            deleted, free_pages = self.cleanup()
+        except Exception as e:
+            logger.exception("History retention cleanup failed")
+            self.signals.failed.emit(str(e))
+            return
+        if deleted:
+            logger.info("Retention cleanup removed %d sessions (%d free pages left)", deleted, free_pages)
+        self.signals.finished.emit(deleted, free_pages)
+
+    def cleanup(self) -> Tuple[int, int]:
+        """Run the whole job; returns (sessions deleted, free pages left)."""
+        if self.retention_days <= 0:
+            return 0, 0
+
+        cutoff = stats_db.retention_cutoff(self.retention_days)
+        archive = get_archive(self.db_path) if self.archive else None
+        deleted = 0
+        while True:
+            batch = stats_db.delete_expired_sessions_batch(cutoff, self.batch_size, self.db_path, archive)
+            deleted += batch
+            if batch < self.batch_size or not self._idle():
+                break
+
+        if self._cancelled.is_set():
+            return deleted, 0
+
+        # Steps through the free pages only on databases already in
+        # incremental mode; a no-op on older files until they are compacted
+        free_pages = stats_db.incremental_vacuum(self.vacuum_pages, self.db_path)
+        while free_pages and self._idle():
+            free_pages = stats_db.incremental_vacuum(self.vacuum_pages, self.db_path)
+        return deleted, free_pages
+
+
+class _CompactDatabaseSignals(QObject):
+    finished = Signal(bool)  # True if the database was converted
+    failed = Signal(str)
+
+
+class CompactDatabaseTask(QRunnable):
+    """User-started compaction of ``db_path``.
+
+    Converts an older database to ``auto_vacuum=INCREMENTAL`` with one full
+    VACUUM (session and settings writes wait for it), or returns all free
+    pages of an already converted one.
+    """
+
+    def __init__(self, db_path: Path):
+        super().__init__()
+        self.db_path = db_path
+        self.signals = _CompactDatabaseSignals()
+
+    def run(self):
+        try:
+            converted = self.compact()
+        except Exception as e:
+            logger.exception("Compacting %s failed", self.db_path)
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(converted)
+
+    def compact(self) -> bool:
+        if stats_db.enable_incremental_vacuum(self.db_path):
+            logger.info("Switched %s to incremental auto_vacuum", Path(self.db_path).name)
+            return True
+        while stats_db.incremental_vacuum(db_path=self.db_path):
+            pass
+        return False
@@ -1,10 +1,10 @@
 """History tab widget for reviewing and managing past typing sessions."""
-import csv
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 from pathlib import Path
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, Signal
 from PySide6.QtGui import QDoubleValidator
 from PySide6.QtWidgets import (
     QWidget,
@@ -14,16 +14,217 @@ from PySide6.QtWidgets import (
     QComboBox,
     QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QAbstractItemView,
     QHeaderView,
     QMessageBox,
     QFileDialog,
+    QProgressDialog,
 )
 
 from app import stats_db, settings
+from app.history_export import (
+    EXPORT_FORMATS,
+    ExportCancelled,
+    export_session_history,
+    format_for_path,
+    format_timestamp as _format_timestamp,
+)
 from app.ui_icons import get_icon
-from app.themes import get_color_scheme
+from app.themes import get_color_scheme, restyle
+
+
+class _HistoryExportSignals(QObject):
+    progress = Signal(int)  # rows written so far
+    finished = Signal(int, str)  # rows written, destination path
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class _HistoryExportTask(QRunnable):
+    """Background task that streams the filtered history to a file."""
+
+    def __init__(self, dest_path: str, fmt: str, filters: Dict):
+        super().__init__()
+        self.dest_path = dest_path
+        self.fmt = fmt
+        self.filters = dict(filters)
+        self.signals = _HistoryExportSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            written = export_session_history(
+                self.dest_path,
+                fmt=self.fmt,
+                filters=self.filters,
+                progress=self.signals.progress.emit,
+                is_cancelled=self._cancel_event.is_set,
+            )
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(written, self.dest_path)
+
+
+class SessionHistoryModel(QAbstractTableModel):
+    """Table model over session history, fetched page by page as the view scrolls.
+
+    Rows come from ``stats_db.fetch_session_history_page`` (keyset pagination)
+    and sorting is done by SQL, so only the visible pages are ever in memory.
+    """
+
+    PAGE_SIZE = 200
+
+    HEADERS = [
+        "Date",
+        "Language",
+        "File",
+        "WPM",
+        "Accuracy",
+        "Duration (s)",
+        "Correct",
+        "Incorrect",
+        "Smart Indent",
+    ]
+
+    # Column index -> key in stats_db.HISTORY_SORT_COLUMNS
+    SORT_KEYS = [
+        "recorded_at",
+        "language",
+        "file_path",
+        "wpm",
+        "accuracy",
+        "duration",
+        "correct",
+        "incorrect",
+        "auto_indent",
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Dict] = []
+        self._filters: Dict[str, Optional[Union[float, str]]] = {}
+        self._sort_column = 0
+        self._sort_order = Qt.DescendingOrder
+        self._has_more = False
+        self._total = 0
+
+    @property
+    def total_count(self) -> int:
+        """Number of sessions matching the current filters (not just loaded rows)."""
+        return self._total
+
+    def set_filters(self, filters: Dict[str, Optional[Union[float, str]]]):
+        self._filters = dict(filters)
+        self.reload()
+
+    def reload(self):
+        """Reset the model to the first page for the current filters and sort."""
+        self.beginResetModel()
+        self._total = stats_db.count_session_history(**self._filters)
+        self._rows = self._fetch_page(None)
+        self._has_more = len(self._rows) == self.PAGE_SIZE
+        self.endResetModel()
+
+    def _fetch_page(self, after: Optional[Dict]) -> List[Dict]:
+        return stats_db.fetch_session_history_page(
+            sort_by=self.SORT_KEYS[self._sort_column],
+            descending=self._sort_order == Qt.DescendingOrder,
+            after=after,
+            limit=self.PAGE_SIZE,
+            **self._filters,
+        )
+
+    def record_at(self, row: int) -> Optional[Dict]:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def record_id(self, row: int) -> Optional[int]:
+        record = self.record_at(row)
+        return record.get("id") if record else None
+
+    # --- QAbstractTableModel interface ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.record_at(index.row())
+        if record is None:
+            return None
+
+        if role == Qt.DisplayRole:
+            return self._display_value(record, index.column())
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        if role == Qt.UserRole:
+            return record.get("id")
+        if role == Qt.ToolTipRole and index.column() == 2:
+            return record.get("file_path") or ""
+        return None
+
+    def _display_value(self, record: Dict, column: int) -> str:
+        if column == 0:
+            return _format_timestamp(record.get("recorded_at"))
+        if column == 1:
+            return record.get("language") or "Unknown"
+        if column == 2:
+            file_path = record.get("file_path") or ""
+            return Path(file_path).name if file_path else ""
+        if column == 3:
+            return f"{record.get('wpm') or 0.0:.1f}"
+        if column == 4:
+            return f"{(record.get('accuracy') or 0.0) * 100:.1f}%"
+        if column == 5:
+            return f"{record.get('duration') or 0.0:.1f}"
+        if column == 6:
+            return str(record.get("correct") or 0)
+        if column == 7:
+            return str(record.get("incorrect") or 0)
+        if column == 8:
+            return "ON" if record.get("auto_indent") else "OFF"
+        return ""
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        page = self._fetch_page(self._rows[-1] if self._rows else None)
+        self._has_more = len(page) == self.PAGE_SIZE
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        if not 0 <= column < len(self.SORT_KEYS):
+            return
+        if column == self._sort_column and order == self._sort_order:
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self.reload()
 
 
 class HistoryTab(QWidget):
@@ -32,6 +233,8 @@ class HistoryTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_filters: Dict[str, Optional[Union[float, str]]] = {}
+        self._export_task: Optional[_HistoryExportTask] = None
+        self._export_progress: Optional[QProgressDialog] = None
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(16, 16, 16, 16)
@@ -102,7 +305,7 @@ class HistoryTab(QWidget):
         self.edit_mode_btn.clicked.connect(self.toggle_edit_mode)
         filter_row.addWidget(self.edit_mode_btn)
         
-        self.export_btn = QPushButton(" Export CSV")
+        self.export_btn = QPushButton(" Export")
         self.export_btn.setIcon(get_icon("DOWNLOAD"))
         self.export_btn.clicked.connect(self.export_to_csv)
         filter_row.addWidget(self.export_btn)
@@ -125,24 +328,17 @@ class HistoryTab(QWidget):
         action_row.addStretch()
         layout.addLayout(action_row)
 
-        self.table = QTableWidget(0, 9)
-        self.table.setHorizontalHeaderLabels([
-            "Date",
-            "Language",
-            "File",
-            "WPM",
-            "Accuracy",
-            "Duration (s)",
-            "Correct",
-            "Incorrect",
-            "Smart Indent",
-        ])
+        self.model = SessionHistoryModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionsClickable(True)
         self.table.horizontalHeader().setDefaultAlignment(Qt.AlignCenter)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.NoSelection)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSortIndicator(0, Qt.DescendingOrder)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setSortingEnabled(True)
         self.table.setShowGrid(True)
         layout.addWidget(self.table)
@@ -164,21 +360,21 @@ class HistoryTab(QWidget):
         accent = scheme.accent_color
         border = scheme.border_color
         
-        self.setStyleSheet(f"background-color: {bg_primary}; color: {text_primary};")
+        restyle(self, f"background-color: {bg_primary}; color: {text_primary};")
         
         # Labels
-        self.header.setStyleSheet(f"font-size: 18px; font-weight: bold; color: {text_primary};")
+        restyle(self.header, f"font-size: 18px; font-weight: bold; color: {text_primary};")
         label_style = f"color: {text_secondary}; font-weight: 500;"
-        self.language_label.setStyleSheet(label_style)
-        self.name_label.setStyleSheet(label_style)
-        self.wpm_label.setStyleSheet(label_style)
-        self.duration_label.setStyleSheet(label_style)
-        self.indent_label.setStyleSheet(label_style)
-        self.count_label.setStyleSheet(f"color: {text_secondary};")
+        restyle(self.language_label, label_style)
+        restyle(self.name_label, label_style)
+        restyle(self.wpm_label, label_style)
+        restyle(self.duration_label, label_style)
+        restyle(self.indent_label, label_style)
+        restyle(self.count_label, f"color: {text_secondary};")
         
         # Table
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
+        restyle(self.table, f"""
+            QTableView {{
                 gridline-color: {border};
                 background-color: {bg_secondary};
                 border: 1px solid {border};
@@ -192,11 +388,11 @@ class HistoryTab(QWidget):
                 border: none;
                 font-weight: bold;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 color: {text_primary};
                 padding: 5px;
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {accent};
                 color: #ffffff;
             }}
@@ -204,7 +400,7 @@ class HistoryTab(QWidget):
         
         # Update Horizontal Header as well
         header = self.table.horizontalHeader()
-        header.setStyleSheet(f"""
+        restyle(header, f"""
             QHeaderView::section {{
                 background-color: {bg_tertiary};
                 color: {text_primary};
@@ -231,10 +427,10 @@ class HistoryTab(QWidget):
                 background-color: {bg_secondary};
             }}
         """
-        self.apply_filters_btn.setStyleSheet(btn_style)
-        self.clear_filters_btn.setStyleSheet(btn_style)
-        self.export_btn.setStyleSheet(btn_style)
-        self.delete_btn.setStyleSheet(btn_style)
+        restyle(self.apply_filters_btn, btn_style)
+        restyle(self.clear_filters_btn, btn_style)
+        restyle(self.export_btn, btn_style)
+        restyle(self.delete_btn, btn_style)
         
         edit_btn_style = btn_style + f"""
             QPushButton:checked {{
@@ -242,7 +438,7 @@ class HistoryTab(QWidget):
                 color: white;
             }}
         """
-        self.edit_mode_btn.setStyleSheet(edit_btn_style)
+        restyle(self.edit_mode_btn, edit_btn_style)
         
         # Inputs
         input_style = f"""
@@ -254,13 +450,13 @@ class HistoryTab(QWidget):
                 padding: 4px;
             }}
         """
-        self.language_combo.setStyleSheet(input_style)
-        self.name_filter_input.setStyleSheet(input_style)
-        self.min_wpm_input.setStyleSheet(input_style)
-        self.max_wpm_input.setStyleSheet(input_style)
-        self.min_duration_input.setStyleSheet(input_style)
-        self.max_duration_input.setStyleSheet(input_style)
-        self.indent_combo.setStyleSheet(input_style)
+        restyle(self.language_combo, input_style)
+        restyle(self.name_filter_input, input_style)
+        restyle(self.min_wpm_input, input_style)
+        restyle(self.max_wpm_input, input_style)
+        restyle(self.min_duration_input, input_style)
+        restyle(self.max_duration_input, input_style)
+        restyle(self.indent_combo, input_style)
 
     def _create_numeric_input(self, placeholder: str) -> QLineEdit:
         """Create a numeric line edit accepting floats with optional blank value."""
@@ -320,7 +516,7 @@ class HistoryTab(QWidget):
 
     def toggle_edit_mode(self, enabled: bool):
         """Toggle multi-select deletion mode."""
-        self.table.setSelectionMode(QTableWidget.ExtendedSelection if enabled else QTableWidget.NoSelection)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection if enabled else QAbstractItemView.NoSelection)
         self.delete_btn.setEnabled(enabled)
         self.edit_mode_btn.setIcon(get_icon("CHECK") if enabled else get_icon("EDIT"))
         self.edit_mode_btn.setText(" Done" if enabled else " Edit Mode")
@@ -336,11 +532,7 @@ class HistoryTab(QWidget):
 
         record_ids: List[int] = []
         for model_index in selected_items:
-            row = model_index.row()
-            item = self.table.item(row, 0)
-            if not item:
-                continue
-            record_id = item.data(Qt.UserRole)
+            record_id = self.model.record_id(model_index.row())
             if record_id is not None:
                 record_ids.append(int(record_id))
 
@@ -377,157 +569,84 @@ class HistoryTab(QWidget):
         return float(text) if text else None
 
     def _load_history(self):
-        """Load rows from the database according to stored filters."""
+        """Reload the first page of rows according to stored filters."""
         filters = getattr(self, "current_filters", {})
-        history = stats_db.fetch_session_history(
-            language=filters.get("language"),
-            file_contains=filters.get("file_contains"),
-            min_wpm=filters.get("min_wpm"),
-            max_wpm=filters.get("max_wpm"),
-            min_duration=filters.get("min_duration"),
-            max_duration=filters.get("max_duration"),
-            auto_indent=filters.get("auto_indent"),
-        )
-
-        header = self.table.horizontalHeader()
-        sort_col = header.sortIndicatorSection()
-        sort_order = header.sortIndicatorOrder()
-
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(0)
-        for record in history:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            timestamp_value = record.get("recorded_at")
-            timestamp_item = QTableWidgetItem(self._format_timestamp(timestamp_value))
-            timestamp_item.setData(Qt.UserRole, record.get("id"))
-            if timestamp_value:
-                timestamp_item.setData(Qt.EditRole, timestamp_value)
-            timestamp_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 0, timestamp_item)
-
-            language_item = QTableWidgetItem(record.get("language") or "Unknown")
-            language_item.setData(Qt.EditRole, (record.get("language") or "Unknown"))
-            language_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 1, language_item)
-
-            file_path = record.get("file_path") or ""
-            file_name = Path(file_path).name if file_path else ""
-            file_item = QTableWidgetItem(file_name)
-            file_item.setData(Qt.EditRole, file_name.lower())
-            file_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 2, file_item)
-
-            wpm_item = QTableWidgetItem(f"{record.get('wpm', 0.0):.1f}")
-            wpm_item.setData(Qt.EditRole, record.get("wpm", 0.0))
-            wpm_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 3, wpm_item)
-
-            accuracy = record.get("accuracy", 0.0)
-            accuracy_item = QTableWidgetItem(f"{accuracy * 100:.1f}%")
-            accuracy_item.setData(Qt.EditRole, accuracy)
-            accuracy_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 4, accuracy_item)
-
-            duration_item = QTableWidgetItem(f"{record.get('duration', 0.0):.1f}")
-            duration_item.setData(Qt.EditRole, record.get("duration", 0.0))
-            duration_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 5, duration_item)
-
-            correct_item = QTableWidgetItem(str(record.get("correct", 0)))
-            correct_item.setData(Qt.EditRole, record.get("correct", 0))
-            correct_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 6, correct_item)
-
-            incorrect_item = QTableWidgetItem(str(record.get("incorrect", 0)))
-            incorrect_item.setData(Qt.EditRole, record.get("incorrect", 0))
-            incorrect_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 7, incorrect_item)
-
-            indent_item = QTableWidgetItem("ON" if record.get("auto_indent") else "OFF")
-            indent_item.setData(Qt.EditRole, 1 if record.get("auto_indent") else 0)
-            indent_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 8, indent_item)
-
-        self.count_label.setText(f"Showing {len(history)} session(s)")
-        self.table.setSortingEnabled(True)
-        if self.table.rowCount() and 0 <= sort_col < self.table.columnCount():
-            self.table.sortItems(sort_col, sort_order)
+        self.table.clearSelection()
+        self.model.set_filters(filters)
+        self.count_label.setText(f"Showing {self.model.total_count} session(s)")
 
     def _format_timestamp(self, value: Optional[str]) -> str:
         """Format timestamp string for display."""
-        if not value:
-            return ""
-        try:
-            return datetime.fromisoformat(value).strftime("%d/%m/%Y %H:%M")
-        except ValueError:
-            return value
+        return _format_timestamp(value)
     
     def export_to_csv(self):
-        """Export current filtered session history to CSV file."""
-        filters = getattr(self, "current_filters", {})
-        history = stats_db.fetch_session_history(
-            language=filters.get("language"),
-            file_contains=filters.get("file_contains"),
-            min_wpm=filters.get("min_wpm"),
-            max_wpm=filters.get("max_wpm"),
-            min_duration=filters.get("min_duration"),
-            max_duration=filters.get("max_duration"),
-        )
-        
-        if not history:
+        """Export the current filtered session history (CSV or NDJSON) in the background."""
+        if self._export_task is not None:
+            return
+
+        filters = dict(getattr(self, "current_filters", {}))
+        total = stats_db.count_session_history(**filters)
+        if not total:
             QMessageBox.information(self, "No Data", "No session history to export.")
             return
         
-        # Ask user where to save the CSV
+        # Ask user where to save the export
         default_filename = f"session_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_filters = ";;".join(list(EXPORT_FORMATS.values()) + ["All Files (*)"])
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Export Session History",
             default_filename,
-            "CSV Files (*.csv);;All Files (*)"
+            file_filters
         )
         
         if not file_path:
             return
-        
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'Date', 'Language', 'File', 'WPM', 'Accuracy', 
-                    'Duration (s)', 'Correct', 'Incorrect', 'Smart Indent'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for record in history:
-                    timestamp_value = record.get("recorded_at", "")
-                    formatted_date = self._format_timestamp(timestamp_value)
-                    file_path_val = record.get("file_path") or ""
-                    file_name = Path(file_path_val).name if file_path_val else ""
-                    accuracy = record.get("accuracy", 0.0)
-                    
-                    writer.writerow({
-                        'Date': formatted_date,
-                        'Language': record.get("language") or "Unknown",
-                        'File': file_name,
-                        'WPM': f"{record.get('wpm', 0.0):.1f}",
-                        'Accuracy': f"{accuracy * 100:.1f}%",
-                        'Duration (s)': f"{record.get('duration', 0.0):.1f}",
-                        'Correct': record.get("correct", 0),
-                        'Incorrect': record.get("incorrect", 0),
-                        'Smart Indent': "ON" if record.get("auto_indent") else "OFF"
-                    })
-            
-            QMessageBox.information(
-                self, 
-                "Export Successful", 
-                f"Exported {len(history)} session(s) to:\n{file_path}"
-            )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Export Failed",
-                f"Failed to export session history:\n{str(e)}"
-            )
+
+        selected_fmt = next((fmt for fmt, label in EXPORT_FORMATS.items() if label == selected_filter), "csv")
+        fmt = format_for_path(file_path, default=selected_fmt)
+
+        progress = QProgressDialog("Exporting session history...", "Cancel", 0, total, self)
+        progress.setWindowTitle("Export Session History")
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+
+        task = _HistoryExportTask(file_path, fmt, filters)
+        progress.canceled.connect(task.cancel)
+        task.signals.progress.connect(self._on_export_progress)
+        task.signals.finished.connect(self._on_export_finished)
+        task.signals.failed.connect(self._on_export_failed)
+        task.signals.cancelled.connect(self._on_export_done)
+
+        self._export_task = task
+        self._export_progress = progress
+        self.export_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_export_progress(self, written: int):
+        if self._export_progress is not None:
+            self._export_progress.setValue(min(written, self._export_progress.maximum()))
+
+    def _on_export_done(self):
+        if self._export_progress is not None:
+            self._export_progress.close()
+        self._export_progress = None
+        self._export_task = None
+        self.export_btn.setEnabled(True)
+
+    def _on_export_finished(self, written: int, file_path: str):
+        self._on_export_done()
+        QMessageBox.information(
+            self, 
+            "Export Successful", 
+            f"Exported {written} session(s) to:\n{file_path}"
+        )
+
+    def _on_export_failed(self, message: str):
+        self._on_export_done()
+        QMessageBox.critical(
+            self,
+            "Export Failed",
+            f"Failed to export session history:\n{message}"
+        )
@@ -1,25 +1,40 @@
 
-"""Icon manager using Material Icon Theme assets."""
+"""Icon manager using Material Icon Theme assets.
+
+Rendered icons are kept in a disk cache next to the icon theme: one PNG per
+SVG and size, named after the SVG's mtime and size so edited icons are
+re-rendered. The manifest mappings are likewise stored as a compact lookup
+table, so a warm start neither parses icons.json nor loads QtSvg.
+"""
 import logging
 import json
 import os
 from pathlib import Path
 from typing import Optional, Dict
 from PySide6.QtGui import QIcon, QPixmap, QPainter
-from PySide6.QtSvg import QSvgRenderer
 from PySide6.QtCore import QSize, Qt, QObject
 
-from app.settings import get_icons_dir
+from app.settings import get_icons_dir, get_icon_cache_dir
 
 logger = logging.getLogger(__name__)
 
+# Bump when the cache layout or rendering changes; old versions are ignored
+ICON_CACHE_VERSION = 1
+
+
+def _stamp(st: os.stat_result) -> str:
+    return f"{st.st_mtime_ns:x}_{st.st_size:x}"
+
+
 class IconManager(QObject):
     """Manages icon retrieval using VS Code Material Icon Theme."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
         super().__init__()
         self.icon_dir = get_icons_dir()
         self.manifest_path = self.icon_dir / "icons.json"
+        self.cache_dir = (cache_dir or get_icon_cache_dir()) / f"v{ICON_CACHE_VERSION}"
+        self.lookup_path = self.cache_dir / "lookup.json"
         
         self.icon_definitions: Dict[str, str] = {}
         self.file_extensions: Dict[str, str] = {}
@@ -45,11 +60,16 @@ class IconManager(QObject):
         self._load_manifest()
 
     def _load_manifest(self):
-        """Load the icons.json manifest."""
-        if not self.manifest_path.exists():
+        """Load the icon mappings, from the lookup table when it is current."""
+        try:
+            manifest_stamp = _stamp(self.manifest_path.stat())
+        except OSError:
             logger.error(f"Icon manifest not found at {self.manifest_path}")
             return
 
+        if self._load_lookup(manifest_stamp):
+            return
+
         try:
             with open(self.manifest_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -78,6 +98,50 @@ class IconManager(QObject):
 
         except Exception as e:
             logger.error(f"Failed to load icon manifest: {e}")
+            return
+
+        self._save_lookup(manifest_stamp)
+
+    def _load_lookup(self, manifest_stamp: str) -> bool:
+        """Load the mappings from the lookup table if it matches the manifest."""
+        try:
+            with open(self.lookup_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("manifest") != manifest_stamp:
+            return False
+
+        self.icon_definitions = data.get("iconDefinitions", {})
+        self.file_extensions = data.get("fileExtensions", {})
+        self.file_names = data.get("fileNames", {})
+        self.folder_names = data.get("folderNames", {})
+        self.language_ids = data.get("languageIds", {})
+        self._ensure_language_mappings()
+        logger.debug("Loaded %d icons from lookup table", len(self.icon_definitions))
+        return True
+
+    def _save_lookup(self, manifest_stamp: str):
+        """Store the parsed mappings as a compact lookup table."""
+        data = {
+            "manifest": manifest_stamp,
+            "iconDefinitions": self.icon_definitions,
+            "fileExtensions": self.file_extensions,
+            "fileNames": self.file_names,
+            "folderNames": self.folder_names,
+            "languageIds": self.language_ids,
+        }
+        try:
+            self._write_atomic(self.lookup_path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        except OSError as e:
+            logger.warning("Could not write icon lookup table: %s", e)
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
 
     def _ensure_language_mappings(self):
         """Add manual mappings for known language names to IDs."""
@@ -86,19 +150,27 @@ class IconManager(QObject):
         # We can also rely on lowercasing the input request.
         pass
 
-    def _get_pixmap_from_svg(self, filename: str, size: int) -> Optional[QPixmap]:
-        """Render SVG to QPixmap."""
-        if not filename:
-            return None
-            
-        cache_key = f"{filename}_{size}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-            
-        path = self.icon_dir / filename
-        if not path.exists():
-            return None
-            
+    def _png_cache_path(self, filename: str, size: int, st: os.stat_result) -> Path:
+        stem = filename.rsplit(".", 1)[0]
+        return self.cache_dir / f"{size}px" / f"{stem}@{_stamp(st)}.png"
+
+    def _store_png(self, pixmap: QPixmap, png_path: Path):
+        """Write a rendered icon to the disk cache, dropping stale renders."""
+        stem = png_path.name.split("@", 1)[0]
+        try:
+            png_path.parent.mkdir(parents=True, exist_ok=True)
+            for stale in png_path.parent.glob(f"{stem}@*.png"):
+                stale.unlink()
+            tmp = png_path.with_name(png_path.name + ".tmp")
+            if pixmap.save(str(tmp), "PNG"):
+                os.replace(tmp, png_path)
+        except OSError as e:
+            logger.debug("Could not cache icon %s: %s", png_path.name, e)
+
+    def _render_svg(self, path: Path, size: int) -> Optional[QPixmap]:
+        # QtSvg is only needed on a disk-cache miss
+        from PySide6.QtSvg import QSvgRenderer
+
         renderer = QSvgRenderer(str(path))
         if not renderer.isValid():
             return None
@@ -109,6 +181,30 @@ class IconManager(QObject):
         painter.setRenderHint(QPainter.Antialiasing)
         renderer.render(painter)
         painter.end()
+        return pixmap
+
+    def _get_pixmap_from_svg(self, filename: str, size: int) -> Optional[QPixmap]:
+        """Render SVG to QPixmap, going through the memory and disk caches."""
+        if not filename:
+            return None
+            
+        cache_key = f"{filename}_{size}"
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+            
+        path = self.icon_dir / filename
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+
+        png_path = self._png_cache_path(filename, size, st)
+        pixmap = QPixmap(str(png_path)) if png_path.exists() else None
+        if pixmap is None or pixmap.isNull():
+            pixmap = self._render_svg(path, size)
+            if pixmap is None:
+                return None
+            self._store_png(pixmap, png_path)
         
         self._cache[cache_key] = pixmap
         return pixmap
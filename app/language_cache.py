@@ -41,6 +41,19 @@ def build_signature(folders: Iterable[str]) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
+def files_signature(language_files: Dict[str, List[str]]) -> str:
+    """Signature of a scan result: every file and the language it was sorted into.
+
+    Unlike build_signature it changes when files are added or removed
+    anywhere below the folders, not just at their top level.
+    """
+    digest = hashlib.sha256()
+    for language in sorted(language_files):
+        for path in sorted(language_files[language]):
+            digest.update(f"{language}\0{path}\n".encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
 def load_cached_snapshot() -> Optional[Tuple[str, Dict[str, List[str]]]]:
     path = _cache_path()
     if not path.exists():
@@ -11,10 +11,13 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QFont
 from typing import Callable, Dict, List, Optional, Tuple
+import logging
 from app import settings, stats_db
-from app.language_cache import build_signature, load_cached_snapshot, save_snapshot
+from app.language_cache import build_signature, files_signature, load_cached_snapshot, save_snapshot
 from app.ui_icons import get_pixmap, get_icon
 
+logger = logging.getLogger(__name__)
+
 # Debug timing flag
 DEBUG_STARTUP_TIMING = True
 
@@ -33,6 +36,13 @@ def _get_folder_scanner():
     return scan_folders
 
 
+def _get_char_indexer():
+    # Drill indexing reads file contents, keep it off the startup path too
+    from app.drill_generator import update_char_index
+
+    return update_char_index
+
+
 class _LanguageScanSignals(QObject):
     completed = Signal(dict, tuple)
     progress = Signal(int)  # file count found so far
@@ -41,11 +51,17 @@ class _LanguageScanSignals(QObject):
 class _LanguageScanTask(QRunnable):
     """Background task that scans folders for language groupings."""
 
-    def __init__(self, folders_snapshot: Tuple[str, ...], scanner: Callable[[List[str]], Dict[str, List[str]]]):
+    def __init__(
+        self,
+        folders_snapshot: Tuple[str, ...],
+        scanner: Callable[[List[str]], Dict[str, List[str]]],
+        indexer: Optional[Callable[[Dict[str, List[str]]], int]] = None,
+    ):
         super().__init__()
         self.folders_snapshot = folders_snapshot
         self.signals = _LanguageScanSignals()
         self._scanner = scanner
+        self._indexer = indexer
 
     def run(self):
         try:
@@ -57,6 +73,13 @@ class _LanguageScanTask(QRunnable):
             result = {}
         self.signals.completed.emit(result, self.folders_snapshot)
 
+        # Cards are up already; refresh the drill index on the same worker
+        if self._indexer and result:
+            try:
+                self._indexer(result)
+            except Exception:
+                logger.exception("Failed to update the drill index")
+
 
 class LanguageCard(QFrame):
     """Card widget displaying a single language with stats."""
@@ -102,18 +125,11 @@ class LanguageCard(QFrame):
         layout.addWidget(name_label)
 
         # File count - simple text
-        completed = max(0, completed_count)
-        total = len(files)
-        if total > 0:
-            progress_pct = int((completed / total) * 100)
-            count_text = f"{completed}/{total} files • {progress_pct}% complete"
-        else:
-            count_text = f"{total} files"
-        
-        count_label = QLabel(count_text)
-        count_label.setAlignment(Qt.AlignCenter)
-        count_label.setStyleSheet("color: gray; font-size: 12px; margin-top: 2px;")
-        layout.addWidget(count_label)
+        self.count_label = QLabel()
+        self.count_label.setAlignment(Qt.AlignCenter)
+        self.count_label.setStyleSheet("color: gray; font-size: 12px; margin-top: 2px;")
+        self.set_completed_count(completed_count)
+        layout.addWidget(self.count_label)
 
         # Avg WPM
         self.wpm_label = QLabel()
@@ -170,6 +186,17 @@ class LanguageCard(QFrame):
             self.clicked.emit(self.language, self.files)
         super().mouseReleaseEvent(event)
 
+    def set_completed_count(self, completed_count: int):
+        """Update the file count label with the number of completed files."""
+        completed = max(0, completed_count)
+        total = len(self.files)
+        if total > 0:
+            progress_pct = int((completed / total) * 100)
+            count_text = f"{completed}/{total} files • {progress_pct}% complete"
+        else:
+            count_text = f"{total} files"
+        self.count_label.setText(count_text)
+
     def _set_wpm_display(self, average_wpm: Optional[float], sample_size: int):
         """Update the WPM label contents and styling."""
         from app.themes import get_color_scheme
@@ -229,6 +256,7 @@ class LanguagesTab(QWidget):
         self._loaded = False
         self._loading = False
         self._cached_language_files: Dict[str, List[str]] = {}
+        self._file_language: Dict[str, str] = {}
         self._last_snapshot: Tuple[str, ...] = tuple()
         self._pending_snapshot: Tuple[str, ...] = tuple()
         self._last_signature: Optional[str] = None
@@ -326,8 +354,11 @@ class LanguagesTab(QWidget):
 
         row, col = 0, 0
         max_cols = 4
-        all_files = [path for paths in language_files.values() for path in paths]
-        stats_map = stats_db.get_file_stats_for_files(all_files)
+        self._file_language = {
+            path: lang for lang, paths in language_files.items() for path in paths
+        }
+        self._sync_scan_index(language_files)
+        progress = stats_db.get_language_progress()
         
         # Batch fetch WPM averages for all languages at once
         all_langs = list(language_files.keys())
@@ -343,9 +374,7 @@ class LanguagesTab(QWidget):
             if recent:
                 avg_wpm = recent.get("average")
                 sample_size = recent.get("count", 0)
-            completed_count = sum(
-                1 for path in files if stats_map.get(path, {}).get("completed")
-            )
+            completed_count = progress.get(lang, {}).get("completed", 0)
             card = LanguageCard(lang, files, avg_wpm, sample_size, completed_count)
             card.clicked.connect(self.on_language_clicked)
             self.card_layout.addWidget(card, row, col)
@@ -356,6 +385,14 @@ class LanguagesTab(QWidget):
                 col = 0
                 row += 1
 
+    def _sync_scan_index(self, language_files: Dict[str, List[str]]):
+        """Rebuild the stored language index unless it holds exactly these files."""
+        # The folder signature misses files added or removed deeper in the tree
+        signature = files_signature(language_files)
+        if stats_db.get_scan_index_signature() == signature:
+            return
+        stats_db.sync_scan_index(language_files, signature)
+
     def ensure_loaded(self, force: bool = False):
         """Ensure the tab has loaded language data, triggering a scan if needed."""
         if self._loading:
@@ -398,7 +435,7 @@ class LanguagesTab(QWidget):
         self._show_message("Scanning folders… (0 files found)")
 
         scanner = _get_folder_scanner()
-        task = _LanguageScanTask(snapshot, scanner)
+        task = _LanguageScanTask(snapshot, scanner, _get_char_indexer())
         task.signals.completed.connect(self._on_scan_finished)
         task.signals.progress.connect(self._on_scan_progress)
         self._active_task = task
@@ -439,6 +476,7 @@ class LanguagesTab(QWidget):
         """Indicate folder data changed so a fresh scan runs next time."""
         self._loaded = False
         self._cached_language_files = {}
+        self._file_language = {}
         self._pending_snapshot = tuple()
         self._pending_signature = None
         self._last_signature = None
@@ -459,21 +497,15 @@ class LanguagesTab(QWidget):
         if not hasattr(self, '_language_cards'):
             return
         
-        # Determine which language the file belongs to
-        target_language = None
-        if file_path:
-            for lang, files in self._cached_language_files.items():
-                if file_path in files:
-                    target_language = lang
-                    break
-        
+        target_language = self._file_language.get(file_path) if file_path else None
+        progress = stats_db.get_language_progress()
+
         # Refresh relevant cards
         for lang, card in self._language_cards.items():
             if target_language and lang != target_language:
                 continue
             
-            files = self._cached_language_files.get(lang, [])
-            if not files:
+            if not self._cached_language_files.get(lang):
                 continue
             
             # Recalculate stats using efficient language-based queries
@@ -481,30 +513,9 @@ class LanguagesTab(QWidget):
             avg_wpm = recent.get("average") if recent else None
             sample_size = recent.get("count", 0) if recent else 0
             
-            # For the completion count, we still need file-level stats
-            # Use chunked retrieval for safety with large datasets
-            stats_map = stats_db.get_file_stats_for_files(files)
-            completed_count = sum(
-                1 for path in files if stats_map.get(path, {}).get("completed")
-            )
-            
             # Update card display
             card._set_wpm_display(avg_wpm, sample_size)
-            
-            # Update file count label (find and update the count label)
-            total = len(files)
-            if total > 0:
-                progress_pct = int((completed_count / total) * 100)
-                count_text = f"{completed_count}/{total} files • {progress_pct}% complete"
-            else:
-                count_text = f"{total} files"
-            
-            # Find the count label (third label in the layout)
-            layout = card.layout()
-            if layout and layout.count() >= 4:
-                count_label = layout.itemAt(3).widget()
-                if isinstance(count_label, QLabel):
-                    count_label.setText(count_text)
+            card.set_completed_count(progress.get(lang, {}).get("completed", 0))
 
     def apply_theme(self):
         """Apply current theme to LanguagesTab and all its children."""
@@ -3,57 +3,134 @@ Central logging configuration for the application.
 
 This module sets up logging to output both to the console (stdout) and to a file.
 The log file is stored in the portable data directory.
+
+Callers only put records on a queue (``QueueHandler``); a ``QueueListener``
+thread does the formatting and the file/console writes, so logging never
+blocks the UI thread on I/O.
 """
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 from app.portable_data import get_data_manager
 
-def setup_logging():
-    """Configure logging to file and console."""
-    
-    # Get log file path from portable data manager
-    try:
-        log_file = get_data_manager().get_log_file_path()
-        # Ensure directory exists
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-    except Exception as e:
-        print(f"Failed to determine log file path: {e}")
-        return
+# Levels offered by the "log_level" setting
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+DEFAULT_LOG_LEVEL = "INFO"
 
-    # Create root logger
-    logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG) # Catch everything
+# The log file rolls over at this size, keeping a few old files around
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
 
-    # Clear existing handlers to avoid duplicates on reload
-    if logger.hasHandlers():
-        logger.handlers.clear()
+_listener: Optional[QueueListener] = None
 
-    # Formatter for logs
+
+def _build_handlers(log_file: Optional[Path]) -> list:
     # Format: [TIME] [LEVEL] [MODULE] - MESSAGE
     file_formatter = logging.Formatter(
         '[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
     # Console formatter can be simpler
-    console_formatter = logging.Formatter(
-        '[%(levelname)s] %(message)s'
-    )
+    console_formatter = logging.Formatter('[%(levelname)s] %(message)s')
 
-    # 1. File Handler (Overwrites each run 'w')
-    try:
-        file_handler = logging.FileHandler(log_file, mode='w', encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-    except Exception as e:
-        print(f"Failed to setup file logging: {e}")
+    handlers = []
+
+    # 1. Rotating file handler (appends; rolls over instead of truncating)
+    if log_file is not None:
+        try:
+            file_handler = RotatingFileHandler(
+                log_file,
+                maxBytes=LOG_MAX_BYTES,
+                backupCount=LOG_BACKUP_COUNT,
+                encoding='utf-8',
+                delay=True,
+            )
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(file_formatter)
+            handlers.append(file_handler)
+        except Exception as e:
+            print(f"Failed to setup file logging: {e}")
 
     # 2. Console Handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO) # Console sees INFO and up (less noise)
+    console_handler.setLevel(logging.INFO)  # Console sees INFO and up (less noise)
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
+    return handlers
+
+
+def setup_logging(level: Optional[str] = None, log_file: Optional[Path] = None) -> Optional[QueueListener]:
+    """Route the root logger through a queue to a background writer thread.
 
-    logging.info(f"Logging initialized. Log file: {log_file}")
+    Args:
+        level: Root level name; defaults to DEFAULT_LOG_LEVEL until the
+            "log_level" setting is applied with set_log_level().
+        log_file: Override for the log file location (tests).
+    """
+    global _listener
+
+    if log_file is None:
+        # Get log file path from portable data manager
+        try:
+            log_file = get_data_manager().get_log_file_path()
+        except Exception as e:
+            print(f"Failed to determine log file path: {e}")
+            return None
+    try:
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"Failed to create log directory: {e}")
+        log_file = None
+
+    shutdown_logging()
+
+    logger = logging.getLogger()
+    # Clear existing handlers to avoid duplicates on reload
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *_build_handlers(log_file), respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(QueueHandler(log_queue))
+    set_log_level(level or DEFAULT_LOG_LEVEL)
+
+    atexit.unregister(shutdown_logging)
+    atexit.register(shutdown_logging)
+    logging.info("Logging initialized. Log file: %s", log_file)
+    return _listener
+
+
+def set_log_level(level: str) -> int:
+    """Set the root log level by name, falling back to DEFAULT_LOG_LEVEL.
+
+    Records below the level are dropped before any formatting happens.
+    Returns the numeric level applied.
+    """
+    name = str(level).upper()
+    if name not in LOG_LEVELS:
+        name = DEFAULT_LOG_LEVEL
+    numeric = logging.getLevelName(name)
+    logging.getLogger().setLevel(numeric)
+    return numeric
+
+
+def apply_log_level_setting() -> int:
+    """Apply the active profile's "log_level" setting."""
+    from app import settings
+    return set_log_level(settings.get_setting("log_level", settings.get_default("log_level")))
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -502,6 +502,10 @@ class PortableDataManager:
         """Get the directory where shared language icons are stored."""
         return self.get_shared_dir() / "icons"
 
+    def get_icon_cache_dir(self) -> Path:
+        """Get the directory where rendered icons are cached."""
+        return self.get_shared_dir() / "cache" / "icons"
+
     def get_sounds_dir(self) -> Path:
         """Get the directory where sound files are stored."""
         # Use shared sounds
@@ -544,6 +548,11 @@ def get_icons_dir() -> Path:
     return _portable_data_manager.get_icons_dir()
 
 
+def get_icon_cache_dir() -> Path:
+    """Get path to the rendered icon cache directory."""
+    return _portable_data_manager.get_icon_cache_dir()
+
+
 def is_portable() -> bool:
     """Check if running as portable executable."""
     return _portable_data_manager.is_portable
@@ -6,7 +6,10 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from PySide6.QtCore import QObject, Signal
 
+from app import db_backup
+from app.db_backup import BackupInfo
 from app.portable_data import get_data_manager
+import app.settings as settings
 
 logger = logging.getLogger(__name__)
 
@@ -281,6 +284,8 @@ class ProfileManager(QObject):
             return False
             
         try:
+            if self.active_profile == name:
+                settings.flush_settings()
             shutil.rmtree(target_dir)
             self.profile_deleted.emit(name)
             
@@ -306,8 +311,54 @@ class ProfileManager(QObject):
         self._save_global_config()
         self.profile_switched.emit(name)
 
+    def get_db_path(self, name: str) -> Path:
+        return self._profiles_dir / name / "typing_stats.db"
+
     def get_current_db_path(self) -> Path:
-        return self._profiles_dir / self.active_profile / "typing_stats.db"
+        return self.get_db_path(self.active_profile)
+
+    def list_backups(self, name: str) -> List[BackupInfo]:
+        """Snapshots of a profile's database, newest first."""
+        return db_backup.list_backups(self.get_db_path(name))
+
+    def backup_profile(self, name: str, keep: int = db_backup.DEFAULT_BACKUP_KEEP) -> Optional[Path]:
+        """Snapshot a profile's database now (blocking). Returns the snapshot path."""
+        if name == self.active_profile:
+            settings.flush_settings()
+        try:
+            return db_backup.create_backup(self.get_db_path(name), keep)
+        except Exception as e:
+            logger.error(f"Failed to back up profile {name}: {e}")
+            return None
+
+    def restore_backup(self, name: str, backup_path: Optional[Path] = None) -> bool:
+        """Restore a profile's database from a snapshot (default: the newest).
+
+        For the active profile the settings cache is reloaded from the
+        restored database; the UI still has to reload its own data.
+        """
+        if backup_path is None:
+            backups = self.list_backups(name)
+            if not backups:
+                return False
+            backup_path = backups[0].path
+
+        db_path = self.get_db_path(name)
+        is_active = name == self.active_profile
+        try:
+            if is_active:
+                settings.flush_settings()
+            db_backup.restore_backup(backup_path, db_path)
+            if is_active:
+                settings.init_db(str(db_path))
+            else:
+                settings.prepare_db(db_path)
+        except Exception as e:
+            logger.error(f"Failed to restore profile {name} from {backup_path}: {e}")
+            return False
+        logger.info(f"Restored profile {name} from {Path(backup_path).name}")
+        self.profile_updated.emit(name)
+        return True
 
     def rename_profile(self, old_name: str, new_name: str) -> bool:
         """Rename a profile and its directory."""
@@ -344,6 +395,10 @@ class ProfileManager(QObject):
                 except Exception as e:
                     logger.warning(f"Failed to update image path in metadata during rename: {e}")
 
+            # Queued settings must land before their database moves
+            if self.active_profile == old_name:
+                settings.flush_settings()
+
             # Rename folder
             old_dir.rename(new_dir)
 
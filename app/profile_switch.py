@@ -0,0 +1,189 @@
+"""Prefetching for profile switches.
+
+Switching profiles used to open, migrate and read the new profile's
+database on the UI thread while the transition overlay animated. The
+data-loading half now runs in ``ProfilePrefetchTask`` on the thread pool:
+it prepares the database and reads the settings, folder list and folder
+summaries into a ``ProfileSnapshot``, which MainWindow applies in one pass.
+
+``ProfileSnapshotCache`` keeps the snapshots of recently left profiles, so
+switching back needs no worker at all as long as the database is unchanged.
+"""
+import logging
+import os
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+import app.settings as settings
+
+logger = logging.getLogger(__name__)
+
+# Recently left profiles kept warm for switching back
+PROFILE_CACHE_SIZE = 3
+
+# (file count, language count, session count) shown on a folder card
+FolderSummary = Tuple[int, int, int]
+
+
+@dataclass
+class ProfileSnapshot:
+    """Everything the UI needs from a profile's database to show it."""
+    name: str
+    db_path: Path
+    settings: Dict[str, Optional[str]]
+    folders: List[dict]
+    folder_summaries: Dict[str, FolderSummary] = field(default_factory=dict)
+    stamp: Tuple = ()
+
+
+def db_stamp(db_path) -> Tuple:
+    """mtime and size of the database and its WAL file."""
+    stamp = []
+    for suffix in ("", "-wal"):
+        try:
+            st = os.stat(f"{db_path}{suffix}")
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def summarize_folders(
+    folders: List[dict],
+    db_path,
+    ignore_settings: Optional[Tuple[List[str], List[str]]] = None,
+) -> Dict[str, FolderSummary]:
+    """Scan each existing folder and count its recorded sessions."""
+    from app.file_scanner import scan_folders
+
+    summaries: Dict[str, FolderSummary] = {}
+    conn = sqlite3.connect(db_path, timeout=10.0)
+    try:
+        for folder in folders:
+            path = folder["path"]
+            if not os.path.isdir(path):
+                continue
+            language_files = scan_folders([path], ignore_settings)
+            file_count = sum(len(files) for files in language_files.values())
+            summaries[path] = (file_count, len(language_files), _count_folder_sessions(conn, path))
+    finally:
+        conn.close()
+    return summaries
+
+
+def _count_folder_sessions(conn: sqlite3.Connection, path: str) -> int:
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM session_history WHERE substr(file_path, 1, ?) = ?",
+            (len(path), path),
+        ).fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+
+def recount_folder_sessions(summaries: Dict[str, FolderSummary], db_path) -> Dict[str, FolderSummary]:
+    """``summaries`` with the session counts re-read from the database.
+
+    File and language counts are kept; only sessions change while a
+    profile is in use, and the folder cards don't follow them.
+    """
+    conn = sqlite3.connect(db_path, timeout=10.0)
+    try:
+        return {
+            path: (files, languages, _count_folder_sessions(conn, path))
+            for path, (files, languages, _) in summaries.items()
+        }
+    finally:
+        conn.close()
+
+
+def load_profile_snapshot(name: str, db_path: Path) -> ProfileSnapshot:
+    """Prepare a profile's database and read what the UI shows first.
+
+    Safe to call off the UI thread: it only touches the given database,
+    never the current one.
+    """
+    from app.file_scanner import parse_ignore_settings
+
+    db_path = Path(db_path)
+    settings.prepare_db(db_path)
+
+    conn = sqlite3.connect(db_path, timeout=10.0)
+    try:
+        rows = dict(conn.execute("SELECT key, value FROM settings").fetchall())
+        folders = settings.read_folders(conn)
+    finally:
+        conn.close()
+
+    ignore_settings = parse_ignore_settings(
+        rows.get("ignored_files") or settings.get_default("ignored_files"),
+        rows.get("ignored_folders") or settings.get_default("ignored_folders"),
+    )
+    summaries = summarize_folders(folders, db_path, ignore_settings)
+    return ProfileSnapshot(name, db_path, rows, folders, summaries, db_stamp(db_path))
+
+
+class ProfileSnapshotCache:
+    """Snapshots of the last few profiles, dropped once their database changes."""
+
+    def __init__(self, capacity: int = PROFILE_CACHE_SIZE):
+        self.capacity = capacity
+        self._snapshots: "OrderedDict[Path, ProfileSnapshot]" = OrderedDict()
+
+    def put(self, snapshot: ProfileSnapshot):
+        if self.capacity <= 0:
+            return
+        self._snapshots.pop(snapshot.db_path, None)
+        self._snapshots[snapshot.db_path] = snapshot
+        while len(self._snapshots) > self.capacity:
+            self._snapshots.popitem(last=False)
+
+    def get(self, db_path) -> Optional[ProfileSnapshot]:
+        """The cached snapshot for ``db_path`` if the database is untouched."""
+        db_path = Path(db_path)
+        snapshot = self._snapshots.get(db_path)
+        if snapshot is None:
+            return None
+        if snapshot.stamp != db_stamp(db_path):
+            del self._snapshots[db_path]
+            return None
+        self._snapshots.move_to_end(db_path)
+        return snapshot
+
+    def discard(self, db_path):
+        self._snapshots.pop(Path(db_path), None)
+
+    def clear(self):
+        self._snapshots.clear()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+
+class _ProfilePrefetchSignals(QObject):
+    finished = Signal(object)  # ProfileSnapshot
+    failed = Signal(str, str)  # profile name, error message
+
+
+class ProfilePrefetchTask(QRunnable):
+    """Background task that loads a ProfileSnapshot for the switch target."""
+
+    def __init__(self, name: str, db_path: Path):
+        super().__init__()
+        self.name = name
+        self.db_path = db_path
+        self.signals = _ProfilePrefetchSignals()
+
+    def run(self):
+        try:
+            snapshot = load_profile_snapshot(self.name, self.db_path)
+        except Exception as e:
+            logger.exception("Prefetching profile '%s' failed", self.name)
+            self.signals.failed.emit(self.name, str(e))
+            return
+        self.signals.finished.emit(snapshot)
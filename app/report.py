@@ -0,0 +1,129 @@
+"""Headless statistics report (``main.py --report``).
+
+Prints the Stats tab's headline numbers for a profile without starting the
+UI: no Qt import, the profile database opened read-only (safe while the
+app has it open), and the figures computed by the same stats_db functions
+the Stats tab calls. The output is plain text or JSON, for scripts and for
+timing the query layer on its own.
+"""
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Union
+
+from app import settings, stats_db
+
+REPORT_FORMATS = ("text", "json")
+DEFAULT_REPORT_DAYS = 30
+
+
+def resolve_profile_db(profile: Optional[str] = None) -> Path:
+    """Database of ``profile``, or of the active profile in global_config.json.
+
+    Only reads the profile configuration; unlike ``--profile`` for the app,
+    it never creates the profile or makes it active.
+    """
+    from app.portable_data import get_data_manager
+
+    dm = get_data_manager()
+    if not profile:
+        profile = "Default"
+        try:
+            with open(dm.get_shared_dir() / "global_config.json", "r") as f:
+                profile = json.load(f).get("active_profile") or profile
+        except (OSError, ValueError):
+            pass
+    return dm.get_profiles_dir() / profile / "typing_stats.db"
+
+
+def build_report(db_path: Union[str, Path], days: int = DEFAULT_REPORT_DAYS) -> Dict[str, Any]:
+    """Collect the summary, per-language stats, streak and trend of a database.
+
+    Makes ``db_path`` the current, read-only database of app.settings.
+
+    Raises:
+        FileNotFoundError: ``db_path`` does not exist.
+        sqlite3.Error: The database can't be read.
+    """
+    db_path = Path(db_path)
+    if not db_path.is_file():
+        raise FileNotFoundError(f"No database at {db_path}")
+    settings.use_read_only_db(db_path)
+    return {
+        "database": str(db_path),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "summary": stats_db.get_aggregated_stats(),
+        "languages": stats_db.get_per_language_stats(),
+        "streak_days": stats_db.get_current_streak(),
+        "trend": stats_db.get_trend_comparison(days),
+    }
+
+
+def _num(value: Optional[float], digits: int = 1, suffix: str = "") -> str:
+    if value is None:
+        return "-"
+    return f"{value:,.{digits}f}{suffix}"
+
+
+def _delta(value: float, digits: int = 1, suffix: str = "") -> str:
+    return f"{value:+.{digits}f}{suffix}"
+
+
+def format_report_text(report: Dict[str, Any]) -> str:
+    """Human-readable version of a build_report result."""
+    summary = report["summary"]
+    trend = report["trend"]
+    current, previous = trend["current"], trend["previous"]
+    days = trend["period_days"]
+
+    lines = [
+        f"Dev Type report: {report['database']}",
+        f"Generated:   {report['generated_at']}",
+        "",
+        f"Sessions:    {summary['total_completed']:,} completed, {summary['total_incomplete']:,} incomplete",
+        f"WPM:         avg {_num(summary['avg_wpm'])}  best {_num(summary['highest_wpm'])}"
+        f"  lowest {_num(summary['lowest_wpm'])}",
+        f"Accuracy:    avg {_num(summary['avg_acc'], suffix='%')}  best {_num(summary['highest_acc'], suffix='%')}"
+        f"  lowest {_num(summary['lowest_acc'], suffix='%')}",
+        f"Best day:    {summary['most_chars_day']:,} chars, {summary['most_sessions_day']:,} sessions",
+        f"Streak:      {report['streak_days']} day{'s' if report['streak_days'] != 1 else ''}",
+        "",
+        f"Last {days} days (previous {days} days):",
+        f"  Sessions   {current['sessions']:,} ({previous['sessions']:,})",
+        f"  Avg WPM    {_num(current['avg_wpm'])} ({_delta(trend['wpm_delta'])})",
+        f"  Accuracy   {_num(current['avg_accuracy'], suffix='%')} ({_delta(trend['acc_delta'], suffix='%')})",
+        f"  Characters {current['total_chars']:,} ({previous['total_chars']:,})",
+    ]
+
+    if report["languages"]:
+        width = max(len(lang["language"]) for lang in report["languages"])
+        lines += ["", "Languages:"]
+        for lang in report["languages"]:
+            lines.append(
+                f"  {lang['language']:<{width}}  {lang['session_count']:>9,} sessions"
+                f"  avg {_num(lang['avg_wpm']):>6} WPM  {_num(lang['avg_accuracy'], suffix='%'):>6}"
+                f"  best {_num(lang['best_wpm'])}"
+            )
+    return "\n".join(lines)
+
+
+def run_report(
+    db_path: Union[str, Path],
+    fmt: str = "text",
+    days: int = DEFAULT_REPORT_DAYS,
+    out: Optional[TextIO] = None,
+) -> int:
+    """Write the report for ``db_path`` to ``out`` (stdout); returns an exit code."""
+    out = out or sys.stdout
+    try:
+        report = build_report(db_path, days)
+    except Exception as e:
+        print(f"[Report] Could not read {db_path}: {e}", file=sys.stderr)
+        return 1
+    if fmt == "json":
+        json.dump(report, out, indent=2)
+        out.write("\n")
+    else:
+        out.write(format_report_text(report) + "\n")
+    return 0
@@ -13,6 +13,35 @@ from typing import List, Dict, Tuple
 from app.ui_icons import get_pixmap
 
 
+# Hover hit-test distance in pixels around a marker
+HOVER_RADIUS = 12
+
+
+def downsample_columns(points: List[Tuple[int, float, float, float]]) -> List[Tuple[int, float, float, float]]:
+    """Reduce projected ``(second, value, x, y)`` points to one pixel column each.
+
+    Each column keeps its lowest and highest point in time order, so the
+    line keeps its envelope. Series no denser than the pixel width come back
+    unchanged.
+    """
+    result = []
+    start = 0
+    while start < len(points):
+        column = int(points[start][2])
+        end = start + 1
+        while end < len(points) and int(points[end][2]) == column:
+            end += 1
+        if end - start <= 2:
+            result.extend(points[start:end])
+        else:
+            bucket = points[start:end]
+            low = min(bucket, key=lambda p: p[1])
+            high = max(bucket, key=lambda p: p[1])
+            result.extend(sorted({low, high}, key=lambda p: p[0]))
+        start = end
+    return result
+
+
 class InteractiveWPMGraph(QWidget):
     """Interactive WPM vs Time graph widget with hover tooltips and error markers."""
     
@@ -63,6 +92,16 @@ class InteractiveWPMGraph(QWidget):
         self.margin_top = 55 if is_race else 45  # More space for race legend
         self.margin_bottom = 45  # Extra space to prevent clipping with continue button
         
+        # Cached geometry and static layer (see _ensure_geometry / _static_layer)
+        self._bg_color = QColor(self.theme.get('bg', '#18181b'))
+        self._text_color = QColor(self.theme.get('text', '#ffffff'))
+        self._geometry_key = None
+        self._series_points: Dict[str, List[Tuple[int, float, float, float]]] = {}
+        self._marker_lookup: Dict[Tuple[str, int], Tuple[float, float, float]] = {}
+        self._hover_columns: Dict[int, List[Tuple[int, str, int, float, float]]] = {}
+        self._layer_key = None
+        self._layer = None
+        
         # Mouse tracking
         self.setMouseTracking(True)
         self.hover_info = None  # (second, type) where type is 'user_wpm', 'user_error', 'ghost_wpm', 'ghost_error'
@@ -196,43 +235,62 @@ class InteractiveWPMGraph(QWidget):
         rect = self._graph_rect()
         return rect.y() + rect.height() - (errors / self.error_max) * rect.height()
     
+    def _ensure_geometry(self):
+        """Project every series to widget coordinates once per widget size.
+
+        Series are reduced to at most two points (the extremes) per pixel
+        column, and the kept markers are bucketed by column for hover tests.
+        """
+        key = (self.width(), self.height())
+        if self._geometry_key == key:
+            return
+        rect = self._graph_rect()
+        left, width = rect.x(), rect.width()
+        bottom, height = rect.y() + rect.height(), rect.height()
+        x_span = self.x_max - self.x_min
+
+        def to_x(second):
+            return left + ((second - self.x_min) / x_span if x_span > 0 else 0) * width
+
+        series = (
+            ('user_error', self.error_history, self.error_max),
+            ('ghost_error', self.ghost_error_history, self.error_max),
+            ('user_wpm', self.second_markers, self.y_max),
+            ('ghost_wpm', self.ghost_second_markers, self.y_max),
+        )
+        self._series_points = {}
+        self._marker_lookup = {}
+        self._hover_columns = {}
+        for priority, (kind, data, y_max) in enumerate(series):
+            projected = [
+                (second, value, to_x(second), bottom - (value / y_max) * height)
+                for second, value in data
+            ]
+            points = downsample_columns(projected)
+            self._series_points[kind] = points
+            for second, value, px, py in points:
+                self._marker_lookup.setdefault((kind, second), (value, px, py))
+                self._hover_columns.setdefault(int(px), []).append((priority, kind, second, px, py))
+        self._geometry_key = key
+
     def _find_hovered_marker(self, x: float, y: float) -> Tuple[int, str]:
         """Find which marker is being hovered, if any.
-        Returns (second, type) where type is 'user_wpm', 'user_error', 'ghost_wpm', 'ghost_error', or (None, None)"""
-        
-        # Check user error markers
-        if self.user_visible and self.user_errors_visible:
-            for second, errors in self.error_history:
-                marker_x = self._time_to_x(second)
-                marker_y = self._error_to_y(errors)
-                if abs(x - marker_x) < 12 and abs(y - marker_y) < 12:
-                    return second, 'user_error'
-        
-        # Check ghost error markers
-        if self.ghost_visible and self.ghost_errors_visible:
-            for second, errors in self.ghost_error_history:
-                marker_x = self._time_to_x(second)
-                marker_y = self._error_to_y(errors)
-                if abs(x - marker_x) < 12 and abs(y - marker_y) < 12:
-                    return second, 'ghost_error'
-        
-        # Check user WPM markers
-        if self.user_visible and self.user_wpm_visible:
-            for second, wpm in self.second_markers:
-                marker_x = self._time_to_x(second)
-                marker_y = self._wpm_to_y(wpm)
-                if abs(x - marker_x) < 12 and abs(y - marker_y) < 12:
-                    return second, 'user_wpm'
-        
-        # Check ghost WPM markers
-        if self.ghost_visible and self.ghost_wpm_visible:
-            for second, wpm in self.ghost_second_markers:
-                marker_x = self._time_to_x(second)
-                marker_y = self._wpm_to_y(wpm)
-                if abs(x - marker_x) < 12 and abs(y - marker_y) < 12:
-                    return second, 'ghost_wpm'
-        
-        return None, None
+        Returns (second, type) where type is 'user_wpm', 'user_error', 'ghost_wpm', 'ghost_error', or (None, None)
+
+        Only the pixel columns within the hover radius are examined. Errors
+        win over WPM and user over ghost, then the earliest second.
+        """
+        self._ensure_geometry()
+        best = None
+        column = int(x)
+        for col in range(column - HOVER_RADIUS, column + HOVER_RADIUS + 1):
+            for priority, kind, second, marker_x, marker_y in self._hover_columns.get(col, ()):
+                if abs(x - marker_x) < HOVER_RADIUS and abs(y - marker_y) < HOVER_RADIUS:
+                    if (best is None or (priority, second) < best[:2]) and self._series_visible(kind):
+                        best = (priority, second, kind)
+        if best is None:
+            return None, None
+        return best[1], best[2]
     
     def mouseDoubleClickEvent(self, event):
         """Handle double-click to toggle legend items."""
@@ -278,6 +336,7 @@ class InteractiveWPMGraph(QWidget):
         """Track mouse position and update hover info."""
         x = event.position().x()
         y = event.position().y()
+        previous_hover = self.hover_info
         self.hover_info = self._find_hovered_marker(x, y)
 
         # Check legend hover
@@ -310,8 +369,9 @@ class InteractiveWPMGraph(QWidget):
             else:
                 QToolTip.hideText()
             self.previous_hover_legend = self.hover_legend
-
-        self.update()
+            self.update()
+        elif self.hover_info != previous_hover:
+            self.update()
     
     def leaveEvent(self, event):
         """Clear hover when mouse leaves."""
@@ -323,15 +383,56 @@ class InteractiveWPMGraph(QWidget):
         self.update()
     
     def paintEvent(self, event):
-        """Draw the interactive graph."""
+        """Draw the interactive graph.
+
+        Axes, grid and the visible series come from a cached pixmap, so a
+        hover repaint only draws the hovered marker, its tooltip and the
+        legend.
+        """
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._static_layer())
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Colors
-        bg_color = QColor(self.theme.get('bg', '#18181b'))
-        text_color = QColor(self.theme.get('text', '#ffffff'))
+        self._draw_hover(painter)
+        self._draw_legend(painter, self._graph_rect(), self._text_color)
+        painter.end()
+
+    def _visibility_state(self) -> Tuple[bool, ...]:
+        return (self.user_visible, self.user_wpm_visible, self.user_errors_visible,
+                self.ghost_visible, self.ghost_wpm_visible, self.ghost_errors_visible)
+
+    def _series_visible(self, kind: str) -> bool:
+        if kind.startswith('user'):
+            if not self.user_visible:
+                return False
+            return self.user_wpm_visible if kind == 'user_wpm' else self.user_errors_visible
+        if not (self.ghost_visible and self.is_race):
+            return False
+        return self.ghost_wpm_visible if kind == 'ghost_wpm' else self.ghost_errors_visible
+
+    def _any_errors_visible(self) -> bool:
+        return bool((self._series_visible('user_error') and self.error_history) or
+                    (self._series_visible('ghost_error') and self.ghost_error_history))
+
+    def _static_layer(self) -> QPixmap:
+        """Background, axes and visible series, re-rendered only when the
+        size or a visibility toggle changes."""
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self._visibility_state())
+        if self._layer_key != key:
+            self._ensure_geometry()
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self._render_static_layer(painter)
+            painter.end()
+            self._layer = pixmap
+            self._layer_key = key
+        return self._layer
+
+    def _render_static_layer(self, painter: QPainter):
+        bg_color, text_color = self._bg_color, self._text_color
         grid_color = QColor(self.theme.get('text_secondary', '#444444'))
-        
         rect = self._graph_rect()
         
         # Draw background
@@ -370,9 +471,7 @@ class InteractiveWPMGraph(QWidget):
             painter.drawText(QRectF(0, y - 8, self.margin_left - 5, 16), 
                            Qt.AlignRight | Qt.AlignVCenter, str(wpm))
         
-        # Check if any errors are visible
-        any_errors_visible = ((self.user_visible and self.user_errors_visible and self.error_history) or
-                             (self.ghost_visible and self.ghost_errors_visible and self.ghost_error_history))
+        any_errors_visible = self._any_errors_visible()
         
         # Right Y-axis labels (Errors) - only if errors are visible
         if any_errors_visible:
@@ -416,223 +515,141 @@ class InteractiveWPMGraph(QWidget):
         painter.drawText(QRectF(rect.x(), self.height() - 15, rect.width(), 15), 
                         Qt.AlignCenter, "Time (seconds)")
         
-        # Draw the WPM curve connecting the second markers (only if visible)
-        # ===== Draw User Data =====
-        user_effective_visible = self.user_visible
         
-        # Draw user WPM curve
-        if user_effective_visible and self.user_wpm_visible and len(self.second_markers) >= 2:
-            path = QPainterPath()
-            first_sec, first_wpm = self.second_markers[0]
-            path.moveTo(self._time_to_x(first_sec), self._wpm_to_y(first_wpm))
-            
-            for sec, wpm in self.second_markers[1:]:
-                path.lineTo(self._time_to_x(sec), self._wpm_to_y(wpm))
-            
-            painter.setPen(QPen(self.line_color, 2))
-            painter.setBrush(Qt.NoBrush)
-            painter.drawPath(path)
-        
-        # Draw user WPM markers (interactive dots)
-        if user_effective_visible and self.user_wpm_visible:
-            for second, wpm in self.second_markers:
-                marker_x = self._time_to_x(second)
-                marker_y = self._wpm_to_y(wpm)
-                
-                hover_sec, hover_type = self.hover_info if self.hover_info else (None, None)
-                is_hovered = (hover_sec == second and hover_type == 'user_wpm')
-                
-                # Draw dot (smaller size)
-                if is_hovered:
-                    painter.setPen(QPen(self.line_color, 1.5))
-                    painter.setBrush(QBrush(self.line_color))
-                    painter.drawEllipse(QPointF(marker_x, marker_y), 3, 3)
+        # Series, drawn in the same order as before: user line, markers and
+        # errors first, then the ghost on top
+        for kind in ('user_wpm', 'user_error', 'ghost_wpm', 'ghost_error'):
+            if not self._series_visible(kind):
+                continue
+            points = self._series_points[kind]
+            if kind.endswith('_wpm') and len(points) >= 2:
+                path = QPainterPath()
+                path.moveTo(points[0][2], points[0][3])
+                for _, _, px, py in points[1:]:
+                    path.lineTo(px, py)
+                if kind == 'user_wpm':
+                    painter.setPen(QPen(self.line_color, 2))
                 else:
-                    painter.setPen(QPen(self.line_color, 1))
-                    painter.setBrush(QBrush(bg_color))
-                    painter.drawEllipse(QPointF(marker_x, marker_y), 2, 2)
-        
-        # Draw user error markers (red X marks)
-        if user_effective_visible and self.user_errors_visible:
-            for second, errors in self.error_history:
-                marker_x = self._time_to_x(second)
-                marker_y = self._error_to_y(errors)
-                
-                hover_sec, hover_type = self.hover_info if self.hover_info else (None, None)
-                is_hovered = (hover_sec == second and hover_type == 'user_error')
-                
-                # Draw X mark (smaller size)
-                size = 4 if is_hovered else 2.5
-                pen_width = 2 if is_hovered else 1.5
-                painter.setPen(QPen(self.error_color, pen_width))
-                painter.drawLine(QPointF(marker_x - size, marker_y - size), 
-                               QPointF(marker_x + size, marker_y + size))
-                painter.drawLine(QPointF(marker_x - size, marker_y + size), 
-                               QPointF(marker_x + size, marker_y - size))
-        
-        # ===== Draw Ghost Data =====
-        ghost_effective_visible = self.ghost_visible and self.is_race
-        
-        # Draw ghost WPM curve
-        if ghost_effective_visible and self.ghost_wpm_visible and len(self.ghost_second_markers) >= 2:
-            path = QPainterPath()
-            first_sec, first_wpm = self.ghost_second_markers[0]
-            path.moveTo(self._time_to_x(first_sec), self._wpm_to_y(first_wpm))
+                    painter.setPen(QPen(self.ghost_wpm_color, 2, Qt.DashLine))  # Dashed for ghost
+                painter.setBrush(Qt.NoBrush)
+                painter.drawPath(path)
+            for _, _, px, py in points:
+                self._draw_marker(painter, kind, px, py, False)
+
+    def _draw_marker(self, painter: QPainter, kind: str, marker_x: float, marker_y: float, is_hovered: bool):
+        """Draw one data point: dot (user WPM), square (ghost WPM) or X (errors)."""
+        if kind == 'user_wpm':
+            # Draw dot (smaller size)
+            if is_hovered:
+                painter.setPen(QPen(self.line_color, 1.5))
+                painter.setBrush(QBrush(self.line_color))
+                painter.drawEllipse(QPointF(marker_x, marker_y), 3, 3)
+            else:
+                painter.setPen(QPen(self.line_color, 1))
+                painter.setBrush(QBrush(self._bg_color))
+                painter.drawEllipse(QPointF(marker_x, marker_y), 2, 2)
+
+        elif kind == 'ghost_wpm':
+            # Draw square marker for ghost (smaller with glow effect)
+            size = 3 if is_hovered else 2
             
-            for sec, wpm in self.ghost_second_markers[1:]:
-                path.lineTo(self._time_to_x(sec), self._wpm_to_y(wpm))
+            # Draw glow effect (slightly larger, semi-transparent)
+            glow_color = QColor(self.ghost_wpm_color)
+            glow_color.setAlpha(60)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(glow_color))
+            painter.drawRect(QRectF(marker_x - size - 2, marker_y - size - 2, (size + 2) * 2, (size + 2) * 2))
             
-            painter.setPen(QPen(self.ghost_wpm_color, 2, Qt.DashLine))  # Dashed for ghost
-            painter.setBrush(Qt.NoBrush)
-            painter.drawPath(path)
-        
-        # Draw ghost WPM markers (squares for ghost)
-        if ghost_effective_visible and self.ghost_wpm_visible:
-            for second, wpm in self.ghost_second_markers:
-                marker_x = self._time_to_x(second)
-                marker_y = self._wpm_to_y(wpm)
-                
-                hover_sec, hover_type = self.hover_info if self.hover_info else (None, None)
-                is_hovered = (hover_sec == second and hover_type == 'ghost_wpm')
-                
-                # Draw square marker for ghost (smaller with glow effect)
-                size = 3 if is_hovered else 2
-                
-                # Draw glow effect (slightly larger, semi-transparent)
-                glow_color = QColor(self.ghost_wpm_color)
-                glow_color.setAlpha(60)
-                painter.setPen(Qt.NoPen)
-                painter.setBrush(QBrush(glow_color))
-                painter.drawRect(QRectF(marker_x - size - 2, marker_y - size - 2, (size + 2) * 2, (size + 2) * 2))
-                
-                if is_hovered:
-                    painter.setPen(QPen(self.ghost_wpm_color, 1.5))
-                    painter.setBrush(QBrush(self.ghost_wpm_color))
-                else:
-                    painter.setPen(QPen(self.ghost_wpm_color, 1))
-                    painter.setBrush(QBrush(bg_color))
-                painter.drawRect(QRectF(marker_x - size, marker_y - size, size * 2, size * 2))
-        
-        # Draw ghost error markers (blue X marks)
-        if ghost_effective_visible and self.ghost_errors_visible:
-            for second, errors in self.ghost_error_history:
-                marker_x = self._time_to_x(second)
-                marker_y = self._error_to_y(errors)
-                
-                hover_sec, hover_type = self.hover_info if self.hover_info else (None, None)
-                is_hovered = (hover_sec == second and hover_type == 'ghost_error')
-                
-                # Draw X mark in ghost error color (smaller with glow effect)
-                size = 4 if is_hovered else 2.5
-                pen_width = 2 if is_hovered else 1.5
-                
-                # Draw glow effect
-                glow_color = QColor(self.ghost_error_color)
+            if is_hovered:
+                painter.setPen(QPen(self.ghost_wpm_color, 1.5))
+                painter.setBrush(QBrush(self.ghost_wpm_color))
+            else:
+                painter.setPen(QPen(self.ghost_wpm_color, 1))
+                painter.setBrush(QBrush(self._bg_color))
+            painter.drawRect(QRectF(marker_x - size, marker_y - size, size * 2, size * 2))
+
+        else:
+            # X mark, with a glow for the ghost (smaller unless hovered)
+            size = 4 if is_hovered else 2.5
+            pen_width = 2 if is_hovered else 1.5
+            color = self.error_color
+            if kind == 'ghost_error':
+                color = self.ghost_error_color
+                glow_color = QColor(color)
                 glow_color.setAlpha(60)
                 painter.setPen(QPen(glow_color, pen_width + 3))
                 painter.drawLine(QPointF(marker_x - size, marker_y - size), 
                                QPointF(marker_x + size, marker_y + size))
                 painter.drawLine(QPointF(marker_x - size, marker_y + size), 
                                QPointF(marker_x + size, marker_y - size))
-                
-                # Draw main X
-                painter.setPen(QPen(self.ghost_error_color, pen_width))
-                painter.drawLine(QPointF(marker_x - size, marker_y - size), 
-                               QPointF(marker_x + size, marker_y + size))
-                painter.drawLine(QPointF(marker_x - size, marker_y + size), 
-                               QPointF(marker_x + size, marker_y - size))
-        
-        # ===== Draw Tooltips =====
+            painter.setPen(QPen(color, pen_width))
+            painter.drawLine(QPointF(marker_x - size, marker_y - size), 
+                           QPointF(marker_x + size, marker_y + size))
+            painter.drawLine(QPointF(marker_x - size, marker_y + size), 
+                           QPointF(marker_x + size, marker_y - size))
+
+    def _draw_hover(self, painter: QPainter):
+        """Highlight the hovered marker and draw its tooltip."""
         hover_sec, hover_type = self.hover_info if self.hover_info else (None, None)
+        if hover_sec is None or not hover_type or not self._series_visible(hover_type):
+            return
+        self._ensure_geometry()
+        marker = self._marker_lookup.get((hover_type, hover_sec))
+        if marker is None:
+            return
+        hover_value, dot_x, dot_y = marker
+        self._draw_marker(painter, hover_type, dot_x, dot_y, True)
+
+        if hover_type == 'user_wpm':
+            tooltip_text = f"{hover_sec}s | {hover_value:.1f} WPM"
+            border_color = self.line_color
+        elif hover_type == 'ghost_wpm':
+            tooltip_text = f"Ghost {hover_sec}s | {hover_value:.1f} WPM"
+            border_color = self.ghost_wpm_color
+        else:
+            error_label = "error" if hover_value == 1 else "errors"
+            prefix = "Ghost " if hover_type == 'ghost_error' else ""
+            tooltip_text = f"{prefix}{hover_sec}s | {hover_value} {error_label}"
+            border_color = self.error_color if hover_type == 'user_error' else self.ghost_error_color
+
+        font = QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        painter.setFont(font)
+        fm = QFontMetrics(font)
+        text_width = fm.horizontalAdvance(tooltip_text)
+        text_height = fm.height()
+        
+        tooltip_x = dot_x + 10
+        tooltip_y = dot_y - 25
+        
+        # Keep tooltip on screen
+        if tooltip_x + text_width + 10 > self.width():
+            tooltip_x = dot_x - text_width - 20
+        if tooltip_y < 5:
+            tooltip_y = dot_y + 10
+        
+        # Draw tooltip background
+        tooltip_rect = QRectF(tooltip_x, tooltip_y, text_width + 10, text_height + 6)
+        painter.setPen(Qt.NoPen)
+        tooltip_bg = QColor(self._bg_color)
+        tooltip_bg.setAlpha(230)
+        painter.setBrush(tooltip_bg)
+        painter.drawRoundedRect(tooltip_rect, 4, 4)
+        
+        # Draw tooltip border
+        painter.setPen(QPen(border_color, 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(tooltip_rect, 4, 4)
         
-        if hover_sec is not None and hover_type:
-            # Find the data for this hover
-            hover_value = None
-            tooltip_text = ""
-            border_color = text_color
-            
-            if hover_type == 'user_wpm':
-                for sec, wpm in self.second_markers:
-                    if sec == hover_sec:
-                        hover_value = wpm
-                        break
-                if hover_value is not None:
-                    tooltip_text = f"{hover_sec}s | {hover_value:.1f} WPM"
-                    border_color = self.line_color
-                    dot_x = self._time_to_x(hover_sec)
-                    dot_y = self._wpm_to_y(hover_value)
-                    
-            elif hover_type == 'ghost_wpm':
-                for sec, wpm in self.ghost_second_markers:
-                    if sec == hover_sec:
-                        hover_value = wpm
-                        break
-                if hover_value is not None:
-                    tooltip_text = f"Ghost {hover_sec}s | {hover_value:.1f} WPM"
-                    border_color = self.ghost_wpm_color
-                    dot_x = self._time_to_x(hover_sec)
-                    dot_y = self._wpm_to_y(hover_value)
-                    
-            elif hover_type == 'user_error':
-                for sec, errors in self.error_history:
-                    if sec == hover_sec:
-                        hover_value = errors
-                        break
-                if hover_value is not None:
-                    error_label = "error" if hover_value == 1 else "errors"
-                    tooltip_text = f"{hover_sec}s | {hover_value} {error_label}"
-                    border_color = self.error_color
-                    dot_x = self._time_to_x(hover_sec)
-                    dot_y = self._error_to_y(hover_value)
-                    
-            elif hover_type == 'ghost_error':
-                for sec, errors in self.ghost_error_history:
-                    if sec == hover_sec:
-                        hover_value = errors
-                        break
-                if hover_value is not None:
-                    error_label = "error" if hover_value == 1 else "errors"
-                    tooltip_text = f"Ghost {hover_sec}s | {hover_value} {error_label}"
-                    border_color = self.ghost_error_color
-                    dot_x = self._time_to_x(hover_sec)
-                    dot_y = self._error_to_y(hover_value)
-            
-            if hover_value is not None:
-                font.setPointSize(9)
-                font.setBold(True)
-                painter.setFont(font)
-                fm = QFontMetrics(font)
-                text_width = fm.horizontalAdvance(tooltip_text)
-                text_height = fm.height()
-                
-                tooltip_x = dot_x + 10
-                tooltip_y = dot_y - 25
-                
-                # Keep tooltip on screen
-                if tooltip_x + text_width + 10 > self.width():
-                    tooltip_x = dot_x - text_width - 20
-                if tooltip_y < 5:
-                    tooltip_y = dot_y + 10
-                
-                # Draw tooltip background
-                tooltip_rect = QRectF(tooltip_x, tooltip_y, text_width + 10, text_height + 6)
-                painter.setPen(Qt.NoPen)
-                tooltip_bg = QColor(bg_color)
-                tooltip_bg.setAlpha(230)
-                painter.setBrush(tooltip_bg)
-                painter.drawRoundedRect(tooltip_rect, 4, 4)
-                
-                # Draw tooltip border
-                painter.setPen(QPen(border_color, 1))
-                painter.setBrush(Qt.NoBrush)
-                painter.drawRoundedRect(tooltip_rect, 4, 4)
-                
-                # Draw tooltip text
-                painter.setPen(text_color)
-                painter.drawText(tooltip_rect, Qt.AlignCenter, tooltip_text)
-        
-        # ===== Draw Legend =====
-        # Hierarchical legend: "You" with WPM/Errors below, "Ghost" with WPM/Errors below (if race)
+        # Draw tooltip text
+        painter.setPen(self._text_color)
+        painter.drawText(tooltip_rect, Qt.AlignCenter, tooltip_text)
+
+    def _draw_legend(self, painter: QPainter, rect: QRectF, text_color: QColor):
+        """Hierarchical legend: "You" with WPM/Errors below, "Ghost" with
+        WPM/Errors below (if race). Also sets the legend hit areas."""
+        font = QFont()
         font.setPointSize(8)
         font.setBold(False)
         painter.setFont(font)
@@ -769,7 +786,6 @@ class InteractiveWPMGraph(QWidget):
             self.ghost_wpm_rect = QRectF()
             self.ghost_error_rect = QRectF()
 
-
 class IconWidget(QLabel):
     """Widget to display SVG icons from ui_icons."""
     ICON_MAP = {
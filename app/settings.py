@@ -2,24 +2,28 @@
 
 APIs:
  - init_db(path=None)
+ - use_read_only_db(path)
  - get_setting(key, default=None)
  - get_default(key) - Get the canonical default for a setting
  - set_setting(key, value)
+ - flush_settings()
  - get_folders()
  - add_folder(path)
  - remove_folder(path)
  - get_indent_test_mode()
  - set_indent_test_mode(enabled)
 """
+import atexit
 import sqlite3
 import os
+import threading
 from pathlib import Path
 from typing import Optional, List, Dict
 import logging
 
 # Import portable data manager for exe/AppImage builds
 try:
-    from app.portable_data import get_data_dir as get_portable_data_dir, get_database_path, is_portable, get_icons_dir as get_portable_icons_dir
+    from app.portable_data import get_data_dir as get_portable_data_dir, get_database_path, is_portable, get_icons_dir as get_portable_icons_dir, get_icon_cache_dir as get_portable_icon_cache_dir
     _PORTABLE_MODE_AVAILABLE = True
 except ImportError:
     _PORTABLE_MODE_AVAILABLE = False
@@ -91,6 +95,7 @@ SETTING_DEFAULTS: Dict[str, str] = {
     "sound_enabled": "1",
     "sound_profile": "keypress_2",
     "sound_volume": "50",
+    "sound_pcm_mixing": "0",
     "custom_sound_profiles": "{}",
     
     # Progress bar colors
@@ -106,9 +111,23 @@ SETTING_DEFAULTS: Dict[str, str] = {
     # Stats settings
     "best_wpm_min_accuracy": "0.9",
     "stats_heatmap_metric": "total_chars",
+    "stats_wpm_bucket_size": "10",
+    "stats_bigram_mode": "slowest",
     
     # History settings
     "history_retention_days": "90",
+    # Expired sessions go to the profile's compressed archive instead of being deleted
+    "history_archive_expired": "1",
+
+    # Backups: hours between automatic snapshots (0 = off) and snapshots kept
+    "backup_interval_hours": "24",
+    "backup_keep": "5",
+
+    # Diagnostics
+    "log_level": "INFO",
+
+    # Profiles: recently left profiles kept in memory for fast switching back (0 = off)
+    "profile_cache_size": "3",
     
     # State persistence (not user-configurable)
     "expanded_folders": "[]",
@@ -152,6 +171,16 @@ _db_initialized: bool = False
 _settings_cache: Dict[str, Optional[str]] = {}
 _settings_cache_loaded: bool = False
 _db_error_shown: bool = False
+# Set by use_read_only_db: connections open the database with mode=ro
+_read_only: bool = False
+
+# Write-behind state: set_setting updates the cache immediately and queues the
+# row here (None = delete); a timer flushes the queue in one transaction.
+SETTINGS_FLUSH_DELAY = 0.5  # seconds
+_pending_writes: Dict[str, Optional[str]] = {}
+_pending_db_path: Optional[Path] = None
+_pending_lock = threading.RLock()
+_flush_timer: Optional[threading.Timer] = None
 
 
 def _reset_settings_cache():
@@ -173,8 +202,11 @@ def _ensure_settings_cache_loaded():
     rows = cur.fetchall()
     conn.close()
 
-    for key, value in rows:
-        _settings_cache[key] = value
+    with _pending_lock:
+        for key, value in rows:
+            # Queued writes are newer than what the database holds
+            if key not in _pending_writes:
+                _settings_cache[key] = value
 
     _settings_cache_loaded = True
 
@@ -208,28 +240,29 @@ def get_icons_dir() -> Path:
     return d
 
 
+def get_icon_cache_dir() -> Path:
+    """Get the directory where rendered icons are cached."""
+    if _PORTABLE_MODE_AVAILABLE:
+        return get_portable_icon_cache_dir()
+    return get_data_dir() / "shared" / "cache" / "icons"
+
+
 def get_current_db_path() -> Optional[Path]:
     return _current_db_path
 
 
-def init_db(path: Optional[str] = None):
-    """
-    Initialize the database at the given path.
-    If path is None, it tries to use the existing _current_db_path.
-    If that is also None, it falls back to the default location.
-    """
-    global _db_initialized, _current_db_path
-    
-    if path:
-        p = Path(path)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        _current_db_path = p
-    elif _current_db_path is None:
-        # Resolve path from portable data manager (Profile aware)
-        _current_db_path = get_database_path()
+def prepare_db(path) -> None:
+    """Create the tables, defaults and stats schema of the database at ``path``.
 
-    conn = sqlite3.connect(_current_db_path)
+    Touches no module state, so it can run on a worker for a database that
+    is about to become current (see app.profile_switch).
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10.0)
     cur = conn.cursor()
+    # Only takes effect on a new, empty database; older ones are converted
+    # when the user compacts them (stats_db.enable_incremental_vacuum)
+    cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS settings (
@@ -261,12 +294,90 @@ def init_db(path: Optional[str] = None):
     conn.commit()
     conn.close()
 
-    # Also initialize stats tables
+    # Also initialize stats tables (skipped when the schema is current)
     from app import stats_db
-    stats_db.init_stats_tables()
+    stats_db.init_stats_tables(path)
+
 
+def init_db(path: Optional[str] = None):
+    """
+    Initialize the database at the given path.
+    If path is None, it tries to use the existing _current_db_path.
+    If that is also None, it falls back to the default location.
+    """
+    global _db_initialized, _current_db_path, _read_only
+
+    # Queued writes belong to the database that was active when they were made
+    flush_settings()
+    _read_only = False
+    
+    if path:
+        _current_db_path = Path(path)
+    elif _current_db_path is None:
+        # Resolve path from portable data manager (Profile aware)
+        _current_db_path = get_database_path()
+
+    prepare_db(_current_db_path)
+
+    _db_initialized = True
+    _reset_settings_cache()
+
+
+def use_prepared_db(path, settings_rows: Dict[str, Optional[str]]):
+    """Make a database already set up by prepare_db current.
+
+    ``settings_rows`` (read together with the database) seed the settings
+    cache, so nothing is read from disk on the calling thread.
+    """
+    global _db_initialized, _current_db_path, _settings_cache_loaded, _read_only
+
+    flush_settings()
+    _current_db_path = Path(path)
+    _read_only = False
     _db_initialized = True
     _reset_settings_cache()
+    _settings_cache.update(settings_rows)
+    _settings_cache_loaded = True
+
+
+def use_read_only_db(path):
+    """Make an existing database current without creating or migrating anything.
+
+    Every later connection opens it with ``mode=ro`` (the headless --report
+    mode reads a profile this way, possibly while the app has it open).
+    The settings table is read once into the cache; a database without one
+    (the sandbox demo database) reads as all defaults.
+
+    Raises:
+        sqlite3.Error: The database does not exist or can't be read.
+    """
+    global _db_initialized, _current_db_path, _settings_cache_loaded, _read_only
+
+    flush_settings()
+    _current_db_path = Path(path)
+    _read_only = True
+    _reset_settings_cache()
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT key, value FROM settings").fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    finally:
+        conn.close()
+    _settings_cache.update(rows)
+    _settings_cache_loaded = True
+    _db_initialized = True
+
+
+def cached_settings() -> Dict[str, Optional[str]]:
+    """Copy of every setting of the current database, as get_setting sees them."""
+    _ensure_settings_cache_loaded()
+    return dict(_settings_cache)
+
+
+def is_db_initialized() -> bool:
+    """Whether init_db has run in this process."""
+    return _db_initialized
 
 
 def _connect():
@@ -276,6 +387,12 @@ def _connect():
         # Determine path if not set (first run implicit init)
         init_db()
         
+    if _read_only:
+        conn = sqlite3.connect(f"file:{_current_db_path.as_posix()}?mode=ro", uri=True, timeout=10.0)
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        return conn
+
     try:
         conn = sqlite3.connect(_current_db_path, timeout=10.0)
         # Apply pragmatic defaults tuned for interactive desktop apps.
@@ -403,32 +520,83 @@ def get_setting_color(key: str, default: str = "#FFFFFF") -> str:
     return default
 
 
-def set_setting(key: str, value: str):
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("INSERT OR REPLACE INTO settings(key, value) VALUES(?,?)", (key, value))
-    conn.commit()
-    conn.close()
+def _queue_write(key: str, value: Optional[str]):
+    """Queue a settings row and make sure a flush is scheduled."""
+    global _pending_db_path, _flush_timer
+    if _current_db_path is None:
+        init_db()
+    with _pending_lock:
+        _pending_writes[key] = value
+        _pending_db_path = _current_db_path
+        # Writes arriving while a flush is scheduled join that batch, so a
+        # slider drag costs one transaction per delay window at most
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(SETTINGS_FLUSH_DELAY, flush_settings)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def flush_settings():
+    """Write all queued settings to the database now.
+
+    Runs from the debounce timer, and explicitly before the active database
+    changes (init_db) and on exit.
+    """
+    global _pending_db_path, _flush_timer
+    with _pending_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        if not _pending_writes:
+            return
+        batch = dict(_pending_writes)
+        db_path = _pending_db_path
+        _pending_writes.clear()
+        _pending_db_path = None
+
+        try:
+            conn = sqlite3.connect(db_path, timeout=10.0)
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO settings(key, value) VALUES(?,?)",
+                        [(k, v) for k, v in batch.items() if v is not None],
+                    )
+                    conn.executemany(
+                        "DELETE FROM settings WHERE key=?",
+                        [(k,) for k, v in batch.items() if v is None],
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logging.error("Failed to save %d setting(s) to %s: %s", len(batch), db_path, e)
+            # Keep them queued for the next flush unless newer values exist
+            if _pending_db_path in (None, db_path):
+                for key, value in batch.items():
+                    _pending_writes.setdefault(key, value)
+                _pending_db_path = db_path
+            return
+    logging.debug("Flushed %d setting(s) to %s", len(batch), db_path)
+
+
+atexit.register(flush_settings)
+
 
+def set_setting(key: str, value: str):
     _settings_cache[key] = value
-    logging.info(f"Setting updated: {key} = {value}")
+    _queue_write(key, value)
+    logging.debug("Setting updated: %s = %s", key, value)
 
 
 def remove_setting(key: str):
     """Remove a setting from the database and cache."""
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM settings WHERE key=?", (key,))
-    conn.commit()
-    conn.close()
-
     if key in _settings_cache:
         del _settings_cache[key]
+    _queue_write(key, None)
 
 
-def get_folders() -> List[dict]:
-    """Return list of folders with metadata: {'path': str, 'is_favorite': bool, 'added_at': str}."""
-    conn = _connect()
+def read_folders(conn: sqlite3.Connection) -> List[dict]:
+    """Folder rows of the database behind ``conn`` (see get_folders)."""
     cur = conn.cursor()
     # Ensure is_favorite exists (for safe fallback if migration failed somehow, though init handles it)
     try:
@@ -444,6 +612,13 @@ def get_folders() -> List[dict]:
             'is_favorite': bool(r[1]),
             'added_at': r[2]
         })
+    return rows
+
+
+def get_folders() -> List[dict]:
+    """Return list of folders with metadata: {'path': str, 'is_favorite': bool, 'added_at': str}."""
+    conn = _connect()
+    rows = read_folders(conn)
     conn.close()
     return rows
 
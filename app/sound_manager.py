@@ -1,14 +1,77 @@
 """Sound effects manager for typing feedback - keypress only."""
 import logging
-from PySide6.QtMultimedia import QSoundEffect
-from PySide6.QtCore import QUrl, QObject, Signal
+from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices, QSoundEffect
+from PySide6.QtCore import QUrl, QObject, Signal, QTimer
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import json
 import app.settings as settings
+from app.sound_mixer import PcmClip, VoiceMixer, load_wav_clip
 
 logger = logging.getLogger(__name__)
 
+# Preloaded QSoundEffect instances per profile, played round-robin
+KEYPRESS_VOICES = 6
+
+# PCM mixing: voices summed in software, pushed in chunks of this length
+PCM_CHUNK_MS = 5
+PCM_MAX_VOICES = 8
+
+
+class _PcmOutput(QObject):
+    """QAudioSink fed by a VoiceMixer from a short timer.
+
+    trigger() only appends a voice offset; the timer does the mixing and
+    stops itself once every voice has finished.
+    """
+
+    def __init__(self, clip: PcmClip, volume: float, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        fmt = QAudioFormat()
+        fmt.setSampleRate(clip.sample_rate)
+        fmt.setChannelCount(clip.channels)
+        fmt.setSampleFormat(QAudioFormat.Int16)
+        device = QMediaDevices.defaultAudioOutput()
+        if device.isNull() or not device.isFormatSupported(fmt):
+            raise RuntimeError("default audio output does not support the clip format")
+
+        self._mixer = VoiceMixer(clip, PCM_MAX_VOICES)
+        self._bytes_per_frame = 2 * clip.channels
+        self._chunk_frames = max(1, clip.sample_rate * PCM_CHUNK_MS // 1000)
+        self._sink = QAudioSink(device, fmt, self)
+        self._sink.setBufferSize(self._chunk_frames * self._bytes_per_frame * 4)
+        self._sink.setVolume(volume)
+        self._io = self._sink.start()
+        if self._io is None:
+            raise RuntimeError("audio sink failed to start")
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(PCM_CHUNK_MS)
+        self._timer.timeout.connect(self._pump)
+
+    def trigger(self):
+        self._mixer.trigger()
+        if not self._timer.isActive():
+            self._pump()
+            self._timer.start()
+
+    def set_volume(self, volume: float):
+        self._sink.setVolume(volume)
+
+    def _pump(self):
+        if not self._mixer.active_voices:
+            self._timer.stop()
+            return
+        frames = min(self._chunk_frames * 2, self._sink.bytesFree() // self._bytes_per_frame)
+        if frames > 0:
+            self._io.write(self._mixer.mix(frames))
+
+    def close(self):
+        self._timer.stop()
+        self._mixer.stop()
+        self._sink.stop()
+        self.deleteLater()
+
 
 class SoundManager(QObject):
     """Manages typing keypress sound effects."""
@@ -18,9 +81,13 @@ class SoundManager(QObject):
     def __init__(self):
         super().__init__()
         self.current_profile = "none"
-        self.sound_effect: Optional[QSoundEffect] = None
+        self._voices: List[QSoundEffect] = []
+        self._next_voice = 0
+        self._voices_ready = False
+        self._pcm: Optional["_PcmOutput"] = None
         self.enabled = True
         self.volume = 0.5
+        self.pcm_mixing = settings.get_setting("sound_pcm_mixing", settings.get_default("sound_pcm_mixing")) == "1"
         self._last_error: Optional[str] = None  # Track sound loading errors
         
         # Base sounds directory (Dynamic: Prefer portable data folder)
@@ -260,6 +327,7 @@ class SoundManager(QObject):
         
         self.set_enabled(enabled)
         self.set_volume(volume)
+        self.pcm_mixing = settings.get_setting("sound_pcm_mixing", settings.get_default("sound_pcm_mixing")) == "1"
         
         # Switch to the profile stored in the new database
         if profile in self.get_all_profiles():
@@ -270,19 +338,13 @@ class SoundManager(QObject):
         
         logger.info(f"SoundManager refreshed. Custom profiles: {len(self.custom_profiles)}")
 
-    def _load_profile(self, profile: str):
-        """Load sound file for a profile."""
-        if profile == "none":
-            if self.sound_effect:
-                self.sound_effect.stop()
-                self.sound_effect.setSource(QUrl())
-            return
-        
+    def _profile_sound_path(self, profile: str) -> Optional[Path]:
+        """Resolve the sound file for a profile (None for silent profiles)."""
         # Get profile data (built-in or custom)
         all_profiles = self.get_all_profiles()
         profile_data = all_profiles.get(profile)
         if not profile_data:
-            return
+            return None
         
         # Determine file path
         sound_path = None
@@ -302,28 +364,78 @@ class SoundManager(QObject):
                 except:
                     custom_sounds_dir = self.sounds_dir / "custom"
                 sound_path = custom_sounds_dir / profile / profile_data["file"]
-        
+        return sound_path
+
+    def _release_voices(self):
+        """Stop and drop the voice pool and the PCM output."""
+        for voice in self._voices:
+            try:
+                voice.stop()
+                voice.deleteLater()
+            except RuntimeError:
+                pass  # Already deleted by Qt
+        self._voices = []
+        self._next_voice = 0
+        self._voices_ready = False
+        if self._pcm is not None:
+            self._pcm.close()
+            self._pcm = None
+
+    def _load_profile(self, profile: str):
+        """Preload the voice pool (or PCM mixer) for a profile."""
+        self._release_voices()
+        if profile == "none":
+            return
+
+        sound_path = self._profile_sound_path(profile)
         if not sound_path:
              return
 
-        # Load sound file
-        if sound_path.exists():
-            if self.sound_effect is None:
-                self.sound_effect = QSoundEffect(self)
-                self.sound_effect.setVolume(self.volume)
-            else:
-                self.sound_effect.stop()
-            
-            self.sound_effect.setSource(QUrl.fromLocalFile(str(sound_path)))
-            self._last_error = None  # Clear any previous error
-            
-            logger.debug(f"Loaded sound profile '{profile}': {sound_path}")
-        else:
+        if not sound_path.exists():
             error_msg = f"Sound file not found: {sound_path.name}"
-            logger.warning(f"Sound profile '{profile}': {error_msg}")
+            logger.warning("Sound profile '%s': %s", profile, error_msg)
             self._last_error = error_msg
-            if self.sound_effect:
-                self.sound_effect.setSource(QUrl())
+            return
+        self._last_error = None  # Clear any previous error
+
+        if self.pcm_mixing:
+            try:
+                self._pcm = _PcmOutput(load_wav_clip(sound_path), self.volume, self)
+                logger.debug("Loaded sound profile '%s' for PCM mixing: %s", profile, sound_path)
+                return
+            except Exception as e:
+                # Not 16-bit PCM or no usable audio device; the pool still works
+                logger.info("PCM mixing unavailable for '%s' (%s), using voice pool", profile, e)
+                self._pcm = None
+
+        url = QUrl.fromLocalFile(str(sound_path))
+        for _ in range(KEYPRESS_VOICES):
+            voice = QSoundEffect(self)
+            voice.setVolume(self.volume)
+            voice.statusChanged.connect(self._on_voice_status_changed)
+            voice.setSource(url)
+            self._voices.append(voice)
+        logger.debug("Loaded sound profile '%s' (%d voices): %s", profile, KEYPRESS_VOICES, sound_path)
+
+    def _on_voice_status_changed(self):
+        """Track readiness and load errors off the key path."""
+        voice = self.sender()
+        if voice is None:
+            return
+        status = voice.status()
+        if status == QSoundEffect.Ready:
+            self._voices_ready = True
+        elif status == QSoundEffect.Error and self._voices:
+            error_msg = "Sound file failed to load (corrupted or unsupported format)"
+            logger.warning("Sound profile '%s': %s", self.current_profile, error_msg)
+            self._last_error = error_msg
+            # Give up on the pool instead of retrying from the key handler
+            self._release_voices()
+
+    @property
+    def sound_effect(self) -> Optional[QSoundEffect]:
+        """First voice of the pool (None when no sound is loaded)."""
+        return self._voices[0] if self._voices else None
     
     def set_profile(self, profile: str):
         """Change sound profile."""
@@ -332,46 +444,58 @@ class SoundManager(QObject):
             self.current_profile = profile
             self._load_profile(profile)
             self.profile_changed.emit(profile)
+
+    def set_pcm_mixing(self, enabled: bool):
+        """Switch between the voice pool and software PCM mixing."""
+        if enabled == self.pcm_mixing:
+            return
+        self.pcm_mixing = enabled
+        self._load_profile(self.current_profile)
     
     def set_volume(self, volume: float):
         """Set volume (0.0 to 1.0)."""
         self.volume = max(0.0, min(1.0, volume))
-        if self.sound_effect and hasattr(self.sound_effect, 'setVolume'):
+        for voice in list(self._voices):
             try:
-                self.sound_effect.setVolume(self.volume)
+                voice.setVolume(self.volume)
             except RuntimeError:
                 # Object already deleted by Qt
                 logger.debug("Sound effect deleted during volume change")
-                self.sound_effect = None
+                self._voices.remove(voice)
+        if self._pcm is not None:
+            self._pcm.set_volume(self.volume)
     
     def set_enabled(self, enabled: bool):
         """Enable/disable sounds."""
         self.enabled = enabled
     
     def play_keypress(self):
-        """Play keypress sound."""
+        """Play keypress sound.
+
+        Called from keyPressEvent, so it only starts the next voice of the
+        preloaded pool (or adds a voice to the mixer); loading and error
+        handling happen in _load_profile and _on_voice_status_changed.
+        """
         if not self.enabled:
             return
-        
-        if not self.sound_effect or not hasattr(self.sound_effect, 'status'):
+
+        if self._pcm is not None:
+            self._pcm.trigger()
+            return
+
+        if not self._voices_ready:
             return
         
+        # Round-robin: a voice is only restarted after KEYPRESS_VOICES other
+        # presses, so fast bursts overlap instead of cutting each other off
+        index = self._next_voice
+        self._next_voice = (index + 1) % len(self._voices)
         try:
-            # Check sound status
-            status = self.sound_effect.status()
-            if status == QSoundEffect.Ready:
-                self.sound_effect.play()
-            elif status == QSoundEffect.Error:
-                error_msg = "Sound file failed to load (corrupted or unsupported format)"
-                logger.warning(f"Sound profile '{self.current_profile}': {error_msg}")
-                self._last_error = error_msg
-                self._load_profile(self.current_profile)
-            else:
-                logger.debug(f"Sound status: {status}")
+            self._voices[index].play()
         except RuntimeError:
             # Object already deleted by Qt
             logger.debug("Sound effect deleted during playback")
-            self.sound_effect = None
+            self._release_voices()
     
     def get_profile_sound_file(self, profile_id: str) -> Optional[str]:
         """Get the file path for a profile's sound."""
@@ -0,0 +1,99 @@
+"""Software mixing of overlapping keypress sounds.
+
+Used by SoundManager when PCM mixing is enabled: the keypress clip is decoded
+once, every key press starts another voice at offset 0, and a timer sums the
+active voices into small chunks for a QAudioSink. Kept free of Qt so the
+mixing itself can be tested anywhere.
+"""
+import array
+import sys
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Union
+
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+
+@dataclass
+class PcmClip:
+    """A decoded 16-bit PCM clip with interleaved channels."""
+    samples: array.array
+    channels: int
+    sample_rate: int
+
+    @property
+    def frames(self) -> int:
+        return len(self.samples) // self.channels
+
+
+def load_wav_clip(path: Union[str, Path]) -> PcmClip:
+    """Decode a 16-bit PCM WAV file.
+
+    Raises:
+        ValueError: The file is not 16-bit PCM.
+        wave.Error / OSError: The file is unreadable or not a WAV file.
+    """
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Only 16-bit PCM can be mixed, got {wav.getsampwidth() * 8}-bit")
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    samples = array.array("h")
+    samples.frombytes(data)
+    if sys.byteorder == "big":
+        samples.byteswap()  # WAV data is little-endian
+    return PcmClip(samples, channels, sample_rate)
+
+
+class VoiceMixer:
+    """Sums overlapping plays of one clip into output chunks.
+
+    Each voice is just a read offset into the clip, so triggering is O(1)
+    and safe to call from a key handler; all sample work happens in mix().
+    """
+
+    def __init__(self, clip: PcmClip, max_voices: int = 8):
+        self.clip = clip
+        self.max_voices = max_voices
+        self._offsets: List[int] = []
+
+    @property
+    def active_voices(self) -> int:
+        return len(self._offsets)
+
+    def trigger(self):
+        """Start another play of the clip, dropping the oldest if full."""
+        if len(self._offsets) >= self.max_voices:
+            self._offsets.pop(0)
+        self._offsets.append(0)
+
+    def stop(self):
+        self._offsets.clear()
+
+    def mix(self, frames: int, volume: float = 1.0) -> bytes:
+        """Return the next ``frames`` frames of all active voices mixed.
+
+        Voices that run past the end of the clip are retired. The result is
+        silence when nothing is playing.
+        """
+        clip = self.clip.samples
+        count = frames * self.clip.channels
+        acc = [0] * count
+        remaining = []
+        for offset in self._offsets:
+            segment = clip[offset:offset + count]
+            acc[:len(segment)] = map(int.__add__, acc[:len(segment)], segment)
+            if offset + count < len(clip):
+                remaining.append(offset + count)
+        self._offsets = remaining
+
+        if volume != 1.0:
+            acc = [int(s * volume) for s in acc]
+        out = array.array("h", [INT16_MIN if s < INT16_MIN else INT16_MAX if s > INT16_MAX else s for s in acc])
+        if sys.byteorder == "big":
+            out.byteswap()
+        return out.tobytes()
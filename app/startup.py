@@ -0,0 +1,216 @@
+"""Startup pipeline and per-phase timing trace.
+
+``StartupPipeline`` moves the Qt-independent part of launching off the main
+thread: profile discovery, settings/schema initialisation and generation of
+the application stylesheet. ``main.py`` starts it before importing the Qt UI
+modules so that work overlaps with the (slow) Qt import; the main thread
+only waits at the points where it needs a result.
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import app.settings as settings
+
+
+@dataclass
+class TracePhase:
+    """One timed startup phase, in milliseconds since the trace began."""
+    name: str
+    thread: str
+    start_ms: float
+    end_ms: float
+    detail: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+class StartupTrace:
+    """Thread-safe recorder of named startup phases."""
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._phases: List[TracePhase] = []
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def phase(self, name: str, **detail) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block. The yielded dict can take extra detail."""
+        start = self._now_ms()
+        try:
+            yield detail
+        finally:
+            entry = TracePhase(name, threading.current_thread().name, start, self._now_ms(), detail)
+            with self._lock:
+                self._phases.append(entry)
+
+    @property
+    def phases(self) -> List[TracePhase]:
+        with self._lock:
+            return sorted(self._phases, key=lambda p: p.start_ms)
+
+    def get(self, name: str) -> Optional[TracePhase]:
+        return next((p for p in self.phases if p.name == name), None)
+
+    def total_ms(self) -> float:
+        phases = self.phases
+        return max((p.end_ms for p in phases), default=0.0)
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "phase": p.name,
+                "thread": p.thread,
+                "start_ms": round(p.start_ms, 1),
+                "duration_ms": round(p.duration_ms, 1),
+                **p.detail,
+            }
+            for p in self.phases
+        ]
+
+    def format(self) -> str:
+        lines = [f"[STARTUP] {'phase':<22} {'thread':<16} {'start':>9} {'took':>9}"]
+        for p in self.phases:
+            extra = " ".join(f"{k}={v}" for k, v in p.detail.items())
+            lines.append(
+                f"[STARTUP] {p.name:<22} {p.thread:<16} {p.start_ms:8.1f}ms {p.duration_ms:8.1f}ms {extra}".rstrip()
+            )
+        lines.append(f"[STARTUP] TOTAL {self.total_ms():.1f}ms")
+        return "\n".join(lines)
+
+
+@dataclass
+class ImportCost:
+    """One line of ``python -X importtime`` output, in microseconds."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(output: str) -> Dict[str, ImportCost]:
+    """Parse ``-X importtime`` output into per-module costs.
+
+    Each module is only reported on its first import, so the result is the
+    cost of the import graph as seen from the measured entry point.
+    """
+    costs: Dict[str, ImportCost] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Header line
+        name = parts[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        costs[module] = ImportCost(module, self_us, cumulative_us, depth)
+    return costs
+
+
+def measure_import_times(*modules: str) -> Dict[str, ImportCost]:
+    """Import ``modules`` in order in a fresh interpreter and return their costs."""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr[-2000:]}")
+    return parse_import_times(result.stderr)
+
+
+class StartupPipeline:
+    """Background preparation of profiles, settings and the stylesheet.
+
+    Call ``start()`` as early as possible, then ``wait_settings()`` before
+    anything reads settings and ``wait_stylesheet()`` before applying the
+    theme. Errors raised on the worker are re-raised by the wait calls.
+    """
+
+    def __init__(self, trace: Optional[StartupTrace] = None):
+        self.trace = trace or StartupTrace()
+        self.db_path = None
+        self.scheme = None
+        self.stylesheet: Optional[str] = None
+        self._settings_ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        self._main_qthread = None
+
+    def start(self) -> "StartupPipeline":
+        # Profile manager is a QObject; it must end up owned by the main thread
+        from PySide6.QtCore import QThread
+        self._main_qthread = QThread.currentThread()
+
+        self._thread = threading.Thread(target=self._run, name="startup-worker", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            with self.trace.phase("profiles") as detail:
+                from app.profile_manager import get_profile_manager
+                pm = get_profile_manager()
+                pm.moveToThread(self._main_qthread)
+                self.db_path = pm.get_current_db_path()
+                detail["profile"] = pm.get_active_profile()
+
+            with self.trace.phase("settings_db") as detail:
+                settings.init_db(str(self.db_path))
+                detail["db"] = self.db_path.name
+                # Warm the settings cache while the main thread is still busy
+                settings.get_setting("dark_scheme")
+                from app.logging_config import apply_log_level_setting
+                apply_log_level_setting()
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._settings_ready.set()
+
+        if self._error is not None:
+            return
+        try:
+            with self.trace.phase("stylesheet"):
+                from app.themes import get_color_scheme, generate_app_stylesheet
+                scheme_name = settings.get_setting("dark_scheme", settings.get_default("dark_scheme"))
+                self.scheme = get_color_scheme("dark", scheme_name)
+                self.stylesheet = generate_app_stylesheet(self.scheme)
+        except BaseException as e:
+            self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def wait_settings(self):
+        """Block until the profile database is initialised."""
+        with self.trace.phase("wait_settings"):
+            self._settings_ready.wait()
+        self._raise_error()
+
+    def wait_stylesheet(self) -> str:
+        """Block until the stylesheet is generated and return it."""
+        with self.trace.phase("wait_stylesheet"):
+            if self._thread is not None:
+                self._thread.join()
+        self._raise_error()
+        return self.stylesheet
@@ -1,9 +1,14 @@
 """Database module for tracking typing statistics and session progress."""
+import heapq
+import json
+import re
 import sqlite3
-from datetime import datetime
-from typing import Any, Optional, Dict, List, Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, Dict, List, Iterable, Iterator, Tuple, Union
 from app.settings import _connect
 import app.settings as settings
+from app.history_archive import ARCHIVE_COLUMNS, HistoryArchive, archive_path_for, get_archive
 
 
 def _use_demo_mode() -> bool:
@@ -62,11 +67,8 @@ def _get_global_ignore_sql() -> str:
     return " AND (" + " AND ".join(clauses) + ")"
 
 
-def init_stats_tables():
-    """Initialize database tables for typing statistics."""
-    conn = _connect_for_stats()
-    cur = conn.cursor()
-    
+def _migrate_practice_tables(cur: sqlite3.Cursor):
+    """file_stats and session_progress, folding in pre-auto_indent layouts."""
     # File statistics table
     cur.execute("""
         CREATE TABLE IF NOT EXISTS file_stats (
@@ -82,7 +84,7 @@ def init_stats_tables():
             PRIMARY KEY (file_path, auto_indent)
         )
     """)
-    
+
     # Migration for file_stats if auto_indent doesn't exist or isn't part of PK
     cur.execute("PRAGMA table_info(file_stats)")
     columns = {row[1] for row in cur.fetchall()}
@@ -103,10 +105,10 @@ def init_stats_tables():
             )
         """)
         cur.execute("""
-            INSERT INTO file_stats (file_path, auto_indent, best_wpm, last_wpm, 
-                                     best_accuracy, last_accuracy, times_practiced, 
+            INSERT INTO file_stats (file_path, auto_indent, best_wpm, last_wpm,
+                                     best_accuracy, last_accuracy, times_practiced,
                                      last_practiced, completed)
-            SELECT file_path, 0, best_wpm, last_wpm, best_accuracy, last_accuracy, 
+            SELECT file_path, 0, best_wpm, last_wpm, best_accuracy, last_accuracy,
                    times_practiced, last_practiced, completed
             FROM file_stats_old
         """)
@@ -134,7 +136,7 @@ def init_stats_tables():
             PRIMARY KEY (file_path, auto_indent)
         )
     """)
-    
+
     # Migration for session_progress if auto_indent doesn't exist
     cur.execute("PRAGMA table_info(session_progress)")
     progress_cols = {row[1] for row in cur.fetchall()}
@@ -163,9 +165,9 @@ def init_stats_tables():
         """)
         # Copy data from old table
         cur.execute("""
-            INSERT INTO session_progress (file_path, auto_indent, cursor_position, total_characters, 
+            INSERT INTO session_progress (file_path, auto_indent, cursor_position, total_characters,
                                           correct_keystrokes, incorrect_keystrokes, session_time, is_paused)
-            SELECT file_path, 0, cursor_position, total_characters, 
+            SELECT file_path, 0, cursor_position, total_characters,
                    correct_keystrokes, incorrect_keystrokes, session_time, is_paused
             FROM session_progress_old
         """)
@@ -191,6 +193,9 @@ def init_stats_tables():
     if "race_state_json" not in progress_columns:
         cur.execute("ALTER TABLE session_progress ADD COLUMN race_state_json TEXT")
 
+
+def _migrate_session_history(cur: sqlite3.Cursor):
+    """session_history, its late-added columns and query indexes."""
     # Historical session table for aggregations
     cur.execute("""
         CREATE TABLE IF NOT EXISTS session_history (
@@ -229,7 +234,119 @@ def init_stats_tables():
                    ON session_history(file_path, recorded_at DESC)""")
     cur.execute("""CREATE INDEX IF NOT EXISTS idx_session_history_language
                    ON session_history(language)""")
-    
+    cur.execute("""CREATE INDEX IF NOT EXISTS idx_session_history_recorded_at
+                   ON session_history(recorded_at DESC, id DESC)""")
+    cur.execute("""CREATE INDEX IF NOT EXISTS idx_session_history_completed_wpm
+                   ON session_history(completed, wpm)""")
+
+
+def _migrate_history_paths(cur: sqlite3.Cursor):
+    # Distinct practiced paths, kept in sync with session_history by triggers.
+    # The fuzzy file filter matches against this (much smaller) table once and
+    # then joins back to history through idx_session_history_file_path.
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history_paths'")
+    needs_path_backfill = cur.fetchone() is None
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS history_paths (
+            id INTEGER PRIMARY KEY,
+            file_path TEXT NOT NULL UNIQUE,
+            path_lower TEXT NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_history_paths_insert
+        AFTER INSERT ON session_history
+        BEGIN
+            INSERT OR IGNORE INTO history_paths (file_path, path_lower)
+            VALUES (NEW.file_path, LOWER(NEW.file_path));
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_history_paths_delete
+        AFTER DELETE ON session_history
+        BEGIN
+            DELETE FROM history_paths
+            WHERE file_path = OLD.file_path
+              AND NOT EXISTS (SELECT 1 FROM session_history WHERE file_path = OLD.file_path);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_history_paths_update
+        AFTER UPDATE OF file_path ON session_history
+        BEGIN
+            INSERT OR IGNORE INTO history_paths (file_path, path_lower)
+            VALUES (NEW.file_path, LOWER(NEW.file_path));
+            DELETE FROM history_paths
+            WHERE file_path = OLD.file_path
+              AND NOT EXISTS (SELECT 1 FROM session_history WHERE file_path = OLD.file_path);
+        END
+    """)
+    if needs_path_backfill:
+        cur.execute("""
+            INSERT OR IGNORE INTO history_paths (file_path, path_lower)
+            SELECT DISTINCT file_path, LOWER(file_path) FROM session_history
+        """)
+
+
+def _migrate_scan_index(cur: sqlite3.Cursor):
+    # Language index of the last folder scan plus per-language completion
+    # counters. The counters are rebuilt when the scan changes and adjusted in
+    # place by update_file_stats, so the Languages tab never has to look up
+    # every scanned file's stats just to draw its cards.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS scan_index (
+            file_path TEXT PRIMARY KEY,
+            language TEXT NOT NULL
+        ) WITHOUT ROWID
+    """)
+    cur.execute("""CREATE INDEX IF NOT EXISTS idx_scan_index_language
+                   ON scan_index(language)""")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS scan_index_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            signature TEXT
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS language_progress (
+            language TEXT NOT NULL,
+            auto_indent INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (language, auto_indent)
+        )
+    """)
+
+
+def _migrate_char_index(cur: sqlite3.Cursor):
+    # Per-file character counts of the scanned corpus (JSON {char: count}),
+    # stamped with mtime/size so rescans only re-read changed files, plus the
+    # densest files per (language, char) for drill candidate lookups.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS char_index (
+            file_path TEXT PRIMARY KEY,
+            language TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            counts TEXT NOT NULL
+        ) WITHOUT ROWID
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS char_postings (
+            language TEXT NOT NULL,
+            char TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            density REAL NOT NULL,
+            PRIMARY KEY (language, char, file_path)
+        ) WITHOUT ROWID
+    """)
+    cur.execute("""CREATE INDEX IF NOT EXISTS idx_char_postings_char
+                   ON char_postings(char, density)""")
+
+
+def _migrate_key_tables(cur: sqlite3.Cursor):
+    """Key, confusion, error type and bigram statistics."""
     # Key statistics table for heatmap - updated to include language
     cur.execute("""
         CREATE TABLE IF NOT EXISTS key_stats (
@@ -257,7 +374,7 @@ def init_stats_tables():
                 PRIMARY KEY (char, language)
             )
         """)
-    
+
     # Key confusions table (what was typed instead of what was expected)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS key_confusions (
@@ -292,9 +409,341 @@ def init_stats_tables():
             PRIMARY KEY (char1, char2, language)
         )
     """)
-    
-    conn.commit()
-    conn.close()
+
+
+# Per-day session aggregates, in session_daily_stats column order. Shared by
+# the migration's backfill and _daily_stats_source's fallback.
+_DAILY_STATS_AGGREGATES = """
+    COUNT(*) AS sessions,
+    SUM(wpm) AS wpm_sum,
+    MIN(wpm) AS wpm_min,
+    MAX(wpm) AS wpm_max,
+    SUM(accuracy) AS accuracy_sum,
+    MIN(accuracy) AS accuracy_min,
+    MAX(accuracy) AS accuracy_max,
+    SUM(IFNULL(total_keystrokes, 0)) AS total_keystrokes,
+    SUM(IFNULL(correct_keystrokes, 0) + IFNULL(incorrect_keystrokes, 0)) AS typed_chars
+"""
+
+# Re-totals of per-day rows, in the same column order
+_DAILY_STATS_TOTALS = """
+    SUM(sessions) AS sessions,
+    SUM(wpm_sum) AS wpm_sum,
+    MIN(wpm_min) AS wpm_min,
+    MAX(wpm_max) AS wpm_max,
+    SUM(accuracy_sum) AS accuracy_sum,
+    MIN(accuracy_min) AS accuracy_min,
+    MAX(accuracy_max) AS accuracy_max,
+    SUM(total_keystrokes) AS total_keystrokes,
+    SUM(typed_chars) AS typed_chars
+"""
+
+_DAILY_STATS_KEY = """
+    day = DATE({row}.recorded_at) AND language = IFNULL({row}.language, '')
+    AND auto_indent = IFNULL({row}.auto_indent, 0) AND completed = IFNULL({row}.completed, 0)
+"""
+
+
+def _daily_stats_add_sql(row: str) -> str:
+    """Trigger statement folding session ``row`` (NEW) into its day's totals."""
+    return f"""
+        INSERT INTO session_daily_stats VALUES (
+            DATE({row}.recorded_at), IFNULL({row}.language, ''),
+            IFNULL({row}.auto_indent, 0), IFNULL({row}.completed, 0),
+            1, {row}.wpm, {row}.wpm, {row}.wpm,
+            {row}.accuracy, {row}.accuracy, {row}.accuracy,
+            IFNULL({row}.total_keystrokes, 0),
+            IFNULL({row}.correct_keystrokes, 0) + IFNULL({row}.incorrect_keystrokes, 0)
+        )
+        ON CONFLICT (day, language, auto_indent, completed) DO UPDATE SET
+            sessions = sessions + 1,
+            wpm_sum = wpm_sum + excluded.wpm_sum,
+            wpm_min = MIN(wpm_min, excluded.wpm_min),
+            wpm_max = MAX(wpm_max, excluded.wpm_max),
+            accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+            accuracy_min = MIN(accuracy_min, excluded.accuracy_min),
+            accuracy_max = MAX(accuracy_max, excluded.accuracy_max),
+            total_keystrokes = total_keystrokes + excluded.total_keystrokes,
+            typed_chars = typed_chars + excluded.typed_chars;
+    """
+
+
+def _daily_stats_remove_sql(row: str) -> str:
+    """Trigger statements taking session ``row`` (OLD) out of its day's totals.
+
+    Sums are adjusted in place. Minimum and maximum can't be, so they are
+    re-read from the day's remaining sessions, but only when the removed
+    session held one of them.
+    """
+    key = _DAILY_STATS_KEY.format(row=row)
+    return f"""
+        UPDATE session_daily_stats SET
+            sessions = sessions - 1,
+            wpm_sum = wpm_sum - {row}.wpm,
+            accuracy_sum = accuracy_sum - {row}.accuracy,
+            total_keystrokes = total_keystrokes - IFNULL({row}.total_keystrokes, 0),
+            typed_chars = typed_chars
+                - IFNULL({row}.correct_keystrokes, 0) - IFNULL({row}.incorrect_keystrokes, 0)
+        WHERE {key};
+        DELETE FROM session_daily_stats WHERE {key} AND sessions <= 0;
+        UPDATE session_daily_stats SET (wpm_min, wpm_max, accuracy_min, accuracy_max) = (
+            SELECT MIN(h.wpm), MAX(h.wpm), MIN(h.accuracy), MAX(h.accuracy)
+            FROM session_history h
+            WHERE h.recorded_at >= session_daily_stats.day
+              AND h.recorded_at < DATE(session_daily_stats.day, '+1 day')
+              AND DATE(h.recorded_at) = session_daily_stats.day
+              AND IFNULL(h.language, '') = session_daily_stats.language
+              AND IFNULL(h.auto_indent, 0) = session_daily_stats.auto_indent
+              AND IFNULL(h.completed, 0) = session_daily_stats.completed
+        )
+        WHERE {key}
+          AND ({row}.wpm <= wpm_min OR {row}.wpm >= wpm_max
+               OR {row}.accuracy <= accuracy_min OR {row}.accuracy >= accuracy_max);
+    """
+
+
+def _migrate_daily_stats(cur: sqlite3.Cursor):
+    # Per-day totals of session_history, kept in sync by triggers. The stats
+    # tab summaries and the --report CLI read a few thousand of these rows
+    # instead of grouping every session (see _daily_stats_source).
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS session_daily_stats (
+            day TEXT NOT NULL,
+            language TEXT NOT NULL,
+            auto_indent INTEGER NOT NULL,
+            completed INTEGER NOT NULL,
+            sessions INTEGER NOT NULL,
+            wpm_sum REAL,
+            wpm_min REAL,
+            wpm_max REAL,
+            accuracy_sum REAL,
+            accuracy_min REAL,
+            accuracy_max REAL,
+            total_keystrokes INTEGER,
+            typed_chars INTEGER,
+            PRIMARY KEY (day, language, auto_indent, completed)
+        ) WITHOUT ROWID
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_stats_insert
+        AFTER INSERT ON session_history
+        WHEN DATE(NEW.recorded_at) IS NOT NULL
+        BEGIN
+            {_daily_stats_add_sql("NEW")}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_stats_delete
+        AFTER DELETE ON session_history
+        WHEN DATE(OLD.recorded_at) IS NOT NULL
+        BEGIN
+            {_daily_stats_remove_sql("OLD")}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_stats_update_old
+        AFTER UPDATE OF language, auto_indent, wpm, accuracy, total_keystrokes,
+            correct_keystrokes, incorrect_keystrokes, completed, recorded_at
+        ON session_history
+        WHEN DATE(OLD.recorded_at) IS NOT NULL
+        BEGIN
+            {_daily_stats_remove_sql("OLD")}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_stats_update_new
+        AFTER UPDATE OF language, auto_indent, wpm, accuracy, total_keystrokes,
+            correct_keystrokes, incorrect_keystrokes, completed, recorded_at
+        ON session_history
+        WHEN DATE(NEW.recorded_at) IS NOT NULL
+        BEGIN
+            {_daily_stats_add_sql("NEW")}
+        END
+    """)
+    _fill_daily_stats(cur)
+
+
+def _fill_daily_stats(cur: sqlite3.Cursor):
+    cur.execute("DELETE FROM session_daily_stats")
+    cur.execute(f"""
+        INSERT INTO session_daily_stats
+        SELECT DATE(recorded_at), IFNULL(language, ''), IFNULL(auto_indent, 0),
+               IFNULL(completed, 0), {_DAILY_STATS_AGGREGATES}
+        FROM session_history
+        WHERE DATE(recorded_at) IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def _migrate_history_paths_version(cur: sqlite3.Cursor):
+    # Bumped by every change to history_paths, so caches derived from the set
+    # of practiced paths (_ignored_paths_filter_sql) can tell it changed. Row
+    # ids can't: a deleted top id is handed out again. Starts at a random
+    # value, so a database recreated at the same path doesn't repeat a stamp.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS history_paths_version (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            version INTEGER NOT NULL
+        )
+    """)
+    cur.execute("INSERT OR IGNORE INTO history_paths_version (id, version) VALUES (0, RANDOM())")
+    for event in ("INSERT", "DELETE", "UPDATE"):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_history_paths_version_{event.lower()}
+            AFTER {event} ON history_paths
+            BEGIN
+                UPDATE history_paths_version SET version = version + 1 WHERE id = 0;
+            END
+        """)
+
+
+def _archive_daily_stats_sql(source: str, where: str) -> str:
+    """Statement folding the ``source`` sessions matching ``where`` into archived_daily_stats."""
+    return f"""
+        INSERT INTO archived_daily_stats
+        SELECT DATE(recorded_at), IFNULL(file_path, ''), IFNULL(language, ''),
+               IFNULL(auto_indent, 0), IFNULL(completed, 0), {_DAILY_STATS_AGGREGATES}
+        FROM {source}
+        WHERE DATE(recorded_at) IS NOT NULL AND {where}
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (day, file_path, language, auto_indent, completed) DO UPDATE SET
+            sessions = sessions + excluded.sessions,
+            wpm_sum = wpm_sum + excluded.wpm_sum,
+            wpm_min = MIN(wpm_min, excluded.wpm_min),
+            wpm_max = MAX(wpm_max, excluded.wpm_max),
+            accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+            accuracy_min = MIN(accuracy_min, excluded.accuracy_min),
+            accuracy_max = MAX(accuracy_max, excluded.accuracy_max),
+            total_keystrokes = total_keystrokes + excluded.total_keystrokes,
+            typed_chars = typed_chars + excluded.typed_chars
+    """
+
+
+def _migrate_archived_daily_stats(cur: sqlite3.Cursor):
+    # Per-day, per-file totals of the sessions moved to the history archive,
+    # written in the same transaction that deletes them. Trend queries union
+    # these instead of decoding the archive; keeping file_path lets the
+    # global ignore rules apply to archived days as well.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS archived_daily_stats (
+            day TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            language TEXT NOT NULL,
+            auto_indent INTEGER NOT NULL,
+            completed INTEGER NOT NULL,
+            sessions INTEGER NOT NULL,
+            wpm_sum REAL,
+            wpm_min REAL,
+            wpm_max REAL,
+            accuracy_sum REAL,
+            accuracy_min REAL,
+            accuracy_max REAL,
+            total_keystrokes INTEGER,
+            typed_chars INTEGER,
+            PRIMARY KEY (day, file_path, language, auto_indent, completed)
+        ) WITHOUT ROWID
+    """)
+    # Backfill from an archive written before this table existed. Sessions
+    # still in the live table (archived, then interrupted before the delete)
+    # are counted there.
+    db_file = next((row[2] for row in cur.execute("PRAGMA database_list") if row[1] == "main"), "")
+    if not db_file:
+        return
+    rows = HistoryArchive(archive_path_for(db_file)).read_rows()
+    if not rows:
+        return
+    columns = ", ".join(ARCHIVE_COLUMNS)
+    cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS archived_sessions ({columns})")
+    cur.execute("DELETE FROM temp.archived_sessions")
+    cur.executemany(
+        f"INSERT INTO temp.archived_sessions VALUES ({', '.join('?' * len(ARCHIVE_COLUMNS))})", rows
+    )
+    cur.execute(_archive_daily_stats_sql(
+        "temp.archived_sessions AS a",
+        "NOT EXISTS (SELECT 1 FROM main.session_history h "
+        "WHERE h.id = a.id AND h.recorded_at = a.recorded_at)",
+    ))
+    cur.execute("DROP TABLE temp.archived_sessions")
+
+
+def rebuild_history_summaries(cur: sqlite3.Cursor):
+    """Recompute history_paths and session_daily_stats from session_history.
+
+    For bulk loads that insert with the session_history triggers dropped
+    (app.demo_data); one grouped pass is far cheaper than the per-row
+    triggers over millions of rows.
+    """
+    cur.execute("DELETE FROM history_paths")
+    cur.execute("""
+        INSERT OR IGNORE INTO history_paths (file_path, path_lower)
+        SELECT DISTINCT file_path, LOWER(file_path) FROM session_history
+    """)
+    _fill_daily_stats(cur)
+
+
+# Ordered schema migrations. Each step must be idempotent (databases created
+# before versioning start at 0 and may already have some of the tables) and
+# runs at most once per database; the database's ``PRAGMA user_version``
+# records the last step applied. Append new steps, never edit shipped ones.
+_STATS_MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Cursor], None]]] = [
+    (1, _migrate_practice_tables),
+    (2, _migrate_session_history),
+    (3, _migrate_history_paths),
+    (4, _migrate_scan_index),
+    (5, _migrate_char_index),
+    (6, _migrate_key_tables),
+    (7, _migrate_daily_stats),
+    (8, _migrate_history_paths_version),
+    (9, _migrate_archived_daily_stats),
+]
+
+STATS_SCHEMA_VERSION = _STATS_MIGRATIONS[-1][0]
+
+
+def _get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def init_stats_tables(db_path: Optional[Union[str, Path]] = None) -> int:
+    """Bring the statistics tables up to STATS_SCHEMA_VERSION.
+
+    An up-to-date database costs a single pragma read. Otherwise every
+    pending migration runs in its own transaction together with the
+    user_version bump, so an interrupted upgrade resumes at the failed step.
+    ``db_path`` migrates a database other than the active one (profile
+    prefetch). Returns the number of migrations applied.
+    """
+    conn = sqlite3.connect(db_path, timeout=10.0) if db_path else _connect_for_stats()
+    try:
+        return apply_stats_migrations(conn)
+    finally:
+        conn.close()
+
+
+def apply_stats_migrations(conn: sqlite3.Connection) -> int:
+    """Run the pending migrations on an open connection (see init_stats_tables).
+
+    The connection must not be inside a transaction.
+    """
+    if _get_schema_version(conn) >= STATS_SCHEMA_VERSION:
+        return 0
+
+    applied = 0
+    for version, migrate in _STATS_MIGRATIONS:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock in case another process got here first
+            if _get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            migrate(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied += 1
+    return applied
 
 
 def get_file_stats(file_path: str, auto_indent: bool = False) -> Optional[Dict]:
@@ -380,8 +829,9 @@ def update_file_stats(file_path: str, wpm: float, accuracy: float, completed: bo
     meets_threshold = accuracy >= min_accuracy
 
     # Get current stats
-    cur.execute("SELECT best_wpm, times_practiced FROM file_stats WHERE file_path = ? AND auto_indent = ?", (file_path, indent_val))
+    cur.execute("SELECT best_wpm, times_practiced, completed FROM file_stats WHERE file_path = ? AND auto_indent = ?", (file_path, indent_val))
     row = cur.fetchone()
+    was_completed = bool(row[2]) if row else False
     
     if row:
         current_best = row[0] or 0.0
@@ -404,11 +854,172 @@ def update_file_stats(file_path: str, wpm: float, accuracy: float, completed: bo
              times_practiced, completed, last_practiced)
             VALUES (?, ?, ?, ?, ?, ?, 1, ?, CURRENT_TIMESTAMP)
         """, (file_path, indent_val, initial_best, wpm, accuracy, accuracy, completed))
+
+    # Keep the per-language completion counters in step with this file
+    delta = int(bool(completed)) - int(was_completed)
+    if delta:
+        cur.execute("""
+            UPDATE language_progress SET completed = completed + ?
+            WHERE auto_indent = ?
+              AND language = (SELECT language FROM scan_index WHERE file_path = ?)
+        """, (delta, indent_val, file_path))
     
     conn.commit()
     conn.close()
 
 
+def get_scan_index_signature() -> Optional[str]:
+    """Return the scan signature the stored language index was built from."""
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    cur.execute("SELECT signature FROM scan_index_state WHERE id = 1")
+    row = cur.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def sync_scan_index(language_files: Dict[str, List[str]], signature: Optional[str] = None):
+    """Replace the stored scan index and rebuild the language_progress counters."""
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM scan_index")
+    cur.executemany(
+        "INSERT OR REPLACE INTO scan_index (file_path, language) VALUES (?, ?)",
+        ((path, lang) for lang, paths in language_files.items() for path in paths if path),
+    )
+    rebuild_language_progress(cur)
+    cur.execute(
+        "INSERT OR REPLACE INTO scan_index_state (id, signature) VALUES (1, ?)",
+        (signature,),
+    )
+    conn.commit()
+    conn.close()
+
+
+def rebuild_language_progress(cur: sqlite3.Cursor):
+    """Recount language_progress from scan_index and file_stats.
+
+    For anything that replaces file_stats wholesale (sync_scan_index,
+    app.demo_data), bypassing the per-file deltas of update_file_stats.
+    """
+    cur.execute("DELETE FROM language_progress")
+    cur.execute("""
+        INSERT INTO language_progress (language, auto_indent, completed, total)
+        SELECT s.language, m.auto_indent,
+               SUM(CASE WHEN f.completed THEN 1 ELSE 0 END),
+               COUNT(*)
+        FROM scan_index s
+        CROSS JOIN (SELECT 0 AS auto_indent UNION ALL SELECT 1) m
+        LEFT JOIN file_stats f
+               ON f.file_path = s.file_path AND f.auto_indent = m.auto_indent
+        GROUP BY s.language, m.auto_indent
+    """)
+
+
+def get_language_progress(auto_indent: bool = False) -> Dict[str, Dict[str, int]]:
+    """Return ``{language: {"completed", "total"}}`` for the indexed scan."""
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT language, completed, total FROM language_progress WHERE auto_indent = ?",
+        (1 if auto_indent else 0,),
+    )
+    progress = {
+        row[0]: {"completed": row[1], "total": row[2]}
+        for row in cur.fetchall()
+    }
+    conn.close()
+    return progress
+
+
+def get_char_index_stamps() -> Dict[str, Tuple[int, int]]:
+    """Return ``{file_path: (mtime_ns, size)}`` for every indexed file."""
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    cur.execute("SELECT file_path, mtime_ns, size FROM char_index")
+    stamps = {row[0]: (row[1], row[2]) for row in cur.fetchall()}
+    conn.close()
+    return stamps
+
+
+def update_char_index(
+    rows: Iterable[Tuple[str, str, int, int, int, str]],
+    removed_paths: Iterable[str] = (),
+    postings_per_char: int = 200,
+):
+    """Store re-counted files, drop removed ones and rebuild affected postings.
+
+    ``rows`` are (file_path, language, mtime_ns, size, length, counts_json).
+    The postings keep the ``postings_per_char`` densest files for every
+    (language, char) pair; only languages with changed files are rebuilt.
+    """
+    rows = list(rows)
+    removed_paths = list(removed_paths)
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+
+    languages = {row[1] for row in rows}
+    for chunk_start in range(0, len(removed_paths), 500):
+        chunk = removed_paths[chunk_start:chunk_start + 500]
+        cur.execute(
+            f"SELECT DISTINCT language FROM char_index WHERE file_path IN ({','.join(['?'] * len(chunk))})",
+            chunk,
+        )
+        languages.update(row[0] for row in cur.fetchall())
+
+    cur.executemany("DELETE FROM char_index WHERE file_path = ?", ((p,) for p in removed_paths))
+    cur.executemany("""
+        INSERT OR REPLACE INTO char_index (file_path, language, mtime_ns, size, length, counts)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+
+    for language in languages:
+        heaps: Dict[str, List[Tuple[float, str]]] = {}
+        cur.execute("SELECT file_path, length, counts FROM char_index WHERE language = ?", (language,))
+        for file_path, length, counts in cur.fetchall():
+            if length <= 0:
+                continue
+            for char, count in json.loads(counts).items():
+                density = count / length
+                heap = heaps.setdefault(char, [])
+                if len(heap) < postings_per_char:
+                    heapq.heappush(heap, (density, file_path))
+                elif density > heap[0][0]:
+                    heapq.heapreplace(heap, (density, file_path))
+        cur.execute("DELETE FROM char_postings WHERE language = ?", (language,))
+        cur.executemany(
+            "INSERT INTO char_postings (language, char, file_path, density) VALUES (?, ?, ?, ?)",
+            ((language, char, file_path, density)
+             for char, heap in heaps.items() for density, file_path in heap),
+        )
+    conn.commit()
+    conn.close()
+
+
+def get_char_postings(
+    chars: Iterable[str],
+    languages: Optional[List[str]] = None,
+) -> List[Tuple[str, str, float]]:
+    """Return (file_path, char, density) postings for ``chars``."""
+    chars = list(chars)
+    if not chars:
+        return []
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    query = f"""
+        SELECT file_path, char, density FROM char_postings
+        WHERE char IN ({",".join(["?"] * len(chars))})
+    """
+    params: List[Any] = list(chars)
+    if languages:
+        query += f" AND language IN ({','.join(['?'] * len(languages))})"
+        params.extend(languages)
+    cur.execute(query, params)
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
 def record_session_history(
     file_path: str,
     language: str,
@@ -528,11 +1139,102 @@ def update_error_type_stats(language: str, errors: Dict[str, int]):
             substitutions = substitutions + excluded.substitutions
     """, (lang, errors.get('omission', 0), errors.get('insertion', 0), 
           errors.get('transposition', 0), errors.get('substitution', 0)))
-            
+
+    conn.commit()
+    conn.close()
+
+
+def update_bigram_stats(language: str, bigrams: Dict[Tuple[str, str], List[float]]):
+    """Add per-bigram latency and error totals from one session.
+
+    ``bigrams`` maps (char1, char2) to [total_time_ms, correct_count, error_count],
+    as produced by ``bigram_extractor.extract_bigrams``.
+    """
+    if not bigrams:
+        return
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    lang = language or ""
+
+    rows = [
+        (char1, char2, lang, total_time, int(correct), int(errors))
+        for (char1, char2), (total_time, correct, errors) in bigrams.items()
+    ]
+    cur.executemany("""
+        INSERT INTO bigram_stats (char1, char2, language, total_time, correct_count, error_count)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(char1, char2, language) DO UPDATE SET
+            total_time = total_time + excluded.total_time,
+            correct_count = correct_count + excluded.correct_count,
+            error_count = error_count + excluded.error_count
+    """, rows)
+
     conn.commit()
     conn.close()
 
 
+def get_bigram_stats(
+    languages: Optional[List[str]] = None,
+    order_by: str = "slowest",
+    limit: int = 10,
+    min_samples: int = 5,
+) -> List[Dict[str, Any]]:
+    """Get the weakest bigrams, optionally filtered by language.
+
+    ``order_by`` is ``"slowest"`` (highest average latency) or ``"errors"``
+    (highest error rate). Bigrams with fewer than ``min_samples`` attempts
+    are left out so a single slow keystroke does not top the list.
+    """
+    if order_by not in ("slowest", "errors"):
+        raise ValueError(f"Unknown bigram ordering: {order_by}")
+
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+
+    where = ""
+    params: List[Any] = []
+    if languages:
+        placeholders = ",".join(["?"] * len(languages))
+        where = f"WHERE language IN ({placeholders})"
+        params.extend(languages)
+
+    if order_by == "slowest":
+        having = "HAVING SUM(correct_count) >= ?"
+        order = "avg_ms DESC"
+    else:
+        having = "HAVING SUM(correct_count) + SUM(error_count) >= ? AND SUM(error_count) > 0"
+        order = "error_rate DESC, error_count DESC"
+    params.extend([min_samples, limit])
+
+    cur.execute(f"""
+        SELECT char1, char2,
+               SUM(total_time) / MAX(SUM(correct_count), 1) AS avg_ms,
+               SUM(correct_count) AS correct_count,
+               SUM(error_count) AS error_count,
+               CAST(SUM(error_count) AS REAL) / (SUM(correct_count) + SUM(error_count)) AS error_rate
+        FROM bigram_stats
+        {where}
+        GROUP BY char1, char2
+        {having}
+        ORDER BY {order}, char1, char2
+        LIMIT ?
+    """, params)
+    rows = cur.fetchall()
+    conn.close()
+
+    return [
+        {
+            "char1": row[0],
+            "char2": row[1],
+            "avg_ms": row[2],
+            "correct_count": row[3],
+            "error_count": row[4],
+            "error_rate": row[5],
+        }
+        for row in rows
+    ]
+
+
 def get_error_type_stats(languages: Optional[List[str]] = None) -> Dict[str, int]:
     """Get aggregated error type statistics."""
     conn = _connect_for_stats()
@@ -766,7 +1468,130 @@ def list_history_languages() -> List[str]:
     return languages
 
 
-def fetch_session_history(
+# The part of file_path after its last / or \ (the File column shows only
+# that); _file_name is the same in Python, for keyset positions
+_FILE_NAME_SQL = (
+    "SUBSTR(file_path, LENGTH(RTRIM(file_path, "
+    "REPLACE(REPLACE(file_path, '/', ''), '\\', ''))) + 1)"
+)
+
+
+def _file_name(file_path: str) -> str:
+    return re.split(r"[\\/]", file_path)[-1]
+
+
+# Sortable history columns: record key -> (SQL expression, value used for NULLs)
+HISTORY_SORT_COLUMNS: Dict[str, tuple] = {
+    "recorded_at": ("recorded_at", ""),
+    "language": ("COALESCE(language, '')", ""),
+    "file_path": (f"{_FILE_NAME_SQL} COLLATE NOCASE", ""),
+    "wpm": ("wpm", 0),
+    "accuracy": ("accuracy", 0),
+    "duration": ("COALESCE(duration, 0)", 0),
+    "correct": ("COALESCE(correct_keystrokes, 0)", 0),
+    "incorrect": ("COALESCE(incorrect_keystrokes, 0)", 0),
+    "auto_indent": ("COALESCE(auto_indent, 0)", 0),
+}
+
+
+# (database, rules, history_paths version) -> paths the rules ignore
+_ignored_paths_cache: Optional[Tuple[Tuple, List[str]]] = None
+
+
+def _ignored_paths_filter_sql(cur: sqlite3.Cursor) -> Tuple[str, List[Any]]:
+    """Global ignore rules resolved against the distinct practiced paths.
+    
+    The GLOB clauses from _get_global_ignore_sql are evaluated once per path
+    in history_paths rather than once per session row. Usually nothing that
+    was practiced is ignored and the filter disappears entirely. Databases
+    without history_paths get the GLOB clauses themselves.
+    
+    Returns:
+        (sql, params) to append to a session_history WHERE clause
+    """
+    global _ignored_paths_cache
+    ignore_sql = _get_global_ignore_sql()
+    if not ignore_sql:
+        return "", []
+    cur.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+        "AND name IN ('history_paths', 'history_paths_version')"
+    )
+    if cur.fetchone()[0] < 2:
+        # Not migrated yet (databases opened read-only, e.g. by --report)
+        return ignore_sql, []
+    # Matching every path against the patterns costs more than the summary
+    # queries using the result, so it is redone only when the rules or the
+    # set of practiced paths change
+    db_file = next((row[2] for row in cur.execute("PRAGMA database_list") if row[1] == "main"), "")
+    cur.execute("SELECT version FROM history_paths_version")
+    stamp = (db_file, ignore_sql, cur.fetchone())
+    if _ignored_paths_cache is not None and _ignored_paths_cache[0] == stamp:
+        ignored = _ignored_paths_cache[1]
+    else:
+        cur.execute(f"SELECT file_path FROM history_paths WHERE NOT (1 = 1 {ignore_sql})")
+        ignored = [row[0] for row in cur.fetchall()]
+        _ignored_paths_cache = (stamp, ignored)
+    if not ignored:
+        return "", []
+    if len(ignored) <= 500:
+        placeholders = ",".join(["?"] * len(ignored))
+        return f" AND file_path NOT IN ({placeholders})", ignored
+    return f" AND file_path IN (SELECT file_path FROM history_paths WHERE 1 = 1 {ignore_sql})", []
+
+
+def _daily_stats_source(
+    cur: sqlite3.Cursor,
+    first_day: Optional[str] = None,
+    last_day: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    """Per-day session totals (session_daily_stats rows) between two days.
+
+    Reads the trigger-maintained session_daily_stats table when it exists
+    and no practiced path is globally ignored. Otherwise (databases opened
+    read-only before their migration, the demo database, ignored paths)
+    the same rows are grouped from session_history on the fly.
+
+    Args:
+        first_day, last_day: Optional inclusive YYYY-MM-DD bounds.
+
+    Returns:
+        (sql, params): a parenthesised subquery to use as a FROM source
+    """
+    ignore_sql, ignore_params = _ignored_paths_filter_sql(cur)
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'session_daily_stats'")
+    if not ignore_sql and cur.fetchone() is not None:
+        where = "1 = 1"
+        params: List[Any] = []
+        if first_day:
+            where += " AND day >= ?"
+            params.append(first_day)
+        if last_day:
+            where += " AND day <= ?"
+            params.append(last_day)
+        return f"(SELECT * FROM session_daily_stats WHERE {where})", params
+
+    # Whole days as a recorded_at range, so idx_session_history_recorded_at applies
+    where = "DATE(recorded_at) IS NOT NULL"
+    params = []
+    if first_day:
+        where += " AND recorded_at >= ?"
+        params.append(first_day)
+    if last_day:
+        next_day = datetime.strptime(last_day, "%Y-%m-%d") + timedelta(days=1)
+        where += " AND recorded_at < ?"
+        params.append(next_day.strftime("%Y-%m-%d"))
+    return f"""(
+        SELECT DATE(recorded_at) AS day, IFNULL(language, '') AS language,
+               IFNULL(auto_indent, 0) AS auto_indent, IFNULL(completed, 0) AS completed,
+               {_DAILY_STATS_AGGREGATES}
+        FROM session_history
+        WHERE {where} {ignore_sql}
+        GROUP BY 1, 2, 3, 4
+    )""", params + ignore_params
+
+
+def _history_filter_sql(
     language: Optional[str] = None,
     file_contains: Optional[str] = None,
     min_wpm: Optional[float] = None,
@@ -774,68 +1599,175 @@ def fetch_session_history(
     min_duration: Optional[float] = None,
     max_duration: Optional[float] = None,
     auto_indent: Optional[bool] = None,
-) -> List[Dict]:
-    """Retrieve session history rows matching the supplied filters."""
-    conn = _connect_for_stats()
-    cur = conn.cursor()
+) -> tuple:
+    """Build the shared WHERE clause (and params) for session history queries."""
     ignore_sql = _get_global_ignore_sql()
-    query = [
-        "SELECT id, file_path, language, wpm, accuracy, total_keystrokes,",
-        "       correct_keystrokes, incorrect_keystrokes, duration, recorded_at, auto_indent",
-        f"FROM session_history WHERE 1=1 {ignore_sql}",
-    ]
+    clauses = []
     params: List[Any] = []
 
+    raw = file_contains.lower().strip() if file_contains else ""
+    if raw:
+        # Fuzzy pattern such that "pow" will match "power.py" (p%o%w). It is
+        # resolved against the distinct paths in history_paths (together with
+        # the ignore globs) instead of being evaluated on every history row.
+        escaped = ["\\" + c if c in "%_\\" else c for c in raw]
+        pattern = "%" + "%".join(escaped) + "%"
+        clauses.append(
+            "file_path IN (SELECT file_path FROM history_paths "
+            f"WHERE path_lower LIKE ? ESCAPE '\\' {ignore_sql})"
+        )
+        params.append(pattern)
+    else:
+        clauses.append(f"1=1 {ignore_sql}")
+
     if language:
-        query.append("AND language = ?")
+        clauses.append("language = ?")
         params.append(language)
-    if file_contains:
-        # Create fuzzy pattern such that "pow" will match "power.py" (p%o%w)
-        raw = file_contains.lower().strip()
-        if raw:
-            escaped = raw.replace("%", r"\%").replace("_", r"\_")
-            pattern = "%" + "%".join(escaped) + "%"
-            query.append("AND LOWER(file_path) LIKE ? ESCAPE '\\'")
-            params.append(pattern)
     if min_wpm is not None:
-        query.append("AND wpm >= ?")
+        clauses.append("wpm >= ?")
         params.append(min_wpm)
     if max_wpm is not None:
-        query.append("AND wpm <= ?")
+        clauses.append("wpm <= ?")
         params.append(max_wpm)
     if min_duration is not None:
-        query.append("AND duration >= ?")
+        clauses.append("duration >= ?")
         params.append(min_duration)
     if max_duration is not None:
-        query.append("AND duration <= ?")
+        clauses.append("duration <= ?")
         params.append(max_duration)
     if auto_indent is not None:
-        query.append("AND auto_indent = ?")
+        clauses.append("auto_indent = ?")
         params.append(1 if auto_indent else 0)
 
-    query.append("ORDER BY recorded_at DESC")
-    cur.execute("\n".join(query), params)
+    return " AND ".join(clauses), params
+
+
+_HISTORY_COLUMNS = """id, file_path, language, wpm, accuracy, total_keystrokes,
+       correct_keystrokes, incorrect_keystrokes, duration, recorded_at, auto_indent"""
+
+
+def _history_row_to_dict(row) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "file_path": row[1],
+        "language": row[2],
+        "wpm": row[3],
+        "accuracy": row[4],
+        "total": row[5],
+        "correct": row[6],
+        "incorrect": row[7],
+        "duration": row[8],
+        "recorded_at": row[9],
+        "auto_indent": bool(row[10]),
+    }
+
+
+def fetch_session_history(
+    language: Optional[str] = None,
+    file_contains: Optional[str] = None,
+    min_wpm: Optional[float] = None,
+    max_wpm: Optional[float] = None,
+    min_duration: Optional[float] = None,
+    max_duration: Optional[float] = None,
+    auto_indent: Optional[bool] = None,
+) -> List[Dict]:
+    """Retrieve session history rows matching the supplied filters."""
+    where_sql, params = _history_filter_sql(
+        language, file_contains, min_wpm, max_wpm, min_duration, max_duration, auto_indent
+    )
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {_HISTORY_COLUMNS} FROM session_history WHERE {where_sql} ORDER BY recorded_at DESC",
+        params,
+    )
     rows = cur.fetchall()
     conn.close()
 
-    history = []
-    for row in rows:
-        history.append(
-            {
-                "id": row[0],
-                "file_path": row[1],
-                "language": row[2],
-                "wpm": row[3],
-                "accuracy": row[4],
-                "total": row[5],
-                "correct": row[6],
-                "incorrect": row[7],
-                "duration": row[8],
-                "recorded_at": row[9],
-                "auto_indent": bool(row[10]),
-            }
+    return [_history_row_to_dict(row) for row in rows]
+
+
+def iter_session_history(chunk_size: int = 1000, **filters) -> Iterator[List[Dict]]:
+    """Yield session history rows matching the filters in chunks of ``chunk_size``.
+
+    A single cursor is stepped with ``fetchmany`` so memory stays bounded
+    regardless of history size. Rows come newest first, like fetch_session_history.
+    """
+    where_sql, params = _history_filter_sql(**filters)
+    conn = _connect_for_stats()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT {_HISTORY_COLUMNS} FROM session_history WHERE {where_sql} "
+            "ORDER BY recorded_at DESC, id DESC",
+            params,
         )
-    return history
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [_history_row_to_dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def count_session_history(**filters) -> int:
+    """Count session history rows matching the same filters as fetch_session_history."""
+    where_sql, params = _history_filter_sql(**filters)
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    cur.execute(f"SELECT COUNT(*) FROM session_history WHERE {where_sql}", params)
+    row = cur.fetchone()
+    conn.close()
+    return row[0] if row else 0
+
+
+def fetch_session_history_page(
+    sort_by: str = "recorded_at",
+    descending: bool = True,
+    after: Optional[Dict[str, Any]] = None,
+    limit: int = 200,
+    **filters,
+) -> List[Dict]:
+    """Fetch one page of session history using keyset pagination.
+
+    Rows are ordered by ``sort_by`` (a key of HISTORY_SORT_COLUMNS) with ``id``
+    as a tie-breaker. Pass the last record of the previous page as ``after``
+    to continue from it; unlike OFFSET this stays cheap deep into the history.
+    """
+    if sort_by not in HISTORY_SORT_COLUMNS:
+        raise ValueError(f"Unsupported sort column: {sort_by}")
+    expr, null_value = HISTORY_SORT_COLUMNS[sort_by]
+    direction = "DESC" if descending else "ASC"
+    cmp = "<" if descending else ">"
+
+    where_sql, params = _history_filter_sql(**filters)
+    if after is not None:
+        value = after.get(sort_by)
+        if value is None:
+            value = null_value
+        elif isinstance(value, bool):
+            value = int(value)
+        elif sort_by == "file_path":
+            value = _file_name(value)
+        where_sql += f" AND ({expr} {cmp} ? OR ({expr} = ? AND id {cmp} ?))"
+        params.extend([value, value, after["id"]])
+
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT {_HISTORY_COLUMNS} FROM session_history
+        WHERE {where_sql}
+        ORDER BY {expr} {direction}, id {direction}
+        LIMIT ?
+        """,
+        params + [limit],
+    )
+    rows = cur.fetchall()
+    conn.close()
+
+    return [_history_row_to_dict(row) for row in rows]
 
 
 def delete_session_history(record_ids: List[int]):
@@ -851,35 +1783,140 @@ def delete_session_history(record_ids: List[int]):
     conn.close()
 
 
-def cleanup_old_sessions(retention_days: Optional[int] = None) -> int:
+# Retention cleanup works in short transactions so typing never waits on it
+RETENTION_BATCH_SIZE = 500
+# Free pages handed back to the filesystem per incremental_vacuum step
+VACUUM_STEP_PAGES = 256
+
+# PRAGMA auto_vacuum value for INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _connect_maintenance(db_path: Optional[Union[str, Path]] = None) -> sqlite3.Connection:
+    if db_path is None:
+        return _connect_for_stats()
+    conn = sqlite3.connect(db_path, timeout=10.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def retention_cutoff(retention_days: int) -> str:
+    """``recorded_at`` value before which sessions are expired (UTC, like CURRENT_TIMESTAMP)."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=int(retention_days))
+    return cutoff.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def delete_expired_sessions_batch(
+    cutoff: str,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    db_path: Optional[Union[str, Path]] = None,
+    archive: Optional["HistoryArchive"] = None,
+) -> int:
+    """Delete up to ``batch_size`` sessions recorded before ``cutoff``.
+
+    The oldest expired ids are looked up first and removed as one rowid
+    range, so each call is a short primary-key write. With ``archive`` the
+    rows are appended to it (and synced) before they are deleted, and their
+    per-day totals go to archived_daily_stats in the deleting transaction.
+    Returns the number of rows deleted; 0 means nothing expired is left.
+    """
+    conn = _connect_maintenance(db_path)
+    try:
+        lo, hi = conn.execute(
+            """SELECT MIN(id), MAX(id) FROM (
+                   SELECT id FROM session_history WHERE recorded_at < ? ORDER BY id LIMIT ?
+               )""",
+            (cutoff, batch_size),
+        ).fetchone()
+        if lo is None:
+            return 0
+        if archive is not None:
+            archive.append(conn.execute(
+                f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM session_history "
+                "WHERE id BETWEEN ? AND ? AND recorded_at < ?",
+                (lo, hi, cutoff),
+            ).fetchall())
+            conn.execute(
+                _archive_daily_stats_sql("session_history", "id BETWEEN ? AND ? AND recorded_at < ?"),
+                (lo, hi, cutoff),
+            )
+        cur = conn.execute(
+            "DELETE FROM session_history WHERE id BETWEEN ? AND ? AND recorded_at < ?",
+            (lo, hi, cutoff),
+        )
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def enable_incremental_vacuum(db_path: Optional[Union[str, Path]] = None) -> bool:
+    """Switch the database to ``auto_vacuum=INCREMENTAL``.
+
+    New databases get the mode from settings.prepare_db(); older ones need
+    one full VACUUM to convert, which holds an exclusive lock for the whole
+    rewrite. Only for an explicit, user-started step (see
+    history_maintenance.CompactDatabaseTask), off the UI thread.
+    Returns True if the database had to be converted.
+    """
+    conn = _connect_maintenance(db_path)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == _AUTO_VACUUM_INCREMENTAL:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+
+def incremental_vacuum(
+    pages: int = VACUUM_STEP_PAGES,
+    db_path: Optional[Union[str, Path]] = None,
+) -> int:
+    """Return up to ``pages`` free pages to the filesystem.
+
+    Returns the number of free pages still left afterwards, or 0 if the
+    database is not in incremental auto_vacuum mode (nothing to do here).
+    """
+    conn = _connect_maintenance(db_path)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != _AUTO_VACUUM_INCREMENTAL:
+            return 0
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def cleanup_old_sessions(retention_days: Optional[int] = None, archive: bool = False) -> int:
     """Delete session history older than specified days.
+
+    Deletes in RETENTION_BATCH_SIZE batches and reclaims the freed pages
+    incrementally; see app.history_maintenance for the background version.
     
     Args:
         retention_days: Number of days to retain. None or 0 means keep all.
+        archive: Move the expired sessions to the profile's history archive.
     
     Returns:
         Number of rows deleted.
     """
     if retention_days is None or retention_days <= 0:
         return 0
-    
-    conn = _connect_for_stats()
-    cur = conn.cursor()
-    
-    # Delete sessions older than retention_days
-    cur.execute("""
-        DELETE FROM session_history 
-        WHERE recorded_at < datetime('now', '-' || ? || ' days')
-    """, (retention_days,))
-    
-    rows_deleted = cur.rowcount
-    conn.commit()
-    
-    # VACUUM to reclaim space if significant deletions occurred
-    if rows_deleted > 100:
-        cur.execute("VACUUM")
-    
-    conn.close()
+
+    cutoff = retention_cutoff(retention_days)
+    cold = get_archive(settings.get_current_db_path()) if archive else None
+    rows_deleted = 0
+    while True:
+        deleted = delete_expired_sessions_batch(cutoff, archive=cold)
+        if not deleted:
+            break
+        rows_deleted += deleted
+
+    if rows_deleted:
+        while incremental_vacuum():
+            pass
     return rows_deleted
 
 
@@ -1014,63 +2051,44 @@ def get_aggregated_stats(languages: Optional[List[str]] = None, auto_indent: Opt
         where_clause += " AND auto_indent = ?"
         params.append(1 if auto_indent else 0)
     
-    ignore_sql = _get_global_ignore_sql()
+    source, source_params = _daily_stats_source(cur)
+    params = source_params + params
     
-    # Get session counts
+    # Session counts plus WPM and accuracy stats (completed sessions only)
     cur.execute(f"""
         SELECT 
-            SUM(CASE WHEN completed = 1 THEN 1 ELSE 0 END) as completed,
-            SUM(CASE WHEN completed = 0 THEN 1 ELSE 0 END) as incomplete
-        FROM session_history
-        WHERE 1=1 {where_clause} {ignore_sql}
+            SUM(CASE WHEN completed = 1 THEN sessions ELSE 0 END) as completed,
+            SUM(CASE WHEN completed = 0 THEN sessions ELSE 0 END) as incomplete,
+            MAX(CASE WHEN completed = 1 THEN wpm_max END) as highest_wpm,
+            MIN(CASE WHEN completed = 1 THEN wpm_min END) as lowest_wpm,
+            SUM(CASE WHEN completed = 1 THEN wpm_sum END)
+                / SUM(CASE WHEN completed = 1 THEN sessions END) as avg_wpm,
+            MAX(CASE WHEN completed = 1 THEN accuracy_max * 100 END) as highest_acc,
+            MIN(CASE WHEN completed = 1 THEN accuracy_min * 100 END) as lowest_acc,
+            SUM(CASE WHEN completed = 1 THEN accuracy_sum END) * 100
+                / SUM(CASE WHEN completed = 1 THEN sessions END) as avg_acc
+        FROM {source}
+        WHERE 1=1 {where_clause}
     """, params)
     row = cur.fetchone()
     total_completed = row[0] or 0
     total_incomplete = row[1] or 0
+    highest_wpm, lowest_wpm, avg_wpm, highest_acc, lowest_acc, avg_acc = row[2:8]
     
-    # Get WPM and accuracy stats (only from completed sessions)
+    # Most characters typed and most sessions completed in a single day
     cur.execute(f"""
-        SELECT 
-            MAX(wpm) as highest_wpm,
-            MIN(wpm) as lowest_wpm,
-            AVG(wpm) as avg_wpm,
-            MAX(accuracy * 100) as highest_acc,
-            MIN(accuracy * 100) as lowest_acc,
-            AVG(accuracy * 100) as avg_acc
-        FROM session_history
-        WHERE completed = 1 {where_clause} {ignore_sql}
-    """, params)
-    row = cur.fetchone()
-    highest_wpm = row[0]
-    lowest_wpm = row[1]
-    avg_wpm = row[2]
-    highest_acc = row[3]
-    lowest_acc = row[4]
-    avg_acc = row[5]
-    
-    # Get most characters typed in a single day
-    cur.execute(f"""
-        SELECT DATE(recorded_at) as day, SUM(correct_keystrokes + incorrect_keystrokes) as total_chars
-        FROM session_history
-        WHERE completed = 1 {where_clause} {ignore_sql}
-        GROUP BY DATE(recorded_at)
-        ORDER BY total_chars DESC
-        LIMIT 1
-    """, params)
-    row = cur.fetchone()
-    most_chars_day = row[1] if row else 0
-    
-    # Get most sessions completed in a single day
-    cur.execute(f"""
-        SELECT DATE(recorded_at) as day, COUNT(*) as session_count
-        FROM session_history
-        WHERE completed = 1 {where_clause} {ignore_sql}
-        GROUP BY DATE(recorded_at)
-        ORDER BY session_count DESC
-        LIMIT 1
+        SELECT MAX(total_chars), MAX(session_count)
+        FROM (
+            SELECT SUM(typed_chars) as total_chars,
+                   SUM(sessions) as session_count
+            FROM {source}
+            WHERE completed = 1 {where_clause}
+            GROUP BY day
+        )
     """, params)
     row = cur.fetchone()
-    most_sessions_day = row[1] if row else 0
+    most_chars_day = row[0] or 0
+    most_sessions_day = row[1] or 0
     
     conn.close()
     
@@ -1112,32 +2130,28 @@ def get_wpm_distribution(languages: Optional[List[str]] = None, bucket_size: int
         where_clause += " AND auto_indent = ?"
         params.append(1 if auto_indent else 0)
     
-    ignore_sql = _get_global_ignore_sql()
-    # Get all WPM values from completed sessions
+    ignore_sql, ignore_params = _ignored_paths_filter_sql(cur)
+    # Count sessions per bucket in SQL; only the non-empty buckets come back
     cur.execute(f"""
-        SELECT wpm FROM session_history
-        WHERE completed = 1 {where_clause} {ignore_sql}
-    """, params)
-    rows = cur.fetchall()
+        SELECT CAST(wpm / ? AS INTEGER) AS bucket, COUNT(*)
+        FROM session_history
+        WHERE completed = 1 AND wpm >= 0 {where_clause} {ignore_sql}
+        GROUP BY bucket
+    """, [float(bucket_size)] + params + ignore_params)
+    counts = dict(cur.fetchall())
     conn.close()
     
-    if not rows:
-        return []
-    
-    wpms = [row[0] for row in rows if row[0] is not None]
-    if not wpms:
+    if not counts:
         return []
     
-    # Calculate bucket distribution
-    max_wpm = max(wpms)
-    num_buckets = int(max_wpm // bucket_size) + 1
+    num_buckets = max(counts) + 1
     
     # Create buckets
     buckets = []
     for i in range(num_buckets):
         min_wpm = i * bucket_size
         max_wpm_bucket = (i + 1) * bucket_size - 1
-        count = sum(1 for w in wpms if min_wpm <= w < (i + 1) * bucket_size)
+        count = counts.get(i, 0)
         
         if count > 0 or i < 10:  # Always show first 10 buckets even if empty
             buckets.append({
@@ -1154,6 +2168,55 @@ def get_wpm_distribution(languages: Optional[List[str]] = None, bucket_size: int
     return buckets
 
 
+def get_wpm_percentiles(
+    languages: Optional[List[str]] = None,
+    auto_indent: Optional[bool] = None,
+    percentiles: Iterable[int] = (50, 90, 99),
+) -> Dict[int, float]:
+    """Get nearest-rank WPM percentiles of completed sessions.
+    
+    Each percentile is a single ``ORDER BY wpm LIMIT 1 OFFSET ?`` lookup
+    served by idx_session_history_completed_wpm, so no raw rows are fetched.
+    
+    Returns:
+        Dict mapping each requested percentile to its WPM (empty if no data)
+    """
+    conn = _connect_for_stats()
+    cur = conn.cursor()
+    
+    where_clause = ""
+    params: List[Any] = []
+    if languages:
+        placeholders = ",".join(["?"] * len(languages))
+        where_clause += f" AND language IN ({placeholders})"
+        params.extend(languages)
+    if auto_indent is not None:
+        where_clause += " AND auto_indent = ?"
+        params.append(1 if auto_indent else 0)
+    
+    ignore_sql, ignore_params = _ignored_paths_filter_sql(cur)
+    params.extend(ignore_params)
+    base_sql = f"""
+        FROM session_history
+        WHERE completed = 1 AND wpm IS NOT NULL {where_clause} {ignore_sql}
+    """
+    cur.execute(f"SELECT COUNT(*) {base_sql}", params)
+    total = cur.fetchone()[0]
+    
+    result: Dict[int, float] = {}
+    if total:
+        for pct in percentiles:
+            rank = max(1, -(-pct * total // 100))  # ceil(pct / 100 * total)
+            cur.execute(
+                f"SELECT wpm {base_sql} ORDER BY wpm LIMIT 1 OFFSET ?",
+                params + [min(rank, total) - 1],
+            )
+            result[pct] = cur.fetchone()[0]
+    
+    conn.close()
+    return result
+
+
 def get_sessions_over_time(languages: Optional[List[str]] = None, auto_indent: Optional[bool] = None) -> List[Dict[str, Any]]:
     """Get session data over time for scatter plot.
     
@@ -1203,6 +2266,45 @@ def get_sessions_over_time(languages: Optional[List[str]] = None, auto_indent: O
     return result
 
 
+def _history_days_source(
+    cur: sqlite3.Cursor,
+    live_where: str,
+    live_params: List[Any],
+    archived_where: str,
+    archived_params: List[Any],
+) -> Tuple[str, List[Any]]:
+    """Per-day session totals of live and archived sessions.
+
+    ``live_where`` filters session_history rows; ``archived_where`` the
+    archived_daily_stats rows, which have the same columns except ``day``
+    in place of recorded_at. The global ignore rules apply to both. A day
+    can appear twice (live and archived), so callers re-group by day.
+
+    Returns:
+        (sql, params): a parenthesised subquery to use as a FROM source,
+        with ``day`` and the session_daily_stats total columns
+    """
+    ignore_sql = _get_global_ignore_sql()
+    sql = f"""
+        SELECT DATE(recorded_at) AS day, {_DAILY_STATS_AGGREGATES}
+        FROM session_history
+        WHERE {live_where} {ignore_sql}
+        GROUP BY 1
+    """
+    params = list(live_params)
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archived_daily_stats'")
+    if cur.fetchone() is not None:
+        sql += f"""
+        UNION ALL
+        SELECT day, {_DAILY_STATS_TOTALS}
+        FROM archived_daily_stats
+        WHERE {archived_where} {ignore_sql}
+        GROUP BY 1
+        """
+        params.extend(archived_params)
+    return f"({sql})", params
+
+
 def get_trend_data(
     languages: Optional[List[str]] = None,
     days: Optional[int] = None,
@@ -1230,34 +2332,38 @@ def get_trend_data(
         where_parts.append(f"language IN ({placeholders})")
         params.extend(languages)
     
+    live_parts, live_params = list(where_parts), list(params)
     if days is not None:
-        where_parts.append("recorded_at >= datetime('now', ?)")
+        live_parts.append("recorded_at >= datetime('now', ?)")
+        live_params.append(f"-{days} days")
+        # Archived sessions are kept per day
+        where_parts.append("day >= DATE('now', ?)")
         params.append(f"-{days} days")
     
-    where_clause = " AND ".join(where_parts)
+    source, source_params = _history_days_source(
+        cur, " AND ".join(live_parts), live_params, " AND ".join(where_parts), params
+    )
     
     # Build GROUP BY based on aggregation
     if aggregation == "week":
         # Group by year and week number
-        date_expr = "strftime('%Y-W%W', recorded_at)"
+        date_expr = "strftime('%Y-W%W', day)"
     elif aggregation == "month":
         # Group by year and month
-        date_expr = "strftime('%Y-%m', recorded_at)"
+        date_expr = "strftime('%Y-%m', day)"
     else:
         # Default to day
-        date_expr = "DATE(recorded_at)"
+        date_expr = "day"
     
-    ignore_sql = _get_global_ignore_sql()
     cur.execute(f"""
         SELECT {date_expr} as period,
-               AVG(wpm) as avg_wpm,
-               AVG(accuracy) * 100 as avg_accuracy,
-               COUNT(*) as session_count
-        FROM session_history
-        WHERE {where_clause} {ignore_sql}
+               SUM(wpm_sum) / SUM(sessions) as avg_wpm,
+               SUM(accuracy_sum) * 100 / SUM(sessions) as avg_accuracy,
+               SUM(sessions) as session_count
+        FROM {source}
         GROUP BY period
         ORDER BY period ASC
-    """, params)
+    """, source_params)
     rows = cur.fetchall()
     conn.close()
     
@@ -1308,32 +2414,37 @@ def get_daily_metrics(
         where_parts.append("auto_indent = ?")
         params.append(1 if auto_indent else 0)
     
+    live_parts, live_params = list(where_parts), list(params)
     if start_date:
-        where_parts.append("DATE(recorded_at) >= ?")
+        live_parts.append("DATE(recorded_at) >= ?")
+        live_params.append(start_date)
+        where_parts.append("day >= ?")
         params.append(start_date)
     
     if end_date:
-        where_parts.append("DATE(recorded_at) <= ?")
+        live_parts.append("DATE(recorded_at) <= ?")
+        live_params.append(end_date)
+        where_parts.append("day <= ?")
         params.append(end_date)
     
-    ignore_sql = _get_global_ignore_sql()
-    where_clause = " AND ".join(where_parts) + ignore_sql
+    source, source_params = _history_days_source(
+        cur, " AND ".join(live_parts), live_params, " AND ".join(where_parts), params
+    )
     
     cur.execute(f"""
-        SELECT DATE(recorded_at) as date,
+        SELECT day as date,
                SUM(total_keystrokes) as total_chars,
-               COUNT(*) as completed_sessions,
-               AVG(wpm) as avg_wpm,
-               MAX(wpm) as highest_wpm,
-               MIN(wpm) as lowest_wpm,
-               AVG(accuracy) * 100 as avg_accuracy,
-               MAX(accuracy) * 100 as highest_accuracy,
-               MIN(accuracy) * 100 as lowest_accuracy
-        FROM session_history
-        WHERE {where_clause}
-        GROUP BY DATE(recorded_at)
+               SUM(sessions) as completed_sessions,
+               SUM(wpm_sum) / SUM(sessions) as avg_wpm,
+               MAX(wpm_max) as highest_wpm,
+               MIN(wpm_min) as lowest_wpm,
+               SUM(accuracy_sum) * 100 / SUM(sessions) as avg_accuracy,
+               MAX(accuracy_max) * 100 as highest_accuracy,
+               MIN(accuracy_min) * 100 as lowest_accuracy
+        FROM {source}
+        GROUP BY day
         ORDER BY date ASC
-    """, params)
+    """, source_params)
     rows = cur.fetchall()
     conn.close()
     
@@ -1378,20 +2489,20 @@ def get_per_language_stats() -> List[Dict[str, Any]]:
     conn = _connect_for_stats()
     cur = conn.cursor()
     
-    ignore_sql = _get_global_ignore_sql()
+    source, params = _daily_stats_source(cur)
     cur.execute(f"""
         SELECT 
             language,
-            COUNT(*) as session_count,
-            AVG(wpm) as avg_wpm,
-            AVG(accuracy) * 100 as avg_accuracy,
+            SUM(sessions) as session_count,
+            SUM(wpm_sum) / SUM(sessions) as avg_wpm,
+            SUM(accuracy_sum) * 100 / SUM(sessions) as avg_accuracy,
             SUM(total_keystrokes) as total_chars,
-            MAX(wpm) as best_wpm
-        FROM session_history
-        WHERE completed = 1 AND language IS NOT NULL AND language != '' {ignore_sql}
+            MAX(wpm_max) as best_wpm
+        FROM {source}
+        WHERE completed = 1 AND language != ''
         GROUP BY language
         ORDER BY session_count DESC
-    """)
+    """, params)
     
     rows = cur.fetchall()
     conn.close()
@@ -1420,6 +2531,11 @@ def get_available_years() -> List[int]:
         years = [int(row[0]) for row in rows if row[0]]
     except Exception:
         years = []
+    try:
+        cur.execute("SELECT DISTINCT SUBSTR(day, 1, 4) FROM archived_daily_stats")
+        years.extend(int(row[0]) for row in cur.fetchall())
+    except sqlite3.OperationalError:
+        pass  # Not migrated yet
     conn.close()
     
     current_year = datetime.now().year
@@ -1437,39 +2553,28 @@ def get_current_streak() -> int:
     conn = _connect_for_stats()
     cur = conn.cursor()
     
-    ignore_sql = _get_global_ignore_sql()
-    # Get all unique dates with completed sessions, ordered descending
+    source, params = _daily_stats_source(cur)
     cur.execute(f"""
-        SELECT DISTINCT DATE(recorded_at) as date
-        FROM session_history
-        WHERE completed = 1 {ignore_sql}
-        ORDER BY date DESC
-    """)
-    
-    rows = cur.fetchall()
-    conn.close()
-    
-    if not rows:
-        return 0
-    
-    from datetime import datetime, timedelta
-    
-    dates = [datetime.strptime(row[0], "%Y-%m-%d").date() for row in rows]
+        SELECT DISTINCT day
+        FROM {source}
+        WHERE completed = 1
+        ORDER BY day DESC
+    """, params)
+
     today = datetime.now().date()
     yesterday = today - timedelta(days=1)
-    
-    # Streak must start from today or yesterday
-    if dates[0] != today and dates[0] != yesterday:
-        return 0
-    
-    streak = 1
-    for i in range(1, len(dates)):
-        expected_date = dates[i-1] - timedelta(days=1)
-        if dates[i] == expected_date:
-            streak += 1
-        else:
+    streak = 0
+    expected = None
+    for (day_str,) in cur:
+        day = datetime.strptime(day_str, "%Y-%m-%d").date()
+        # Streak must start from today or yesterday
+        if expected is None and day != today and day != yesterday:
             break
-    
+        if expected is not None and day != expected:
+            break
+        streak += 1
+        expected = day - timedelta(days=1)
+    conn.close()
     return streak
 
 
@@ -1503,20 +2608,18 @@ def get_trend_comparison(days: int = 30, languages: Optional[List[str]] = None)
         lang_params = list(languages)
     
     def get_period_stats(start_date, end_date):
-        params = [start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")] + lang_params
-        ignore_sql = _get_global_ignore_sql()
+        source, params = _daily_stats_source(
+            cur, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+        )
         cur.execute(f"""
             SELECT 
-                COUNT(*) as sessions,
-                AVG(wpm) as avg_wpm,
-                AVG(accuracy) * 100 as avg_accuracy,
+                SUM(sessions) as sessions,
+                SUM(wpm_sum) / SUM(sessions) as avg_wpm,
+                SUM(accuracy_sum) * 100 / SUM(sessions) as avg_accuracy,
                 SUM(total_keystrokes) as total_chars
-            FROM session_history
-            WHERE completed = 1 
-              AND DATE(recorded_at) >= ? 
-              AND DATE(recorded_at) <= ?
-              {lang_clause} {ignore_sql}
-        """, params)
+            FROM {source}
+            WHERE completed = 1 {lang_clause}
+        """, params + lang_params)
         row = cur.fetchone()
         return {
             "sessions": row[0] or 0,
@@ -1,10 +1,10 @@
 """Stats tab widget for visualizing typing statistics and performance metrics."""
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
 from PySide6.QtCore import Qt, Signal, QRectF, QPointF, QDate
-from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QFontMetrics
+from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QFontMetrics, QPixmap
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -21,6 +21,12 @@ from PySide6.QtWidgets import (
 
 from app import stats_db
 from app import settings
+from app.chart_data import (
+    PointBucketIndex,
+    linear_regression,
+    lttb_indices,
+    minmax_indices,
+)
 from app.ui_icons import get_pixmap
 
 
@@ -501,9 +507,13 @@ class SummaryStatCard(QFrame):
 class WPMDistributionChart(QWidget):
     """Bar chart showing WPM distribution across sessions."""
     
+    # Selectable bucket widths in WPM
+    BUCKET_SIZES = [5, 10, 20, 25]
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.data: List[Dict] = []  # List of {range_label, count}
+        self.percentiles: Dict[int, float] = {}  # {50: wpm, 90: wpm, ...}
         self.hover_index: Optional[int] = None
         
         # Colors will be set from theme
@@ -533,9 +543,10 @@ class WPMDistributionChart(QWidget):
         self._update_colors()
         self.update()
     
-    def set_data(self, data: List[Dict]):
-        """Set the distribution data."""
+    def set_data(self, data: List[Dict], percentiles: Optional[Dict[int, float]] = None):
+        """Set the distribution data and optional percentile markers."""
         self.data = data
+        self.percentiles = percentiles or {}
         self.update()
     
     def _chart_rect(self) -> QRectF:
@@ -547,6 +558,18 @@ class WPMDistributionChart(QWidget):
             self.height() - self.margin_top - self.margin_bottom
         )
     
+    def _wpm_to_x(self, wpm: float) -> Optional[float]:
+        """Map a WPM value onto the bucket axis, or None if off the chart."""
+        if not self.data:
+            return None
+        rect = self._chart_rect()
+        first = self.data[0]
+        bucket_size = first["max_wpm"] - first["min_wpm"] + 1
+        position = (wpm - first["min_wpm"]) / bucket_size
+        if position < 0 or position > len(self.data):
+            return None
+        return rect.x() + position * (rect.width() / len(self.data))
+    
     def _get_bar_rect(self, index: int) -> QRectF:
         """Get the rectangle for a specific bar."""
         if not self.data:
@@ -664,6 +687,19 @@ class WPMDistributionChart(QWidget):
             painter.setFont(font)
             painter.drawText(label_rect, Qt.AlignCenter, bucket["range_label"])
         
+        # Percentile markers
+        font.setPointSize(8)
+        painter.setFont(font)
+        for pct, wpm in sorted(self.percentiles.items()):
+            marker_x = self._wpm_to_x(wpm)
+            if marker_x is None:
+                continue
+            painter.setPen(QPen(self.text_color, 1, Qt.DashLine))
+            painter.drawLine(QPointF(marker_x, rect.y()), QPointF(marker_x, rect.y() + rect.height()))
+            painter.setPen(self.text_color)
+            painter.drawText(QRectF(marker_x + 3, rect.y(), 80, 14),
+                             Qt.AlignLeft | Qt.AlignVCenter, f"p{pct} {wpm:.0f}")
+        
         # Draw axes
         painter.setPen(QPen(self.grid_color, 2))
         painter.drawLine(QPointF(rect.x(), rect.y()), 
@@ -759,6 +795,14 @@ class CalendarHeatmap(QWidget):
         self._hovered_date: Optional[str] = None
         self._hovered_rect: Optional[QRectF] = None
         
+        # Per-year cell grid {date: (rect, level, tooltip)} and month label
+        # positions, rebuilt on data/year/metric changes. The static layer is
+        # rendered once into a pixmap; hover only paints an overlay.
+        self._cells: Dict[str, Tuple[QRectF, int, str]] = {}
+        self._month_positions: List[Tuple[float, str]] = []
+        self._grid_year: Optional[int] = None
+        self._pixmap: Optional[QPixmap] = None
+        
         # Calculate size based on 54 weeks (buffer for Jan alignment)
         total_width = self._weekday_label_width + 54 * (self._cell_size + self._cell_gap)
         total_height = self._month_label_height + 7 * (self._cell_size + self._cell_gap) + 30
@@ -769,23 +813,23 @@ class CalendarHeatmap(QWidget):
         """Set the year to display."""
         if self._year != year:
             self._year = year
-            self.update()
+            self._invalidate()
 
     def set_metric(self, metric: str):
         """Set the metric to display."""
         if metric != self._metric:
             self._metric = metric
             self._process_data()
-            self.update()
+            self._invalidate()
 
     def _process_data(self):
         """Process raw daily data into the display format."""
         self._data = {}
         for entry in self._daily_data:
-            date = entry.get("date")
+            date_str = entry.get("date")
             value = entry.get(self._metric, 0)
-            if date:
-                self._data[date] = float(value)
+            if date_str:
+                self._data[date_str] = float(value)
 
     def _update_colors(self):
         """Sync with current theme colors."""
@@ -805,12 +849,19 @@ class CalendarHeatmap(QWidget):
         """Update heatmap data."""
         self._daily_data = daily_data
         self._process_data()
+        self._invalidate()
+
+    def _invalidate(self):
+        """Drop the cached grid and pixmap so the next paint rebuilds them."""
+        self._grid_year = None
+        self._pixmap = None
         self.update()
 
-    def _get_heat_level(self, value: float) -> int:
+    def _get_heat_level(self, value: float, max_val: Optional[float] = None) -> int:
         if not self._data or value <= 0:
             return 0
-        max_val = max(self._data.values()) if self._data else 1
+        if max_val is None:
+            max_val = max(self._data.values())
         if max_val <= 0: return 0
         ratio = value / max_val
         if ratio <= 0: return 0
@@ -824,19 +875,57 @@ class CalendarHeatmap(QWidget):
         y = self._month_label_height + day * (self._cell_size + self._cell_gap)
         return QRectF(x, y, self._cell_size, self._cell_size)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        self._update_colors()
+    def _grid_start(self) -> date:
+        """Sunday of the week containing Jan 1st of the displayed year."""
+        jan_first = date(self._year, 1, 1)
+        return jan_first - timedelta(days=(jan_first.weekday() + 1) % 7)
 
-        # Start from the Sunday of the week containing Jan 1st
-        start_date = QDate(self._year, 1, 1)
-        offset = start_date.dayOfWeek() % 7 # 0=Sun, 1=Mon...
-        start_date = start_date.addDays(-offset)
-        end_date = QDate(self._year, 12, 31)
+    def _format_tooltip(self, day: date, value: float) -> str:
+        if self._metric == "total_chars": value_str = f"{int(value):,} chars"
+        elif self._metric == "completed_sessions": value_str = f"{int(value)} sessions"
+        else: value_str = f"{value:.1f}"
+        return f"{day.strftime('%d %b %Y')}: {value_str}"
+
+    def _ensure_grid(self):
+        """Compute cell rects, heat levels and tooltips for the displayed year."""
+        if self._grid_year == self._year:
+            return
+        self._grid_year = self._year
+        self._pixmap = None
+
+        max_val = max(self._data.values(), default=0)
+        start = self._grid_start()
+        day = date(self._year, 1, 1)
+        end = date(self._year, 12, 31)
+        self._cells = {}
+        self._month_positions = []
+        while day <= end:
+            offset = (day - start).days
+            week, day_of_week = divmod(offset, 7)
+            if day.day == 1:
+                x_pos = self._weekday_label_width + week * (self._cell_size + self._cell_gap)
+                self._month_positions.append((x_pos, day.strftime("%b")))
+            date_str = day.isoformat()
+            value = self._data.get(date_str, 0)
+            self._cells[date_str] = (
+                self._get_cell_rect(week, day_of_week),
+                self._get_heat_level(value, max_val),
+                self._format_tooltip(day, value),
+            )
+            day += timedelta(days=1)
+
+    def _render_pixmap(self) -> QPixmap:
+        """Render cells, labels and legend for the current year."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
 
         # Draw weekday labels
-        font = painter.font()
+        font = QFont(self.font())
         font.setPointSize(9)
         painter.setFont(font)
         painter.setPen(self._text_color)
@@ -847,49 +936,15 @@ class CalendarHeatmap(QWidget):
                 painter.drawText(QRectF(0, y, self._weekday_label_width - 6, self._cell_size),
                                Qt.AlignRight | Qt.AlignVCenter, label)
 
-        current_month = -1
-        month_positions = []
-        current_date = start_date
-        week = 0
-        self._hovered_rect = None
-        
         # Draw cells
-        while current_date <= end_date or current_date.dayOfWeek() % 7 != 0:
-            day_of_week = current_date.dayOfWeek() % 7
-            
-            # Month track
-            if current_date.year() == self._year and current_date.month() != current_month:
-                current_month = current_date.month()
-                x_pos = self._weekday_label_width + week * (self._cell_size + self._cell_gap)
-                month_name = current_date.toString("MMM")
-                month_positions.append((x_pos, month_name))
-
-            if current_date.year() == self._year:
-                rect = self._get_cell_rect(week, day_of_week)
-                date_str = current_date.toString("yyyy-MM-dd")
-                value = self._data.get(date_str, 0)
-                level = self._get_heat_level(value)
-                color = self._heat_levels[level]
-                
-                painter.setBrush(QBrush(color))
-                painter.setPen(Qt.NoPen)
-                painter.drawRoundedRect(rect, 2, 2)
-
-                if date_str == self._hovered_date:
-                    painter.setPen(QPen(self._colors["text_primary"], 1.5))
-                    painter.setBrush(Qt.NoBrush)
-                    painter.drawRoundedRect(rect.adjusted(-0.5, -0.5, 0.5, 0.5), 2, 2)
-                    self._hovered_rect = rect
-
-            current_date = current_date.addDays(1)
-            if current_date.dayOfWeek() % 7 == 0:
-                week += 1
-            if current_date.year() > self._year and current_date.dayOfWeek() % 7 == 0:
-                break
+        painter.setPen(Qt.NoPen)
+        for rect, level, _ in self._cells.values():
+            painter.setBrush(QBrush(self._heat_levels[level]))
+            painter.drawRoundedRect(rect, 2, 2)
 
         # Render month names
         painter.setPen(self._text_color)
-        for x_pos, month_name in month_positions:
+        for x_pos, month_name in self._month_positions:
             painter.drawText(QRectF(x_pos, 0, 40, self._month_label_height), Qt.AlignLeft | Qt.AlignVCenter, month_name)
 
         # Legend
@@ -907,19 +962,36 @@ class CalendarHeatmap(QWidget):
         legend_x += len(self._heat_levels) * (self._cell_size + 2) + 5
         painter.drawText(QRectF(legend_x, legend_y, 30, self._cell_size), Qt.AlignLeft | Qt.AlignVCenter, "More")
 
-        # Tooltip
-        if self._hovered_date and self._hovered_rect:
-            value = self._data.get(self._hovered_date, 0)
-            if self._metric == "total_chars": value_str = f"{int(value):,} chars"
-            elif self._metric == "completed_sessions": value_str = f"{int(value)} sessions"
-            else: value_str = f"{value:.1f}"
-            
-            try:
-                date_obj = datetime.strptime(self._hovered_date, "%Y-%m-%d")
-                date_display = date_obj.strftime("%d %b %Y")
-            except: date_display = self._hovered_date
-            
-            tooltip_text = f"{date_display}: {value_str}"
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        self._ensure_grid()
+        ratio = self.devicePixelRatioF()
+        if (
+            self._pixmap is None
+            or self._pixmap.devicePixelRatio() != ratio
+            or self._pixmap.width() != int(self.width() * ratio)
+            or self._pixmap.height() != int(self.height() * ratio)
+        ):
+            self._pixmap = self._render_pixmap()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self._pixmap)
+
+        # Hover overlay
+        cell = self._cells.get(self._hovered_date) if self._hovered_date else None
+        self._hovered_rect = cell[0] if cell else None
+        if cell:
+            rect, _, tooltip_text = cell
+            painter.setPen(QPen(self._colors["text_primary"], 1.5))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(rect.adjusted(-0.5, -0.5, 0.5, 0.5), 2, 2)
+
+            font = QFont(self.font())
+            font.setPointSize(8)
+            painter.setFont(font)
             fm = QFontMetrics(font)
             text_width = fm.horizontalAdvance(tooltip_text) + 16
             tooltip_rect = QRectF(self._hovered_rect.center().x() - text_width/2, self._hovered_rect.y() - 28, text_width, 22)
@@ -938,10 +1010,6 @@ class CalendarHeatmap(QWidget):
             painter.drawText(tooltip_rect, Qt.AlignCenter, tooltip_text)
 
     def mouseMoveEvent(self, event):
-        start_date = QDate(self._year, 1, 1)
-        offset = start_date.dayOfWeek() % 7
-        start_date = start_date.addDays(-offset)
-        
         x, y = event.position().x(), event.position().y()
         if x < self._weekday_label_width or y < self._month_label_height:
             if self._hovered_date: self._hovered_date = None; self.update()
@@ -951,9 +1019,9 @@ class CalendarHeatmap(QWidget):
         day = int((y - self._month_label_height) / (self._cell_size + self._cell_gap))
         
         if 0 <= day <= 6 and week >= 0:
-            hovered_date = start_date.addDays(week * 7 + day)
-            if hovered_date.year() == self._year:
-                date_str = hovered_date.toString("yyyy-MM-dd")
+            hovered_date = self._grid_start() + timedelta(days=week * 7 + day)
+            if hovered_date.year == self._year:
+                date_str = hovered_date.isoformat()
                 if date_str != self._hovered_date:
                     self._hovered_date = date_str
                     self.update()
@@ -967,6 +1035,7 @@ class CalendarHeatmap(QWidget):
 
     def apply_theme(self):
         self._update_colors()
+        self._pixmap = None
         self.update()
 
 
@@ -980,6 +1049,15 @@ class MetricScatterPlot(QWidget):
         self.hover_info: Optional[Tuple[int, str]] = None  # (index, 'point' or 'trend')
         self._ctrl_held = False  # Track Ctrl key state for trend line mode
         
+        # Derived from data once per set_data() rather than on every paint
+        self._values: List[float] = []
+        self._value_range: Tuple[float, float] = (0.0, 100.0)
+        self._trend: Tuple[float, float] = (0, 0)
+        # Screen geometry, rebuilt only when the data or widget size changes
+        self._geometry_key: Optional[Tuple[int, int]] = None
+        self._plot_points: List[Tuple[int, float, float]] = []
+        self._hit_index = PointBucketIndex(())
+        
         # Colors - will be set from theme
         self._update_colors()
         
@@ -1015,6 +1093,11 @@ class MetricScatterPlot(QWidget):
     def set_data(self, data: List[Dict]):
         """Set the session data."""
         self.data = data
+        self.hover_info = None
+        self._values = self._get_processed_values()
+        self._value_range = self._get_range(self._values)
+        self._trend = self._calculate_trend_line(self._values)
+        self._geometry_key = None
         self.update()
     
     def _chart_rect(self) -> QRectF:
@@ -1026,16 +1109,36 @@ class MetricScatterPlot(QWidget):
             self.height() - self.margin_top - self.margin_bottom
         )
     
-    def _date_to_x(self, index: int) -> float:
-        """Convert data index to X coordinate."""
+    def _ensure_geometry(self):
+        """Downsample the points to the chart width and index them for hover."""
+        key = (self.width(), self.height())
+        if key == self._geometry_key:
+            return
+        self._geometry_key = key
+        
         rect = self._chart_rect()
+        values = self._values
+        min_r, max_r = self._value_range
+        # Roughly one point per horizontal pixel is all that can be seen
+        visible = lttb_indices(values, max(3, int(rect.width())))
+        self._plot_points = [
+            (i, self._date_to_x(i, rect), self._val_to_y(values[i], min_r, max_r, rect))
+            for i in visible
+        ]
+        self._hit_index = PointBucketIndex(self._plot_points)
+    
+    def _date_to_x(self, index: int, rect: Optional[QRectF] = None) -> float:
+        """Convert data index to X coordinate."""
+        if rect is None:
+            rect = self._chart_rect()
         if len(self.data) <= 1:
             return rect.x() + rect.width() / 2
         return rect.x() + (index / (len(self.data) - 1)) * rect.width()
     
-    def _val_to_y(self, val: float, min_val: float, max_val: float) -> float:
+    def _val_to_y(self, val: float, min_val: float, max_val: float, rect: Optional[QRectF] = None) -> float:
         """Convert metric value to Y coordinate."""
-        rect = self._chart_rect()
+        if rect is None:
+            rect = self._chart_rect()
         span = max_val - min_val
         if span <= 0:
             span = 10 if self.metric_type == 'wpm' else 20
@@ -1080,28 +1183,7 @@ class MetricScatterPlot(QWidget):
     
     def _calculate_trend_line(self, values: List[float]) -> Tuple[float, float]:
         """Calculate linear regression for trend line. Returns (slope, intercept)."""
-        if len(values) < 2:
-            return 0, values[0] if values else 0
-        
-        n = len(values)
-        x_vals = list(range(n))
-        
-        # Calculate means
-        x_mean = sum(x_vals) / n
-        y_mean = sum(values) / n
-        
-        # Calculate slope and intercept
-        numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_vals, values))
-        denominator = sum((x - x_mean) ** 2 for x in x_vals)
-        
-        if denominator == 0:
-            return 0, y_mean
-        
-        slope = numerator / denominator
-        intercept = y_mean - slope * x_mean
-        
-        return slope, intercept
-    
+        return linear_regression(values)
     
     def mouseMoveEvent(self, event):
         if not self.data: return
@@ -1109,9 +1191,8 @@ class MetricScatterPlot(QWidget):
         rect = self._chart_rect()
         x, y = event.position().x(), event.position().y()
         
-        values = self._get_processed_values()
-        min_r, max_r = self._get_range(values)
-        slope, intercept = self._calculate_trend_line(values)
+        min_r, max_r = self._value_range
+        slope, intercept = self._trend
         
         closest_info = None
         if self._ctrl_held:
@@ -1125,14 +1206,10 @@ class MetricScatterPlot(QWidget):
                     closest_info = (int(x_idx), 'trend')
         else:
             # Normal mode: hover points first, then trend if no point
-            closest_dist = float('inf')
-            for i, val in enumerate(values):
-                px = self._date_to_x(i)
-                py = self._val_to_y(val, min_r, max_r)
-                dist = ((x - px)**2 + (y - py)**2)**0.5
-                if dist < 15 and dist < closest_dist:
-                    closest_dist = dist
-                    closest_info = (i, 'point')
+            self._ensure_geometry()
+            point_idx = self._hit_index.nearest(x, y, 15)
+            if point_idx is not None:
+                closest_info = (point_idx, 'point')
             if closest_info is None and len(self.data) >= 2 and rect.contains(x, y):
                 x_ratio = (x - rect.x()) / rect.width()
                 x_idx = x_ratio * (len(self.data) - 1)
@@ -1182,8 +1259,9 @@ class MetricScatterPlot(QWidget):
             painter.drawText(rect, Qt.AlignCenter, "No session data available")
             return
         
-        values = self._get_processed_values()
-        min_r, max_r = self._get_range(values)
+        self._ensure_geometry()
+        values = self._values
+        min_r, max_r = self._value_range
         font = QFont(); font.setPointSize(9)
         painter.setFont(font)
         
@@ -1209,10 +1287,8 @@ class MetricScatterPlot(QWidget):
         hover_idx, hover_type = self.hover_info if self.hover_info else (None, None)
         point_opacity = 1.0
         
-        # Points
-        for i, val in enumerate(values):
-            px = self._date_to_x(i)
-            py = self._val_to_y(val, min_r, max_r)
+        # Points (downsampled to the chart width)
+        for i, px, py in self._plot_points:
             is_hovered = (hover_idx == i and hover_type == 'point') and not self._ctrl_held
             size = 5 if is_hovered else 3
             p_color = QColor(self.active_color)
@@ -1223,7 +1299,7 @@ class MetricScatterPlot(QWidget):
             
         # Trend Line
         if len(self.data) >= 2:
-            slope, intercept = self._calculate_trend_line(values)
+            slope, intercept = self._trend
             x_start = self._date_to_x(0)
             x_end = self._date_to_x(len(self.data) - 1)
             base_width = 2
@@ -1249,7 +1325,7 @@ class MetricScatterPlot(QWidget):
         if self.hover_info:
             idx, p_type = self.hover_info
             if p_type == 'trend':
-                slope, intercept = self._calculate_trend_line(values)
+                slope, intercept = self._trend
                 unit = "WPM" if self.metric_type == 'wpm' else "%"
                 if abs(slope) < 0.01: trend_desc = f"Your {self.metric_type} is steady"
                 elif slope > 0: trend_desc = f"Your {self.metric_type} is increasing (+{slope:.2f}{unit}/session)"
@@ -1340,6 +1416,15 @@ class DateRangeChart(QWidget):
         self._left_metric = "total_chars"
         self._right_metric = "avg_wpm"
         
+        # Screen geometry, rebuilt when the data, size or metrics change
+        self._geometry_key: Optional[Tuple[int, int, str, str]] = None
+        self._max_left = 1
+        self._max_right = 100
+        self._bars: List[Tuple[int, float, float]] = []
+        self._line_points: List[Tuple[int, float, float]] = []
+        self._bar_index = PointBucketIndex(())
+        self._line_index = PointBucketIndex(())
+        
         # Create controls
         self._setup_controls()
     
@@ -1538,11 +1623,15 @@ class DateRangeChart(QWidget):
     def _on_left_changed(self, index: int):
         """Handle left dropdown change."""
         self._left_metric = self.LEFT_OPTIONS[index][0]
+        self.hover_info = None
+        self._geometry_key = None
         self.update()
     
     def _on_right_changed(self, index: int):
         """Handle right dropdown change."""
         self._right_metric = self.RIGHT_OPTIONS[index][0]
+        self.hover_info = None
+        self._geometry_key = None
         self.update()
     
     def get_date_range(self) -> Tuple[str, str]:
@@ -1556,6 +1645,7 @@ class DateRangeChart(QWidget):
         """Set the chart data."""
         self.data = data
         self.hover_info = None
+        self._geometry_key = None
         self.update()
     
     def _chart_rect(self) -> QRectF:
@@ -1567,9 +1657,10 @@ class DateRangeChart(QWidget):
             self.height() - self.margin_top - self.margin_bottom
         )
     
-    def _x_to_pos(self, idx: int) -> float:
+    def _x_to_pos(self, idx: int, rect: Optional[QRectF] = None) -> float:
         """Convert data index to X position (center of bar)."""
-        rect = self._chart_rect()
+        if rect is None:
+            rect = self._chart_rect()
         if len(self.data) <= 1:
             return rect.x() + rect.width() / 2
         bar_width = rect.width() / len(self.data)
@@ -1600,6 +1691,50 @@ class DateRangeChart(QWidget):
         """Check if right metric is an accuracy metric."""
         return "accuracy" in self._right_metric
     
+    def _right_value(self, d: Dict[str, Any]) -> float:
+        """Right metric value for a day, with accuracy scaled to percent."""
+        val_right = d[self._right_metric]
+        if self._is_right_metric_accuracy() and val_right <= 1.0 and d.get("total_keystrokes", 0) > 0:
+            val_right = (d["correct_keystrokes"] / d["total_keystrokes"]) * 100
+        elif self._is_right_metric_accuracy() and val_right <= 1.0:
+            val_right *= 100
+        return val_right
+    
+    def _ensure_geometry(self):
+        """Compute axis maxima and the downsampled bar/line geometry."""
+        key = (self.width(), self.height(), self._left_metric, self._right_metric)
+        if key == self._geometry_key:
+            return
+        self._geometry_key = key
+        
+        rect = self._chart_rect()
+        left_vals = [d[self._left_metric] for d in self.data]
+        right_vals = [self._right_value(d) for d in self.data]
+        
+        max_left = max(1, max(left_vals, default=1))
+        # Round up to nice number
+        magnitude = 10 ** (len(str(int(max_left))) - 1)
+        self._max_left = ((int(max_left) // magnitude) + 1) * magnitude
+        
+        if self._is_right_metric_accuracy():
+            self._max_right = 100
+        else:
+            max_right = max((d[self._right_metric] for d in self.data), default=1)
+            self._max_right = ((int(max_right) // 20) + 1) * 20
+        
+        # Long ranges have more days than pixels; keep each column's extremes
+        columns = max(1, int(rect.width()))
+        self._bars = [
+            (i, self._x_to_pos(i, rect), self._left_to_y(left_vals[i], self._max_left))
+            for i in minmax_indices(left_vals, columns)
+        ]
+        self._line_points = [
+            (i, self._x_to_pos(i, rect), self._right_to_y(right_vals[i], self._max_right))
+            for i in minmax_indices(right_vals, columns)
+        ]
+        self._bar_index = PointBucketIndex(self._bars)
+        self._line_index = PointBucketIndex(self._line_points)
+    
     def mouseMoveEvent(self, event):
         """Track mouse for hover tooltips."""
         x, y = event.position().x(), event.position().y()
@@ -1610,42 +1745,21 @@ class DateRangeChart(QWidget):
             self.update()
             return
         
-        # Calculate max values
-        max_left = max((d[self._left_metric] for d in self.data), default=1)
-        max_left = max(1, max_left)
-        
-        if self._is_right_metric_accuracy():
-            max_right = 100
-        else:
-            max_right = max((d[self._right_metric] for d in self.data), default=1)
-            max_right = ((int(max_right) // 20) + 1) * 20
-        
-        closest_dist = float('inf')
+        self._ensure_geometry()
         closest_info = None
         bar_width = self._bar_width()
+        bar_bottom = rect.y() + rect.height()
         
-        for i, d in enumerate(self.data):
-            px = self._x_to_pos(i)
-            
-            # Check bar hover (within bar width)
-            if abs(x - px) < bar_width / 2:
-                bar_y = self._left_to_y(d[self._left_metric], max_left)
-                if y >= bar_y and y <= rect.y() + rect.height():
-                    closest_info = (i, 'bar')
-                    break
-            
-            # Check line point
-            val_right = d[self._right_metric]
-            if self._is_right_metric_accuracy() and val_right <= 1.0 and d.get("total_keystrokes", 0) > 0:
-                val_right = (d["correct_keystrokes"] / d["total_keystrokes"]) * 100
-            elif self._is_right_metric_accuracy() and val_right <= 1.0:
-                val_right *= 100
-                
-            py_line = self._right_to_y(val_right, max_right)
-            dist = ((x - px) ** 2 + (y - py_line) ** 2) ** 0.5
-            if dist < 12 and dist < closest_dist:
-                closest_dist = dist
-                closest_info = (i, 'line')
+        # Bars take priority over line points
+        for i, px, bar_y in self._bar_index.candidates(x, bar_width / 2):
+            if abs(x - px) < bar_width / 2 and bar_y <= y <= bar_bottom:
+                closest_info = (i, 'bar')
+                break
+        
+        if closest_info is None:
+            point_idx = self._line_index.nearest(x, y, 12)
+            if point_idx is not None:
+                closest_info = (point_idx, 'line')
         
         self.hover_info = closest_info
         self.update()
@@ -1673,18 +1787,9 @@ class DateRangeChart(QWidget):
             painter.drawText(rect, Qt.AlignCenter, "No data for selected date range")
             return
         
-        # Calculate max values
-        max_left = max((d[self._left_metric] for d in self.data), default=1)
-        max_left = max(1, max_left)
-        # Round up to nice number
-        magnitude = 10 ** (len(str(int(max_left))) - 1)
-        max_left = ((int(max_left) // magnitude) + 1) * magnitude
-        
-        if self._is_right_metric_accuracy():
-            max_right = 100
-        else:
-            max_right = max((d[self._right_metric] for d in self.data), default=1)
-            max_right = ((int(max_right) // 20) + 1) * 20
+        self._ensure_geometry()
+        max_left = self._max_left
+        max_right = self._max_right
         
         font = QFont()
         font.setPointSize(9)
@@ -1740,52 +1845,29 @@ class DateRangeChart(QWidget):
         bar_width = self._bar_width()
         
         # Draw bars (left metric)
-        for i, d in enumerate(self.data):
-            px = self._x_to_pos(i)
-            val = d[self._left_metric]
-            bar_top = self._left_to_y(val, max_left)
-            bar_bottom = rect.y() + rect.height()
-            bar_height = bar_bottom - bar_top
-            
+        bar_bottom = rect.y() + rect.height()
+        painter.setPen(Qt.NoPen)
+        for i, px, bar_top in self._bars:
             is_hovered = (hover_idx == i and hover_type == 'bar')
             
             # Bar fill
-            bar_rect = QRectF(px - bar_width / 2, bar_top, bar_width, bar_height)
+            bar_rect = QRectF(px - bar_width / 2, bar_top, bar_width, bar_bottom - bar_top)
             if is_hovered:
                 painter.setBrush(self.bar_color.lighter(130))
             else:
                 painter.setBrush(self.bar_color)
-            painter.setPen(Qt.NoPen)
             painter.drawRect(bar_rect)
         
         # Draw line (right metric)
-        if len(self.data) >= 1:
+        if self._line_points:
             # Draw connecting line
-            if len(self.data) >= 2:
+            if len(self._line_points) >= 2:
                 painter.setPen(QPen(self.line_color, 2))
-                for i in range(len(self.data) - 1):
-                    x1 = self._x_to_pos(i)
-                    val1 = self.data[i][self._right_metric]
-                    if self._is_right_metric_accuracy() and val1 <= 1.0: val1 *= 100
-                    y1 = self._right_to_y(val1, max_right)
-                    
-                    x2 = self._x_to_pos(i + 1)
-                    val2 = self.data[i + 1][self._right_metric]
-                    if self._is_right_metric_accuracy() and val2 <= 1.0: val2 *= 100
-                    y2 = self._right_to_y(val2, max_right)
-                    
+                for (_, x1, y1), (_, x2, y2) in zip(self._line_points, self._line_points[1:]):
                     painter.drawLine(QPointF(x1, y1), QPointF(x2, y2))
             
             # Draw points
-            for i, d in enumerate(self.data):
-                px = self._x_to_pos(i)
-                val_right = d[self._right_metric]
-                if self._is_right_metric_accuracy() and val_right <= 1.0 and d.get("total_keystrokes", 0) > 0:
-                    val_right = (d["correct_keystrokes"] / d["total_keystrokes"]) * 100
-                elif self._is_right_metric_accuracy() and val_right <= 1.0:
-                    val_right *= 100
-                    
-                py = self._right_to_y(val_right, max_right)
+            for i, px, py in self._line_points:
                 is_hovered = (hover_idx == i and hover_type == 'line')
                 size = 5 if is_hovered else 3
                 
@@ -2404,6 +2486,95 @@ class ErrorTypePieChart(QWidget):
 
 
 
+class BigramChart(QWidget):
+    """Horizontal bars for the slowest or most error-prone character pairs."""
+    MODE_OPTIONS = [
+        ("slowest", "Slowest"),
+        ("errors", "Most Errors"),
+    ]
+    # Whitespace is invisible as a label, so show a glyph for it
+    CHAR_GLYPHS = {" ": "\u2423", "\n": "\u21b5", "\t": "\u21e5"}
+    ROW_HEIGHT = 26
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data: List[Dict[str, Any]] = []
+        self.mode = "slowest"
+        self.setMinimumHeight(120)
+        self._update_colors()
+
+    def _update_colors(self):
+        colors = get_theme_colors()
+        self.bg_color = colors["bg_secondary"]
+        self.text_primary = colors["text_primary"]
+        self.text_secondary = colors["text_secondary"]
+        self.bar_colors = {
+            "slowest": colors.get("warning", QColor("#ff9100")),
+            "errors": colors.get("error", QColor("#ff1744")),
+        }
+
+    def apply_theme(self):
+        self._update_colors()
+        self.update()
+
+    def set_data(self, data: List[Dict[str, Any]], mode: str = "slowest"):
+        self.data = data
+        self.mode = mode
+        self.setFixedHeight(max(120, len(data) * self.ROW_HEIGHT + 24))
+        self.update()
+
+    def _format_pair(self, entry: Dict[str, Any]) -> str:
+        return "".join(self.CHAR_GLYPHS.get(c, c) for c in (entry["char1"], entry["char2"]))
+
+    def _bar_value(self, entry: Dict[str, Any]) -> float:
+        return entry["avg_ms"] if self.mode == "slowest" else entry["error_rate"]
+
+    def _format_value(self, entry: Dict[str, Any]) -> str:
+        if self.mode == "slowest":
+            return f"{entry['avg_ms']:.0f} ms  ({entry['correct_count']} samples)"
+        attempts = entry["correct_count"] + entry["error_count"]
+        return f"{entry['error_rate'] * 100:.1f}%  ({entry['error_count']}/{attempts})"
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect()
+
+        if not self.data:
+            painter.setPen(self.text_secondary)
+            painter.drawText(rect, Qt.AlignCenter, "Not enough bigram data yet")
+            return
+
+        label_w = 60
+        value_w = 170
+        left = 20 + label_w
+        bar_max_w = max(40, rect.width() - left - value_w - 20)
+        max_val = max(self._bar_value(e) for e in self.data) or 1
+        bar_color = self.bar_colors.get(self.mode, self.text_secondary)
+
+        y = 12
+        for entry in self.data:
+            row = QRectF(20, y, label_w - 10, self.ROW_HEIGHT - 6)
+            painter.setFont(QFont("JetBrains Mono", 11, QFont.Bold))
+            painter.setPen(self.text_primary)
+            painter.drawText(row, Qt.AlignVCenter | Qt.AlignRight, self._format_pair(entry))
+
+            bar_w = max(2, bar_max_w * self._bar_value(entry) / max_val)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(bar_color)
+            painter.drawRoundedRect(QRectF(left, y + 3, bar_w, self.ROW_HEIGHT - 12), 3, 3)
+
+            painter.setFont(QFont("Inter", 9))
+            painter.setPen(self.text_secondary)
+            painter.drawText(
+                QRectF(left + bar_w + 8, y, value_w, self.ROW_HEIGHT - 6),
+                Qt.AlignVCenter | Qt.AlignLeft,
+                self._format_value(entry),
+            )
+            y += self.ROW_HEIGHT
+
+
+
 class StatsTab(QWidget):
     """Tab providing visualizations and statistics of typing performance."""
     
@@ -2607,6 +2778,28 @@ class StatsTab(QWidget):
         
         self.error_pie_chart = ErrorTypePieChart()
         self.content_layout.addWidget(self.error_pie_chart)
+
+        # Bigram Breakdown
+        bigram_header = QHBoxLayout()
+        bigram_header.setSpacing(12)
+        bigram_header.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
+        bigram_header.setContentsMargins(0, 16, 0, 0)
+        self.bigram_label = QLabel("Weakest Bigrams")
+        self.bigram_label.setStyleSheet(label_style)
+        bigram_header.addWidget(self.bigram_label)
+
+        self.bigram_mode_combo = QComboBox()
+        for key, label in BigramChart.MODE_OPTIONS:
+            self.bigram_mode_combo.addItem(label, key)
+        self.bigram_mode_combo.setFixedWidth(140)
+        self.bigram_mode_combo.setStyleSheet(self._get_combo_style())
+        self.bigram_mode_combo.currentIndexChanged.connect(self._on_bigram_mode_changed)
+        bigram_header.addWidget(self.bigram_mode_combo)
+        bigram_header.addStretch()
+        self.content_layout.addLayout(bigram_header)
+
+        self.bigram_chart = BigramChart()
+        self.content_layout.addWidget(self.bigram_chart)
         
         # WPM Over Time
         wpm_scatter_header = QHBoxLayout()
@@ -2643,6 +2836,16 @@ class StatsTab(QWidget):
         self.bar_label = QLabel("WPM Distribution")
         self.bar_label.setStyleSheet(label_style)
         bar_header.addWidget(self.bar_label)
+        
+        # Bucket width selector
+        self.wpm_bucket_combo = QComboBox()
+        for size in WPMDistributionChart.BUCKET_SIZES:
+            self.wpm_bucket_combo.addItem(f"{size} WPM buckets", size)
+        self.wpm_bucket_combo.setFixedWidth(140)
+        self.wpm_bucket_combo.setStyleSheet(self._get_combo_style())
+        self.wpm_bucket_combo.currentIndexChanged.connect(self._on_wpm_bucket_changed)
+        bar_header.addWidget(self.wpm_bucket_combo)
+        bar_header.addStretch()
         self.content_layout.addLayout(bar_header)
         
         self.wpm_distribution_chart = WPMDistributionChart()
@@ -2710,6 +2913,20 @@ class StatsTab(QWidget):
         else:
             self.calendar_heatmap._year = datetime.now().year
 
+        # WPM distribution bucket size
+        bucket_size = settings.get_setting("stats_wpm_bucket_size", settings.get_default("stats_wpm_bucket_size"))
+        bucket_idx = self.wpm_bucket_combo.findData(int(bucket_size)) if str(bucket_size).isdigit() else -1
+        self.wpm_bucket_combo.blockSignals(True)
+        self.wpm_bucket_combo.setCurrentIndex(bucket_idx if bucket_idx >= 0 else self.wpm_bucket_combo.findData(10))
+        self.wpm_bucket_combo.blockSignals(False)
+
+        # Bigram ordering
+        bigram_mode = settings.get_setting("stats_bigram_mode", settings.get_default("stats_bigram_mode"))
+        mode_idx = self.bigram_mode_combo.findData(bigram_mode)
+        self.bigram_mode_combo.blockSignals(True)
+        self.bigram_mode_combo.setCurrentIndex(mode_idx if mode_idx >= 0 else 0)
+        self.bigram_mode_combo.blockSignals(False)
+
         # Keyboard Shift
         kb_shift = settings.get_setting("stats_kb_shift", "0") == "1"
         self.kb_shift_btn.setChecked(kb_shift)
@@ -2730,6 +2947,16 @@ class StatsTab(QWidget):
             if year_val:
                 settings.set_setting("stats_heatmap_year", str(year_val))
 
+        # WPM distribution bucket size
+        bucket_size = self.wpm_bucket_combo.currentData()
+        if bucket_size:
+            settings.set_setting("stats_wpm_bucket_size", str(bucket_size))
+
+        # Bigram ordering
+        bigram_mode = self.bigram_mode_combo.currentData()
+        if bigram_mode:
+            settings.set_setting("stats_bigram_mode", bigram_mode)
+
         # Keyboard Shift
         settings.set_setting("stats_kb_shift", "1" if self.kb_shift_btn.isChecked() else "0")
 
@@ -2744,6 +2971,18 @@ class StatsTab(QWidget):
             self.calendar_heatmap.set_metric(metric)
             self._save_stats_preferences()
     
+    def _on_wpm_bucket_changed(self, index: int):
+        """Handle WPM distribution bucket size change."""
+        self._save_stats_preferences()
+        langs = list(self._selected_languages) if self._selected_languages else None
+        self._update_wpm_distribution(langs, self.indent_filter.get_selected_value())
+    
+    def _on_bigram_mode_changed(self, index: int):
+        """Handle bigram chart ordering change."""
+        self._save_stats_preferences()
+        langs = list(self._selected_languages) if self._selected_languages else None
+        self._update_bigram_stats(langs)
+
     def _on_filter_changed(self, selected_languages: Set[str]):
         """Handle language filter change."""
         self._selected_languages = selected_languages
@@ -2807,6 +3046,7 @@ class StatsTab(QWidget):
         self._update_calendar_heatmap(langs)
         self._update_keyboard_heatmap()
         self._update_error_type_stats(langs)
+        self._update_bigram_stats(langs)
         self._update_scatter_chart(langs, auto_indent)
         self._update_wpm_distribution(langs, auto_indent)
     
@@ -2895,8 +3135,12 @@ class StatsTab(QWidget):
     
     def _update_wpm_distribution(self, languages_list=None, auto_indent=None):
         """Update the WPM distribution bar chart."""
-        distribution_data = stats_db.get_wpm_distribution(languages=languages_list, auto_indent=auto_indent)
-        self.wpm_distribution_chart.set_data(distribution_data)
+        bucket_size = self.wpm_bucket_combo.currentData() or 10
+        distribution_data = stats_db.get_wpm_distribution(
+            languages=languages_list, bucket_size=bucket_size, auto_indent=auto_indent
+        )
+        percentiles = stats_db.get_wpm_percentiles(languages=languages_list, auto_indent=auto_indent)
+        self.wpm_distribution_chart.set_data(distribution_data, percentiles)
 
     def _update_keyboard_heatmap(self):
         """Update the keyboard accuracy heatmap."""
@@ -2909,6 +3153,12 @@ class StatsTab(QWidget):
         """Update the error type breakdown pie chart."""
         error_data = stats_db.get_error_type_stats(languages_list)
         self.error_pie_chart.set_data(error_data)
+
+    def _update_bigram_stats(self, languages_list=None):
+        """Update the weakest bigrams chart."""
+        mode = self.bigram_mode_combo.currentData() or "slowest"
+        bigrams = stats_db.get_bigram_stats(languages_list, order_by=mode)
+        self.bigram_chart.set_data(bigrams, mode)
     
     
     def apply_theme(self):
@@ -2989,6 +3239,12 @@ class StatsTab(QWidget):
             self.heatmap_metric_combo.setStyleSheet(self._get_combo_style())
         if hasattr(self, 'heatmap_year_combo'):
             self.heatmap_year_combo.setStyleSheet(self._get_combo_style())
+        if hasattr(self, 'wpm_bucket_combo'):
+            self.wpm_bucket_combo.setStyleSheet(self._get_combo_style())
+        if hasattr(self, 'bigram_mode_combo'):
+            self.bigram_mode_combo.setStyleSheet(self._get_combo_style())
+        if hasattr(self, 'bigram_label'):
+            self.bigram_label.setStyleSheet(label_style)
         if hasattr(self, 'wpm_scatter_label'):
             self.wpm_scatter_label.setStyleSheet(label_style)
         if hasattr(self, 'acc_scatter_label'):
@@ -3028,4 +3284,6 @@ class StatsTab(QWidget):
         self.keyboard_heatmap.apply_theme()
         if hasattr(self, 'error_pie_chart'):
             self.error_pie_chart.apply_theme()
+        if hasattr(self, 'bigram_chart'):
+            self.bigram_chart.apply_theme()
         self.wpm_distribution_chart.apply_theme()
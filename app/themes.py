@@ -3,17 +3,25 @@
 This module provides theme definitions and application logic for the typing app.
 Themes include complete color schemes for UI elements, text editor, and all widgets.
 """
+import hashlib
 import logging
 import re
 import json
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, Set
+from dataclasses import dataclass, asdict, field, fields
 import app.settings as settings
 
 logger = logging.getLogger(__name__)
 
-# Cache for generated stylesheets to avoid regeneration
+# Cache for generated stylesheets to avoid regeneration, keyed by theme_key()
 _stylesheet_cache: Dict[str, str] = {}
+# QPalette per theme_key(), built on first apply
+_palette_cache: Dict[str, Any] = {}
+# Tokens of the scheme last applied by apply_theme_to_app()
+_applied_tokens: Dict[str, str] = {}
+# ColorScheme fields read inside record_token_reads(), when active
+_token_reads: Optional[Set[str]] = None
 
 # Regex pattern for validating hex colors (#RGB or #RRGGBB)
 _HEX_COLOR_PATTERN = re.compile(r'^#(?:[0-9a-fA-F]{3}){1,2}$')
@@ -205,11 +213,47 @@ def get_color_scheme(theme: str = "dark", scheme: str = "nord") -> ColorScheme:
     # 1. Check custom themes (full ColorScheme dicts)
     customs = _get_custom_themes()
     if theme in customs and scheme in customs[theme]:
-        return ColorScheme.from_dict(customs[theme][scheme])
-    
-    # 2. Check built-in palettes (RawPalette -> generator)
-    raw_palette = THEME_MAP.get(scheme, NORD) # Default to Nord
-    return create_from_palette(raw_palette)
+        result = ColorScheme.from_dict(customs[theme][scheme])
+    else:
+        # 2. Check built-in palettes (RawPalette -> generator)
+        raw_palette = THEME_MAP.get(scheme, NORD) # Default to Nord
+        result = create_from_palette(raw_palette)
+    if _token_reads is not None:
+        result = _RecordingScheme(**asdict(result))
+    return result
+
+
+class _RecordingScheme(ColorScheme):
+    """ColorScheme noting which fields are read (see record_token_reads)."""
+
+    def __getattribute__(self, name: str):
+        reads = _token_reads
+        if reads is not None and name in _SCHEME_FIELDS:
+            reads.add(name)
+        return object.__getattribute__(self, name)
+
+
+_SCHEME_FIELDS = frozenset(f.name for f in fields(ColorScheme))
+
+
+@contextmanager
+def record_token_reads() -> Iterator[Set[str]]:
+    """Collect the ColorScheme fields read from get_color_scheme() results.
+
+    Re-theming code wrapped in this reveals which tokens it depends on, so
+    a later ThemeChange can skip it when none of them changed. Schemes
+    obtained before the block are not tracked.
+    """
+    global _token_reads
+    outer = _token_reads
+    reads: Set[str] = set()
+    _token_reads = reads
+    try:
+        yield reads
+    finally:
+        _token_reads = outer
+        if outer is not None:
+            outer |= reads
 
 def is_builtin_theme(theme: str, scheme: str) -> bool:
     """Check if a theme is built-in (and unmodified)."""
@@ -235,9 +279,7 @@ def generate_app_stylesheet(scheme: ColorScheme) -> str:
     ui_family = settings.get_setting("ui_font_family", settings.get_default("ui_font_family"))
     ui_size = settings.get_setting("ui_font_size", settings.get_default("ui_font_size"))
     
-    # Create cache key from all scheme colors and fonts to ensure updates
-    colors_key = "|".join(f"{k}:{v}" for k, v in sorted(scheme.to_dict().items()))
-    cache_key = f"{colors_key}|font:{ui_family}|size:{ui_size}"
+    cache_key = theme_key(scheme, ui_family, ui_size)
     
     # Return cached stylesheet if available
     if cache_key in _stylesheet_cache:
@@ -595,12 +637,110 @@ def generate_app_stylesheet(scheme: ColorScheme) -> str:
     return stylesheet
 
 
-def apply_theme_to_app(app, scheme: ColorScheme):
+@dataclass
+class ThemeChange:
+    """What apply_theme_to_app() actually had to touch.
+
+    Falsy when the theme was already in place, so callers can skip
+    re-theming their own widgets.
+    """
+    tokens: Set[str] = field(default_factory=set)  # ColorScheme fields whose value changed
+    stylesheet: bool = False  # The application stylesheet was replaced
+
+    def __bool__(self) -> bool:
+        return bool(self.tokens) or self.stylesheet
+
+
+def theme_key(scheme: ColorScheme, ui_family: str = "", ui_size: str = "") -> str:
+    """Hash of a scheme's colors and the UI font, used as the cache key."""
+    colors = "|".join(f"{k}:{v}" for k, v in sorted(scheme.to_dict().items()))
+    return hashlib.sha1(f"{colors}|font:{ui_family}|size:{ui_size}".encode("utf-8")).hexdigest()
+
+
+def changed_tokens(old: Dict[str, str], new: Dict[str, str]) -> Set[str]:
+    """Names of the tokens whose color differs between two scheme dicts."""
+    return {k for k in new.keys() | old.keys() if old.get(k) != new.get(k)}
+
+
+def build_palette(scheme: ColorScheme):
+    """QPalette matching ``scheme``, for widgets and dialogs the stylesheet doesn't cover."""
+    key = theme_key(scheme)
+    palette = _palette_cache.get(key)
+    if palette is not None:
+        return palette
+
+    from PySide6.QtGui import QColor, QPalette
+
+    palette = QPalette()
+    roles = {
+        QPalette.Window: scheme.bg_primary,
+        QPalette.WindowText: scheme.text_primary,
+        QPalette.Base: scheme.bg_secondary,
+        QPalette.AlternateBase: scheme.bg_tertiary,
+        QPalette.Text: scheme.text_primary,
+        QPalette.PlaceholderText: scheme.text_secondary,
+        QPalette.Button: scheme.button_bg,
+        QPalette.ButtonText: scheme.text_primary,
+        QPalette.BrightText: scheme.error_color,
+        QPalette.Light: scheme.button_hover,
+        QPalette.Mid: scheme.border_color,
+        QPalette.Highlight: scheme.accent_color,
+        QPalette.HighlightedText: scheme.bg_primary,
+        QPalette.ToolTipBase: scheme.bg_tertiary,
+        QPalette.ToolTipText: scheme.text_primary,
+        QPalette.Link: scheme.accent_color,
+        QPalette.LinkVisited: scheme.info_color,
+    }
+    for role, color in roles.items():
+        palette.setColor(role, QColor(color))
+    for role in (QPalette.WindowText, QPalette.Text, QPalette.ButtonText):
+        palette.setColor(QPalette.Disabled, role, QColor(scheme.text_disabled))
+
+    _palette_cache[key] = palette
+    return palette
+
+
+def restyle(widget, stylesheet: str) -> bool:
+    """Set ``widget``'s stylesheet unless it already has exactly this one.
+
+    Qt repolishes the widget and its whole subtree on every setStyleSheet(),
+    even when the text is unchanged, so re-theming code should go through
+    here. Returns whether the stylesheet was replaced.
+    """
+    if widget.styleSheet() == stylesheet:
+        return False
+    widget.setStyleSheet(stylesheet)
+    return True
+
+
+def apply_theme_to_app(app, scheme: ColorScheme, stylesheet: Optional[str] = None) -> ThemeChange:
     """Apply color scheme to entire QApplication.
     
+    The application stylesheet and palette are only replaced when they
+    differ from what is installed, so re-applying the current theme (or
+    editing a color the global stylesheet doesn't use) skips the repolish
+    of the whole widget tree.
+
     Args:
         app: QApplication instance
         scheme: ColorScheme to apply
+        stylesheet: Stylesheet already generated for ``scheme`` (e.g. at startup)
+
+    Returns:
+        ThemeChange describing which tokens changed since the last call.
     """
-    stylesheet = generate_app_stylesheet(scheme)
-    app.setStyleSheet(stylesheet)
+    global _applied_tokens
+    if stylesheet is None:
+        stylesheet = generate_app_stylesheet(scheme)
+
+    tokens = scheme.to_dict()
+    change = ThemeChange(tokens=changed_tokens(_applied_tokens, tokens))
+    _applied_tokens = tokens
+
+    if app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
+        change.stylesheet = True
+    palette = build_palette(scheme)
+    if app.palette() != palette:
+        app.setPalette(palette)
+    return change
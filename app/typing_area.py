@@ -360,7 +360,7 @@ class TypingAreaWidget(QTextEdit):
                 else:
                     self.ghost_accumulated_ms = 0
             except Exception as e:
-                print(f"[GhostRecorder] Failed to resume keystrokes: {e}")
+                logger.warning("[GhostRecorder] Failed to resume keystrokes: %s", e)
                 self.ghost_keystrokes = []
                 self.ghost_accumulated_ms = 0
         else:
@@ -371,7 +371,7 @@ class TypingAreaWidget(QTextEdit):
         
         if self.highlighter:
             self.highlighter.clear_ghost_progress()
-        print(f"[GhostRecorder] Recording initialized (resumed: {bool(resume_data)})")
+        logger.debug("[GhostRecorder] Recording initialized (resumed: %s)", bool(resume_data))
 
     def _recalculate_index_maps(self):
         """Build precise character position mapping and line indices for fast lookup."""
@@ -858,7 +858,7 @@ class TypingAreaWidget(QTextEdit):
             if modifiers & Qt.ControlModifier:
                 # Ctrl+Backspace
                 if self.logging_enabled:
-                    print(f"[BACKSPACE] CTRL+Backspace pressed at pos {self.engine.state.cursor_position}")
+                    logger.info("[BACKSPACE] CTRL+Backspace pressed at pos %d", self.engine.state.cursor_position)
                 self._record_keystroke("<CTRL-BACKSPACE>", True)
                 old_engine_pos = self.engine.state.cursor_position
                 self.engine.process_ctrl_backspace()
@@ -873,7 +873,8 @@ class TypingAreaWidget(QTextEdit):
                 # Regular backspace
                 if self.logging_enabled:
                     removed_char = self.engine.state.content[self.engine.state.cursor_position - 1] if self.engine.state.cursor_position > 0 else "None"
-                    print(f"[PRE-BACKSPACE] Pos: {self.engine.state.cursor_position} | Removing: '{self._display_char_for(removed_char)}'")
+                    logger.info("[PRE-BACKSPACE] Pos: %d | Removing: '%s'",
+                                self.engine.state.cursor_position, self._display_char_for(removed_char))
                 
                 self._record_keystroke("\b", True)
                 if self.engine.state.cursor_position > 0 or self.engine.mistake_at is not None:
@@ -895,7 +896,8 @@ class TypingAreaWidget(QTextEdit):
 
                     if self.logging_enabled:
                         now_expected = self.engine.state.content[new_pos]
-                        print(f"[POST-BACKSPACE] Pos: {new_pos} | Now Expecting: '{self._display_char_for(now_expected)}' (Untyped)")
+                        logger.info("[POST-BACKSPACE] Pos: %d | Now Expecting: '%s' (Untyped)",
+                                    new_pos, self._display_char_for(now_expected))
 
             self.stats_updated.emit()
             return
@@ -931,13 +933,15 @@ class TypingAreaWidget(QTextEdit):
                     all_correct = False
                     # Log failure
                     if self.logging_enabled:
-                        print(f"[TAB-STEP] Expected: '{self._display_char_for(expected_from_engine)}' | Typed: ' ' | Result: WRONG (Red)")
+                        logger.info("[TAB-STEP] Expected: '%s' | Typed: ' ' | Result: WRONG (Red)",
+                                    self._display_char_for(expected_from_engine))
                     # Stop to prevent drawing multiple red indicators at one spot
                     break
                 
                 # Log success
                 if self.logging_enabled:
-                     print(f"[TAB-STEP] Expected: '{self._display_char_for(expected_from_engine)}' | Typed: ' ' | Result: CORRECT (Green)")
+                     logger.info("[TAB-STEP] Expected: '%s' | Typed: ' ' | Result: CORRECT (Green)",
+                                 self._display_char_for(expected_from_engine))
                 
                 if expected_from_engine == "" and not is_correct:
                     # strict mode block
@@ -994,7 +998,8 @@ class TypingAreaWidget(QTextEdit):
             if self.logging_enabled:
                 if self.engine.state.cursor_position < len(self.engine.state.content):
                     pre_expected = self.engine.state.content[self.engine.state.cursor_position]
-                    print(f"[PRE-INPUT] Pos: {self.engine.state.cursor_position} | Expecting: '{self._display_char_for(pre_expected)}' (Untyped)")
+                    logger.info("[PRE-INPUT] Pos: %d | Expecting: '%s' (Untyped)",
+                                self.engine.state.cursor_position, self._display_char_for(pre_expected))
 
             # Process keystroke
             is_correct, expected, skipped_count = self.engine.process_keystroke(char, space_per_tab=self.space_per_tab)
@@ -1002,7 +1007,9 @@ class TypingAreaWidget(QTextEdit):
             # Log expected vs actual if enabled
             if self.logging_enabled:
                 status = "CORRECT (Green)" if is_correct else "WRONG (Red)"
-                print(f"[INPUT] Key: '{self._display_char_for(char)}' | Expected: '{self._display_char_for(expected)}' | Result: {status} | Pos: {self.engine.state.cursor_position}")
+                logger.info("[INPUT] Key: '%s' | Expected: '%s' | Result: %s | Pos: %d",
+                            self._display_char_for(char), self._display_char_for(expected),
+                            status, self.engine.state.cursor_position)
             
             # If engine was paused and is now running, emit typing_resumed signal
             if was_paused and not self.engine.state.is_paused:
@@ -1289,5 +1296,5 @@ class TypingAreaWidget(QTextEdit):
         """Enable or disable logging of typed characters to terminal."""
         self.logging_enabled = enabled
         if enabled:
-            print("[TypingArea] Logging enabled")
+            logger.info("[TypingArea] Logging enabled")
 
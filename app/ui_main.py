@@ -46,32 +46,47 @@ from PySide6.QtWidgets import (
 )
 import logging
 from PySide6.QtGui import QIcon, QColor, QFontDatabase
-from PySide6.QtCore import Qt, Signal, QObject, QSize, QTimer
+from PySide6.QtCore import Qt, Signal, QObject, QSize, QThreadPool, QTimer
 import sys
 import json
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Set
 import logging
 
 logger = logging.getLogger(__name__)
 
+import importlib
 import app.settings as settings
-from app.languages_tab import LanguagesTab
-from app.history_tab import HistoryTab
-from app.editor_tab import EditorTab
-from app.stats_tab import StatsTab
-from app.shortcuts_tab import ShortcutsTab
 from app.ui_profile_widgets import ProfileTrigger
-from app.ui_profile_selector import ProfileManagerDialog
 from app.profile_manager import get_profile_manager
 from app.profile_transition import ProfileTransitionOverlay # NEW
+from app.profile_switch import (
+    ProfilePrefetchTask, ProfileSnapshot, ProfileSnapshotCache, db_stamp, load_profile_snapshot,
+    recount_folder_sessions,
+)
 from PySide6.QtWidgets import QGraphicsBlurEffect # NEW
 from PySide6.QtCore import QPropertyAnimation, QEasingCurve # NEW
 from app.ui_icons import get_pixmap, get_icon
+from app.themes import restyle
+from app.history_maintenance import (
+    RETENTION_CHANGE_DELAY_MS, RETENTION_STARTUP_DELAY_MS, CompactDatabaseTask, RetentionCleanupTask,
+)
+from app.db_backup import BACKUP_CHECK_INTERVAL_MS, BACKUP_STARTUP_DELAY_MS, BackupTask, backup_due
 # Toggle for startup timing debug output - set to False in production
 DEBUG_STARTUP_TIMING = True
 
+# Tabs that start as placeholders: attribute -> (module, class, label, icon).
+# Their modules are imported on first use, so only the shell and the Folders
+# tab have to load before the window is first painted.
+LAZY_TABS = {
+    "languages_tab": ("app.languages_tab", "LanguagesTab", "Languages", "CODE"),
+    "history_tab": ("app.history_tab", "HistoryTab", "History", "CLOCK"),
+    "stats_tab": ("app.stats_tab", "StatsTab", "Stats", "CHART"),
+    "editor_tab": ("app.editor_tab", "EditorTab", "Typing", "TYPING"),
+    "shortcuts_tab": ("app.shortcuts_tab", "ShortcutsTab", "Shortcuts", "KEYBOARD"),
+}
+
 
 class FolderCardWidget(QFrame):
     """Stylized folder row used within the folders list."""
@@ -668,20 +683,31 @@ class FoldersTab(QWidget):
             logging.info(f"Opening folder in typing tab: {folder_path}")
             parent_window.open_typing_tab(folder_path)
 
-    def load_folders(self):
-        """Load folders using custom FolderCardWidget."""
+    def load_folders(self, folders: Optional[List[dict]] = None, summaries: Optional[Dict[str, tuple]] = None):
+        """Load folders using custom FolderCardWidget.
+
+        ``folders`` and ``summaries`` come from a profile-switch prefetch;
+        otherwise they are read and scanned here.
+        """
         if DEBUG_STARTUP_TIMING:
             import time
             t0 = time.time()
         
         self.list.clear()
         
-        folders = settings.get_folders()
+        if folders is None:
+            folders = settings.get_folders()
         is_remove_mode = hasattr(self, 'edit_btn') and self.edit_btn.isChecked()
         
         # Collect folder stats from file scanner and session history
-        from app.file_scanner import scan_folders as scan_folder_files
-        from app import stats_db
+        if summaries is None:
+            from app.profile_switch import summarize_folders
+            try:
+                summaries = summarize_folders(folders, settings.get_current_db_path())
+            except Exception:
+                logging.exception("Failed to summarize folders")
+                summaries = {}
+        self.folder_summaries = summaries
         
         for i, folder_data in enumerate(folders):
             # Create widget
@@ -701,29 +727,11 @@ class FoldersTab(QWidget):
             card.attach(self.list, item)
             self.list.setItemWidget(item, card)
             
-            # Compute stats if folder exists
-            if card.folder_exists():
-                try:
-                    # Scan for files (quick since already cached in most cases)
-                    language_files = scan_folder_files([path_str])
-                    file_count = sum(len(files) for files in language_files.values())
-                    language_count = len(language_files)
-                    
-                    # Count sessions for files in this folder
-                    session_count = 0
-                    try:
-                        all_sessions = stats_db.fetch_session_history(limit=10000)
-                        for session in all_sessions:
-                            if session.get('file_path', '').startswith(path_str):
-                                session_count += 1
-                    except Exception:
-                        pass
-                    
-                    card.update_stats(file_count, language_count, session_count)
-                except Exception:
-                    card.update_stats(0, 0, 0)
+            # Stats for existing folders; missing ones still need update_stats
+            # to finalize the layout
+            if card.folder_exists() and path_str in summaries:
+                card.update_stats(*summaries[path_str])
             else:
-                # Still call update_stats to finalize layout
                 card.update_stats(0, 0, 0)
 
             # Important: Update size hint after dynamic content is added
@@ -1063,13 +1071,13 @@ class FoldersTab(QWidget):
         
         # Update header labels
         if hasattr(self, 'title_label'):
-            self.title_label.setStyleSheet(f"font-size: 18pt; font-weight: bold; color: {scheme.text_primary};")
+            restyle(self.title_label, f"font-size: 18pt; font-weight: bold; color: {scheme.text_primary};")
         if hasattr(self, 'desc_label'):
-            self.desc_label.setStyleSheet(f"color: {scheme.text_secondary}; font-size: 10pt;")
+            restyle(self.desc_label, f"color: {scheme.text_secondary}; font-size: 10pt;")
 
         # Update Search Bar (Crucial)
         if hasattr(self, 'folder_search_bar'):
-            self.folder_search_bar.setStyleSheet(f"""
+            restyle(self.folder_search_bar, f"""
                 QLineEdit {{
                     background-color: {scheme.bg_secondary};
                     color: {scheme.text_primary};
@@ -1108,12 +1116,12 @@ class FoldersTab(QWidget):
                 color: {scheme.text_primary};
             }}
         """
-        if hasattr(self, 'btn_all'): self.btn_all.setStyleSheet(tab_style)
-        if hasattr(self, 'btn_fav'): self.btn_fav.setStyleSheet(tab_style)
-        if hasattr(self, 'btn_rec'): self.btn_rec.setStyleSheet(tab_style)
+        if hasattr(self, 'btn_all'): restyle(self.btn_all, tab_style)
+        if hasattr(self, 'btn_fav'): restyle(self.btn_fav, tab_style)
+        if hasattr(self, 'btn_rec'): restyle(self.btn_rec, tab_style)
         
         # Update list widget styling to maintain clean look
-        self.list.setStyleSheet("""
+        restyle(self.list, """
             QListWidget {
                 background: transparent;
                 border: none;
@@ -1137,7 +1145,7 @@ class FoldersTab(QWidget):
         """)
 
         # Update toolbar buttons
-        self.add_btn.setStyleSheet(f"""
+        restyle(self.add_btn, f"""
             QPushButton {{
                 background-color: {scheme.success_color};
                 color: white;
@@ -1157,7 +1165,7 @@ class FoldersTab(QWidget):
             # Green icon matching button, with white outline
             self.add_btn.setIcon(get_icon("PLUS", color_override=scheme.success_color, outline_color="white"))
         
-        self.edit_btn.setStyleSheet(f"""
+        restyle(self.edit_btn, f"""
             QPushButton {{
                 background-color: {scheme.error_color};
                 color: white;
@@ -1221,11 +1229,13 @@ class MainWindow(QMainWindow):
         if DEBUG_STARTUP_TIMING:
             print(f"  [INIT] QMainWindow.__init__: {time.time() - t:.3f}s")
         
-        if DEBUG_STARTUP_TIMING:
-            t = time.time()
-        settings.init_db()
-        if DEBUG_STARTUP_TIMING:
-            print(f"  [INIT] DB initialization: {time.time() - t:.3f}s")
+        # Normally done by the startup pipeline already
+        if not settings.is_db_initialized():
+            if DEBUG_STARTUP_TIMING:
+                t = time.time()
+            settings.init_db()
+            if DEBUG_STARTUP_TIMING:
+                print(f"  [INIT] DB initialization: {time.time() - t:.3f}s")
         
         # Initialize sound manager
         if DEBUG_STARTUP_TIMING:
@@ -1323,6 +1333,28 @@ class MainWindow(QMainWindow):
         # Connect Profile Signals
         self.pm.profile_updated.connect(self._on_profile_updated)
         self.pm.profile_switched.connect(self.switch_profile)
+
+        # Profile switch prefetch (see start_profile_transition)
+        self._profile_cache = ProfileSnapshotCache()
+        self._prefetch_task: Optional[ProfilePrefetchTask] = None
+        self._prefetched: Optional[ProfileSnapshot] = None
+        self._switch_waiting: Optional[str] = None
+        # Tabs whose data belongs to the previous profile until next shown
+        self._stale_tabs = set()
+        # Scheme tokens each re-themed part of the window reads (see _theme_part)
+        self._theme_token_uses: Dict[str, Set[str]] = {}
+        # Background history retention (see schedule_retention_cleanup)
+        self._retention_task: Optional[RetentionCleanupTask] = None
+        self._retention_timer = QTimer(self)
+        self._retention_timer.setSingleShot(True)
+        self._retention_timer.timeout.connect(self._start_retention_cleanup)
+        # User-started database compaction (see _on_compact_db_clicked)
+        self._compact_task: Optional[CompactDatabaseTask] = None
+        # Scheduled profile backups (see schedule_backup_check)
+        self._backup_task: Optional[BackupTask] = None
+        self._backup_timer = QTimer(self)
+        self._backup_timer.setSingleShot(True)
+        self._backup_timer.timeout.connect(self._check_backup_due)
     
     # Tabs
         if DEBUG_STARTUP_TIMING:
@@ -1337,40 +1369,9 @@ class MainWindow(QMainWindow):
             logging.info(f"[INIT] FoldersTab: {t_add - t:.3f}s")
         self.tabs.addTab(self.folders_tab, get_icon("FOLDER"), "Folders")
         
-        # --- Languages Tab (Immediate) ---
-        if DEBUG_STARTUP_TIMING:
-            t = time.time()
-        self.languages_tab = LanguagesTab()
-        if DEBUG_STARTUP_TIMING:
-            t_add = time.time()
-            logging.info(f"[INIT] LanguagesTab: {t_add - t:.3f}s")
-        self.tabs.addTab(self.languages_tab, get_icon("CODE"), "Languages")
-
-        # --- History Tab (Lazy) ---
-        self.history_tab = QLabel("Loading History...")
-        self.history_tab.setAlignment(Qt.AlignCenter)
-        self.history_tab.setStyleSheet("color: #888888; font-size: 14pt;")
-        self.tabs.addTab(self.history_tab, get_icon("CLOCK"), "History")
-        
-        # --- Stats Tab (Lazy) ---
-        self.stats_tab = QLabel("Loading Stats...")
-        self.stats_tab.setAlignment(Qt.AlignCenter)
-        self.stats_tab.setStyleSheet("color: #888888; font-size: 14pt;")
-        self.tabs.addTab(self.stats_tab, get_icon("CHART"), "Stats")
-        
-        # --- Editor/Typing Tab (Lazy) ---
-        # EditorTab is lightweight in init, but we want to defer its 'ensure_loaded'
-        if DEBUG_STARTUP_TIMING:
-            t = time.time()
-        self.editor_tab = EditorTab()
-        if DEBUG_STARTUP_TIMING:
-            t_add = time.time()
-            logging.info(f"[INIT] EditorTab (init only): {t_add - t:.3f}s")
-        self.tabs.addTab(self.editor_tab, get_icon("TYPING"), "Typing")
-
-        # --- Shortcuts Tab (Immediate) ---
-        self.shortcuts_tab = ShortcutsTab()
-        self.tabs.addTab(self.shortcuts_tab, get_icon("KEYBOARD"), "Shortcuts")
+        # --- Languages, History, Stats, Typing and Shortcuts Tabs (Lazy) ---
+        for attr in LAZY_TABS:
+            self._add_placeholder_tab(attr)
 
         # --- Settings Tab (Lazy) ---
         self.settings_tab = QLabel("Loading Settings...")
@@ -1386,14 +1387,9 @@ class MainWindow(QMainWindow):
         if DEBUG_STARTUP_TIMING:
             logging.info(f"[INIT] setCentralWidget + signals: {time.time() - t:.3f}s")
         
-        # Connect settings signals to editor tab for dynamic updates
-        # (We can connect these now because editor_tab instance exists, even if not fully loaded)
-        if DEBUG_STARTUP_TIMING:
-            t = time.time()
-        self._connect_settings_signals()
-        if DEBUG_STARTUP_TIMING:
-            logging.info(f"[INIT] Connect signals: {time.time() - t:.3f}s")
-        
+        # Settings signals are connected to the editor tab once it is built
+        # (see _ensure_tab)
+
         # Connect profile manager signals
         self.pm.profile_updated.connect(self._on_profile_updated)
         
@@ -1418,40 +1414,73 @@ class MainWindow(QMainWindow):
             logging.info(f"[INIT] QTimer.singleShot (background load): {time.time() - t:.3f}s")
             logging.info(f"[INIT] === TOTAL MainWindow.__init__: {time.time() - t_init_start:.3f}s ===")
 
+    def _add_placeholder_tab(self, attr: str):
+        """Add a 'Loading...' label in place of a lazily built tab."""
+        _, _, label, icon = LAZY_TABS[attr]
+        placeholder = QLabel(f"Loading {label}...")
+        placeholder.setAlignment(Qt.AlignCenter)
+        placeholder.setStyleSheet("color: #888888; font-size: 14pt;")
+        setattr(self, attr, placeholder)
+        self.tabs.addTab(placeholder, get_icon(icon), label)
+
+    def _loaded_tab(self, attr: str) -> Optional[QWidget]:
+        """Return the tab stored in ``attr`` if it has been built, else None."""
+        widget = getattr(self, attr, None)
+        if widget is None or isinstance(widget, QLabel):
+            return None
+        return widget
+
+    def _ensure_tab(self, attr: str) -> QWidget:
+        """Import and build a lazy tab on first use, replacing its placeholder."""
+        widget = self._loaded_tab(attr)
+        if widget is not None:
+            return widget
+
+        if DEBUG_STARTUP_TIMING:
+            import time
+            t = time.time()
+        module_name, class_name, label, _ = LAZY_TABS[attr]
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+        widget = tab_class()
+        self._replace_tab(getattr(self, attr), widget, label)
+        setattr(self, attr, widget)
+        # A new tab already shows the current profile
+        self._stale_tabs.discard(attr)
+
+        if attr == "editor_tab":
+            widget.ensure_loaded()
+            # Connect signals now that typing_area exists
+            self._connect_settings_signals()
+        if DEBUG_STARTUP_TIMING:
+            logging.info(f"[INIT] {class_name} (import + init): {time.time() - t:.3f}s")
+        return widget
+
     def _start_background_loading(self):
         """Start the chain of background tab loading."""
         # 1. Load Languages data (scan) - was previously done separately
-        self.languages_tab.ensure_loaded()
+        self._ensure_tab("languages_tab").ensure_loaded()
         
         # 2. Schedule next step: History Tab
         QTimer.singleShot(50, self._load_history_tab_lazy)
 
     def _load_history_tab_lazy(self):
         """Lazy load history tab."""
-        if isinstance(self.history_tab, QLabel):
-            real_history = HistoryTab()
-            self._replace_tab(self.history_tab, real_history, "History")
-            self.history_tab = real_history
+        self._ensure_tab("history_tab")
         
         # 3. Schedule next step: Stats Tab
         QTimer.singleShot(50, self._load_stats_tab_lazy)
     
     def _load_stats_tab_lazy(self):
         """Lazy load stats tab."""
-        if isinstance(self.stats_tab, QLabel):
-            real_stats = StatsTab()
-            self._replace_tab(self.stats_tab, real_stats, "Stats")
-            self.stats_tab = real_stats
+        self._ensure_tab("stats_tab")
         
         # 4. Schedule next step: Editor Tab content
         QTimer.singleShot(50, self._load_editor_tab_lazy)
 
     def _load_editor_tab_lazy(self):
         """Lazy load editor tab content."""
-        self.editor_tab.ensure_loaded()
-        
-        # Connect signals now that typing_area exists
-        self._connect_settings_signals()
+        self._ensure_tab("editor_tab")
+        self._ensure_tab("shortcuts_tab")
         
         # 5. Schedule next step: Settings Tab
         QTimer.singleShot(50, self._load_settings_tab_lazy)
@@ -1481,10 +1510,14 @@ class MainWindow(QMainWindow):
         if index != -1:
             is_current = (self.tabs.currentIndex() == index)
             icon = self.tabs.tabIcon(index)
+            # The visible tab doesn't change, so don't let the remove/insert
+            # shuffle look like a tab switch (and build neighbouring tabs)
+            self.tabs.blockSignals(True)
             self.tabs.removeTab(index)
             self.tabs.insertTab(index, new_widget, icon, label)
             if is_current:
                 self.tabs.setCurrentIndex(index)
+            self.tabs.blockSignals(False)
             old_widget.deleteLater()
 
     def _on_tab_changed(self, index: int):
@@ -1519,11 +1552,22 @@ class MainWindow(QMainWindow):
         # Existing persistence logic for editor
         typing_index = self.tabs.indexOf(self.editor_tab)
         if typing_index != -1 and self._last_tab_index == typing_index and index != typing_index:
-            self.editor_tab.save_active_progress()
+            if self._loaded_tab("editor_tab"):
+                self.editor_tab.save_active_progress()
+
+        # Build a lazy tab right away if the user opens it before the
+        # background chain got to it
+        current = self.tabs.widget(index)
+        for attr in LAZY_TABS:
+            if current is getattr(self, attr):
+                self._ensure_tab(attr)
+                break
 
         languages_index = self.tabs.indexOf(self.languages_tab)
         if index == languages_index and languages_index != -1:
             self.languages_tab.ensure_loaded()
+
+        self._refresh_stale_tab(self.tabs.widget(index))
             
         self._last_tab_index = index
         
@@ -1718,9 +1762,16 @@ class MainWindow(QMainWindow):
         # self.statusBar().showMessage(f"Theme: {next_scheme}", 2000)
 
     def closeEvent(self, event):
-        """Ensure active typing progress is saved before exit."""
-        if hasattr(self, "editor_tab"):
+        """Ensure active typing progress and queued settings are saved before exit."""
+        if self._loaded_tab("editor_tab"):
             self.editor_tab.save_active_progress()
+        settings.flush_settings()
+        self._retention_timer.stop()
+        if self._retention_task is not None:
+            self._retention_task.cancel()
+        self._backup_timer.stop()
+        if self._backup_task is not None:
+            self._backup_task.cancel()
         super().closeEvent(event)
 
     def _create_settings_tab(self) -> QWidget:
@@ -1822,6 +1873,35 @@ class MainWindow(QMainWindow):
         
         confirm_del = settings.get_setting("delete_confirm", settings.get_default("delete_confirm")) == "1"
         self._update_confirm_del_buttons(confirm_del)
+
+        general_layout.addSpacing(10)
+
+        log_level_label = QLabel("Log Level")
+        log_level_label.setStyleSheet("font-weight: bold;")
+        general_layout.addWidget(log_level_label)
+
+        log_level_desc = QLabel("How much detail is written to the log file. Takes effect immediately.")
+        log_level_desc.setWordWrap(True)
+        log_level_desc.setStyleSheet("color: #888888; font-size: 10pt;")
+        general_layout.addWidget(log_level_desc)
+
+        log_level_row = QHBoxLayout()
+        log_level_row.addWidget(QLabel("Level:"))
+        self.log_level_combo = QComboBox()
+        from app.logging_config import LOG_LEVELS
+        for level in LOG_LEVELS:
+            self.log_level_combo.addItem(level.capitalize(), level)
+        self.log_level_combo.setMinimumWidth(120)
+
+        current_log_level = settings.get_setting("log_level", settings.get_default("log_level"))
+        index = self.log_level_combo.findData(current_log_level)
+        if index >= 0:
+            self.log_level_combo.setCurrentIndex(index)
+
+        self.log_level_combo.currentIndexChanged.connect(self._handle_log_level_changed)
+        log_level_row.addWidget(self.log_level_combo)
+        log_level_row.addStretch()
+        general_layout.addLayout(log_level_row)
         
         general_group.setLayout(general_layout)
         s_layout.addWidget(general_group)
@@ -1919,6 +1999,54 @@ class MainWindow(QMainWindow):
         retention_row.addStretch()
         
         history_layout.addLayout(retention_row)
+
+        archive_row = QHBoxLayout()
+        archive_row.setSpacing(8)
+        archive_row.addWidget(QLabel("Older sessions:"))
+
+        self.archive_combo = QComboBox()
+        self.archive_combo.addItem("Archive (kept for long-term stats)", "1")
+        self.archive_combo.addItem("Delete", "0")
+        self.archive_combo.setMinimumWidth(120)
+        index = self.archive_combo.findData(
+            settings.get_setting("history_archive_expired", settings.get_default("history_archive_expired"))
+        )
+        if index >= 0:
+            self.archive_combo.setCurrentIndex(index)
+        self.archive_combo.currentIndexChanged.connect(self._handle_archive_changed)
+        archive_row.addWidget(self.archive_combo)
+        archive_row.addStretch()
+
+        history_layout.addLayout(archive_row)
+
+        backup_row = QHBoxLayout()
+        backup_row.setSpacing(8)
+        backup_row.addWidget(QLabel("Back up profile:"))
+
+        self.backup_interval_combo = QComboBox()
+        self.backup_interval_combo.addItem("Every 6 hours", "6")
+        self.backup_interval_combo.addItem("Daily", "24")
+        self.backup_interval_combo.addItem("Weekly", "168")
+        self.backup_interval_combo.addItem("Never", "0")
+        self.backup_interval_combo.setMinimumWidth(120)
+        index = self.backup_interval_combo.findData(
+            settings.get_setting("backup_interval_hours", settings.get_default("backup_interval_hours"))
+        )
+        if index >= 0:
+            self.backup_interval_combo.setCurrentIndex(index)
+        self.backup_interval_combo.currentIndexChanged.connect(self._handle_backup_interval_changed)
+        backup_row.addWidget(self.backup_interval_combo)
+
+        self.restore_backup_btn = QPushButton("Restore Backup...")
+        self.restore_backup_btn.clicked.connect(self._on_restore_backup_clicked)
+        backup_row.addWidget(self.restore_backup_btn)
+
+        self.compact_db_btn = QPushButton("Compact Database...")
+        self.compact_db_btn.clicked.connect(self._on_compact_db_clicked)
+        backup_row.addWidget(self.compact_db_btn)
+        backup_row.addStretch()
+
+        history_layout.addLayout(backup_row)
         
         history_group.setLayout(history_layout)
         s_layout.addWidget(history_group)
@@ -2927,6 +3055,26 @@ class MainWindow(QMainWindow):
         
         profile_layout.addStretch()
         sound_layout.addLayout(profile_layout)
+
+        playback_row = QHBoxLayout()
+        playback_row.addWidget(QLabel("Playback:"))
+        self.sound_playback_combo = QComboBox()
+        self.sound_playback_combo.addItem("Sound effects", "0")
+        self.sound_playback_combo.addItem("Software mixing", "1")
+        self.sound_playback_combo.setMinimumWidth(160)
+        self.sound_playback_combo.setToolTip(
+            "Software mixing sums overlapping key sounds into one audio stream "
+            "(16-bit WAV only); falls back to sound effects otherwise"
+        )
+        index = self.sound_playback_combo.findData(
+            settings.get_setting("sound_pcm_mixing", settings.get_default("sound_pcm_mixing"))
+        )
+        if index >= 0:
+            self.sound_playback_combo.setCurrentIndex(index)
+        self.sound_playback_combo.currentIndexChanged.connect(self._handle_sound_playback_changed)
+        playback_row.addWidget(self.sound_playback_combo)
+        playback_row.addStretch()
+        sound_layout.addLayout(playback_row)
         
         sound_group.setLayout(sound_layout)
         s_layout.addWidget(sound_group)
@@ -3154,7 +3302,7 @@ class MainWindow(QMainWindow):
 
     def open_typing_tab(self, folder_path: str):
         """Switch to typing tab and load the specified folder."""
-        self.editor_tab.load_folder(folder_path)
+        self._ensure_tab("editor_tab").load_folder(folder_path)
         self.tabs.setCurrentWidget(self.editor_tab)
 
     def _update_folder_selection_state(self):
@@ -3172,11 +3320,13 @@ class MainWindow(QMainWindow):
     
     def open_typing_tab_for_language(self, language: str, files: list):
         """Switch to typing tab and load files for a specific language."""
-        self.editor_tab.load_language_files(language, files)
+        self._ensure_tab("editor_tab").load_language_files(language, files)
         self.tabs.setCurrentWidget(self.editor_tab)
     
     def refresh_languages_tab(self):
         """Refresh the languages tab after folders change."""
+        if not self._loaded_tab("languages_tab"):
+            return  # Scans the current folders when it is built
         self.languages_tab.mark_dirty()
         if self.tabs.currentWidget() is self.languages_tab:
             self.languages_tab.ensure_loaded(force=True)
@@ -3188,8 +3338,8 @@ class MainWindow(QMainWindow):
 
     def refresh_history_tab(self):
         """Refresh the session history tab."""
-        if hasattr(self, "history_tab"):
-            self.history_tab.refresh_history()
+        if hasattr(self, "history_tab") and hasattr(self.history_tab, "refresh"):
+            self.history_tab.refresh()
 
     def refresh_stats_tab(self):
         """Refresh the stats tab after session completion."""
@@ -3811,8 +3961,17 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to reset data directory: {e}")
     
-    def apply_current_theme(self):
-        """Apply the current theme settings to the entire application."""
+    def apply_current_theme(self, stylesheet: Optional[str] = None, force: bool = False):
+        """Apply the current theme settings to the entire application.
+
+        Only the parts of the window that read one of the changed scheme
+        tokens are re-themed (see _theme_part); when nothing changed since
+        the last call, none are.
+
+        Args:
+            stylesheet: Pre-generated stylesheet for the current scheme, if any.
+            force: Re-theme every tab even if nothing changed (new widgets).
+        """
         if DEBUG_STARTUP_TIMING:
             import time
             t_total = time.time()
@@ -3829,18 +3988,28 @@ class MainWindow(QMainWindow):
         if DEBUG_STARTUP_TIMING:
             t = time.time()
         app = QApplication.instance()
-        if app:
-            apply_theme_to_app(app, scheme)
+        change = apply_theme_to_app(app, scheme, stylesheet) if app else None
         if DEBUG_STARTUP_TIMING:
             print(f"  [THEME] apply_theme_to_app: {time.time() - t:.3f}s")
-        
+        if change is not None and not force and not change:
+            return
+        # None: re-theme everything
+        changed = None if change is None or force else change.tokens
+
+        def current_scheme():
+            # Fetched inside each part, so its token reads are recorded
+            return get_color_scheme("dark", scheme_name)
+
         # Update typing area colors if editor tab is initialized
         if DEBUG_STARTUP_TIMING:
             t = time.time()
-        if hasattr(self, 'editor_tab'):
-            self.editor_tab.apply_theme()
-            if hasattr(self.editor_tab, 'typing_area'):
-                self.update_typing_colors(scheme)
+        if self._loaded_tab("editor_tab"):
+            def theme_editor():
+                self.editor_tab.apply_theme()
+                if hasattr(self.editor_tab, 'typing_area'):
+                    self.update_typing_colors(current_scheme())
+            self._theme_part("editor_tab", theme_editor, changed)
+            if hasattr(self.editor_tab, 'typing_area') and (changed is None or change.stylesheet):
                 # Re-apply font settings as global stylesheet might have overridden them
                 self._emit_font_changed()
         if DEBUG_STARTUP_TIMING:
@@ -3848,42 +4017,62 @@ class MainWindow(QMainWindow):
         
         # Update specific tabs
         if hasattr(self, 'folders_tab') and hasattr(self.folders_tab, 'apply_theme'):
-            self.folders_tab.apply_theme()
+            self._theme_part("folders_tab", self.folders_tab.apply_theme, changed)
             
-        if hasattr(self, 'languages_tab') and hasattr(self.languages_tab, 'apply_theme'):
-            self.languages_tab.apply_theme()
+        if self._loaded_tab("languages_tab"):
+            self._theme_part("languages_tab", self.languages_tab.apply_theme, changed)
             
         if hasattr(self, 'history_tab') and not isinstance(self.history_tab, QLabel) and hasattr(self.history_tab, 'apply_theme'):
-            self.history_tab.apply_theme()
+            self._theme_part("history_tab", self.history_tab.apply_theme, changed)
             
         if hasattr(self, 'stats_tab') and not isinstance(self.stats_tab, QLabel) and hasattr(self.stats_tab, 'apply_theme'):
-            self.stats_tab.apply_theme()
+            self._theme_part("stats_tab", self.stats_tab.apply_theme, changed)
             
         if hasattr(self, 'profile_trigger') and hasattr(self.profile_trigger, 'apply_theme'):
-            self.profile_trigger.apply_theme()
+            self._theme_part("profile_trigger", self.profile_trigger.apply_theme, changed)
         
-        if hasattr(self, 'shortcuts_tab') and hasattr(self.shortcuts_tab, 'apply_theme'):
-            self.shortcuts_tab.apply_theme()
+        if self._loaded_tab("shortcuts_tab"):
+            self._theme_part("shortcuts_tab", self.shortcuts_tab.apply_theme, changed)
             
         if not isinstance(self.settings_tab, QLabel):
-            self.update_color_buttons_from_theme()
+            self._theme_part("color_buttons", self.update_color_buttons_from_theme, changed)
 
-        self._update_ignore_inputs_style(scheme)
+        self._theme_part(
+            "ignore_inputs", lambda: self._update_ignore_inputs_style(current_scheme()), changed
+        )
 
         # Update tab icons (ensures icons match theme colors)
-        self.tabs.setTabIcon(self.tabs.indexOf(self.folders_tab), get_icon("FOLDER"))
-        self.tabs.setTabIcon(self.tabs.indexOf(self.languages_tab), get_icon("CODE"))
-        self.tabs.setTabIcon(self.tabs.indexOf(self.history_tab), get_icon("CLOCK"))
-        self.tabs.setTabIcon(self.tabs.indexOf(self.stats_tab), get_icon("CHART"))
-        self.tabs.setTabIcon(self.tabs.indexOf(self.editor_tab), get_icon("TYPING"))
-        self.tabs.setTabIcon(self.tabs.indexOf(self.settings_tab), get_icon("SETTINGS"))
-        self.tabs.setTabIcon(self.tabs.indexOf(self.shortcuts_tab), get_icon("KEYBOARD"))
+        if changed is None or changed:
+            self.tabs.setTabIcon(self.tabs.indexOf(self.folders_tab), get_icon("FOLDER"))
+            self.tabs.setTabIcon(self.tabs.indexOf(self.languages_tab), get_icon("CODE"))
+            self.tabs.setTabIcon(self.tabs.indexOf(self.history_tab), get_icon("CLOCK"))
+            self.tabs.setTabIcon(self.tabs.indexOf(self.stats_tab), get_icon("CHART"))
+            self.tabs.setTabIcon(self.tabs.indexOf(self.editor_tab), get_icon("TYPING"))
+            self.tabs.setTabIcon(self.tabs.indexOf(self.settings_tab), get_icon("SETTINGS"))
+            self.tabs.setTabIcon(self.tabs.indexOf(self.shortcuts_tab), get_icon("KEYBOARD"))
 
         if DEBUG_STARTUP_TIMING:
             print(f"  [THEME] TOTAL apply_current_theme: {time.time() - t_total:.3f}s")
         
-        self.colors_changed.emit()
-    
+        if changed is None or changed:
+            self.colors_changed.emit()
+
+    def _theme_part(self, name: str, apply: Callable[[], None], changed: Optional[Set[str]]):
+        """Run ``apply`` unless it is known not to read any of the ``changed`` tokens.
+
+        The scheme tokens a part reads are recorded each time it runs (and
+        accumulated, in case a later run touches more widgets). Parts that
+        have not run yet, or read no tokens, always run.
+        """
+        from app.themes import record_token_reads
+
+        used = self._theme_token_uses.get(name)
+        if changed is not None and used and not used & changed:
+            return
+        with record_token_reads() as reads:
+            apply()
+        self._theme_token_uses[name] = (used or set()) | reads
+
     def update_typing_colors(self, scheme):
         """Update typing area highlighter colors from scheme."""
         typing_area = self.editor_tab.typing_area
@@ -3918,9 +4107,9 @@ class MainWindow(QMainWindow):
         """
         
         if self.ignored_files_edit:
-            self.ignored_files_edit.setStyleSheet(style)
+            restyle(self.ignored_files_edit, style)
         if self.ignored_folders_edit:
-            self.ignored_folders_edit.setStyleSheet(style)
+            restyle(self.ignored_folders_edit, style)
     
     def update_color_buttons_from_theme(self):
         """Update color picker button displays and labels to reflect theme colors."""
@@ -4070,7 +4259,23 @@ class MainWindow(QMainWindow):
                 self.sound_profile_combo.setCurrentIndex(index)
                 self.sound_profile_combo.blockSignals(False)
         
+        if hasattr(self, 'sound_playback_combo'):
+            current_playback = settings.get_setting("sound_pcm_mixing", settings.get_default("sound_pcm_mixing"))
+            index = self.sound_playback_combo.findData(current_playback)
+            if index >= 0:
+                self.sound_playback_combo.blockSignals(True)
+                self.sound_playback_combo.setCurrentIndex(index)
+                self.sound_playback_combo.blockSignals(False)
+        
         # 8. Global Exclusion settings & History
+        if hasattr(self, 'log_level_combo'):
+            current_log_level = settings.get_setting("log_level", settings.get_default("log_level"))
+            index = self.log_level_combo.findData(current_log_level)
+            if index >= 0:
+                self.log_level_combo.blockSignals(True)
+                self.log_level_combo.setCurrentIndex(index)
+                self.log_level_combo.blockSignals(False)
+
         if hasattr(self, 'retention_combo'):
             current_retention = settings.get_setting("history_retention_days", settings.get_default("history_retention_days"))
             index = self.retention_combo.findData(current_retention)
@@ -4079,6 +4284,24 @@ class MainWindow(QMainWindow):
                 self.retention_combo.setCurrentIndex(index)
                 self.retention_combo.blockSignals(False)
 
+        if hasattr(self, 'backup_interval_combo'):
+            index = self.backup_interval_combo.findData(
+                settings.get_setting("backup_interval_hours", settings.get_default("backup_interval_hours"))
+            )
+            if index >= 0:
+                self.backup_interval_combo.blockSignals(True)
+                self.backup_interval_combo.setCurrentIndex(index)
+                self.backup_interval_combo.blockSignals(False)
+
+        if hasattr(self, 'archive_combo'):
+            index = self.archive_combo.findData(
+                settings.get_setting("history_archive_expired", settings.get_default("history_archive_expired"))
+            )
+            if index >= 0:
+                self.archive_combo.blockSignals(True)
+                self.archive_combo.setCurrentIndex(index)
+                self.archive_combo.blockSignals(False)
+
         if hasattr(self, 'ignored_files_edit'):
             self.ignored_files_edit.setText(settings.get_setting("ignored_files", settings.get_default("ignored_files")))
         if hasattr(self, 'ignored_folders_edit'):
@@ -4251,7 +4474,7 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'folders_tab'):
             self.folders_tab.load_folders()
             
-        if hasattr(self, 'languages_tab'):
+        if self._loaded_tab("languages_tab"):
             self.languages_tab.ensure_loaded(force=True)
             
         if hasattr(self, 'stats_tab') and not isinstance(self.stats_tab, QLabel):
@@ -4286,27 +4509,67 @@ class MainWindow(QMainWindow):
         self.blur_anim.setEasingCurve(QEasingCurve.OutQuad)
         self.blur_anim.start()
         
-        # 3. Start Overlay
+        # 3. Load the target profile's data while the overlay animates
+        self._start_profile_prefetch(target_profile)
+
+        # 4. Start Overlay
         self.transition_overlay.start_transition(
             target_profile, 
             img_path, 
             lambda: self._finish_profile_switch(target_profile)
         )
 
+    def _start_profile_prefetch(self, target_profile: str):
+        """Prepare the target's database and data on the thread pool."""
+        self._prefetched = None
+        self._switch_waiting = None
+        db_path = self.pm.get_db_path(target_profile)
+        if self._profile_cache.get(db_path) is not None:
+            self._prefetch_task = None
+            return
+
+        task = ProfilePrefetchTask(target_profile, db_path)
+        task.signals.finished.connect(self._on_profile_prefetched)
+        task.signals.failed.connect(self._on_profile_prefetch_failed)
+        self._prefetch_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_profile_prefetched(self, snapshot: ProfileSnapshot):
+        if self._prefetch_task is None or snapshot.name != self._prefetch_task.name:
+            return  # Superseded by another switch
+        self._prefetch_task = None
+        self._prefetched = snapshot
+        if self._switch_waiting == snapshot.name:
+            self._finish_profile_switch(snapshot.name)
+
+    def _on_profile_prefetch_failed(self, name: str, error: str):
+        if self._prefetch_task is None or name != self._prefetch_task.name:
+            return
+        # switch_profile loads synchronously and reports errors as before
+        self._prefetch_task = None
+        if self._switch_waiting == name:
+            self._finish_profile_switch(name)
+
     def _finish_profile_switch(self, target_profile: str):
         """Called when overlay animation completes."""
-        # 4. Data Swap (In-Place)
+        # Keep the overlay up until the prefetch has landed
+        if self._prefetch_task is not None and self._prefetch_task.name == target_profile:
+            self._switch_waiting = target_profile
+            return
+        self._switch_waiting = None
+
+        # 5. Data Swap (In-Place)
         self.switch_profile(target_profile)
         
         # Force layout update to ensure new theme/data is rendered
         QApplication.processEvents()
         
-        # 5. Capture NEW state for unblurring
+        # 6. Capture NEW state for unblurring
         # We need to make sure content_container has updated its look
         screenshot = self.content_container.grab()
         self.proxy_label.setPixmap(screenshot)
         
-        # 6. Reverse Blur (20 -> 0px)
+        # 7. Reverse Blur (20 -> 0px)
         self.unblur_anim = QPropertyAnimation(self.blur_effect, b"blurRadius")
         self.unblur_anim.setDuration(400)
         self.unblur_anim.setStartValue(20)
@@ -4319,11 +4582,12 @@ class MainWindow(QMainWindow):
         
         self.unblur_anim.start()
         
-        # 7. Switch to Folders Tab (index 0)
+        # 8. Switch to Folders Tab (index 0)
         self.tabs.setCurrentIndex(0)
 
     def open_profile_manager(self):
         """Open the profile manager dialog."""
+        from app.ui_profile_selector import ProfileManagerDialog
         dialog = ProfileManagerDialog(parent=self)
         
         # Variable to capture selection
@@ -4352,15 +4616,75 @@ class MainWindow(QMainWindow):
             self.profile_trigger.update_profile(name, img_path)
             logger.info(f"Active profile updated: {name}. DB path refreshed.")
 
-    def switch_profile(self, name):
-        """Switch profile and reload data in-place."""
-        if name == self.pm.get_active_profile():
+    def _take_profile_snapshot(self, name: str) -> ProfileSnapshot:
+        """Snapshot for ``name``: prefetched, cached, or loaded right here."""
+        db_path = self.pm.get_db_path(name)
+        snapshot, self._prefetched = self._prefetched, None
+        if snapshot is not None and snapshot.name == name and snapshot.db_path == db_path:
+            return snapshot
+        snapshot = self._profile_cache.get(db_path)
+        if snapshot is not None:
+            return snapshot
+        return load_profile_snapshot(name, db_path)
+
+    def _cache_active_profile(self):
+        """Keep the profile being left warm for switching back to it."""
+        self._profile_cache.capacity = settings.get_setting_int(
+            "profile_cache_size", int(settings.get_default("profile_cache_size")), min_val=0
+        )
+        db_path = settings.get_current_db_path()
+        if db_path is None or self._profile_cache.capacity <= 0:
+            return
+        try:
+            snapshot = ProfileSnapshot(
+                self.pm.get_active_profile(),
+                Path(db_path),
+                settings.cached_settings(),
+                settings.get_folders(),
+                # The tab's counts are from when the profile was entered
+                recount_folder_sessions(getattr(self.folders_tab, 'folder_summaries', {}), db_path),
+            )
+            # Stamp last: reading may have checkpointed the WAL
+            snapshot.stamp = db_stamp(db_path)
+            self._profile_cache.put(snapshot)
+        except Exception:
+            logger.exception("Failed to cache profile snapshot")
+
+    def _refresh_stale_tab(self, widget):
+        """Refresh a tab left over from the previous profile when it is shown."""
+        for attr in list(self._stale_tabs):
+            tab = self._loaded_tab(attr)
+            if tab is None:
+                # Not built yet: it loads the new profile's data on creation
+                self._stale_tabs.discard(attr)
+            elif tab is widget:
+                self._stale_tabs.discard(attr)
+                tab.refresh()
+
+    def switch_profile(self, name, reload: bool = False):
+        """Switch profile and reload data in-place.
+
+        The database work comes from a ProfileSnapshot (prefetched during
+        the transition, cached, or loaded here). Languages, history and
+        stats refresh when they are next shown. ``reload`` re-reads the
+        active profile, e.g. after restoring a backup over it.
+        """
+        if name == self.pm.get_active_profile() and not reload:
             return
             
         # 1. Switch Backend & DB
+        settings.flush_settings()
+        if reload:
+            self._prefetched = None
+            self._profile_cache.discard(self.pm.get_db_path(name))
+        else:
+            self._cache_active_profile()
+        snapshot = self._take_profile_snapshot(name)
         self.pm.switch_profile(name)
-        db_path = self.pm.get_current_db_path()
-        settings.init_db(str(db_path))
+        settings.use_prepared_db(snapshot.db_path, snapshot.settings)
+        self._profile_cache.discard(snapshot.db_path)
+        from app.logging_config import apply_log_level_setting
+        apply_log_level_setting()
         
         # 2. Update Profile Trigger
         all_profiles = self.pm.get_all_profiles()
@@ -4379,25 +4703,11 @@ class MainWindow(QMainWindow):
         
         # Folders
         if hasattr(self, 'folders_tab'):
-            self.folders_tab.load_folders()
-            
-        # Languages
-        if hasattr(self, 'languages_tab'):
-            self.languages_tab.refresh()
+            self.folders_tab.load_folders(snapshot.folders, snapshot.folder_summaries)
             
-        # History
-        if hasattr(self, 'history_tab') and not isinstance(self.history_tab, QLabel):
-            if hasattr(self.history_tab, 'refresh'):
-                self.history_tab.refresh()
-            else:
-                # Reset to lazy state if refresh not supported
-                # For now just assume it handles itself or user won't notice until click
-                pass
-
-        # Stats
-        if hasattr(self, 'stats_tab') and not isinstance(self.stats_tab, QLabel):
-            if hasattr(self.stats_tab, 'refresh'):
-                self.stats_tab.refresh()
+        # Languages, History, Stats: refreshed when shown
+        self._stale_tabs = {"languages_tab", "history_tab", "stats_tab"}
+        self._refresh_stale_tab(self.tabs.currentWidget())
                 
         # Settings - Reload ALL values from new DB
         if hasattr(self, 'settings_tab'):
@@ -4415,7 +4725,7 @@ class MainWindow(QMainWindow):
             self.editor_tab.refresh()
 
         # 4. Refresh Editor Settings, Theme & Notify Listeners
-        self.apply_current_theme() 
+        self.apply_current_theme(force=True)
         self._emit_initial_settings()
         
         # 5. Reset Editor Session if needed
@@ -4462,6 +4772,26 @@ class MainWindow(QMainWindow):
         settings.set_setting("delete_confirm", "1" if enabled else "0")
         self._update_confirm_del_buttons(enabled)
     
+    def _handle_log_level_changed(self):
+        """Handle changes to the log level."""
+        if not hasattr(self, 'log_level_combo'):
+            return
+        level = self.log_level_combo.currentData()
+        if level is not None:
+            settings.set_setting("log_level", level)
+            from app.logging_config import set_log_level
+            set_log_level(level)
+
+    def _handle_sound_playback_changed(self):
+        """Handle switching between sound effects and software mixing."""
+        if not hasattr(self, 'sound_playback_combo'):
+            return
+        value = self.sound_playback_combo.currentData()
+        if value is not None:
+            settings.set_setting("sound_pcm_mixing", value)
+            from app.sound_manager import get_sound_manager
+            get_sound_manager().set_pcm_mixing(value == "1")
+
     def _handle_retention_changed(self):
         """Handle changes to the history retention period."""
         if not hasattr(self, 'retention_combo'):
@@ -4469,6 +4799,139 @@ class MainWindow(QMainWindow):
         days = self.retention_combo.currentData()
         if days is not None:
             settings.set_setting("history_retention_days", str(days))
+            self.schedule_retention_cleanup()
+
+    def _handle_archive_changed(self):
+        """Handle switching between archiving and deleting expired sessions."""
+        value = self.archive_combo.currentData()
+        if value is not None:
+            settings.set_setting("history_archive_expired", value)
+
+    def schedule_retention_cleanup(self, delay_ms: int = RETENTION_CHANGE_DELAY_MS):
+        """Enforce the history retention setting on the thread pool after ``delay_ms``."""
+        self._retention_timer.start(delay_ms)
+
+    def _start_retention_cleanup(self):
+        value = settings.get_setting("history_retention_days", settings.get_default("history_retention_days"))
+        try:
+            days = int(value)
+        except (TypeError, ValueError):
+            days = 0
+        if days <= 0:
+            return
+
+        if self._retention_task is not None:
+            self._retention_task.cancel()
+        archive = settings.get_setting(
+            "history_archive_expired", settings.get_default("history_archive_expired")
+        ) == "1"
+        task = RetentionCleanupTask(days, settings.get_current_db_path(), archive=archive)
+        task.signals.finished.connect(self._on_retention_cleanup_finished)
+        self._retention_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_retention_cleanup_finished(self, deleted: int, free_pages: int):
+        if deleted:
+            # Sessions disappeared from under the history and stats views
+            self._stale_tabs |= {"history_tab", "stats_tab"}
+            self._refresh_stale_tab(self.tabs.currentWidget())
+
+    def _handle_backup_interval_changed(self):
+        """Handle changes to the automatic backup interval."""
+        hours = self.backup_interval_combo.currentData()
+        if hours is not None:
+            settings.set_setting("backup_interval_hours", hours)
+            self.schedule_backup_check(0)
+
+    def schedule_backup_check(self, delay_ms: int = BACKUP_CHECK_INTERVAL_MS):
+        """Check whether the active profile is due a snapshot after ``delay_ms``."""
+        self._backup_timer.start(delay_ms)
+
+    def _check_backup_due(self):
+        self.schedule_backup_check()
+        if self._backup_task is not None:
+            return  # Still running
+        hours = settings.get_setting_int(
+            "backup_interval_hours", int(settings.get_default("backup_interval_hours")), min_val=0
+        )
+        db_path = settings.get_current_db_path()
+        if db_path is None or not backup_due(db_path, hours):
+            return
+
+        settings.flush_settings()
+        keep = settings.get_setting_int("backup_keep", int(settings.get_default("backup_keep")), min_val=1)
+        task = BackupTask(Path(db_path), keep)
+        task.signals.finished.connect(self._on_backup_done)
+        task.signals.failed.connect(self._on_backup_done)
+        self._backup_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_backup_done(self, _result: str):
+        self._backup_task = None
+
+    def _on_restore_backup_clicked(self):
+        """Let the user pick a snapshot of the active profile and restore it."""
+        from PySide6.QtWidgets import QInputDialog
+
+        name = self.pm.get_active_profile()
+        backups = self.pm.list_backups(name)
+        if not backups:
+            QMessageBox.information(self, "Restore Backup", f"There are no backups of '{name}' yet.")
+            return
+
+        labels = [
+            f"{b.created.strftime('%Y-%m-%d %H:%M')}  ({b.size / (1024 * 1024):.1f} MB)" for b in backups
+        ]
+        label, ok = QInputDialog.getItem(self, "Restore Backup", "Restore from:", labels, 0, False)
+        if not ok:
+            return
+        backup = backups[labels.index(label)]
+
+        reply = QMessageBox.question(
+            self, "Restore Backup",
+            f"Replace all data of '{name}' with the backup from {label.split('  ')[0]}?\n\n"
+            "Sessions recorded since then will be lost.",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        if self._loaded_tab("editor_tab"):
+            self.editor_tab.save_active_progress()
+        if not self.pm.restore_backup(name, backup.path):
+            QMessageBox.warning(self, "Restore Backup", "The backup could not be restored. Your data was not changed.")
+            return
+        self.switch_profile(name, reload=True)
+
+    def _on_compact_db_clicked(self):
+        """Return the active profile's free space to the disk, after confirming."""
+        if self._compact_task is not None:
+            return  # Still running
+        reply = QMessageBox.question(
+            self, "Compact Database",
+            "Compact the database of this profile?\n\n"
+            "Older profiles are rewritten once, which can take a while on a long "
+            "history. Finishing a session waits until it is done.",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        settings.flush_settings()
+        task = CompactDatabaseTask(settings.get_current_db_path())
+        task.signals.finished.connect(self._on_compact_db_done)
+        task.signals.failed.connect(self._on_compact_db_failed)
+        self._compact_task = task
+        self.compact_db_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_compact_db_done(self, _converted: bool):
+        self._compact_task = None
+        self.compact_db_btn.setEnabled(True)
+
+    def _on_compact_db_failed(self, message: str):
+        self._on_compact_db_done(False)
+        QMessageBox.warning(self, "Compact Database", f"The database could not be compacted:\n{message}")
 
     def _handle_allow_continue_button(self, enabled: bool):
         """Handle clicks on the allow-continue buttons."""
@@ -4691,7 +5154,7 @@ class MainWindow(QMainWindow):
         self._update_auto_indent_buttons(enabled)
         self.auto_indent_changed.emit(enabled)
         # Update engine immediately if it exists
-        if hasattr(self, 'editor_tab'):
+        if self._loaded_tab("editor_tab"):
             if self.editor_tab.typing_area and self.editor_tab.typing_area.engine:
                 self.editor_tab.typing_area.engine.auto_indent = enabled
             if self.editor_tab.file_tree:
@@ -4802,18 +5265,21 @@ def create_splash_screen(app):
     return splash_widget, status, progress_bar
 
 
-def run_app_with_splash(splash=None):
-    """
-    Run the application with an optional pre-created splash screen.
-    
+def build_app_window(splash=None, pipeline=None):
+    """Create the QApplication and a fully themed MainWindow, ready to show.
+
     Args:
         splash: An InstantSplash instance, or None for no splash.
+        pipeline: A started StartupPipeline, or None to start one here.
+
+    Returns:
+        (app, window, trace)
     """
-    import time
-    start = time.time()
-    
-    if DEBUG_STARTUP_TIMING:
-        print("[STARTUP] Starting app initialization...")
+    from app.startup import StartupPipeline
+
+    if pipeline is None:
+        pipeline = StartupPipeline().start()
+    trace = pipeline.trace
     
     def update(text: str, progress: int):
         if splash:
@@ -4822,79 +5288,55 @@ def run_app_with_splash(splash=None):
             except:
                 pass
     
-    # Create QApplication
-    if DEBUG_STARTUP_TIMING:
-        t1 = time.time()
+    # QApplication creation overlaps with the pipeline's profile/DB work
     update("Initializing...", 25)
-    app = QApplication(sys.argv)
-    if DEBUG_STARTUP_TIMING:
-        print(f"[STARTUP] QApplication created: {time.time() - t1:.3f}s")
+    with trace.phase("qapplication"):
+        app = QApplication.instance() or QApplication(sys.argv)
     
-    # Initialize Profile System
-    update("Loading profile...", 30)
-    from app.profile_manager import get_profile_manager
-    pm = get_profile_manager()
-    active_db = pm.get_current_db_path()
-
-    # Initialize database
-    if DEBUG_STARTUP_TIMING:
-        t_db = time.time()
     update("Loading settings...", 40)
-    settings.init_db(str(active_db))
-    if DEBUG_STARTUP_TIMING:
-        print(f"[STARTUP] Database initialized: {time.time() - t_db:.3f}s")
+    pipeline.wait_settings()
     
-    # Cleanup old session history (non-blocking, in background)
-    try:
-        retention_days = settings.get_setting("history_retention_days", settings.get_default("history_retention_days"))
-        retention_days = int(retention_days) if retention_days and retention_days != "0" else 0
-        if retention_days > 0:
-            import threading
-            def cleanup_history():
-                from app import stats_db
-                stats_db.cleanup_old_sessions(retention_days)
-            
-            cleanup_thread = threading.Thread(target=cleanup_history, daemon=True)
-            cleanup_thread.start()
-    except Exception as e:
-        if DEBUG_STARTUP_TIMING:
-            print(f"[STARTUP] History cleanup error: {e}")
-    
-    # Create main window
-    if DEBUG_STARTUP_TIMING:
-        t2 = time.time()
+    # Stylesheet generation keeps running on the worker meanwhile
     update("Building interface...", 60)
-    win = MainWindow()
-    if DEBUG_STARTUP_TIMING:
-        print(f"[STARTUP] MainWindow created: {time.time() - t2:.3f}s")
+    with trace.phase("main_window"):
+        win = MainWindow()
+    # Old sessions are deleted in the background once the UI has settled
+    win.schedule_retention_cleanup(RETENTION_STARTUP_DELAY_MS)
+    win.schedule_backup_check(BACKUP_STARTUP_DELAY_MS)
     
-    # Apply theme
-    if DEBUG_STARTUP_TIMING:
-        t_theme = time.time()
     update("Applying theme...", 85)
-    win.apply_current_theme()
-    if DEBUG_STARTUP_TIMING:
-        print(f"[STARTUP] Theme applied: {time.time() - t_theme:.3f}s")
+    stylesheet = pipeline.wait_stylesheet()
+    with trace.phase("apply_theme"):
+        win.apply_current_theme(stylesheet)
     
-    # Final update before showing
     update("Ready!", 100)
+    return app, win, trace
+
+
+def run_app_with_splash(splash=None, pipeline=None):
+    """
+    Run the application with an optional pre-created splash screen.
     
-    # Brief pause so user sees "Ready!"
-    time.sleep(0.15)
+    Args:
+        splash: An InstantSplash instance, or None for no splash.
+        pipeline: A StartupPipeline started before the Qt import, if any.
+    """
+    app, win, trace = build_app_window(splash, pipeline)
     
     # Close splash and show main window
-    if splash:
-        try:
-            splash.close()
-        except:
-            pass
-    
-    win.show()
-    win.raise_()
-    win.activateWindow()
+    with trace.phase("show"):
+        if splash:
+            try:
+                splash.close()
+            except:
+                pass
+        
+        win.show()
+        win.raise_()
+        win.activateWindow()
     
     if DEBUG_STARTUP_TIMING:
-        print(f"[STARTUP] TOTAL TIME: {time.time() - start:.3f}s")
+        print(trace.format())
     
     sys.exit(app.exec())
 
@@ -7,13 +7,6 @@ import argparse
 
 
 def main():
-    # --- Setup Logging ---
-    try:
-        from app.logging_config import setup_logging
-        setup_logging()
-    except Exception as e:
-        print(f"Failed to setup logging: {e}")
-
     # --- Argument Parsers ---
     parser = argparse.ArgumentParser(description="Dev Type - Typing Practice App")
     
@@ -26,7 +19,7 @@ def main():
     parser.add_argument("--gen-data", action="store_true", help="Generate fake history data for the active profile/sandbox")
     parser.add_argument("--gen-days", type=int, default=365, help="Number of days of history to generate (default: 365)")
     parser.add_argument("--gen-langs", type=str, help="Comma-separated list of languages (e.g. 'Python,Rust')")
-    parser.add_argument("--gen-count", type=str, default="3-10", help="Range of sessions per day (e.g. '3-10')")
+    parser.add_argument("--gen-count", type=str, default="3-10", help="Sessions per day as a range (e.g. '3-10'), or a total to spread over the period (e.g. '5000000')")
     parser.add_argument("--year", type=int, help="Specific year for generation (Legacy config)")
     parser.add_argument("--persist", action="store_true", help="Don't overwrite existing sandbox data (Legacy)")
 
@@ -34,7 +27,40 @@ def main():
     parser.add_argument("--debug-indent", action="store_true", help="Enable indent testing mode (formerly --indent_test)")
     parser.add_argument("--indent_test", action="store_true", help="Alias for --debug-indent")
 
+    # Headless report
+    parser.add_argument("--report", action="store_true", help="Print a stats report for the profile (or sandbox) and exit, without starting the UI")
+    parser.add_argument("--report-format", choices=["text", "json"], default="text", help="Report output format (default: text)")
+    parser.add_argument("--report-days", type=int, default=30, help="Length of the report's trend periods in days (default: 30)")
+
     args = parser.parse_args()
+
+    # --- Headless Report ---
+    # Reads the database read-only and exits before logging, Qt or any
+    # profile/config changes, so stdout carries nothing but the report
+    if args.report:
+        from app.report import resolve_profile_db, run_report
+        if args.sandbox or args.demo:
+            from app.demo_data import get_demo_db_path
+            report_db = get_demo_db_path()
+        else:
+            report_db = resolve_profile_db(args.profile)
+        raise SystemExit(run_report(report_db, args.report_format, args.report_days))
+
+    # Checked up front: a typo must not generate a different amount of data
+    should_generate = args.gen_data or args.demo
+    if should_generate:
+        from app.demo_data import parse_gen_count
+        try:
+            sessions_range, total_sessions = parse_gen_count(args.gen_count)
+        except ValueError as e:
+            parser.error(f"argument --gen-count: {e}")
+
+    # --- Setup Logging ---
+    try:
+        from app.logging_config import setup_logging
+        setup_logging()
+    except Exception as e:
+        print(f"Failed to setup logging: {e}")
     
     # --- Flag Normalization ---
     indent_mode = args.debug_indent or args.indent_test
@@ -112,19 +138,13 @@ def main():
 
     # Handle Data Generation if requested (or if classic --demo implies it)
     # logic: if --gen-data is explicitly asking, OR if old --demo flag is used (which implies gen)
-    should_generate = args.gen_data or (args.demo and not args.gen_data)
-    
     if should_generate:
         if splash: splash.update("Generating data...", 20)
         
         # Parse generation options
         langs = args.gen_langs.split(",") if args.gen_langs else None
         
-        try:
-            min_s, max_s = map(int, args.gen_count.split("-"))
-            sessions_range = (min_s, max_s)
-        except:
-            sessions_range = (3, 10)
+        sessions_range = sessions_range or (3, 10)
 
         # Call generation
         # If active_db_path is None (e.g. standard run without --profile), 
@@ -162,18 +182,26 @@ def main():
             year=args.year,
             days=args.gen_days,
             sessions_range=sessions_range,
-            languages=langs
+            languages=langs,
+            total_sessions=total_sessions,
+            # The sandbox has no ghosts folder of its own; don't touch a profile's
+            ghosts_dir=None if sandbox_mode else active_db_path.parent / "ghosts",
         )
 
 
+    # Profiles, settings and the stylesheet load on a worker meanwhile
+    from app.startup import StartupPipeline
+    pipeline = StartupPipeline().start()
+
     # Heavy import - splash visible during this
     if splash:
         splash.update("Loading Qt framework...", 15)
     
-    from app.ui_main import run_app_with_splash
+    with pipeline.trace.phase("import_ui"):
+        from app.ui_main import run_app_with_splash
     
     # Run the app, passing the splash to close later
-    run_app_with_splash(splash)
+    run_app_with_splash(splash, pipeline)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,54 @@
+"""Tests for session-end bigram extraction."""
+from app.bigram_extractor import extract_bigrams
+
+
+def _keys(*pairs):
+    return [{"t": t, "k": k, "c": 1} for t, k in pairs]
+
+
+def test_clean_run_records_latencies():
+    totals = extract_bigrams(_keys((0, "a"), (100, "b"), (250, "c")), "abc")
+    assert totals == {("a", "b"): [100.0, 1, 0], ("b", "c"): [150.0, 1, 0]}
+
+
+def test_repeated_bigram_accumulates():
+    totals = extract_bigrams(_keys((0, "a"), (100, "b"), (200, "a"), (320, "b")), "abab")
+    assert totals[("a", "b")] == [220.0, 2, 0]
+    assert totals[("b", "a")] == [100.0, 1, 0]
+
+
+def test_error_and_correction_break_the_chain():
+    keystrokes = _keys((0, "a"), (100, "x"), (200, "\b"), (300, "b"), (400, "c"))
+    totals = extract_bigrams(keystrokes, "abc")
+    # The miss counts against (a, b); the corrected "b" has no clean predecessor
+    assert totals[("a", "b")] == [0.0, 0, 1]
+    assert totals[("b", "c")] == [100.0, 1, 0]
+
+
+def test_long_pauses_are_ignored():
+    totals = extract_bigrams(_keys((0, "a"), (5000, "b"), (5100, "c")), "abc", max_gap_ms=2000)
+    assert ("a", "b") not in totals
+    assert totals[("b", "c")] == [100.0, 1, 0]
+
+
+def test_auto_indent_links_newline_to_first_typed_char():
+    content = "if x:\n    y"
+    keystrokes = _keys(*[(i * 100, ch) for i, ch in enumerate("if x:\ny")])
+    totals = extract_bigrams(keystrokes, content, auto_indent=True)
+    assert totals[(":", "\n")] == [100.0, 1, 0]
+    assert totals[("\n", "y")] == [100.0, 1, 0]
+    assert ("\n", " ") not in totals
+
+
+def test_tab_replay_keeps_alignment():
+    content = "a\n    b"
+    keystrokes = _keys((0, "a"), (100, "\n"), (200, "\t"), (300, "b"))
+    totals = extract_bigrams(keystrokes, content, space_per_tab=4)
+    assert totals[("a", "\n")] == [100.0, 1, 0]
+    # Tab is not a bigram endpoint, but "b" still lands on the right position
+    assert (" ", "b") not in totals
+    assert all(counts[2] == 0 for counts in totals.values())
+
+
+def test_empty_keystrokes():
+    assert extract_bigrams([], "abc") == {}
@@ -0,0 +1,114 @@
+"""Tests for the chart level-of-detail helpers."""
+import math
+import random
+import time
+
+import pytest
+
+from app.chart_data import (
+    PointBucketIndex,
+    linear_regression,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def _reference_regression(values):
+    n = len(values)
+    x_mean = (n - 1) / 2
+    y_mean = sum(values) / n
+    num = sum((x - x_mean) * (y - y_mean) for x, y in enumerate(values))
+    den = sum((x - x_mean) ** 2 for x in range(n))
+    slope = num / den
+    return slope, y_mean - slope * x_mean
+
+
+def test_linear_regression_matches_reference():
+    rng = random.Random(3)
+    values = [40 + i * 0.05 + rng.uniform(-10, 10) for i in range(500)]
+    slope, intercept = linear_regression(values)
+    ref_slope, ref_intercept = _reference_regression(values)
+    assert slope == pytest.approx(ref_slope)
+    assert intercept == pytest.approx(ref_intercept)
+
+
+def test_linear_regression_short_inputs():
+    assert linear_regression([]) == (0, 0)
+    assert linear_regression([42.0]) == (0, 42.0)
+    assert linear_regression([1.0, 3.0]) == pytest.approx((2.0, 1.0))
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    values = [math.sin(i / 50) for i in range(5000)]
+    indices = lttb_indices(values, 300)
+    assert len(indices) == 300
+    assert indices[0] == 0 and indices[-1] == 4999
+    assert indices == sorted(set(indices))
+
+
+def test_lttb_keeps_spike():
+    values = [50.0] * 10000
+    values[4321] = 150.0
+    assert 4321 in lttb_indices(values, 200)
+
+
+def test_lttb_passthrough_when_small():
+    assert lttb_indices([1, 2, 3], 10) == [0, 1, 2]
+    assert lttb_indices([1, 2, 3, 4], 2) == [0, 1, 2, 3]
+
+
+def test_minmax_indices_keep_extremes():
+    values = [5] * 1000
+    values[10] = 0
+    values[990] = 99
+    indices = minmax_indices(values, 50)
+    assert 10 in indices and 990 in indices
+    assert indices == sorted(set(indices))
+    assert len(indices) <= 100
+    assert minmax_indices([1, 2, 3], 5) == [0, 1, 2]
+
+
+def test_point_bucket_index_matches_linear_scan():
+    rng = random.Random(7)
+    points = [(i, rng.uniform(0, 800), rng.uniform(0, 200)) for i in range(2000)]
+    points.sort(key=lambda p: p[1])
+    points = [(i, x, y) for i, (_, x, y) in enumerate(points)]
+    index = PointBucketIndex(points)
+    for _ in range(200):
+        x, y = rng.uniform(-20, 820), rng.uniform(0, 200)
+        expected, best = None, 15
+        for i, px, py in points:
+            dist = math.hypot(x - px, y - py)
+            if dist < best:
+                best, expected = dist, i
+        assert index.nearest(x, y, 15) == expected
+
+
+@pytest.mark.slow
+def test_scatter_hover_benchmark():
+    """Hover lookups on 50k sessions stay cheap once downsampled and bucketed."""
+    rng = random.Random(1)
+    values = [rng.uniform(20, 120) for _ in range(50_000)]
+    width = 900
+
+    start = time.perf_counter()
+    visible = lttb_indices(values, width)
+    index = PointBucketIndex(
+        (i, i / (len(values) - 1) * width, 200 - values[i]) for i in visible
+    )
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for step in range(1000):
+        index.nearest(step * 0.9, 120, 15)
+    per_hover = (time.perf_counter() - start) / 1000
+
+    start = time.perf_counter()
+    for step in range(5):
+        x = step * 180
+        min(math.hypot(x - i / (len(values) - 1) * width, 120 - (200 - v))
+            for i, v in enumerate(values))
+    full_scan = (time.perf_counter() - start) / 5
+
+    print(f"\nbuild {build * 1000:.1f}ms, hover {per_hover * 1e6:.1f}us, full scan {full_scan * 1000:.1f}ms")
+    assert per_hover < full_scan / 50
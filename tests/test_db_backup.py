@@ -0,0 +1,136 @@
+"""Tests for db_backup.py"""
+import sqlite3
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app import db_backup, settings, stats_db
+from app.db_backup import BackupCancelled, BackupError, backup_due, create_backup, list_backups, restore_backup
+
+
+@pytest.fixture
+def db_file(tmp_path: Path) -> Path:
+    path = tmp_path / "Default" / "typing_stats.db"
+    settings.init_db(str(path))
+    stats_db.record_session_history("/src/a.py", "Python", 55.0, 0.97, 100, 97, 3, 20.0, completed=True)
+    return path
+
+
+def _session_count(path: Path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM session_history").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_backup_includes_uncheckpointed_wal(db_file: Path):
+    # Keep the WAL from being checkpointed into the main file
+    holder = sqlite3.connect(db_file)
+    holder.execute("BEGIN")
+    holder.execute("SELECT 1 FROM session_history").fetchall()
+    stats_db.record_session_history("/src/b.py", "Python", 60.0, 1.0, 10, 10, 0, 5.0)
+
+    snapshot = create_backup(db_file, pause_s=0)
+    holder.rollback()
+    holder.close()
+
+    assert snapshot.parent == db_file.parent / "backups"
+    assert db_backup.verify_database(snapshot)
+    assert _session_count(snapshot) == 2
+    assert not list(snapshot.parent.glob("*.partial"))
+
+
+def test_backups_rotate(db_file: Path):
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    made = [create_backup(db_file, keep=2, pause_s=0, now=start + timedelta(hours=i)) for i in range(4)]
+
+    assert [b.path for b in list_backups(db_file)] == [made[3], made[2]]
+
+
+def test_cancelled_backup_leaves_nothing(db_file: Path):
+    with pytest.raises(BackupCancelled):
+        create_backup(db_file, pages=1, pause_s=0, cancelled=lambda: True)
+    assert list_backups(db_file) == []
+    assert not list((db_file.parent / "backups").glob("*.partial"))
+
+
+def test_restore_replaces_live_data(db_file: Path):
+    snapshot = create_backup(db_file, pause_s=0)
+    for _ in range(3):
+        stats_db.record_session_history("/src/c.py", "Python", 70.0, 1.0, 10, 10, 0, 5.0)
+    assert _session_count(db_file) == 4
+
+    restore_backup(snapshot, db_file)
+
+    assert _session_count(db_file) == 1
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_restore_rejects_damaged_backup(db_file: Path, tmp_path: Path):
+    bad = tmp_path / "bad.db"
+    bad.write_bytes(b"not a database" * 100)
+    with pytest.raises(BackupError):
+        restore_backup(bad, db_file)
+    assert _session_count(db_file) == 1
+
+
+def test_backup_due(db_file: Path):
+    now = datetime(2026, 3, 1, 12, 0, 0)
+    assert backup_due(db_file, 24, now) is True
+    assert backup_due(db_file, 0, now) is False
+    create_backup(db_file, pause_s=0, now=now - timedelta(hours=2))
+    assert backup_due(db_file, 24, now) is False
+    assert backup_due(db_file, 1, now) is True
+
+
+@pytest.mark.slow
+def test_session_commits_not_stalled_by_backup(tmp_path: Path):
+    """Recording sessions keeps its latency while a 500 MB database is backed up."""
+    db_path = tmp_path / "Big" / "typing_stats.db"
+    settings.init_db(str(db_path))
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE filler (data BLOB)")
+    blob = b"\x5a" * (1024 * 1024)
+    for _ in range(10):
+        conn.executemany("INSERT INTO filler VALUES (?)", [(blob,)] * 50)
+        conn.commit()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    assert db_path.stat().st_size >= 500 * 1024 * 1024
+
+    def commit_latencies(count):
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter()
+            stats_db.record_session_history("/src/a.py", "Python", 60.0, 1.0, 10, 10, 0, 5.0, completed=True)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.005)
+        return latencies
+
+    baseline = commit_latencies(50)
+
+    result = {}
+    worker = threading.Thread(target=lambda: result.setdefault("path", create_backup(db_path)))
+    start = time.perf_counter()
+    worker.start()
+    during = []
+    while worker.is_alive():
+        during.extend(commit_latencies(10))
+    worker.join()
+    backup_s = time.perf_counter() - start
+
+    base_p95 = statistics.quantiles(baseline, n=20)[-1]
+    during_p95 = statistics.quantiles(during, n=20)[-1]
+    print(f"\nbackup {backup_s:.1f}s, {len(during)} commits meanwhile, "
+          f"p95 {base_p95 * 1000:.2f}ms idle vs {during_p95 * 1000:.2f}ms during backup")
+    assert "path" in result
+    assert _session_count(result["path"]) >= 1
+    assert during_p95 < max(base_p95 * 5, 0.05)
@@ -421,3 +421,168 @@ class TestDemoDataEdgeCases:
         conn.close()
         
         assert count >= 0  # Should complete without error
+
+
+class TestStreamingGeneration:
+    """Test chunked generation and the matching auxiliary data."""
+
+    def test_parse_gen_count(self):
+        from app import demo_data
+
+        assert demo_data.parse_gen_count("3-10") == ((3, 10), None)
+        assert demo_data.parse_gen_count("5000000") == (None, 5_000_000)
+        assert demo_data.parse_gen_count("5_000_000") == (None, 5_000_000)
+        for bad in ("10-3", "many", "-5"):
+            with pytest.raises(ValueError):
+                demo_data.parse_gen_count(bad)
+
+    def test_total_sessions_in_bounded_chunks(self):
+        import random
+        from app import demo_data
+
+        start = datetime(2024, 1, 1)
+        plan = demo_data.plan_daily_sessions(start, 90, total_sessions=12_345, rng=random.Random(3))
+        assert sum(plan) == 12_345
+        assert plan[-10:].count(0) == 0  # Current streak
+
+        chunks = list(demo_data.iter_session_chunks(
+            start, plan, demo_data.DEFAULT_LANGUAGES, demo_data.DEFAULT_LANGUAGE_WEIGHTS,
+            chunk_size=1000, rng=random.Random(3),
+        ))
+        rows = [row for chunk in chunks for row in chunk]
+        assert len(rows) == 12_345
+        assert max(len(chunk) for chunk in chunks) <= 1000
+        assert [row[-1] for row in rows] == sorted(row[-1] for row in rows)
+        assert all(len(row) == len(demo_data.SESSION_COLUMNS) for row in rows)
+
+    def test_single_day_split_across_chunks(self):
+        """A day with more sessions than a chunk never has to be held whole."""
+        import random
+        from app import demo_data
+
+        chunks = demo_data.iter_session_chunks(
+            datetime(2024, 1, 1), [25_000], ["Python"], [1], chunk_size=1000, rng=random.Random(4),
+        )
+        sizes, last, total = [], "", 0
+        for chunk in chunks:
+            sizes.append(len(chunk))
+            assert chunk[0][-1] >= last
+            assert [row[-1] for row in chunk] == sorted(row[-1] for row in chunk)
+            last = chunk[-1][-1]
+            total += len(chunk)
+
+        assert total == 25_000
+        assert max(sizes) <= 1000
+
+    def test_generated_data_matches_summaries(self, tmp_path):
+        from app import demo_data, settings, stats_db
+
+        db_path = tmp_path / "typing_stats.db"
+        count = demo_data.generate_data_for_db(db_path, days=60, total_sessions=3000, seed=7)
+        assert count == 3000
+
+        conn = demo_data.connect_demo(db_path)
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*), COUNT(DISTINCT auto_indent) FROM session_history")
+        assert cur.fetchone() == (3000, 2)
+        # Triggers and indexes are back after the bulk load
+        cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE tbl_name = 'session_history' AND type = 'trigger'")
+        assert cur.fetchone()[0] > 0
+        cur.execute("SELECT SUM(sessions), SUM(typed_chars) FROM session_daily_stats")
+        rollup = cur.fetchone()
+        cur.execute("SELECT COUNT(*), SUM(correct_keystrokes + incorrect_keystrokes) FROM session_history")
+        assert rollup == cur.fetchone()
+        cur.execute("SELECT COUNT(*) FROM history_paths")
+        paths = cur.fetchone()[0]
+        cur.execute("SELECT COUNT(DISTINCT file_path) FROM session_history")
+        assert paths == cur.fetchone()[0]
+        for table in ("key_stats", "key_confusions", "bigram_stats", "error_type_stats"):
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            assert cur.fetchone()[0] > 0, table
+        cur.execute("SELECT SUM(times_practiced) FROM file_stats")
+        assert cur.fetchone()[0] == 3000
+        conn.close()
+
+        settings.init_db(str(db_path))
+        stats = stats_db.get_aggregated_stats()
+        assert stats["total_completed"] + stats["total_incomplete"] == 3000
+        assert stats_db.get_current_streak() >= 10
+
+    def test_regeneration_replaces_data(self, tmp_path):
+        from app import demo_data
+
+        db_path = tmp_path / "typing_stats.db"
+        demo_data.generate_data_for_db(db_path, days=30, total_sessions=500, seed=1)
+        demo_data.generate_data_for_db(db_path, days=30, total_sessions=200, seed=2)
+
+        conn = demo_data.connect_demo(db_path)
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM session_history")
+        assert cur.fetchone()[0] == 200
+        cur.execute("SELECT SUM(sessions) FROM session_daily_stats")
+        assert cur.fetchone()[0] == 200
+        conn.close()
+
+    def test_generation_recounts_language_progress(self, tmp_path):
+        """Replacing file_stats on a profile updates the Languages tab counters."""
+        from app import demo_data, settings, stats_db
+
+        db_path = tmp_path / "typing_stats.db"
+        settings.init_db(str(db_path))
+        stats_db.sync_scan_index({"Python": ["/demo/projects/python/main.py", "/src/other.py"]}, "sig")
+        stats_db.update_file_stats("/src/other.py", wpm=50, accuracy=0.95, completed=True)
+        assert stats_db.get_language_progress()["Python"]["completed"] == 1
+
+        demo_data.generate_data_for_db(db_path, days=30, total_sessions=600, languages=["Python"], seed=3)
+
+        conn = demo_data.connect_demo(db_path)
+        completed = conn.execute(
+            "SELECT completed FROM file_stats WHERE file_path = '/demo/projects/python/main.py' AND auto_indent = 0"
+        ).fetchone()[0]
+        conn.close()
+        assert stats_db.get_language_progress()["Python"] == {"completed": completed, "total": 2}
+
+    def test_ghosts_written(self, tmp_path):
+        from app import demo_data
+        from app.ghost_manager import GhostManager
+
+        db_path = tmp_path / "typing_stats.db"
+        ghosts_dir = tmp_path / "ghosts"
+        demo_data.generate_data_for_db(db_path, days=30, total_sessions=400, ghosts_dir=ghosts_dir, seed=5)
+
+        conn = demo_data.connect_demo(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT file_path, auto_indent, MAX(wpm) FROM session_history
+            WHERE completed = 1 GROUP BY file_path, auto_indent ORDER BY MAX(wpm) DESC LIMIT 1
+        """)
+        file_path, auto_indent, best_wpm = cur.fetchone()
+        conn.close()
+
+        manager = GhostManager(ghosts_dir)
+        ghost = manager.load_ghost(file_path, bool(auto_indent))
+        assert ghost is not None
+        assert ghost["wpm"] == round(best_wpm, 1)
+        assert len(ghost["keys"]) == demo_data.DEMO_GHOST_KEYSTROKES
+        assert ghost["final_stats"]["total"] == demo_data.DEMO_GHOST_KEYSTROKES
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("days", [1095, 1])
+    def test_generation_benchmark(self, tmp_path, days):
+        """Benchmark: 1M sessions with bounded memory, also all on one day."""
+        import time
+        import tracemalloc
+        from app import demo_data
+
+        db_path = tmp_path / "typing_stats.db"
+        start = time.perf_counter()
+        tracemalloc.start()
+        try:
+            demo_data.generate_data_for_db(db_path, days=days, total_sessions=1_000_000, seed=11)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        elapsed = time.perf_counter() - start
+
+        print(f"\n1M sessions over {days} days: generated in {elapsed:.0f}s, peak {peak / 1e6:.0f}MB")
+        assert peak < 100e6
@@ -0,0 +1,135 @@
+"""Tests for weak-key drill generation."""
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from app import settings, stats_db
+from app import drill_generator
+from app.drill_generator import (
+    WeaknessProfile,
+    assemble_drill,
+    build_weakness_profile,
+    count_chars,
+    generate_drill,
+    rank_candidate_files,
+    score_line,
+    update_char_index,
+)
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    stats_db.init_stats_tables()
+
+
+def _write(directory: Path, name: str, text: str) -> str:
+    path = directory / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_count_chars_skips_whitespace():
+    length, counts = count_chars("a b\n\tab;")
+    assert length == 5
+    assert counts == {"a": 2, "b": 2, ";": 1}
+
+
+def test_build_weakness_profile():
+    key_stats = {
+        ";": {"correct": 10, "error": 10},
+        "q": {"correct": 15, "error": 5},
+        "e": {"correct": 1000, "error": 0},
+        "z": {"correct": 1, "error": 3},  # Too few attempts
+        " ": {"correct": 10, "error": 10},
+    }
+    confusions = {";": {"l": 7, "'": 2}}
+    bigrams = [{"char1": "t", "char2": "h", "avg_ms": 300.0, "error_rate": 0.0}]
+
+    profile = build_weakness_profile(key_stats, confusions, bigrams)
+
+    assert profile.keys == {";": 1.0, "q": 0.5, "l": 0.5}
+    assert profile.bigrams == {("t", "h"): 1.0}
+
+
+def test_score_line_prefers_dense_lines():
+    profile = WeaknessProfile(keys={";": 1.0}, bigrams={("t", "h"): 1.0})
+    assert score_line("a;b;", profile) == pytest.approx(0.5)
+    assert score_line("the", profile) == pytest.approx(1 / 3)
+    assert score_line("", profile) == 0.0
+
+
+def test_char_index_is_incremental(db, tmp_path: Path):
+    a = _write(tmp_path, "a.py", "x = 1;\n")
+    b = _write(tmp_path, "b.py", "print(x)\n")
+    files = {"Python": [a, b]}
+
+    assert update_char_index(files) == 2
+    assert update_char_index(files) == 0
+
+    time.sleep(0.01)
+    _write(tmp_path, "a.py", "x = 1;;;\n")
+    assert update_char_index(files) == 1
+
+    assert update_char_index({"Python": [a]}) == 0
+    assert set(stats_db.get_char_index_stamps()) == {a}
+    postings = stats_db.get_char_postings([";"], ["Python"])
+    assert postings == [(a, ";", pytest.approx(3 / 6))]
+
+
+def test_generate_drill_picks_weak_lines(db, tmp_path: Path):
+    dense = _write(tmp_path, "dense.py", "\n".join([
+        "    value = items[idx];;",
+        "    other = call(a);  # ;",
+        "    return something_plain",
+    ]))
+    plain = _write(tmp_path, "plain.py", "def function_name(argument):\n    return argument\n")
+    update_char_index({"Python": [dense, plain]})
+
+    profile = WeaknessProfile(keys={";": 1.0})
+    assert rank_candidate_files(profile, ["Python"]) == [dense]
+    assert rank_candidate_files(profile, ["Go"]) == []
+
+    drill = generate_drill(["Python"], profile=profile)
+    assert drill.splitlines() == ["value = items[idx];;", "other = call(a);  # ;"]
+
+
+def test_generate_drill_without_data(db):
+    assert generate_drill() is None
+
+
+def test_assemble_drill_respects_target():
+    text = "\n".join(f"line_{i:03d} = x;" for i in range(100))
+    drill = assemble_drill(WeaknessProfile(keys={";": 1.0}), ["f"], target_chars=50, read_text=lambda p: text)
+    assert 50 <= len(drill) < 50 + drill_generator.MAX_LINE_LENGTH + 1
+
+
+@pytest.mark.slow
+def test_drill_generation_benchmark(db, tmp_path: Path):
+    """Drill assembly stays interactive over a 100k-file index."""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    files = []
+    for i in range(200):
+        files.append(_write(corpus, f"f{i}.py", f"value_{i} = compute({i}); other[{i}] = {{k: v}}\n" * 20))
+    update_char_index({"Python": files})
+
+    # Bulk rows for a corpus of 100k files; only the ones above exist on disk
+    rows = []
+    for i in range(100_000):
+        counts = {ch: (i * 7 + n) % 13 + 1 for n, ch in enumerate("abcdefghijklmnop(){}[];=_")}
+        rows.append((f"/virtual/f{i}.py", "Python", 0, 0, sum(counts.values()) * 3, json.dumps(counts)))
+    start = time.perf_counter()
+    stats_db.update_char_index(rows)
+    index_ms = (time.perf_counter() - start) * 1000
+
+    profile = WeaknessProfile(keys={";": 1.0, "{": 0.8, "[": 0.6}, bigrams={("(", ")"): 0.5})
+    start = time.perf_counter()
+    drill = generate_drill(["Python"], profile=profile)
+    drill_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n100k files: index rebuild {index_ms:.0f}ms, drill {drill_ms:.1f}ms")
+    assert drill
+    assert drill_ms < 250
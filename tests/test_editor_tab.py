@@ -166,6 +166,33 @@ class TestEditorTabFileOperations:
         assert editor_tab.is_racing is False
         assert editor_tab._race_pending_start is False
 
+    
+    def test_drill_opens_generated_buffer(self, editor_tab, tmp_path):
+        """The drill button writes the drill for the current language and opens it."""
+        editor_tab.ensure_loaded()
+        editor_tab.load_language_files("Python", [])
+        
+        manager = MagicMock()
+        manager.get_active_profile_dir.return_value = tmp_path
+        with patch("app.drill_generator.generate_drill", return_value="x = a[0];\ny = b[1];") as gen, \
+             patch("app.portable_data.get_data_manager", return_value=manager):
+            editor_tab.on_drill_clicked()
+        
+        gen.assert_called_once_with(["Python"])
+        assert editor_tab.current_file == str(tmp_path / "drills" / "weak_keys_drill.py")
+        assert editor_tab.typing_area.original_content == "x = a[0];\ny = b[1];"
+    
+    def test_drill_without_data_shows_message(self, editor_tab):
+        """No drill leaves the current file alone and tells the user why."""
+        editor_tab.ensure_loaded()
+        
+        with patch("app.drill_generator.generate_drill", return_value=None), \
+             patch("app.editor_tab.QMessageBox.information") as info:
+            editor_tab.on_drill_clicked()
+        
+        info.assert_called_once()
+        assert editor_tab.current_file is None
+
 
 class TestEditorTabProgressIndicator:
     """Test progress indicator functionality."""
@@ -205,6 +232,36 @@ class TestEditorTabStatsUpdate:
         assert editor_tab.stats_display is not None
 
 
+    def test_bigram_stats_recorded_off_the_ui_thread(self, editor_tab, tmp_path):
+        """Session-end bigram extraction runs on the thread pool from a keystroke snapshot."""
+        import threading
+        from PySide6.QtCore import QThreadPool
+        from app import stats_db
+        from app import editor_tab as editor_tab_module
+
+        editor_tab.ensure_loaded()
+        test_file = tmp_path / "test.py"
+        test_file.write_text("abc", encoding='utf-8')
+        editor_tab.on_file_selected(str(test_file))
+        keystrokes = [{"t": t, "k": k, "c": 1} for t, k in ((0, "a"), (100, "b"), (250, "c"))]
+        editor_tab.typing_area.ghost_keystrokes = keystrokes
+
+        threads = []
+        real_extract = editor_tab_module.extract_bigrams
+        def extract(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return real_extract(*args, **kwargs)
+
+        with patch("app.editor_tab.extract_bigrams", side_effect=extract):
+            editor_tab._record_bigram_stats("Python")
+            keystrokes.clear()
+            QThreadPool.globalInstance().waitForDone()
+
+        assert threads and threads[0] is not threading.main_thread()
+        bigrams = stats_db.get_bigram_stats(["Python"], min_samples=1)
+        assert {(b["char1"], b["char2"]) for b in bigrams} == {("a", "b"), ("b", "c")}
+
+
 class TestGhostRaceStats:
     """Test ghost race statistics updates."""
 
@@ -176,3 +176,110 @@ def test_max_depth_enforced(tmp_path):
         for path in result["Python"]:
             parts = Path(path).relative_to(tmp_path).parts
             assert len(parts) <= MAX_SCAN_DEPTH + 1  # +1 for file itself
+
+
+def _reference_should_ignore(path: Path, patterns):
+    """Per-pattern fnmatch loop the compiled IgnoreManager must agree with."""
+    import fnmatch
+    name = path.name
+    str_path = str(path)
+    for pattern in patterns:
+        is_ci = pattern.startswith('"') and pattern.endswith('"')
+        p = pattern[1:-1].lower() if is_ci else pattern
+        is_path = "/" in p or "\\" in p
+        to_check = str_path if is_path else name
+        if is_ci:
+            if fnmatch.fnmatch(to_check.lower(), p):
+                return True
+        elif fnmatch.fnmatchcase(to_check, p):
+            return True
+    return False
+
+
+def _make_ignore_patterns(count: int):
+    patterns = ["*.log", "*.tmp", '"*.BAK"', "LICENSE", '"readme*"', "*/generated/*", "test_?.py"]
+    for i in range(count - len(patterns)):
+        if i % 4 == 0:
+            patterns.append(f"*_gen{i}.py")
+        elif i % 4 == 1:
+            patterns.append(f'"Build{i}*"')
+        elif i % 4 == 2:
+            patterns.append(f"*/vendor{i}/*")
+        else:
+            patterns.append(f"file{i}?.txt")
+    return patterns
+
+
+def _make_paths(count: int):
+    names = ["main.py", "a.log", "notes.BaK", "LICENSE", "README.md", "test_1.py",
+             "mod_gen8.py", "build5x.js", "file11a.txt", "keep.rs", "x.tmp"]
+    dirs = ["/src", "/src/generated", "/proj/vendor2", "/proj/lib"]
+    return [Path(f"{dirs[i % len(dirs)]}/d{i % 97}/{names[i % len(names)]}") for i in range(count)]
+
+
+def test_ignore_manager_matches_fnmatch_reference():
+    """Compiled matcher agrees with the per-pattern fnmatch semantics."""
+    from app.file_scanner import IgnoreManager
+
+    patterns = _make_ignore_patterns(40)
+    manager = IgnoreManager(patterns, [])
+    for path in _make_paths(2000):
+        expected = _reference_should_ignore(path, patterns)
+        assert manager.should_ignore_file(path) == expected, path
+        assert manager.should_ignore_file(str(path)) == expected, path
+
+
+def test_ignore_manager_folder_patterns_and_cache():
+    """Folder decisions honour name/path globs and are cached per directory."""
+    from app.file_scanner import IgnoreManager
+
+    manager = IgnoreManager([], ["node_modules", '"Cache*"', "*/tmp/*", "build?"])
+    assert manager.should_ignore_folder(Path("/a/node_modules"))
+    assert manager.should_ignore_folder("/a/cacheDir")
+    assert manager.should_ignore_folder("/a/tmp/x")
+    assert manager.should_ignore_folder("/a/build2")
+    assert not manager.should_ignore_folder("/a/src")
+    assert manager.should_ignore_folder("/a/CACHE")
+
+    assert manager._folder_cache["/a/src"] is False
+    assert manager._folder_cache["/a/node_modules"] is True
+
+
+def test_legacy_wrappers_reuse_compiled_manager():
+    """Legacy helpers don't rebuild an IgnoreManager on every call."""
+    from app import file_scanner
+
+    file_scanner._get_ignore_manager.cache_clear()
+    for _ in range(50):
+        assert file_scanner.should_ignore_file(Path("/x/a.log"), ["*.log"])
+        assert not file_scanner.should_ignore_folder(Path("/x/src"), ["build"])
+    info = file_scanner._get_ignore_manager.cache_info()
+    assert info.misses == 2
+
+
+@pytest.mark.slow
+def test_ignore_manager_benchmark():
+    """Benchmark: 200 user patterns over 100k paths vs the per-pattern loop."""
+    import time
+    from app.file_scanner import IgnoreManager
+
+    patterns = _make_ignore_patterns(200)
+    paths = [str(p) for p in _make_paths(100_000)]
+    # Unique directories per path so the name cache can't hide path globs
+    paths = [f"/root{i}{p}" for i, p in enumerate(paths)]
+
+    manager = IgnoreManager(patterns, [])
+    start = time.perf_counter()
+    compiled_hits = sum(1 for p in paths if manager.should_ignore_file(p))
+    compiled_time = time.perf_counter() - start
+
+    # The reference loop is far slower; time a sample and extrapolate
+    sample = [Path(p) for p in paths[:2000]]
+    start = time.perf_counter()
+    reference_hits = sum(1 for p in sample if _reference_should_ignore(p, patterns))
+    reference_time = (time.perf_counter() - start) * (len(paths) / len(sample))
+
+    assert reference_hits == sum(1 for p in paths[:2000] if manager.should_ignore_file(p))
+    assert compiled_hits > 0
+    print(f"\ncompiled: {compiled_time:.3f}s  per-pattern (extrapolated): {reference_time:.3f}s")
+    assert compiled_time < reference_time / 5
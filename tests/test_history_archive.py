@@ -0,0 +1,165 @@
+"""Tests for history_archive.py"""
+import sqlite3
+from pathlib import Path
+
+from app import settings, stats_db
+from app.history_archive import HistoryArchive, archive_path_for, get_archive
+from app.history_maintenance import RetentionCleanupTask
+
+
+def _row(session_id, recorded_at, wpm=50.0, language="Python"):
+    return (session_id, "/src/a.py", language, 0, wpm, 0.95, 100, 95, 5, 30.0, 1, recorded_at)
+
+
+def test_append_and_read_by_month(tmp_path: Path):
+    archive = HistoryArchive(tmp_path / "p.archive")
+    rows = [
+        _row(1, "2021-01-05 10:00:00"),
+        _row(2, "2021-03-01 09:00:00"),
+        _row(3, "2021-01-20 08:00:00"),
+    ]
+    assert archive.append(rows) == 3
+
+    assert archive.months() == ["2021-01", "2021-03"]
+    assert archive.first_recorded_at() == "2021-01-05 10:00:00"
+    assert [r[0] for r in archive.read_rows()] == [1, 3, 2]
+    assert [r[0] for r in archive.read_rows("2021-02")] == [2]
+    assert [r[0] for r in archive.read_rows(last_month="2021-01")] == [1, 3]
+    assert archive.read_rows()[0] == rows[0]
+
+
+def test_reader_sees_appends_from_another_instance(tmp_path: Path):
+    path = tmp_path / "p.archive"
+    reader = HistoryArchive(path)
+    assert reader.read_rows() == []
+
+    HistoryArchive(path).append([_row(1, "2020-06-01 00:00:00")])
+    assert [r[0] for r in reader.read_rows()] == [1]
+
+
+def test_truncated_frame_is_ignored_and_overwritten(tmp_path: Path):
+    path = tmp_path / "p.archive"
+    archive = HistoryArchive(path)
+    archive.append([_row(1, "2020-01-01 00:00:00")])
+    good_size = path.stat().st_size
+    archive.append([_row(2, "2020-02-01 00:00:00")])
+    with open(path, "r+b") as f:
+        f.truncate(path.stat().st_size - 3)  # Crash mid-append
+
+    fresh = HistoryArchive(path)
+    assert [r[0] for r in fresh.read_rows()] == [1]
+
+    fresh.append([_row(3, "2020-03-01 00:00:00")])
+    assert [r[0] for r in HistoryArchive(path).read_rows()] == [1, 3]
+    assert path.stat().st_size > good_size
+
+
+def test_duplicate_sessions_read_once(tmp_path: Path):
+    archive = HistoryArchive(tmp_path / "p.archive")
+    archive.append([_row(7, "2019-05-05 00:00:00")])
+    archive.append([_row(7, "2019-05-05 00:00:00")])
+    assert len(archive.read_rows()) == 1
+
+
+def _seed_history(db_file: Path):
+    settings.init_db(str(db_file))
+    conn = sqlite3.connect(db_file)
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, total_keystrokes, completed, recorded_at) "
+        "VALUES ('/src/a.py', 'Python', ?, 0.9, 100, 1, ?)",
+        [(40, "2019-03-10 10:00:00"), (60, "2019-03-10 12:00:00"), (80, "2019-07-01 10:00:00")],
+    )
+    conn.execute(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, total_keystrokes, completed, recorded_at) "
+        "VALUES ('/src/a.py', 'Python', 100, 1.0, 100, 1, datetime('now'))"
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_stats_queries_include_archived_sessions(tmp_path: Path):
+    db_file = tmp_path / "typing_stats.db"
+    _seed_history(db_file)
+    before = (
+        stats_db.get_trend_data(aggregation="month"),
+        stats_db.get_daily_metrics(start_date="2019-01-01", end_date="2019-12-31"),
+        stats_db.get_available_years(),
+    )
+
+    task = RetentionCleanupTask(90, db_file, pause_s=0, archive=True)
+    deleted, _ = task.cleanup()
+
+    assert deleted == 3
+    assert stats_db.count_session_history() == 1
+    assert archive_path_for(db_file).exists()
+    assert get_archive(db_file).months() == ["2019-03", "2019-07"]
+    after = (
+        stats_db.get_trend_data(aggregation="month"),
+        stats_db.get_daily_metrics(start_date="2019-01-01", end_date="2019-12-31"),
+        stats_db.get_available_years(),
+    )
+    assert after == before
+    daily = after[1]
+    assert daily[0]["date"] == "2019-03-10"
+    assert daily[0]["completed_sessions"] == 2
+    assert daily[0]["avg_wpm"] == 50
+    assert 2019 in after[2]
+
+
+def test_stats_queries_do_not_decode_archive(tmp_path: Path, monkeypatch):
+    db_file = tmp_path / "typing_stats.db"
+    _seed_history(db_file)
+    stats_db.cleanup_old_sessions(90, archive=True)
+
+    def fail(*args):
+        raise AssertionError("archive decoded")
+    monkeypatch.setattr(HistoryArchive, "read_rows", fail)
+
+    assert [row["session_count"] for row in stats_db.get_trend_data(days=30)] == [1]
+    assert [row["session_count"] for row in stats_db.get_trend_data(aggregation="month")] == [2, 1, 1]
+    assert len(stats_db.get_daily_metrics(start_date="2019-01-01", end_date="2019-12-31")) == 2
+    assert 2019 in stats_db.get_available_years()
+
+
+def test_ignore_rules_apply_to_archived_days(tmp_path: Path):
+    db_file = tmp_path / "typing_stats.db"
+    _seed_history(db_file)
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, total_keystrokes, completed, recorded_at) "
+        "VALUES ('/src/secret.py', 'Python', 500, 1.0, 100, 1, '2019-03-10 15:00:00')"
+    )
+    conn.commit()
+    conn.close()
+    stats_db.cleanup_old_sessions(90, archive=True)
+
+    settings.set_setting("ignored_files", "secret.py")
+    daily = stats_db.get_daily_metrics(start_date="2019-03-10", end_date="2019-03-10")
+
+    assert daily[0]["completed_sessions"] == 2
+    assert daily[0]["highest_wpm"] == 60
+
+
+def test_migration_backfills_existing_archive(tmp_path: Path):
+    db_file = tmp_path / "typing_stats.db"
+    _seed_history(db_file)
+    stats_db.cleanup_old_sessions(90, archive=True)
+    before = stats_db.get_trend_data(aggregation="month")
+
+    # As left by builds that archived before archived_daily_stats existed
+    conn = sqlite3.connect(db_file)
+    conn.execute("DROP TABLE archived_daily_stats")
+    conn.execute("PRAGMA user_version = 8")
+    conn.commit()
+    conn.close()
+    stats_db.init_stats_tables(db_file)
+
+    assert stats_db.get_trend_data(aggregation="month") == before
+
+
+def test_cleanup_without_archive_discards(tmp_path: Path):
+    db_file = tmp_path / "typing_stats.db"
+    _seed_history(db_file)
+    assert stats_db.cleanup_old_sessions(90) == 3
+    assert not archive_path_for(db_file).exists()
+    assert 2019 not in stats_db.get_available_years()
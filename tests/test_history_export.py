@@ -0,0 +1,99 @@
+"""Tests for the streaming session history exporter."""
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from app import settings, stats_db
+from app.history_export import (
+    ExportCancelled,
+    export_session_history,
+    format_for_path,
+    write_records,
+)
+
+
+@pytest.fixture
+def history_db(tmp_path):
+    """Database with a handful of sessions in both indent modes."""
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    for i in range(7):
+        stats_db.record_session_history(
+            file_path=f"/proj/file{i}.py",
+            language="Python" if i % 2 else "Rust",
+            wpm=40.0 + i,
+            accuracy=0.9,
+            total_keystrokes=100,
+            correct_keystrokes=90,
+            incorrect_keystrokes=10,
+            duration=30.0,
+            completed=True,
+            auto_indent=bool(i % 3 == 0),
+        )
+    yield tmp_path
+
+
+def test_format_for_path():
+    assert format_for_path("out.csv") == "csv"
+    assert format_for_path("out.NDJSON") == "ndjson"
+    assert format_for_path("out.jsonl") == "ndjson"
+    assert format_for_path("out.txt", default="ndjson") == "ndjson"
+
+
+def test_iter_session_history_chunks(history_db):
+    """Rows are yielded in bounded chunks, newest first."""
+    chunks = list(stats_db.iter_session_history(chunk_size=3))
+    assert [len(c) for c in chunks] == [3, 3, 1]
+    ids = [r["id"] for c in chunks for r in c]
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_export_csv(history_db):
+    dest = history_db / "history.csv"
+    written = export_session_history(str(dest), chunk_size=2)
+
+    assert written == 7
+    with open(dest, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 7
+    assert rows[0]["File"] == "file6.py"
+    assert rows[0]["Accuracy"] == "90.0%"
+    assert not Path(f"{dest}.part").exists()
+
+
+def test_export_ndjson_respects_filters(history_db):
+    """NDJSON keeps raw values and the export honours the auto_indent filter."""
+    dest = history_db / "history.ndjson"
+    written = export_session_history(str(dest), filters={"auto_indent": True, "language": "Rust"})
+
+    lines = dest.read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert written == len(records) == 2  # i = 0 and 6
+    assert all(r["auto_indent"] is True and r["language"] == "Rust" for r in records)
+    assert records[0]["file_path"] == "/proj/file6.py"
+    assert records[0]["accuracy"] == 0.9
+
+
+def test_export_cancel_leaves_no_file(history_db):
+    dest = history_db / "history.csv"
+    calls = []
+
+    def is_cancelled():
+        calls.append(1)
+        return len(calls) > 1
+
+    with pytest.raises(ExportCancelled):
+        export_session_history(str(dest), chunk_size=2, is_cancelled=is_cancelled)
+    assert not dest.exists()
+    assert not Path(f"{dest}.part").exists()
+
+
+def test_write_records_reports_progress():
+    chunks = [[{"id": i, "wpm": 50.0} for i in range(4)] for _ in range(3)]
+    seen = []
+    stream = io.StringIO()
+    assert write_records(iter(chunks), stream, "ndjson", progress=seen.append) == 12
+    assert seen == [4, 8, 12]
+    assert len(stream.getvalue().splitlines()) == 12
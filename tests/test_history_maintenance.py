@@ -0,0 +1,111 @@
+"""Tests for history_maintenance.py"""
+import sqlite3
+from pathlib import Path
+
+from app import settings, stats_db
+from app.history_maintenance import CompactDatabaseTask, RetentionCleanupTask
+
+
+def _make_db(tmp_path: Path, old: int, recent: int) -> Path:
+    db_file = tmp_path / "history.db"
+    settings.init_db(str(db_file))
+    conn = sqlite3.connect(db_file)
+    rows = [("-400 days",)] * old + [("-1 days",)] * recent
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, recorded_at) "
+        "VALUES ('/src/a.py', 'Python', 60, 1, datetime('now', ?))",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def test_task_deletes_expired_and_reclaims_pages(tmp_path: Path):
+    db_file = _make_db(tmp_path, old=1000, recent=10)
+    task = RetentionCleanupTask(90, db_file, batch_size=128, vacuum_pages=16, pause_s=0)
+    results = []
+    task.signals.finished.connect(lambda deleted, free: results.append((deleted, free)))
+
+    task.run()
+
+    assert results == [(1000, 0)]
+    assert stats_db.count_session_history() == 10
+
+
+def test_task_stays_on_its_database(tmp_path: Path):
+    db_file = _make_db(tmp_path, old=5, recent=0)
+    settings.init_db(str(tmp_path / "other" / "history.db"))
+
+    deleted, _ = RetentionCleanupTask(30, db_file, pause_s=0).cleanup()
+
+    assert deleted == 5
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("SELECT COUNT(*) FROM session_history").fetchone()[0] == 0
+    conn.close()
+
+
+def test_cancelled_task_stops_between_batches(tmp_path: Path):
+    db_file = _make_db(tmp_path, old=300, recent=0)
+    task = RetentionCleanupTask(30, db_file, batch_size=100, pause_s=0)
+    task.cancel()
+
+    deleted, _ = task.cleanup()
+
+    assert deleted == 100
+
+
+def test_task_keeps_everything_when_retention_disabled(tmp_path: Path):
+    db_file = _make_db(tmp_path, old=3, recent=0)
+    assert RetentionCleanupTask(0, db_file, pause_s=0).cleanup() == (0, 0)
+    assert stats_db.count_session_history() == 3
+
+
+def _make_legacy_db(tmp_path: Path, old: int) -> Path:
+    """A database created before auto_vacuum=INCREMENTAL was the default."""
+    db_file = tmp_path / "legacy" / "history.db"
+    db_file.parent.mkdir()
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA auto_vacuum = NONE")
+    conn.execute("CREATE TABLE legacy (id INTEGER)")  # Fixes the mode
+    conn.close()
+    settings.init_db(str(db_file))
+    conn = sqlite3.connect(db_file)
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, recorded_at) "
+        "VALUES ('/src/a.py', 'Python', 60, 1, datetime('now', '-400 days'))",
+        [()] * old,
+    )
+    conn.commit()
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    conn.close()
+    return db_file
+
+
+def test_task_never_converts_older_databases(tmp_path: Path):
+    """Retention cleanup must not run the full VACUUM conversion."""
+    db_file = _make_legacy_db(tmp_path, old=500)
+
+    assert RetentionCleanupTask(90, db_file, pause_s=0).cleanup() == (500, 0)
+
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] > 0
+    conn.close()
+
+
+def test_compact_task_converts_then_steps(tmp_path: Path):
+    db_file = _make_legacy_db(tmp_path, old=500)
+    RetentionCleanupTask(90, db_file, pause_s=0).cleanup()
+    results = []
+    task = CompactDatabaseTask(db_file)
+    task.signals.finished.connect(results.append)
+
+    task.run()
+    task.run()
+
+    assert results == [True, False]
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
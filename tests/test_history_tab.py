@@ -112,17 +112,17 @@ class TestHistoryTabEditMode:
     
     def test_toggle_edit_mode_on(self, history_tab):
         """Test enabling edit mode."""
-        from PySide6.QtWidgets import QTableWidget
+        from PySide6.QtWidgets import QAbstractItemView
         
         history_tab.toggle_edit_mode(True)
         
         assert history_tab.delete_btn.isEnabled() is True
         assert "Done" in history_tab.edit_mode_btn.text()
-        assert history_tab.table.selectionMode() == QTableWidget.ExtendedSelection
+        assert history_tab.table.selectionMode() == QAbstractItemView.ExtendedSelection
     
     def test_toggle_edit_mode_off(self, history_tab):
         """Test disabling edit mode."""
-        from PySide6.QtWidgets import QTableWidget
+        from PySide6.QtWidgets import QAbstractItemView
         
         # First enable
         history_tab.toggle_edit_mode(True)
@@ -131,7 +131,7 @@ class TestHistoryTabEditMode:
         
         assert history_tab.delete_btn.isEnabled() is False
         assert "Edit" in history_tab.edit_mode_btn.text()
-        assert history_tab.table.selectionMode() == QTableWidget.NoSelection
+        assert history_tab.table.selectionMode() == QAbstractItemView.NoSelection
 
 
 class TestHistoryTabTableDisplay:
@@ -139,7 +139,7 @@ class TestHistoryTabTableDisplay:
     
     def test_table_columns(self, history_tab):
         """Test that table has expected columns."""
-        column_count = history_tab.table.columnCount()
+        column_count = history_tab.model.columnCount()
         # Should have columns for: Date/Time, File, Language, WPM, Accuracy, Duration, Completed
         assert column_count >= 6
     
@@ -149,7 +149,7 @@ class TestHistoryTabTableDisplay:
         header = history_tab.table.horizontalHeader()
         assert header is not None
         # Table should be functional
-        assert history_tab.table.rowCount() >= 0
+        assert history_tab.model.rowCount() >= 0
 
 
 class TestHistoryTabWithData:
@@ -175,7 +175,7 @@ class TestHistoryTabWithData:
         history_tab._load_history()
         
         # Table should have at least one row
-        assert history_tab.table.rowCount() >= 1
+        assert history_tab.model.rowCount() >= 1
     
     def test_language_combo_populated(self, history_tab, db_setup):
         """Test that language combo is populated with available languages."""
@@ -201,3 +201,101 @@ class TestHistoryTabWithData:
         
         # Language combo should have "All" + languages
         assert history_tab.language_combo.count() >= 2
+
+
+class TestHistoryTabPagination:
+    """Test keyset-paginated loading and SQL-side sorting."""
+
+    @staticmethod
+    def _insert_sessions(count):
+        from app import settings
+
+        conn = settings._connect()
+        conn.executemany(
+            """
+            INSERT INTO session_history (file_path, language, wpm, accuracy, duration, completed, recorded_at)
+            VALUES (?, 'Python', ?, 0.9, 10, 1, datetime('2024-01-01', ? || ' minutes'))
+            """,
+            [(f"/test/file{i}.py", float(i % 120), i) for i in range(count)],
+        )
+        conn.commit()
+        conn.close()
+
+    def test_loads_first_page_and_fetches_more(self, history_tab, db_setup):
+        """Only one page is loaded up front; the rest arrives via fetchMore."""
+        self._insert_sessions(450)
+        history_tab._load_history()
+
+        model = history_tab.model
+        assert model.total_count == 450
+        assert model.rowCount() == model.PAGE_SIZE
+        assert "450" in history_tab.count_label.text()
+
+        while model.canFetchMore():
+            model.fetchMore()
+        assert model.rowCount() == 450
+        ids = [model.record_id(row) for row in range(model.rowCount())]
+        assert len(set(ids)) == 450
+
+    def test_sort_is_pushed_to_sql(self, history_tab, db_setup):
+        """Sorting by a column orders rows across page boundaries."""
+        from PySide6.QtCore import Qt
+
+        self._insert_sessions(300)
+        history_tab._load_history()
+
+        model = history_tab.model
+        model.sort(3, Qt.AscendingOrder)
+        while model.canFetchMore():
+            model.fetchMore()
+        wpms = [model.record_at(row)["wpm"] for row in range(model.rowCount())]
+        assert wpms == sorted(wpms)
+        assert model.data(model.index(0, 3)) == "0.0"
+
+    def test_delete_selected_uses_model_ids(self, history_tab, db_setup):
+        """Deleting selected rows removes them from the database."""
+        from PySide6.QtWidgets import QMessageBox
+        from app import stats_db
+
+        self._insert_sessions(5)
+        history_tab._load_history()
+        history_tab.toggle_edit_mode(True)
+        history_tab.table.selectRow(0)
+
+        with patch.object(QMessageBox, "question", return_value=QMessageBox.Yes):
+            history_tab.delete_selected()
+
+        assert stats_db.count_session_history() == 4
+        assert history_tab.model.total_count == 4
+
+
+class TestHistoryTabExport:
+    """Test the background export flow."""
+
+    def test_export_runs_on_worker_thread(self, history_tab, db_setup, tmp_path):
+        """Export streams to disk off the UI thread and reports completion."""
+        from PySide6.QtCore import QThreadPool
+        from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
+        from app import stats_db
+
+        for i in range(3):
+            stats_db.record_session_history(
+                f"/test/f{i}.py", "Python", 50 + i, 0.9, 10, 9, 1, 5.0,
+                completed=True, auto_indent=(i == 0),
+            )
+        history_tab.indent_combo.setCurrentIndex(1)  # ON
+        history_tab.apply_filters()
+
+        dest = tmp_path / "out.ndjson"
+        with patch.object(QFileDialog, "getSaveFileName", return_value=(str(dest), "NDJSON (*.ndjson)")), \
+             patch.object(QMessageBox, "information") as info:
+            history_tab.export_to_csv()
+            QThreadPool.globalInstance().waitForDone(5000)
+            for _ in range(50):
+                QApplication.processEvents()
+                if info.called:
+                    break
+
+        assert info.called
+        assert len(dest.read_text(encoding="utf-8").splitlines()) == 1
+        assert history_tab.export_btn.isEnabled()
@@ -1,4 +1,5 @@
 """Tests for icon_manager.py"""
+import json
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -103,3 +104,73 @@ def test_singleton_get_icon_manager():
     mgr1 = get_icon_manager()
     mgr2 = get_icon_manager()
     assert mgr1 is mgr2
+
+@pytest.fixture
+def theme_dir(tmp_path):
+    """A tiny icon theme: manifest plus two SVGs."""
+    icons = tmp_path / "icons"
+    icons.mkdir()
+    svg = '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20"><rect width="20" height="20" fill="red"/></svg>'
+    (icons / "python.svg").write_text(svg)
+    (icons / "file.svg").write_text(svg)
+    manifest = {
+        "iconDefinitions": {
+            "python": {"iconPath": "./../icons/python.svg"},
+            "file": {"iconPath": "./../icons/file.svg"},
+        },
+        "fileExtensions": {"py": "python"},
+        "fileNames": {},
+        "folderNames": {},
+        "languageIds": {"python": "python"},
+    }
+    (icons / "icons.json").write_text(json.dumps(manifest))
+    return icons
+
+def test_rendered_icons_are_cached_on_disk(qapp, theme_dir, tmp_path):
+    """A second manager loads the PNG instead of rendering the SVG again."""
+    cache = tmp_path / "cache"
+    with patch("app.icon_manager.get_icons_dir", return_value=theme_dir):
+        first = IconManager(cache_dir=cache)
+        assert not first.get_file_icon("main.py", size=16).isNull()
+        pngs = list(cache.rglob("python@*.png"))
+        assert len(pngs) == 1
+
+        second = IconManager(cache_dir=cache)
+        with patch.object(IconManager, "_render_svg") as mock_render:
+            pixmap = second.get_file_icon("main.py", size=16)
+        mock_render.assert_not_called()
+        assert pixmap.width() == 16
+
+def test_changed_svg_invalidates_disk_cache(qapp, theme_dir, tmp_path):
+    cache = tmp_path / "cache"
+    with patch("app.icon_manager.get_icons_dir", return_value=theme_dir):
+        IconManager(cache_dir=cache).get_icon("Python", size=20)
+        svg = theme_dir / "python.svg"
+        svg.write_text(svg.read_text().replace("red", "blue") + "\n")
+
+        manager = IconManager(cache_dir=cache)
+        with patch.object(IconManager, "_render_svg", wraps=manager._render_svg) as mock_render:
+            manager.get_icon("Python", size=20)
+        mock_render.assert_called_once()
+        # The stale render was replaced, not kept alongside
+        assert len(list(cache.rglob("python@*.png"))) == 1
+
+def test_lookup_table_replaces_manifest_parse(qapp, theme_dir, tmp_path):
+    cache = tmp_path / "cache"
+    with patch("app.icon_manager.get_icons_dir", return_value=theme_dir):
+        first = IconManager(cache_dir=cache)
+        assert first.lookup_path.exists()
+
+        with patch("app.icon_manager.json.load", wraps=json.load) as mock_load:
+            second = IconManager(cache_dir=cache)
+        # Only the lookup table is read, and it yields the same mappings
+        assert mock_load.call_count == 1
+        assert second.file_extensions == {"py": "python"}
+        assert second.icon_definitions == {"python": "python.svg", "file": "file.svg"}
+
+        # Touching the manifest makes the table stale
+        manifest = theme_dir / "icons.json"
+        data = json.loads(manifest.read_text())
+        data["fileExtensions"]["pyi"] = "python"
+        manifest.write_text(json.dumps(data))
+        assert "pyi" in IconManager(cache_dir=cache).file_extensions
@@ -223,7 +223,7 @@ class TestLanguagesTab:
         mock_icon.get_emoji_fallback.return_value = "🐍"
         mock_icon_mgr.return_value = mock_icon
         
-        mock_stats_db.get_file_stats_for_files.return_value = {}
+        mock_stats_db.get_language_progress.return_value = {}
         mock_stats_db.get_recent_wpm_average.return_value = {"average": 70.0, "count": 5}
         mock_stats_db.get_bulk_recent_wpm_averages.return_value = {
             "Python": {"average": 75.0, "count": 3},
@@ -240,6 +240,59 @@ class TestLanguagesTab:
         assert tab._status_label is None
         assert tab.card_layout.count() >= 2
 
+    def test_populate_cards_uses_language_progress(self, app, db_setup, mock_icon_manager):
+        """Card counts come from the maintained per-language counters."""
+        from app import stats_db
+        from app.languages_tab import LanguagesTab
+
+        from app.language_cache import files_signature
+
+        stats_db.update_file_stats("/p/a.py", wpm=50, accuracy=0.95, completed=True)
+
+        tab = LanguagesTab()
+        tab._last_signature = "sig"
+        tab._cached_language_files = {"Python": ["/p/a.py", "/p/b.py"], "Go": ["/main.go"]}
+        tab._populate_cards(tab._cached_language_files)
+
+        assert stats_db.get_scan_index_signature() == files_signature(tab._cached_language_files)
+        assert tab._language_cards["Python"].count_label.text().startswith("1/2 files")
+        assert tab._file_language["/main.go"] == "Go"
+
+    def test_populate_cards_resyncs_deep_file_changes(self, app, db_setup, mock_icon_manager):
+        """A rescan with the same folder signature but other files rebuilds the index."""
+        from app import stats_db
+        from app.languages_tab import LanguagesTab
+
+        tab = LanguagesTab()
+        tab._last_signature = "sig"
+        tab._populate_cards({"Python": ["/p/a.py"]})
+        stats_db.update_file_stats("/p/deep/new.py", wpm=50, accuracy=0.95, completed=True)
+
+        # Same top-level folder signature, a file added in a subfolder
+        tab._populate_cards({"Python": ["/p/a.py", "/p/deep/new.py"]})
+
+        assert stats_db.get_language_progress()["Python"] == {"completed": 1, "total": 2}
+        assert tab._language_cards["Python"].count_label.text().startswith("1/2 files")
+
+    def test_refresh_language_stats_targets_file_language(self, app, db_setup, mock_icon_manager):
+        """Only the card owning the practiced file is refreshed."""
+        from app import stats_db
+        from app.languages_tab import LanguagesTab
+
+        tab = LanguagesTab()
+        tab._last_signature = "sig"
+        tab._cached_language_files = {"Python": ["/p/a.py", "/p/b.py"], "Go": ["/main.go"]}
+        tab._populate_cards(tab._cached_language_files)
+
+        stats_db.update_file_stats("/p/b.py", wpm=50, accuracy=0.95, completed=True)
+        stats_db.update_file_stats("/main.go", wpm=50, accuracy=0.95, completed=True)
+        with patch.object(stats_db, "get_recent_wpm_average_by_language", wraps=stats_db.get_recent_wpm_average_by_language) as recent:
+            tab.refresh_language_stats("/p/b.py")
+
+        recent.assert_called_once_with("Python", limit=10)
+        assert tab._language_cards["Python"].count_label.text().startswith("1/2 files")
+        assert tab._language_cards["Go"].count_label.text().startswith("0/1 files")
+
 
 class TestLanguageScanTask:
     """Test background scan task."""
@@ -274,3 +327,39 @@ class TestLanguageScanTask:
         
         assert len(scanner_called) == 1
         assert "/folder1" in scanner_called[0]
+    
+    def test_scan_task_indexes_after_completion(self, app):
+        """The drill indexer runs on the scan result once cards can be built."""
+        from app.languages_tab import _LanguageScanTask
+        
+        events = []
+        task = _LanguageScanTask(
+            folders_snapshot=("/folder1",),
+            scanner=lambda folders: {"Python": ["/test.py"]},
+            indexer=lambda result: events.append(("indexed", result)),
+        )
+        task.signals.completed.connect(lambda result, snapshot: events.append(("completed", result)))
+        
+        task.run()
+        
+        assert [name for name, _ in events] == ["completed", "indexed"]
+        assert events[1][1] == {"Python": ["/test.py"]}
+    
+    def test_scan_task_logs_indexer_failure(self, app, caplog):
+        """A failing drill index update is logged, not swallowed."""
+        from app.languages_tab import _LanguageScanTask
+        
+        def indexer(result):
+            raise OSError("disk full")
+        
+        task = _LanguageScanTask(
+            folders_snapshot=("/folder1",),
+            scanner=lambda folders: {"Python": ["/test.py"]},
+            indexer=indexer,
+        )
+        
+        with caplog.at_level("ERROR", logger="app.languages_tab"):
+            task.run()
+        
+        assert "Failed to update the drill index" in caplog.text
+        assert "disk full" in caplog.text
@@ -0,0 +1,77 @@
+"""Tests for the queue-based logging setup."""
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+import pytest
+
+from app import logging_config
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    yield tmp_path / "logs" / "app.log"
+    logging_config.shutdown_logging()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def test_records_are_written_by_listener_thread(log_file, monkeypatch):
+    writer_threads = []
+    original_emit = logging.StreamHandler.emit
+
+    def recording_emit(self, record):
+        writer_threads.append(threading.current_thread().name)
+        original_emit(self, record)
+
+    monkeypatch.setattr(logging.StreamHandler, "emit", recording_emit)
+    logging_config.setup_logging("DEBUG", log_file=log_file)
+
+    root = logging.getLogger()
+    assert [type(h) for h in root.handlers] == [QueueHandler]
+
+    logging.getLogger("app.test").debug("typed %d keys", 42)
+    logging_config.shutdown_logging()
+
+    text = log_file.read_text(encoding="utf-8")
+    assert "[DEBUG] [app.test] - typed 42 keys" in text
+    assert writer_threads and threading.main_thread().name not in writer_threads
+
+
+def test_log_file_is_appended_and_rotated(log_file, monkeypatch):
+    monkeypatch.setattr(logging_config, "LOG_MAX_BYTES", 2000)
+    log_file.parent.mkdir(parents=True)
+    log_file.write_text("previous run\n", encoding="utf-8")
+
+    logging_config.setup_logging("INFO", log_file=log_file)
+    for i in range(100):
+        logging.getLogger("app.test").info("line %d of the rotation test", i)
+    logging_config.shutdown_logging()
+
+    backups = sorted(p.name for p in log_file.parent.iterdir() if p.name != log_file.name)
+    assert backups == ["app.log.1", "app.log.2", "app.log.3"]
+    assert "line 99 of the rotation test" in log_file.read_text(encoding="utf-8")
+
+
+def test_set_log_level_at_runtime(log_file):
+    logging_config.setup_logging(log_file=log_file)
+    root = logging.getLogger()
+    assert root.level == logging.INFO
+
+    assert logging_config.set_log_level("warning") == logging.WARNING
+    assert not root.isEnabledFor(logging.INFO)
+    # Unknown names fall back to the default instead of raising
+    assert logging_config.set_log_level("chatty") == logging.INFO
+
+
+def test_log_level_setting_is_applied(log_file, tmp_path):
+    from app import settings
+
+    settings.init_db(str(tmp_path / "test.db"))
+    logging_config.setup_logging(log_file=log_file)
+    settings.set_setting("log_level", "ERROR")
+
+    assert logging_config.apply_log_level_setting() == logging.ERROR
+    assert logging.getLogger().level == logging.ERROR
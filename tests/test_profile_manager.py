@@ -364,3 +364,28 @@ def test_migration_logic(tmp_path):
         assert not (data_dir / "ghosts").exists()
         assert not legacy_sounds.exists()
         assert not legacy_snapshot.exists()
+
+
+def test_backup_and_restore_active_profile(temp_data_dir):
+    """A restore brings back the snapshot's data and reloads the settings cache."""
+    import app.settings as settings
+
+    manager, data_dir = temp_data_dir
+    db_path = manager.get_current_db_path()
+    settings.init_db(str(db_path))
+    settings.set_setting("dark_scheme", "nord")
+
+    snapshot = manager.backup_profile("Default")
+    assert snapshot is not None and snapshot.parent == db_path.parent / "backups"
+    assert [b.path for b in manager.list_backups("Default")] == [snapshot]
+
+    settings.set_setting("dark_scheme", "dracula")
+    settings.flush_settings()
+
+    assert manager.restore_backup("Default") is True
+    assert settings.get_setting("dark_scheme") == "nord"
+
+
+def test_restore_without_backups_fails(temp_data_dir):
+    manager, data_dir = temp_data_dir
+    assert manager.restore_backup("Default") is False
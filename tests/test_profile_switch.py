@@ -0,0 +1,129 @@
+"""Tests for profile_switch.py"""
+import sqlite3
+
+import pytest
+
+from app import settings, stats_db
+from app.profile_switch import (
+    ProfileSnapshotCache,
+    db_stamp,
+    load_profile_snapshot,
+    recount_folder_sessions,
+    summarize_folders,
+)
+
+
+@pytest.fixture
+def other_db(tmp_path):
+    """A second profile's database, separate from the active one."""
+    settings.init_db(str(tmp_path / "active" / "typing_stats.db"))
+    return tmp_path / "other" / "typing_stats.db"
+
+
+def test_load_profile_snapshot_prepares_db_without_switching(other_db, tmp_path):
+    active = settings.get_current_db_path()
+
+    snapshot = load_profile_snapshot("Other", other_db)
+
+    assert settings.get_current_db_path() == active
+    assert snapshot.name == "Other"
+    assert snapshot.settings["dark_scheme"] == settings.get_default("dark_scheme")
+    assert snapshot.folders == []
+    conn = sqlite3.connect(other_db)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert version == stats_db.STATS_SCHEMA_VERSION
+
+
+def test_snapshot_reads_target_folders_and_ignore_settings(other_db, tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "main.py").write_text("print(1)\n")
+    (project / "notes.md").write_text("# notes\n")
+
+    settings.prepare_db(other_db)
+    conn = sqlite3.connect(other_db)
+    conn.execute("INSERT INTO folders(path) VALUES(?)", (str(project),))
+    conn.execute("UPDATE settings SET value = '*.md' WHERE key = 'ignored_files'")
+    conn.execute(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, total_keystrokes, "
+        "correct_keystrokes, incorrect_keystrokes, duration) VALUES (?, 'Python', 50, 1, 10, 10, 0, 5)",
+        (str(project / "main.py"),),
+    )
+    conn.commit()
+    conn.close()
+
+    snapshot = load_profile_snapshot("Other", other_db)
+
+    assert [f["path"] for f in snapshot.folders] == [str(project)]
+    # The target profile's ignore patterns apply, not the active profile's
+    assert snapshot.folder_summaries[str(project)] == (1, 1, 1)
+
+
+def test_use_prepared_db_seeds_settings_cache(other_db, monkeypatch):
+    snapshot = load_profile_snapshot("Other", other_db)
+    snapshot.settings["dark_scheme"] = "cyberpunk"
+
+    settings.use_prepared_db(snapshot.db_path, snapshot.settings)
+
+    connects = []
+    monkeypatch.setattr(settings.sqlite3, "connect", lambda *a, **k: connects.append(a))
+    assert settings.get_current_db_path() == other_db
+    assert settings.get_setting("dark_scheme") == "cyberpunk"
+    assert connects == []
+
+
+def test_summarize_folders_skips_missing(other_db, tmp_path):
+    settings.prepare_db(other_db)
+    missing = str(tmp_path / "gone")
+    assert summarize_folders([{"path": missing}], other_db, ([], [])) == {}
+
+
+def test_recount_folder_sessions_sees_sessions_since_summary(other_db, tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "main.py").write_text("print(1)\n")
+    settings.prepare_db(other_db)
+    summaries = summarize_folders([{"path": str(project)}], other_db, ([], []))
+    assert summaries[str(project)] == (1, 1, 0)
+
+    conn = sqlite3.connect(other_db)
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy) VALUES (?, 'Python', 50, 1)",
+        [(str(project / "main.py"),), (str(project / "main.py"),), ("/elsewhere/x.py",)],
+    )
+    conn.commit()
+    conn.close()
+
+    assert recount_folder_sessions(summaries, other_db) == {str(project): (1, 1, 2)}
+    assert summaries[str(project)] == (1, 1, 0)
+
+
+def test_snapshot_cache_invalidates_on_write(other_db):
+    cache = ProfileSnapshotCache(capacity=2)
+    snapshot = load_profile_snapshot("Other", other_db)
+    cache.put(snapshot)
+    assert cache.get(other_db) is snapshot
+
+    conn = sqlite3.connect(other_db)
+    conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES('dark_scheme', 'nord')")
+    conn.commit()
+    conn.close()
+
+    assert db_stamp(other_db) != snapshot.stamp
+    assert cache.get(other_db) is None
+    assert len(cache) == 0
+
+
+def test_snapshot_cache_evicts_least_recent(tmp_path):
+    settings.init_db(str(tmp_path / "active.db"))
+    cache = ProfileSnapshotCache(capacity=2)
+    snapshots = [load_profile_snapshot(name, tmp_path / f"{name}.db") for name in ("a", "b", "c")]
+    cache.put(snapshots[0])
+    cache.put(snapshots[1])
+    cache.get(snapshots[0].db_path)  # a is now the most recent
+    cache.put(snapshots[2])
+
+    assert cache.get(snapshots[1].db_path) is None
+    assert cache.get(snapshots[0].db_path) is snapshots[0]
+    assert cache.get(snapshots[2].db_path) is snapshots[2]
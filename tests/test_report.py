@@ -0,0 +1,174 @@
+"""Tests for report.py"""
+import io
+import json
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app import settings, stats_db
+from app.report import build_report, format_report_text, run_report
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def db_file(tmp_path: Path) -> Path:
+    path = tmp_path / "Default" / "typing_stats.db"
+    settings.init_db(str(path))
+    stats_db.record_session_history("/src/a.py", "Python", 55.0, 0.97, 100, 97, 3, 20.0, completed=True)
+    stats_db.record_session_history("/src/b.go", "Go", 40.0, 0.9, 80, 72, 8, 20.0, completed=True)
+    stats_db.record_session_history("/src/c.go", "Go", 30.0, 0.8, 10, 8, 2, 5.0, completed=False)
+    return path
+
+
+def test_report_matches_stats_functions(db_file: Path):
+    expected = (
+        stats_db.get_aggregated_stats(),
+        stats_db.get_per_language_stats(),
+        stats_db.get_current_streak(),
+        stats_db.get_trend_comparison(7),
+    )
+
+    report = build_report(db_file, days=7)
+
+    assert (report["summary"], report["languages"], report["streak_days"], report["trend"]) == expected
+    assert report["summary"]["total_completed"] == 2
+    assert report["streak_days"] == 1
+
+
+def test_report_leaves_database_untouched(db_file: Path):
+    settings.init_db(str(db_file.parent / "other.db"))
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    before = (db_file.stat().st_mtime_ns, db_file.read_bytes())
+
+    build_report(db_file)
+
+    assert settings.get_current_db_path() == db_file
+    conn = settings._connect()
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        conn.execute("UPDATE settings SET value = 'nord' WHERE key = 'dark_scheme'")
+    conn.close()
+    assert (db_file.stat().st_mtime_ns, db_file.read_bytes()) == before
+
+
+def test_report_reads_database_without_settings_table(tmp_path: Path):
+    """The sandbox demo database has no settings; defaults apply."""
+    path = tmp_path / "demo_stats.db"
+    settings.init_db(str(path))
+    stats_db.record_session_history("/src/a.py", "Python", 55.0, 0.97, 100, 97, 3, 20.0, completed=True)
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE settings")
+    conn.commit()
+    conn.close()
+
+    assert build_report(path)["summary"]["total_completed"] == 1
+
+
+def test_report_reads_database_before_migrations(tmp_path: Path):
+    """Databases from older builds are reported as they are, not migrated."""
+    path = tmp_path / "typing_stats.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE file_stats (
+            file_path TEXT, auto_indent INTEGER DEFAULT 0, best_wpm REAL DEFAULT 0,
+            last_wpm REAL DEFAULT 0, best_accuracy REAL DEFAULT 0, last_accuracy REAL DEFAULT 0,
+            times_practiced INTEGER DEFAULT 0, last_practiced TIMESTAMP, completed BOOLEAN DEFAULT 0,
+            PRIMARY KEY (file_path, auto_indent)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE session_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, file_path TEXT NOT NULL, language TEXT DEFAULT '',
+            auto_indent INTEGER DEFAULT 0, wpm REAL NOT NULL, accuracy REAL NOT NULL,
+            total_keystrokes INTEGER DEFAULT 0, correct_keystrokes INTEGER DEFAULT 0,
+            incorrect_keystrokes INTEGER DEFAULT 0, duration REAL DEFAULT 0,
+            completed BOOLEAN DEFAULT 0, recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, total_keystrokes, completed) "
+        "VALUES (?, 'Python', ?, 0.9, 100, 1)",
+        [("/src/a.py", 50.0), ("/src/debug.log", 90.0)],  # *.log is ignored by default
+    )
+    conn.commit()
+    conn.close()
+
+    out = io.StringIO()
+    assert run_report(path, "json", out=out) == 0
+    report = json.loads(out.getvalue())
+    assert report["languages"][0]["session_count"] == 1
+    assert report["languages"][0]["best_wpm"] == 50.0
+
+
+def test_run_report_formats(db_file: Path, tmp_path: Path):
+    out = io.StringIO()
+    assert run_report(db_file, "json", days=7, out=out) == 0
+    report = json.loads(out.getvalue())
+    assert report["trend"]["period_days"] == 7
+
+    text = format_report_text(report)
+    assert "2 completed, 1 incomplete" in text
+    assert "Go" in text and "Python" in text
+
+    assert run_report(tmp_path / "missing.db", out=io.StringIO()) == 1
+    assert not (tmp_path / "missing.db").exists()
+
+
+def test_report_does_not_import_qt(db_file: Path):
+    script = (
+        "import sys\n"
+        "from app.report import run_report\n"
+        f"code = run_report({str(db_file)!r}, 'json')\n"
+        "assert 'PySide6' not in sys.modules, 'Qt was imported'\n"
+        "sys.exit(code)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)["summary"]["total_completed"] == 2
+
+
+@pytest.mark.slow
+def test_report_benchmark(tmp_path: Path):
+    """Benchmark: the full report on 1M sessions."""
+    import random
+    path = tmp_path / "bench_stats.db"
+    settings.init_db(str(path))
+    rng = random.Random(2)
+    languages = ["Python", "Go", "Rust", "C", "Java", "TypeScript"]
+    start_day = datetime.now() - timedelta(days=1095)
+    conn = settings._connect()
+    conn.execute("PRAGMA synchronous=OFF")
+    for chunk in range(100):
+        conn.executemany(
+            "INSERT INTO session_history (file_path, language, wpm, accuracy, total_keystrokes, "
+            "correct_keystrokes, incorrect_keystrokes, duration, completed, recorded_at) "
+            "VALUES (?, ?, ?, ?, 300, 285, 15, 60, ?, ?)",
+            [
+                (f"/bench/{i % 5000}.py", languages[i % len(languages)], rng.uniform(20, 120),
+                 rng.uniform(0.8, 1.0), int(rng.random() < 0.9),
+                 (start_day + timedelta(seconds=i * 94.6)).strftime("%Y-%m-%d %H:%M:%S"))
+                for i in range(chunk * 10_000, (chunk + 1) * 10_000)
+            ],
+        )
+    conn.commit()
+    conn.close()
+
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        report = build_report(path)
+        durations.append(time.perf_counter() - start)
+
+    print(f"\n1M sessions: report {min(durations) * 1000:.0f}ms (first run {durations[0] * 1000:.0f}ms)")
+    assert report["summary"]["total_completed"] + report["summary"]["total_incomplete"] == 1_000_000
+    assert report["streak_days"] > 1000
+    assert max(durations) < 1.0
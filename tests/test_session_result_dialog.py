@@ -277,6 +277,54 @@ def test_graph_error_coordinate_conversion(app, db_setup):
 
 # ============== SESSION RESULT DIALOG TESTS ==============
 
+def test_downsample_columns_keeps_column_extremes():
+    """Dense series keep the lowest and highest point of each pixel column."""
+    from app.session_result_dialog import downsample_columns
+    sparse = [(1, 10.0, 0.0, 0.0), (2, 20.0, 5.0, 0.0)]
+    assert downsample_columns(sparse) == sparse
+
+    dense = [(s, v, 40.0 + s * 0.1, 0.0) for s, v in enumerate([5, 9, 1, 7, 3])]
+    assert [p[1] for p in downsample_columns(dense)] == [9, 1]
+
+
+def test_graph_hover_finds_markers_by_column(app, db_setup):
+    """Hover hits the nearest marker and respects visibility toggles."""
+    graph = InteractiveWPMGraph(
+        times=[1.0, 2.0, 3.0], wpms=[50.0, 55.0, 60.0], total_time=3.0,
+        line_color="#4CAF50", theme_colors={},
+        error_history=[(2, 0)],
+    )
+    x, y = graph._time_to_x(2), graph._wpm_to_y(55.0)
+    assert graph._find_hovered_marker(x + 3, y - 3) == (2, 'user_wpm')
+    assert graph._find_hovered_marker(x, graph._error_to_y(0)) == (2, 'user_error')
+    assert graph._find_hovered_marker(x, y + 40) == (None, None)
+
+    graph.user_wpm_visible = False
+    assert graph._find_hovered_marker(x, y) == (None, None)
+
+
+def test_graph_static_layer_is_reused_on_hover(app, db_setup):
+    """Hover repaints reuse the cached layer; toggles rebuild it."""
+    seconds = list(range(1, 3601))
+    graph = InteractiveWPMGraph(
+        times=[float(s) for s in seconds], wpms=[60.0 + (s % 17) for s in seconds],
+        total_time=3600.0, line_color="#4CAF50", theme_colors={}, is_race=True,
+        ghost_wpm_history=[(s, 55.0 + (s % 13)) for s in seconds],
+    )
+    graph.grab()
+    layer = graph._layer
+    # Hour-long series are reduced to the pixel width of the plot
+    assert len(graph._series_points['user_wpm']) <= 2 * graph._graph_rect().width() + 2
+
+    graph.hover_info = graph._find_hovered_marker(graph._time_to_x(1800), graph._wpm_to_y(60.0 + 1800 % 17))
+    graph.grab()
+    assert graph._layer is layer
+
+    graph.ghost_visible = False
+    graph.grab()
+    assert graph._layer is not layer
+
+
 def test_session_result_dialog_initialization(app, db_setup):
     """Test SessionResultDialog initializes correctly."""
     stats = {
@@ -332,3 +332,75 @@ def test_init_db_points_to_active_profile(tmp_path):
         
         assert settings.get_current_db_path() == special_db
         assert special_db.exists()
+
+
+def _stored_setting(db_file: Path, key: str):
+    import sqlite3
+    conn = sqlite3.connect(db_file)
+    row = conn.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def test_set_setting_is_write_behind(tmp_path: Path, monkeypatch):
+    """Writes hit the cache at once and reach the database in one batch."""
+    db_file = tmp_path / "test.db"
+    settings.init_db(str(db_file))
+    monkeypatch.setattr(settings, "SETTINGS_FLUSH_DELAY", 60)
+
+    for size in range(10, 20):
+        settings.set_setting("font_size", str(size))
+    settings.set_setting("pause_delay", "3")
+    settings.remove_setting("stats_bigram_mode")
+
+    assert settings.get_setting("font_size") == "19"
+    assert settings.get_setting("stats_bigram_mode", "fallback") == "fallback"
+    assert _stored_setting(db_file, "font_size") == settings.get_default("font_size")
+
+    connects = []
+    real_connect = settings.sqlite3.connect
+    with monkeypatch.context() as m:
+        m.setattr(settings.sqlite3, "connect", lambda *a, **kw: connects.append(a) or real_connect(*a, **kw))
+        settings.flush_settings()
+        settings.flush_settings()  # Nothing queued: no connection
+    assert len(connects) == 1
+
+    assert _stored_setting(db_file, "font_size") == "19"
+    assert _stored_setting(db_file, "pause_delay") == "3"
+    assert _stored_setting(db_file, "stats_bigram_mode") is None
+
+
+def test_settings_flush_after_delay(tmp_path: Path, monkeypatch):
+    import time
+
+    db_file = tmp_path / "test.db"
+    settings.init_db(str(db_file))
+    monkeypatch.setattr(settings, "SETTINGS_FLUSH_DELAY", 0.01)
+
+    settings.set_setting("expanded_folders", '["/a"]')
+    deadline = time.time() + 5
+    while _stored_setting(db_file, "expanded_folders") != '["/a"]' and time.time() < deadline:
+        time.sleep(0.01)
+    assert _stored_setting(db_file, "expanded_folders") == '["/a"]'
+
+
+def test_queued_settings_follow_their_database(tmp_path: Path, monkeypatch):
+    """Switching databases flushes pending writes into the old one first."""
+    monkeypatch.setattr(settings, "SETTINGS_FLUSH_DELAY", 60)
+    first, second = tmp_path / "first.db", tmp_path / "second.db"
+    settings.init_db(str(first))
+    settings.set_setting("dark_scheme", "dracula")
+
+    settings.init_db(str(second))
+    assert _stored_setting(first, "dark_scheme") == "dracula"
+    assert settings.get_setting("dark_scheme") == settings.get_default("dark_scheme")
+
+
+def test_cache_load_keeps_queued_values(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "SETTINGS_FLUSH_DELAY", 60)
+    settings.init_db(str(tmp_path / "test.db"))
+
+    settings.set_setting("font_size", "31")  # Before anything loaded the cache
+    assert settings.get_setting("font_family") is not None
+    assert settings.get_setting("font_size") == "31"
+    settings.flush_settings()
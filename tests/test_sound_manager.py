@@ -102,3 +102,55 @@ def test_set_profile_loads_effect(qapp, temp_sounds_env):
         assert manager.current_profile == "default_1"
         assert manager.sound_effect is not None
         mock_set_source.assert_called()
+
+def test_play_keypress_round_robins_voices(qapp, temp_sounds_env):
+    """Fast key presses start successive voices instead of restarting one."""
+    sound_manager_mod._sound_manager = None
+
+    with patch("app.portable_data.get_data_manager") as mock_gdm, \
+         patch("PySide6.QtMultimedia.QSoundEffect.setSource"), \
+         patch("PySide6.QtMultimedia.QSoundEffect.play") as mock_play:
+
+        mock_dm = MagicMock()
+        mock_dm.get_sounds_dir.return_value = temp_sounds_env["sounds"]
+        mock_gdm.return_value = mock_dm
+
+        manager = SoundManager()
+        manager.set_profile("default_1")
+        assert len(manager._voices) == sound_manager_mod.KEYPRESS_VOICES
+
+        # Not ready yet: nothing plays and nothing is reloaded
+        manager.play_keypress()
+        mock_play.assert_not_called()
+
+        manager._voices_ready = True
+        for _ in range(sound_manager_mod.KEYPRESS_VOICES + 1):
+            manager.play_keypress()
+        assert mock_play.call_count == sound_manager_mod.KEYPRESS_VOICES + 1
+        assert manager._next_voice == 1
+
+
+@pytest.mark.slow
+def test_play_keypress_benchmark(qapp, temp_sounds_env):
+    """play_keypress stays well under a millisecond in a tight loop."""
+    import time
+    sound_manager_mod._sound_manager = None
+
+    with patch("app.portable_data.get_data_manager") as mock_gdm, \
+         patch("PySide6.QtMultimedia.QSoundEffect.setSource"):
+
+        mock_dm = MagicMock()
+        mock_dm.get_sounds_dir.return_value = temp_sounds_env["sounds"]
+        mock_gdm.return_value = mock_dm
+
+        manager = SoundManager()
+        manager.set_profile("default_1")
+        manager._voices_ready = True
+
+        presses = 2000
+        start = time.perf_counter()
+        for _ in range(presses):
+            manager.play_keypress()
+        mean_ms = (time.perf_counter() - start) * 1000 / presses
+        print(f"\nplay_keypress: {mean_ms * 1000:.1f}us per call")
+        assert mean_ms < 1.0
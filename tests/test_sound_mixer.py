@@ -0,0 +1,89 @@
+"""Tests for sound_mixer.py"""
+import array
+import wave
+
+import pytest
+
+from app.sound_mixer import INT16_MAX, INT16_MIN, PcmClip, VoiceMixer, load_wav_clip
+
+
+def _write_wav(path, samples, channels=1, sample_rate=8000, sampwidth=2):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sampwidth)
+        wav.setframerate(sample_rate)
+        if sampwidth == 2:
+            wav.writeframes(array.array("h", samples).tobytes())
+        else:
+            wav.writeframes(bytes(samples))
+
+
+def _samples(data: bytes):
+    out = array.array("h")
+    out.frombytes(data)
+    return list(out)
+
+
+def test_load_wav_clip(tmp_path):
+    path = tmp_path / "key.wav"
+    _write_wav(path, [1, -2, 3, -4], channels=2, sample_rate=22050)
+
+    clip = load_wav_clip(path)
+
+    assert list(clip.samples) == [1, -2, 3, -4]
+    assert clip.channels == 2
+    assert clip.sample_rate == 22050
+    assert clip.frames == 2
+
+
+def test_load_wav_clip_rejects_8bit(tmp_path):
+    path = tmp_path / "key8.wav"
+    _write_wav(path, [128, 129], sampwidth=1)
+
+    with pytest.raises(ValueError):
+        load_wav_clip(path)
+
+
+def test_mix_sums_overlapping_voices():
+    mixer = VoiceMixer(PcmClip(array.array("h", [10, 20, 30, 40]), 1, 8000))
+
+    mixer.trigger()
+    assert _samples(mixer.mix(2)) == [10, 20]
+    mixer.trigger()
+    # Second voice starts at the beginning while the first is half way
+    assert _samples(mixer.mix(2)) == [40, 60]
+    assert mixer.active_voices == 1
+    assert _samples(mixer.mix(3)) == [30, 40, 0]
+    assert mixer.active_voices == 0
+    assert _samples(mixer.mix(2)) == [0, 0]
+
+
+def test_mix_clips_and_scales():
+    mixer = VoiceMixer(PcmClip(array.array("h", [30000, -30000]), 1, 8000))
+    mixer.trigger()
+    mixer.trigger()
+    assert _samples(mixer.mix(2)) == [INT16_MAX, INT16_MIN]
+
+    mixer.trigger()
+    assert _samples(mixer.mix(2, volume=0.5)) == [15000, -15000]
+
+
+def test_trigger_drops_oldest_voice_when_full():
+    mixer = VoiceMixer(PcmClip(array.array("h", [1] * 10), 1, 8000), max_voices=2)
+    mixer.trigger()
+    mixer.mix(4)
+    mixer.trigger()
+    mixer.trigger()
+
+    assert mixer.active_voices == 2
+    # Both remaining voices are fresh, so they run for the full clip
+    assert _samples(mixer.mix(10)) == [2] * 10
+    assert mixer.active_voices == 0
+
+
+def test_stop_silences_all_voices():
+    mixer = VoiceMixer(PcmClip(array.array("h", [5, 5]), 1, 8000))
+    mixer.trigger()
+    mixer.stop()
+    assert mixer.active_voices == 0
+    assert _samples(mixer.mix(2)) == [0, 0]
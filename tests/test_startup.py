@@ -0,0 +1,160 @@
+"""Tests for the startup pipeline and its timing trace."""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.startup import StartupPipeline, StartupTrace, measure_import_times, parse_import_times
+
+
+# Modules that must stay off the import path of app.ui_main
+TAB_MODULES = (
+    "app.languages_tab",
+    "app.history_tab",
+    "app.stats_tab",
+    "app.editor_tab",
+    "app.shortcuts_tab",
+)
+DEFERRED_UI_MODULES = TAB_MODULES + (
+    "app.session_result_dialog",
+    "app.ui_profile_selector",
+    "app.sound_manager",
+)
+
+# Budget for the app's own modules on the critical path (Qt itself excluded)
+UI_CRITICAL_PATH_BUDGET_MS = 100
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Isolated Dev_Type_Data directory with a fresh profile manager."""
+    import app.profile_manager
+
+    root = tmp_path / "Dev_Type_Data"
+    (root / "profiles").mkdir(parents=True)
+    (root / "shared").mkdir()
+    dm = MagicMock()
+    dm.get_data_dir.return_value = root
+    dm.get_profiles_dir.return_value = root / "profiles"
+    dm.get_shared_dir.return_value = root / "shared"
+
+    with patch("app.portable_data.get_data_manager", return_value=dm), \
+         patch("app.profile_manager.get_data_manager", return_value=dm):
+        app.profile_manager._profile_manager = None
+        app.profile_manager.ProfileManager._instance = None
+        yield root
+        app.profile_manager._profile_manager = None
+        app.profile_manager.ProfileManager._instance = None
+
+
+def test_trace_records_phases_per_thread():
+    trace = StartupTrace()
+    with trace.phase("first", files=3):
+        pass
+    with trace.phase("second") as detail:
+        detail["cached"] = True
+
+    names = [p.name for p in trace.phases]
+    assert names == ["first", "second"]
+    assert trace.get("first").detail == {"files": 3}
+    assert trace.as_dicts()[1]["cached"] is True
+    assert trace.as_dicts()[0]["thread"] == "MainThread"
+    assert "[STARTUP] TOTAL" in trace.format()
+
+
+def test_pipeline_prepares_settings_and_stylesheet(data_dir):
+    from app import settings
+
+    pipeline = StartupPipeline().start()
+    pipeline.wait_settings()
+    stylesheet = pipeline.wait_stylesheet()
+
+    assert pipeline.db_path == data_dir / "profiles" / "Default" / "typing_stats.db"
+    assert settings.get_current_db_path() == pipeline.db_path
+    assert stylesheet and "QWidget" in stylesheet
+    for name in ("profiles", "settings_db", "stylesheet"):
+        assert pipeline.trace.get(name).thread == "startup-worker"
+
+
+def test_pipeline_reraises_worker_errors(data_dir):
+    with patch("app.settings.init_db", side_effect=RuntimeError("disk full")):
+        pipeline = StartupPipeline().start()
+        with pytest.raises(RuntimeError, match="disk full"):
+            pipeline.wait_settings()
+
+
+@pytest.mark.slow
+def test_startup_benchmark(data_dir):
+    """Worker phases overlap main-thread work and warm launches skip the schema."""
+    import_ms = 300
+
+    def launch():
+        pipeline = StartupPipeline().start()
+        with pipeline.trace.phase("import_ui"):
+            time.sleep(import_ms / 1000)  # Stand-in for the Qt UI import
+        pipeline.wait_settings()
+        pipeline.wait_stylesheet()
+        return pipeline.trace
+
+    cold = launch()
+    from app import profile_manager
+    profile_manager._profile_manager = None
+    profile_manager.ProfileManager._instance = None
+    warm = launch()
+
+    for trace in (cold, warm):
+        print("\n" + trace.format())
+        worker_ms = sum(trace.get(n).duration_ms for n in ("profiles", "settings_db", "stylesheet"))
+        # Everything the worker did was hidden behind the import
+        assert trace.get("wait_settings").duration_ms + trace.get("wait_stylesheet").duration_ms < 20
+        assert trace.total_ms() < import_ms + 50
+        assert worker_ms < import_ms
+
+    # The warm launch finds the schema current and only reads user_version
+    assert warm.get("settings_db").duration_ms < cold.get("settings_db").duration_ms
+
+
+def test_parse_import_times():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     app.palettes",
+        "import time:       300 |        420 |   app.themes",
+        "import time:      1000 |       1420 | app.ui_main",
+        "unrelated stderr line",
+    ])
+    costs = parse_import_times(output)
+
+    assert list(costs) == ["app.palettes", "app.themes", "app.ui_main"]
+    assert costs["app.ui_main"].cumulative_us == 1420
+    assert costs["app.themes"].self_us == 300
+    assert [c.depth for c in costs.values()] == [2, 1, 0]
+
+
+def test_ui_main_import_defers_tab_modules():
+    """Only the shell and the Folders tab are imported before first paint."""
+    costs = measure_import_times("app.ui_main")
+
+    assert "app.ui_main" in costs
+    assert [m for m in DEFERRED_UI_MODULES if m in costs] == []
+
+
+@pytest.mark.slow
+def test_ui_import_benchmark():
+    """Benchmark: import cost of the UI shell vs the tab modules it defers."""
+    shell = measure_import_times("app.ui_main")
+    own = [c for c in shell.values() if c.module.startswith("app.") and c.depth == 1]
+    own_ms = sum(c.cumulative_us for c in own) / 1000
+    print(f"\napp.ui_main cumulative {shell['app.ui_main'].cumulative_us / 1000:.1f}ms, app modules {own_ms:.1f}ms")
+    for cost in sorted(own, key=lambda c: c.cumulative_us, reverse=True):
+        print(f"  {cost.module:<28} {cost.cumulative_us / 1000:8.1f}ms")
+
+    # Tab modules imported after the shell, as the background loader does
+    full = measure_import_times("app.ui_main", *TAB_MODULES)
+    deferred = [full[m] for m in TAB_MODULES if full[m].depth == 0]
+    for cost in deferred:
+        print(f"  deferred {cost.module:<19} {cost.cumulative_us / 1000:8.1f}ms")
+    deferred_ms = sum(c.cumulative_us for c in deferred) / 1000
+    print(f"deferred total {deferred_ms:.1f}ms")
+
+    assert own_ms < UI_CRITICAL_PATH_BUDGET_MS
+    assert own_ms < deferred_ms
@@ -1,7 +1,10 @@
 """Tests for typing statistics database module."""
 from pathlib import Path
 from datetime import datetime, timedelta
+import sqlite3
+import re
 import time
+import pytest
 from app import settings, stats_db
 
 
@@ -284,6 +287,113 @@ def test_get_wpm_distribution_with_data(tmp_path: Path):
     assert bucket_50 is not None and bucket_50["count"] == 1
 
 
+def _python_wpm_distribution(wpms, bucket_size):
+    """The original fetch-everything bucketing, kept as a reference."""
+    if not wpms:
+        return []
+    num_buckets = int(max(wpms) // bucket_size) + 1
+    buckets = []
+    for i in range(num_buckets):
+        count = sum(1 for w in wpms if i * bucket_size <= w < (i + 1) * bucket_size)
+        if count > 0 or i < 10:
+            buckets.append({
+                "range_label": f"{i * bucket_size}-{(i + 1) * bucket_size - 1}",
+                "min_wpm": i * bucket_size,
+                "max_wpm": (i + 1) * bucket_size - 1,
+                "count": count,
+            })
+    while buckets and buckets[-1]["count"] == 0:
+        buckets.pop()
+    return buckets
+
+
+def _insert_completed_sessions(wpms):
+    conn = settings._connect()
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, completed) "
+        "VALUES (?, 'Python', ?, 0.95, 1)",
+        ((f"/bench/{i % 500}.py", wpm) for i, wpm in enumerate(wpms)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_wpm_distribution_matches_python_bucketing(tmp_path: Path):
+    """SQL bucketing returns exactly what the old Python loop produced."""
+    import random
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    stats_db.init_stats_tables()
+    rng = random.Random(5)
+    wpms = [round(rng.uniform(0, 180), 2) for _ in range(2000)] + [20.0, 29.999, 30.0, 150.0]
+    _insert_completed_sessions(wpms)
+
+    for bucket_size in (5, 10, 20, 25):
+        assert stats_db.get_wpm_distribution(bucket_size=bucket_size) == \
+            _python_wpm_distribution(wpms, bucket_size)
+
+
+def test_get_wpm_percentiles(tmp_path: Path):
+    """Nearest-rank percentiles over completed sessions only."""
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    stats_db.init_stats_tables()
+    assert stats_db.get_wpm_percentiles() == {}
+
+    _insert_completed_sessions([float(w) for w in range(1, 101)])
+    stats_db.record_session_history("/tmp/x.py", "Python", 500.0, 0.9, 10, 9, 1, 5.0, False)
+
+    assert stats_db.get_wpm_percentiles() == {50: 50.0, 90: 90.0, 99: 99.0}
+    assert stats_db.get_wpm_percentiles(percentiles=(1, 100)) == {1: 1.0, 100: 100.0}
+    assert stats_db.get_wpm_percentiles(languages=["Go"]) == {}
+
+
+def test_wpm_distribution_respects_ignore_rules(tmp_path: Path):
+    """Sessions for ignored files stay out of the histogram and percentiles."""
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    stats_db.init_stats_tables()
+    settings.set_setting("ignored_files", "secret.py")
+    stats_db.record_session_history("/src/main.py", "Python", 42.0, 0.9, 10, 9, 1, 5.0, True)
+    stats_db.record_session_history("/src/secret.py", "Python", 99.0, 0.9, 10, 9, 1, 5.0, True)
+
+    distribution = stats_db.get_wpm_distribution(bucket_size=10)
+    assert sum(b["count"] for b in distribution) == 1
+    assert distribution[-1]["min_wpm"] == 40
+    assert stats_db.get_wpm_percentiles(percentiles=(100,)) == {100: 42.0}
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("sessions", [10_000, 100_000, 1_000_000])
+def test_wpm_distribution_benchmark(tmp_path: Path, sessions: int):
+    """SQL histogram and percentiles versus fetching every WPM into Python."""
+    import random
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    stats_db.init_stats_tables()
+    rng = random.Random(11)
+    _insert_completed_sessions(rng.gauss(70, 20) for _ in range(sessions))
+
+    start = time.perf_counter()
+    distribution = stats_db.get_wpm_distribution(bucket_size=10)
+    sql_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    percentiles = stats_db.get_wpm_percentiles()
+    pct_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    conn = settings._connect()
+    wpms = [row[0] for row in conn.execute(
+        f"SELECT wpm FROM session_history WHERE completed = 1 {stats_db._get_global_ignore_sql()}"
+    )]
+    conn.close()
+    expected = _python_wpm_distribution(wpms, 10)
+    python_elapsed = time.perf_counter() - start
+
+    print(f"\n{sessions} sessions: sql {sql_elapsed * 1000:.0f}ms, "
+          f"percentiles {pct_elapsed * 1000:.0f}ms, python {python_elapsed * 1000:.0f}ms")
+    assert distribution == expected
+    assert 60 < percentiles[50] < 80
+    assert sql_elapsed < python_elapsed
+
+
 def test_get_recent_wpm_average_empty(tmp_path: Path):
     """Test recent WPM average with no data."""
     db_file = tmp_path / "test_stats.db"
@@ -429,3 +539,480 @@ def test_multiple_incomplete_sessions(tmp_path: Path):
     incomplete = stats_db.get_incomplete_sessions()
     assert len(incomplete) == 2
     assert "/tmp/b.py" not in incomplete
+
+
+def test_language_progress_counters(tmp_path: Path):
+    """Completion counters follow the scan index and update_file_stats."""
+    db_file = tmp_path / "test_stats.db"
+    settings.init_db(str(db_file))
+    stats_db.init_stats_tables()
+
+    stats_db.update_file_stats("/p/a.py", wpm=50, accuracy=0.95, completed=True)
+    stats_db.sync_scan_index(
+        {"Python": ["/p/a.py", "/p/b.py"], "Go": ["/g/main.go"]}, "sig-1"
+    )
+
+    assert stats_db.get_scan_index_signature() == "sig-1"
+    assert stats_db.get_language_progress() == {
+        "Python": {"completed": 1, "total": 2},
+        "Go": {"completed": 0, "total": 1},
+    }
+    assert stats_db.get_language_progress(auto_indent=True)["Python"]["completed"] == 0
+
+    stats_db.update_file_stats("/p/b.py", wpm=40, accuracy=0.95, completed=True)
+    stats_db.update_file_stats("/p/b.py", wpm=42, accuracy=0.95, completed=True)
+    stats_db.update_file_stats("/p/a.py", wpm=45, accuracy=0.95, completed=False)
+    stats_db.update_file_stats("/g/main.go", wpm=30, accuracy=0.95, completed=True, auto_indent=True)
+    stats_db.update_file_stats("/elsewhere.py", wpm=30, accuracy=0.95, completed=True)
+
+    progress = stats_db.get_language_progress()
+    assert progress["Python"] == {"completed": 1, "total": 2}
+    assert progress["Go"] == {"completed": 0, "total": 1}
+    assert stats_db.get_language_progress(auto_indent=True)["Go"]["completed"] == 1
+
+    # A fresh scan rebuilds the counters from file_stats
+    stats_db.sync_scan_index({"Python": ["/p/b.py", "/elsewhere.py"]}, "sig-2")
+    assert stats_db.get_language_progress() == {"Python": {"completed": 2, "total": 2}}
+
+
+def test_fetch_session_history_page_keyset(tmp_path: Path):
+    """Keyset pages cover every matching row exactly once, in order."""
+    db_file = tmp_path / "test_stats.db"
+    settings.init_db(str(db_file))
+
+    for i in range(25):
+        stats_db.record_session_history(
+            f"/tmp/f{i}.py", "Python" if i % 2 else "Go", float(i % 7), 0.9,
+            10, 9, 1, 5.0, completed=True,
+        )
+
+    seen = []
+    after = None
+    while True:
+        page = stats_db.fetch_session_history_page(sort_by="wpm", descending=True, after=after, limit=4)
+        if not page:
+            break
+        seen.extend(page)
+        after = page[-1]
+
+    assert len(seen) == 25
+    assert len({r["id"] for r in seen}) == 25
+    assert [r["wpm"] for r in seen] == sorted((r["wpm"] for r in seen), reverse=True)
+
+    assert stats_db.count_session_history() == 25
+    assert stats_db.count_session_history(language="Go") == 13
+    go_page = stats_db.fetch_session_history_page(language="Go", limit=100)
+    assert {r["language"] for r in go_page} == {"Go"}
+
+
+def test_fetch_session_history_page_sorts_by_file_name(tmp_path: Path):
+    """The File column shows the basename, so that is what it sorts by."""
+    db_file = tmp_path / "test_stats.db"
+    settings.init_db(str(db_file))
+
+    paths = ["/a/zeta.py", "/z/Alpha.py", "C:\\work\\mid.py", "/m/beta.py", "/b/alpha.py", "top.py"]
+    for path in paths * 2:
+        stats_db.record_session_history(path, "Python", 50.0, 0.9, 10, 9, 1, 5.0, completed=True)
+
+    seen = []
+    after = None
+    while True:
+        page = stats_db.fetch_session_history_page(sort_by="file_path", descending=False, after=after, limit=5)
+        if not page:
+            break
+        seen.extend(page)
+        after = page[-1]
+
+    names = [re.split(r"[\\/]", r["file_path"])[-1].lower() for r in seen]
+    assert len({r["id"] for r in seen}) == 12
+    assert names == sorted(names)
+    assert names[0] == "alpha.py" and names[-1] == "zeta.py"
+
+
+def test_history_paths_kept_in_sync(tmp_path: Path):
+    """Distinct path index follows inserts/deletes and powers the fuzzy filter."""
+    db_file = tmp_path / "test_stats.db"
+    settings.init_db(str(db_file))
+
+    stats_db.record_session_history("/src/Power.py", "Python", 50, 0.9, 10, 9, 1, 5.0, completed=True)
+    stats_db.record_session_history("/src/Power.py", "Python", 55, 0.9, 10, 9, 1, 5.0, completed=True)
+    stats_db.record_session_history("/src/other.py", "Python", 40, 0.9, 10, 9, 1, 5.0, completed=True)
+
+    conn = settings._connect()
+    paths = {row[0]: row[1] for row in conn.execute("SELECT file_path, path_lower FROM history_paths")}
+    conn.close()
+    assert paths == {"/src/Power.py": "/src/power.py", "/src/other.py": "/src/other.py"}
+
+    assert len(stats_db.fetch_session_history(file_contains="pow")) == 2
+    assert len(stats_db.fetch_session_history(file_contains="PWR")) == 2
+    assert stats_db.count_session_history(file_contains="oth") == 1
+    assert stats_db.fetch_session_history(file_contains="100%") == []
+
+    stats_db.record_session_history("/src/my_mod.py", "Python", 40, 0.9, 10, 9, 1, 5.0, completed=True)
+    assert stats_db.count_session_history(file_contains="y_m") == 1
+
+    ids = [r["id"] for r in stats_db.fetch_session_history(file_contains="other")]
+    stats_db.delete_session_history(ids)
+    conn = settings._connect()
+    remaining = [row[0] for row in conn.execute("SELECT file_path FROM history_paths")]
+    conn.close()
+    assert sorted(remaining) == ["/src/Power.py", "/src/my_mod.py"]
+
+
+def test_history_paths_backfilled_for_existing_db(tmp_path: Path):
+    """Databases created before the path index get it populated on init."""
+    db_file = tmp_path / "test_stats.db"
+    settings.init_db(str(db_file))
+    stats_db.record_session_history("/a/alpha.py", "Python", 50, 0.9, 10, 9, 1, 5.0, completed=True)
+
+    conn = settings._connect()
+    conn.execute("DROP TABLE history_paths")
+    conn.execute("PRAGMA user_version = 0")  # As written by builds before the table existed
+    conn.commit()
+    conn.close()
+
+    settings.init_db(str(db_file))
+    assert stats_db.count_session_history(file_contains="alp") == 1
+
+
+@pytest.mark.slow
+def test_fuzzy_file_filter_benchmark(tmp_path: Path):
+    """Benchmark: fuzzy file filter on 100k sessions across 10k files."""
+    db_file = tmp_path / "bench_stats.db"
+    settings.init_db(str(db_file))
+
+    conn = settings._connect()
+    conn.executemany(
+        """
+        INSERT INTO session_history (file_path, language, wpm, accuracy, duration, completed, recorded_at)
+        VALUES (?, 'Python', ?, 0.9, 10, 1, datetime('2024-01-01', ? || ' minutes'))
+        """,
+        (
+            (f"/home/user/projects/repo{i % 50}/pkg{i % 200}/module_{i % 10000}.py", float(i % 120), i)
+            for i in range(100_000)
+        ),
+    )
+    conn.commit()
+
+    needle = "module_123"
+    raw = needle.lower()
+    legacy_sql = (
+        "SELECT COUNT(*) FROM session_history WHERE 1=1 "
+        f"{stats_db._get_global_ignore_sql()} AND LOWER(file_path) LIKE ? ESCAPE '\\'"
+    )
+    legacy_pattern = "%" + "%".join("\\" + c if c == "_" else c for c in raw) + "%"
+
+    start = time.perf_counter()
+    legacy_count = conn.execute(legacy_sql, (legacy_pattern,)).fetchone()[0]
+    legacy_time = time.perf_counter() - start
+    conn.close()
+
+    start = time.perf_counter()
+    indexed_count = stats_db.count_session_history(file_contains=needle)
+    page = stats_db.fetch_session_history_page(file_contains=needle, limit=200)
+    indexed_time = time.perf_counter() - start
+
+    print(f"\nlegacy LIKE scan: {legacy_time * 1000:.1f}ms  path index: {indexed_time * 1000:.1f}ms")
+    assert indexed_count == legacy_count > 0
+    assert len(page) == min(200, legacy_count)
+    assert indexed_time < legacy_time
+
+
+def test_bigram_stats_upsert_and_ranking(tmp_path: Path):
+    """Bigram totals accumulate across sessions and rank by latency or error rate."""
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    stats_db.init_stats_tables()
+
+    stats_db.update_bigram_stats("Python", {
+        ("d", "e"): [1000.0, 5, 0],
+        ("e", "f"): [600.0, 6, 3],
+        ("x", "y"): [5000.0, 2, 0],  # Too few samples to rank
+    })
+    stats_db.update_bigram_stats("Python", {("d", "e"): [1000.0, 5, 1]})
+    stats_db.update_bigram_stats("Go", {("e", "f"): [400.0, 4, 0]})
+
+    slowest = stats_db.get_bigram_stats(["Python"], order_by="slowest")
+    assert [(b["char1"], b["char2"]) for b in slowest] == [("d", "e"), ("e", "f")]
+    assert slowest[0]["avg_ms"] == pytest.approx(200.0)
+    assert slowest[0]["correct_count"] == 10
+    assert slowest[0]["error_count"] == 1
+
+    errors = stats_db.get_bigram_stats(["Python"], order_by="errors")
+    assert [(b["char1"], b["char2"]) for b in errors] == [("e", "f"), ("d", "e")]
+    assert errors[0]["error_rate"] == pytest.approx(3 / 9)
+
+    # Without a filter languages are summed per bigram
+    combined = {(b["char1"], b["char2"]): b for b in stats_db.get_bigram_stats(order_by="slowest")}
+    assert combined[("e", "f")]["correct_count"] == 10
+    assert combined[("e", "f")]["avg_ms"] == pytest.approx(100.0)
+
+    assert stats_db.get_bigram_stats(["Python"], limit=1)[0]["char1"] == "d"
+    with pytest.raises(ValueError):
+        stats_db.get_bigram_stats(order_by="fastest")
+
+
+def test_stats_schema_runs_once_per_version(tmp_path: Path):
+    """init_db only runs migrations the database's user_version hasn't seen."""
+    db_file = tmp_path / "test_stats.db"
+    settings.init_db(str(db_file))
+
+    conn = settings._connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == stats_db.STATS_SCHEMA_VERSION
+    conn.close()
+    assert stats_db.init_stats_tables() == 0
+
+    # Every step is idempotent, so replaying them over a current schema is safe
+    stats_db.record_session_history("/a/alpha.py", "Python", 50, 0.9, 10, 9, 1, 5.0, completed=True)
+    conn = settings._connect()
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+    assert stats_db.init_stats_tables() == len(stats_db._STATS_MIGRATIONS)
+    assert stats_db.count_session_history() == 1
+
+
+def test_failed_stats_migration_rolls_back(tmp_path: Path, monkeypatch):
+    """A failing step leaves user_version at the last step that succeeded."""
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    current = stats_db.STATS_SCHEMA_VERSION
+
+    def add_table(cur):
+        cur.execute("CREATE TABLE migrated_ok (id INTEGER)")
+
+    def broken(cur):
+        cur.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("boom")
+
+    migrations = stats_db._STATS_MIGRATIONS + [(current + 1, add_table), (current + 2, broken)]
+    monkeypatch.setattr(stats_db, "_STATS_MIGRATIONS", migrations)
+    monkeypatch.setattr(stats_db, "STATS_SCHEMA_VERSION", current + 2)
+
+    with pytest.raises(sqlite3.OperationalError):
+        stats_db.init_stats_tables()
+
+    conn = settings._connect()
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert version == current + 1
+    assert "migrated_ok" in tables
+    assert "half_done" not in tables
+
+
+def _insert_aged_sessions(db_file: Path, count: int, days_old: int):
+    conn = sqlite3.connect(db_file)
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, wpm, accuracy, recorded_at) "
+        "VALUES (?, 'Python', 50, 1, datetime('now', ?))",
+        [(f"/src/f{i}.py", f"-{days_old} days") for i in range(count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_new_db_uses_incremental_auto_vacuum(tmp_path: Path):
+    db_file = tmp_path / "new.db"
+    settings.init_db(str(db_file))
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    conn.close()
+
+
+def test_cleanup_old_sessions_deletes_in_batches(tmp_path: Path, monkeypatch):
+    db_file = tmp_path / "retention.db"
+    settings.init_db(str(db_file))
+    _insert_aged_sessions(db_file, 120, days_old=200)
+    _insert_aged_sessions(db_file, 30, days_old=5)
+
+    batches = []
+    real_batch = stats_db.delete_expired_sessions_batch
+    monkeypatch.setattr(stats_db, "RETENTION_BATCH_SIZE", 50)
+    monkeypatch.setattr(
+        stats_db, "delete_expired_sessions_batch",
+        lambda cutoff, *a, **k: batches.append(real_batch(cutoff, 50)) or batches[-1],
+    )
+
+    assert stats_db.cleanup_old_sessions(90) == 120
+    assert batches == [50, 50, 20, 0]
+    assert stats_db.count_session_history() == 30
+
+
+def test_incremental_vacuum_converts_and_shrinks(tmp_path: Path):
+    db_file = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE filler (data BLOB)")
+    conn.executemany("INSERT INTO filler VALUES (?)", [(b"x" * 4000,) for _ in range(500)])
+    conn.commit()
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    conn.execute("DELETE FROM filler")
+    conn.commit()
+    conn.close()
+
+    # Without incremental mode there is nothing to step through
+    assert stats_db.incremental_vacuum(db_path=db_file) == 0
+    assert stats_db.enable_incremental_vacuum(db_file) is True
+    assert stats_db.enable_incremental_vacuum(db_file) is False
+
+    conn = sqlite3.connect(db_file)
+    conn.executemany("INSERT INTO filler VALUES (?)", [(b"x" * 4000,) for _ in range(500)])
+    conn.commit()
+    conn.execute("DELETE FROM filler")
+    conn.commit()
+    free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    conn.close()
+
+    left = stats_db.incremental_vacuum(100, db_file)
+    assert left == free_before - 100
+    while left:
+        left = stats_db.incremental_vacuum(100, db_file)
+
+
+def _grouped_daily_stats(conn) -> dict:
+    """session_daily_stats as rebuilt from scratch, keyed like the table."""
+    rows = conn.execute(f"""
+        SELECT DATE(recorded_at), IFNULL(language, ''), IFNULL(auto_indent, 0), IFNULL(completed, 0),
+               {stats_db._DAILY_STATS_AGGREGATES}
+        FROM session_history GROUP BY 1, 2, 3, 4
+    """).fetchall()
+    return {row[:4]: tuple(round(v, 6) for v in row[4:]) for row in rows}
+
+
+def test_daily_stats_follow_history_changes(tmp_path: Path):
+    """The per-day totals match a full regroup after inserts, deletes and updates."""
+    import random
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    rng = random.Random(3)
+    conn = settings._connect()
+    conn.executemany(
+        "INSERT INTO session_history (file_path, language, auto_indent, wpm, accuracy, total_keystrokes, "
+        "correct_keystrokes, incorrect_keystrokes, completed, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (f"/src/{i % 7}.py", rng.choice(["Python", "Go", None]), i % 2,
+             round(rng.uniform(20, 120), 2), round(rng.uniform(0.8, 1.0), 3),
+             100, 95, 5, int(rng.random() < 0.8),
+             f"2025-03-{1 + i % 5:02d} {i % 24:02d}:00:00")
+            for i in range(400)
+        ],
+    )
+    conn.commit()
+
+    # Remove the extremes of some days so their min/max must be recomputed
+    conn.execute("DELETE FROM session_history WHERE wpm > 110 OR accuracy < 0.82 OR id % 9 = 0")
+    conn.execute("UPDATE session_history SET completed = 1 - completed, wpm = wpm + 1 WHERE id % 5 = 0")
+    conn.execute("UPDATE session_history SET recorded_at = '2025-03-09 10:00:00' WHERE id % 11 = 0")
+    conn.commit()
+
+    table = {row[:4]: tuple(round(v, 6) for v in row[4:])
+             for row in conn.execute("SELECT * FROM session_daily_stats")}
+    expected = _grouped_daily_stats(conn)
+    conn.execute("DELETE FROM session_history")
+    conn.commit()
+    leftover = conn.execute("SELECT COUNT(*) FROM session_daily_stats").fetchone()[0]
+    conn.close()
+
+    assert table == expected
+    assert leftover == 0
+
+
+def test_daily_stats_backfilled_for_existing_db(tmp_path: Path):
+    """Databases from before the rollup get it filled from their history."""
+    db_file = tmp_path / "test_stats.db"
+    settings.init_db(str(db_file))
+    stats_db.record_session_history("/a/alpha.py", "Python", 50, 0.9, 10, 9, 1, 5.0, completed=True)
+    stats_db.record_session_history("/a/beta.py", "Python", 70, 1.0, 10, 10, 0, 5.0, completed=True)
+
+    conn = settings._connect()
+    conn.execute("DROP TABLE session_daily_stats")
+    conn.execute("PRAGMA user_version = 6")  # As written by builds before the table existed
+    conn.commit()
+    conn.close()
+
+    settings.init_db(str(db_file))
+    stats = stats_db.get_aggregated_stats()
+    assert stats["total_completed"] == 2
+    assert stats["avg_wpm"] == pytest.approx(60)
+    assert stats["most_chars_day"] == 20
+
+
+def _rounded(value):
+    """Floats rounded off (the two paths add up sums in a different order)."""
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {k: _rounded(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_rounded(v) for v in value]
+    return value
+
+
+def test_summaries_same_with_and_without_daily_stats(tmp_path: Path):
+    """Grouping session_history directly gives what the rollup table gives."""
+    import random
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    rng = random.Random(8)
+    today = datetime.now().date()
+    for i in range(300):
+        stats_db.record_session_history(
+            f"/src/{i % 9}.py", rng.choice(["Python", "Go", "Rust"]), rng.uniform(20, 120),
+            rng.uniform(0.8, 1.0), 100, 90, 10, 30.0, completed=rng.random() < 0.85,
+            auto_indent=bool(i % 2),
+        )
+    conn = settings._connect()
+    conn.executemany(
+        "UPDATE session_history SET recorded_at = ? WHERE id = ?",
+        [(f"{today - timedelta(days=i % 70)} 12:00:00", i) for i in range(1, 301)],
+    )
+    conn.commit()
+    conn.close()
+
+    def summaries():
+        return (
+            stats_db.get_aggregated_stats(),
+            stats_db.get_aggregated_stats(languages=["Go"], auto_indent=True),
+            stats_db.get_per_language_stats(),
+            stats_db.get_current_streak(),
+            stats_db.get_trend_comparison(30, languages=["Python", "Rust"]),
+        )
+
+    with_rollup = summaries()
+    conn = settings._connect()
+    conn.execute("DROP TABLE session_daily_stats")
+    conn.commit()
+    conn.close()
+    without_rollup = summaries()
+
+    assert with_rollup[3] == 70
+    assert _rounded(with_rollup) == _rounded(without_rollup)
+
+
+def test_summaries_respect_ignore_rules(tmp_path: Path):
+    """Ignored paths drop out of the summaries although the rollup counts them."""
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    stats_db.record_session_history("/src/main.py", "Python", 40.0, 0.9, 10, 9, 1, 5.0, True)
+    stats_db.record_session_history("/src/secret.py", "Python", 90.0, 0.9, 10, 9, 1, 5.0, True)
+    assert stats_db.get_aggregated_stats()["highest_wpm"] == 90.0
+
+    settings.set_setting("ignored_files", "secret.py")
+
+    stats = stats_db.get_aggregated_stats()
+    assert (stats["total_completed"], stats["highest_wpm"]) == (1, 40.0)
+    assert stats_db.get_per_language_stats()[0]["session_count"] == 1
+    assert stats_db.get_trend_comparison(7)["current"]["sessions"] == 1
+
+
+def test_ignore_cache_notices_reused_path_ids(tmp_path: Path):
+    """A new path taking a deleted path's row id must not hit the stale cache."""
+    settings.init_db(str(tmp_path / "test_stats.db"))
+    settings.set_setting("ignored_files", "secret.py")
+    stats_db.record_session_history("/src/a.py", "Python", 50.0, 0.9, 10, 9, 1, 5.0, True)
+    stats_db.record_session_history("/src/x.py", "Python", 60.0, 0.9, 10, 9, 1, 5.0, True)
+    assert stats_db.get_aggregated_stats()["total_completed"] == 2
+
+    conn = settings._connect()
+    conn.execute("DELETE FROM session_history WHERE file_path = '/src/x.py'")
+    conn.commit()
+    conn.close()
+    stats_db.record_session_history("/src/secret.py", "Python", 200.0, 0.9, 10, 9, 1, 5.0, True)
+
+    stats = stats_db.get_aggregated_stats()
+    assert (stats["total_completed"], stats["highest_wpm"]) == (1, 50.0)
@@ -266,6 +266,56 @@ class TestCalendarHeatmap:
         assert heatmap._daily_data is not None
         assert len(heatmap._daily_data) == 2
     
+    def test_heatmap_grid_levels_and_tooltips(self, app, db_setup):
+        """The per-year grid holds every day with its level and tooltip."""
+        from app.stats_tab import CalendarHeatmap
+        
+        heatmap = CalendarHeatmap()
+        heatmap.set_year(2024)
+        heatmap.set_data([
+            {"date": "2024-01-01", "total_chars": 100},
+            {"date": "2024-06-15", "total_chars": 400},
+        ])
+        heatmap._ensure_grid()
+        
+        assert len(heatmap._cells) == 366
+        assert heatmap._cells["2024-06-15"][1] == 4
+        assert heatmap._cells["2024-01-01"][1] == 1
+        assert heatmap._cells["2024-01-02"][1] == 0
+        assert heatmap._cells["2024-06-15"][2] == "15 Jun 2024: 400 chars"
+        # Jan 1st 2024 was a Monday: first column, second row
+        rect = heatmap._cells["2024-01-01"][0]
+        assert rect.x() == heatmap._weekday_label_width
+        assert rect.y() == heatmap._month_label_height + heatmap._cell_size + heatmap._cell_gap
+        assert [name for _, name in heatmap._month_positions][:2] == ["Jan", "Feb"]
+    
+    def test_heatmap_hover_reuses_pixmap(self, app, db_setup):
+        """Hover repaints draw over the cached pixmap instead of re-rendering."""
+        from PySide6.QtCore import QPointF, Qt, QEvent
+        from PySide6.QtGui import QMouseEvent
+        from app.stats_tab import CalendarHeatmap
+        
+        heatmap = CalendarHeatmap()
+        heatmap.resize(900, heatmap.height())
+        heatmap.set_year(2024)
+        heatmap.set_data([{"date": "2024-03-05", "total_chars": 50}])
+        heatmap.grab()
+        pixmap = heatmap._pixmap
+        assert pixmap is not None
+        
+        rect = heatmap._cells["2024-03-05"][0]
+        pos = rect.center()
+        event = QMouseEvent(QEvent.MouseMove, pos, pos, Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+        heatmap.mouseMoveEvent(event)
+        heatmap.grab()
+        
+        assert heatmap._hovered_date == "2024-03-05"
+        assert heatmap._hovered_rect == rect
+        assert heatmap._pixmap is pixmap
+        
+        heatmap.set_metric("completed_sessions")
+        assert heatmap._pixmap is None
+    
     def test_heatmap_apply_theme(self, app, db_setup):
         """Test applying theme colors."""
         from app.stats_tab import CalendarHeatmap
@@ -276,6 +326,137 @@ class TestCalendarHeatmap:
         heatmap.apply_theme()
 
 
+class TestMetricScatterPlot:
+    """Test MetricScatterPlot level-of-detail caching."""
+    
+    def _sessions(self, count):
+        return [
+            {"date": "2025-01-01", "wpm": 40 + (i % 50), "file_path": f"/f{i}.py",
+             "correct": 90, "incorrect": 10, "total": 100}
+            for i in range(count)
+        ]
+    
+    def test_set_data_precomputes_values_and_trend(self, app, db_setup):
+        """Processed values, range and regression are cached on set_data."""
+        from app.stats_tab import MetricScatterPlot
+        
+        chart = MetricScatterPlot(metric_type='accuracy')
+        chart.set_data(self._sessions(3))
+        
+        assert chart._values == [90.0, 90.0, 90.0]
+        assert chart._value_range == chart._get_range(chart._values)
+        assert chart._trend == pytest.approx((0.0, 90.0))
+    
+    def test_points_downsampled_to_width(self, app, db_setup):
+        """Large datasets are reduced to about one point per pixel."""
+        from app.stats_tab import MetricScatterPlot
+        
+        chart = MetricScatterPlot()
+        chart.resize(500, 220)
+        chart.set_data(self._sessions(20000))
+        chart._ensure_geometry()
+        
+        assert len(chart._plot_points) <= int(chart._chart_rect().width())
+        assert chart._plot_points[0][0] == 0
+        assert chart._plot_points[-1][0] == 19999
+        
+        # Geometry is rebuilt on resize only
+        points = chart._plot_points
+        chart._ensure_geometry()
+        assert chart._plot_points is points
+        chart.resize(300, 220)
+        chart._ensure_geometry()
+        assert chart._plot_points is not points
+    
+    def test_hover_finds_point(self, app, db_setup):
+        """Hovering over a drawn point selects it."""
+        from PySide6.QtCore import QPointF, Qt, QEvent
+        from PySide6.QtGui import QMouseEvent
+        from app.stats_tab import MetricScatterPlot
+        
+        chart = MetricScatterPlot()
+        chart.resize(500, 220)
+        chart.set_data(self._sessions(5))
+        chart._ensure_geometry()
+        idx, px, py = chart._plot_points[2]
+        
+        event = QMouseEvent(QEvent.MouseMove, QPointF(px + 1, py), QPointF(px + 1, py),
+                            Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+        chart.mouseMoveEvent(event)
+        
+        assert chart.hover_info == (idx, 'point')
+
+
+class TestDateRangeChart:
+    """Test DateRangeChart level-of-detail caching."""
+    
+    def _days(self, count):
+        return [
+            {"date": "2025-01-01", "total_chars": 100 + i % 7, "completed_sessions": 1,
+             "avg_wpm": 50 + i % 11, "highest_wpm": 60, "lowest_wpm": 40,
+             "avg_accuracy": 95.0, "highest_accuracy": 99.0, "lowest_accuracy": 90.0}
+            for i in range(count)
+        ]
+    
+    def test_long_ranges_downsampled(self, app, db_setup):
+        """More days than pixels keeps at most two bars per column."""
+        from app.stats_tab import DateRangeChart
+        
+        chart = DateRangeChart()
+        chart.resize(400, 300)
+        chart.set_data(self._days(3000))
+        chart._ensure_geometry()
+        
+        columns = int(chart._chart_rect().width())
+        assert len(chart._bars) <= 2 * columns
+        assert len(chart._line_points) <= 2 * columns
+    
+    def test_metric_change_rebuilds_geometry(self, app, db_setup):
+        """Switching the right metric invalidates the cached geometry."""
+        from app.stats_tab import DateRangeChart
+        
+        chart = DateRangeChart()
+        chart.resize(600, 300)
+        chart.set_data(self._days(10))
+        chart._ensure_geometry()
+        assert chart._max_right == 60
+        
+        chart._on_right_changed(3)  # avg_accuracy
+        chart._ensure_geometry()
+        assert chart._max_right == 100
+
+
+class TestBigramChart:
+    """Test BigramChart and its StatsTab wiring."""
+    
+    def test_set_data_sizes_to_rows(self, app, db_setup):
+        """Chart height follows the number of bigrams shown."""
+        from app.stats_tab import BigramChart
+        
+        chart = BigramChart()
+        rows = [
+            {"char1": "e", "char2": " ", "avg_ms": 180.0, "correct_count": 20,
+             "error_count": 2, "error_rate": 2 / 22},
+        ] * 8
+        chart.set_data(rows, "errors")
+        
+        assert chart.mode == "errors"
+        assert chart.height() == 8 * BigramChart.ROW_HEIGHT + 24
+        assert chart._format_pair(rows[0]) == "e\u2423"
+        assert chart._format_value(rows[0]).startswith("9.1%")
+    
+    def test_stats_tab_loads_bigrams(self, app, db_setup):
+        """Recorded bigrams reach the chart in the selected ordering."""
+        from app import stats_db
+        from app.stats_tab import StatsTab
+        
+        stats_db.update_bigram_stats("Python", {("d", "e"): [1000.0, 5, 0]})
+        tab = StatsTab()
+        tab.refresh()
+        
+        assert [(b["char1"], b["char2"]) for b in tab.bigram_chart.data] == [("d", "e")]
+
+
 class TestStatsTab:
     """Test main StatsTab widget."""
     
@@ -182,3 +182,148 @@ def test_validate_hex_color_returns_default():
     assert validate_hex_color("invalid", "#FFFFFF") == "#FFFFFF"
     assert validate_hex_color("#GGGGGG", "#00FF00") == "#00FF00"
     assert validate_hex_color("", "#0000FF") == "#0000FF"
+
+
+@pytest.fixture
+def qt_app():
+    """QApplication with the theme state reset around each test."""
+    from PySide6.QtGui import QPalette
+    from PySide6.QtWidgets import QApplication
+    from app import themes
+
+    app = QApplication.instance() or QApplication([])
+    themes._applied_tokens = {}
+    yield app
+    app.setStyleSheet("")
+    app.setPalette(QPalette())
+    themes._applied_tokens = {}
+
+
+def test_theme_key_tracks_colors_and_font():
+    from dataclasses import replace
+    from app.themes import theme_key
+
+    nord = get_color_scheme("dark", "nord")
+    assert theme_key(nord, "Inter", "10") == theme_key(get_color_scheme("dark", "nord"), "Inter", "10")
+    assert theme_key(nord, "Inter", "10") != theme_key(nord, "Inter", "11")
+    assert theme_key(nord) != theme_key(replace(nord, error_color="#123456"))
+
+
+def test_apply_theme_reports_changed_tokens(qt_app):
+    from dataclasses import replace
+    from app.themes import apply_theme_to_app
+
+    nord = get_color_scheme("dark", "nord")
+    first = apply_theme_to_app(qt_app, nord)
+    assert first.stylesheet
+    assert first.tokens == set(nord.to_dict())
+
+    assert not apply_theme_to_app(qt_app, nord)
+
+    # error_color isn't used by the global stylesheet: no repolish needed
+    change = apply_theme_to_app(qt_app, replace(nord, error_color="#123456"))
+    assert change.tokens == {"error_color"}
+    assert not change.stylesheet
+
+
+def test_apply_theme_skips_identical_stylesheet(qt_app, monkeypatch):
+    from app.themes import apply_theme_to_app
+
+    nord = get_color_scheme("dark", "nord")
+    apply_theme_to_app(qt_app, nord)
+    calls = []
+    monkeypatch.setattr(qt_app, "setStyleSheet", lambda sheet: calls.append(sheet))
+    apply_theme_to_app(qt_app, nord)
+    assert calls == []
+
+
+def test_apply_theme_sets_palette(qt_app):
+    from PySide6.QtGui import QPalette
+    from app.themes import apply_theme_to_app, build_palette
+
+    dracula = get_color_scheme("dark", "dracula")
+    apply_theme_to_app(qt_app, dracula)
+    assert qt_app.palette().color(QPalette.Window).name() == dracula.bg_primary
+    assert qt_app.palette().color(QPalette.Highlight).name() == dracula.accent_color
+    assert build_palette(dracula) is build_palette(get_color_scheme("dark", "dracula"))
+
+
+def test_restyle_only_touches_changed_widgets(qt_app):
+    from PySide6.QtWidgets import QLabel
+    from app.themes import restyle
+
+    label = QLabel()
+    assert restyle(label, "color: #ffffff;")
+    assert not restyle(label, "color: #ffffff;")
+    assert restyle(label, "color: #000000;")
+    assert label.styleSheet() == "color: #000000;"
+
+
+def test_record_token_reads():
+    from app.themes import record_token_reads
+
+    outside = get_color_scheme("dark", "nord")
+    with record_token_reads() as outer:
+        with record_token_reads() as inner:
+            get_color_scheme("dark", "nord").accent_color
+        scheme = get_color_scheme("dark", "dracula")
+        scheme.bg_primary
+        outside.error_color  # Fetched before recording started
+
+    assert inner == {"accent_color"}
+    assert outer == {"accent_color", "bg_primary"}
+    assert type(get_color_scheme("dark", "nord")) is ColorScheme
+
+
+def test_theme_parts_rerun_only_for_their_tokens():
+    """MainWindow re-themes a part only when a token it read changed."""
+    from types import SimpleNamespace
+    from app.ui_main import MainWindow
+
+    window = SimpleNamespace(_theme_token_uses={})
+    runs = []
+
+    def history_part():
+        runs.append("history")
+        get_color_scheme("dark", "nord").bg_secondary
+
+    def icons_part():
+        runs.append("icons")  # Reads no tokens
+
+    for changed in (None, {"error_color"}, {"bg_secondary"}):
+        MainWindow._theme_part(window, "history", history_part, changed)
+        MainWindow._theme_part(window, "icons", icons_part, changed)
+
+    assert runs == ["history", "icons", "icons", "history", "icons"]
+    assert window._theme_token_uses["history"] == {"bg_secondary"}
+
+
+@pytest.mark.slow
+def test_theme_switch_benchmark(qt_app):
+    """Re-applying the current theme is nearly free even with a large tree."""
+    import time
+    from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem
+    from app.themes import apply_theme_to_app
+
+    tree = QTreeWidget()
+    tree.setColumnCount(4)
+    for i in range(20_000):
+        QTreeWidgetItem(tree, [f"session {i}", "Python", "72.5", "98%"])
+    tree.resize(900, 700)
+    tree.show()
+    qt_app.processEvents()
+
+    def timed(name):
+        start = time.perf_counter()
+        apply_theme_to_app(qt_app, get_color_scheme("dark", name))
+        qt_app.processEvents()
+        return time.perf_counter() - start
+
+    timed("nord")
+    switches = [timed(name) for name in ("dracula", "gruvbox", "catppuccin", "nord")]
+    reapply = min(timed("nord") for _ in range(5))
+    tree.close()
+
+    switch = sum(switches) / len(switches)
+    print(f"\ntheme switch {switch * 1000:.1f}ms, re-apply {reapply * 1000:.2f}ms")
+    assert reapply < switch / 5